@@ -1,6 +1,6 @@
 from itertools import product
-from math import inf
-from typing import List, Tuple, Union, Optional
+from math import inf, ceil
+from typing import List, Tuple, Union, Optional, Dict
 
 from hwt.hdl.types.stream import HStream
 from hwtLib.abstract.frame_utils.byte_src_info import ByteSrcInfo
@@ -159,18 +159,29 @@ class FrameAlignmentUtils():
 
     def get_important_byte_cnts(
             self, offset_out: int, offset_in: int, chunk_size: int,
-            chunk_cnt_min: Union[int, float], chunk_cnt_max: Union[int, float]):
+            chunk_cnt_min: Union[int, float], chunk_cnt_max: Union[int, float],
+            misaligned_body_words: bool=False):
         """
         Filter chunk cnt range, let only those values
         which affect the number of valid bytes
         in first/last word of frame and presence of words in body frame
+
+        :param misaligned_body_words: if True and the input and output is not aligned
+            add also the frames with an additional body word (each output body word is composed
+            of 2 input words and the frame needs 2 body words to contain the output word
+            where none of these input words is the last one)
         """
         # assert chunk_cnt_min > 0
         assert chunk_cnt_min <= chunk_cnt_max, (chunk_cnt_min, chunk_cnt_max)
+        add_body_word = misaligned_body_words and offset_out != offset_in
         if isinstance(chunk_cnt_min, int) and isinstance(chunk_cnt_max, int)\
                 and chunk_cnt_min == chunk_cnt_max:
-            _, _, _, min_representative_frame_size = self.get_bytes_in_frame_info(
+            _, has_body_words, _, min_representative_frame_size = self.get_bytes_in_frame_info(
                 offset_out, offset_in, chunk_size, chunk_cnt_min, False)
+            if add_body_word and has_body_words:
+                min_representative_frame_size = min(
+                    min_representative_frame_size + self.word_bytes,
+                    chunk_size * chunk_cnt_min)
             return [min_representative_frame_size, ]
 
         word_bytes = self.word_bytes
@@ -188,28 +199,35 @@ class FrameAlignmentUtils():
                 offset_out, offset_in, chunk_size, chunk_cnt,
                 already_has_body_words)
             sizes.add(min_representative_frame_size)
+            if add_body_word and has_body_words:
+                sizes.add(min_representative_frame_size + word_bytes)
             already_has_body_words |= has_body_words
 
         return sorted(sizes)
 
     def stream_to_all_possible_frame_formats(
-            self, t: HStream, stream_i: int, offset_out: int):
+            self, t: HStream, stream_i: int, offset_out: int,
+            misaligned_body_words: bool=False):
         """
         Generate all possible frame formats with unique features
         (related to masks, last and data mux)
+
+        :see: :meth:`~.get_important_byte_cnts`
         """
         frames = []
         chunk_size = t.element_t.bit_length() // 8
         for offset_in in t.start_offsets:
             for byte_cnt in self.get_important_byte_cnts(
-                    offset_out, offset_in, chunk_size, t.len_min, t.len_max):
+                    offset_out, offset_in, chunk_size, t.len_min, t.len_max,
+                    misaligned_body_words):
                 frame = self.create_frame(
                     stream_i, byte_cnt, offset_out, offset_in)
                 frames.append(frame)
         return frames
 
     def streams_to_all_possible_frame_formats(
-            self, streams: List[HStream], offset: int):
+            self, streams: List[HStream], offset: int,
+            misaligned_body_words: bool=False):
         """
         :see: :func:`FrameJoinUtils.stream_to_all_possible_frame_formats`
             for multiple input streams
@@ -222,7 +240,7 @@ class FrameAlignmentUtils():
             f_frames = set()
             for offset_out in prev_end_offsets:
                 f_frames_tmp = self.stream_to_all_possible_frame_formats(
-                    t, i, offset_out)
+                    t, i, offset_out, misaligned_body_words)
                 f_frames.update(f_frames_tmp)
 
             f_frames = list(f_frames)
@@ -256,6 +274,77 @@ class FrameAlignmentUtils():
             frames, len(streams))
         return input_B_dst
 
+    def streams_to_all_possible_segmented_frame_formats(
+            self, streams: List[HStream], segment_bytes: int)\
+            ->Tuple[List[Tuple[Tuple[Optional[ByteSrcInfo], ...], ...]], Dict[Tuple[int, int], int]]:
+        """
+        Same as :meth:`~.streams_to_all_possible_frame_formats` but the output word
+        is divided in to segments of segment_bytes and the next frame may start
+        at the beginning of the first free segment after the end of the previous frame
+        (in the same output word). Frames always start on segment boundary
+        and at most 2 frames can share a single output word
+        (end of the previous frame and the start of the next frame).
+
+        :return: tuple (frames, next_frame_starts), where next_frame_starts is a dictionary
+            {(frame index, output word index): output byte index where the next frame starts}
+            for the output words shared by 2 frames
+        :note: The words before the shared word are only a context required to resolve
+            the state of the input registers, the frame starting on non 0 offset exists only
+            as a part of the shared word.
+        """
+        word_bytes = self.word_bytes
+        assert self.out_offset == 0, ("Frames have to start at the segment boundary", self.out_offset)
+        assert word_bytes % segment_bytes == 0, (word_bytes, segment_bytes)
+        formats_for_offset = {
+            o: self.streams_to_all_possible_frame_formats(streams, o, True)
+            for o in range(0, word_bytes, segment_bytes)
+        }
+        frames = list(formats_for_offset[0])
+        next_frame_starts = {}
+        for o, o_frames in formats_for_offset.items():
+            for f in o_frames:
+                if o != 0 and len(f) == 1:
+                    # the frame starts and ends in a word which is already shared with the previous frame
+                    continue
+                last_word = f[-1]
+                end = max(i for i, b in enumerate(last_word) if b is not None) + 1
+                next_start = ceil(end / segment_bytes) * segment_bytes
+                if next_start >= word_bytes:
+                    # no space for the next frame in this word
+                    continue
+                # number of words from each input consumed by the previous frame
+                # (the input registers are shared between frames)
+                in_word_cnt = [0 for _ in streams]
+                for w in f:
+                    for b in w:
+                        if b is not None:
+                            in_word_cnt[b.stream_i] = max(in_word_cnt[b.stream_i], b.word_i + 1)
+
+                for next_f in formats_for_offset[next_start]:
+                    next_f = [
+                        [b if b is None else
+                         ByteSrcInfo(b.stream_i, b.word_i + in_word_cnt[b.stream_i],
+                                     b.byte_i, b.is_from_last_input_word)
+                         for b in w]
+                        for w in next_f
+                    ]
+                    merged_word = [*last_word[:next_start], *next_f[0][next_start:]]
+                    next_frame_starts[(len(frames), len(f) - 1)] = next_start
+                    frames.append(freeze_frame([*f[:-1], merged_word, *next_f[1:]]))
+
+        return frames, next_frame_starts
+
+    def resolve_input_bytes_destinations_segmented(self, streams: List[HStream], segment_bytes: int):
+        """
+        :see: :meth:`~.streams_to_all_possible_segmented_frame_formats`
+        :return: tuple (input_B_dst, next_frame_starts)
+        """
+        frames, next_frame_starts = self.streams_to_all_possible_segmented_frame_formats(
+            streams, segment_bytes)
+        input_B_dst = self._resolve_input_bytes_destinations(
+            frames, len(streams))
+        return input_B_dst, next_frame_starts
+
     @staticmethod
     def can_produce_zero_len_frame(streams: List[HStream]):
         return [s.len_min == 0 for s in streams]
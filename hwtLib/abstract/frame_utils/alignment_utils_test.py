@@ -10,10 +10,12 @@ from hwtLib.abstract.frame_utils.alignment_utils import FrameAlignmentUtils
 
 def get_important_byte_cnts(
         offset_out: int, offset_in: int, word_bytes: int, chunk_size: int,
-        chunk_cnt_min: Union[int, float], chunk_cnt_max: Union[int, float]):
+        chunk_cnt_min: Union[int, float], chunk_cnt_max: Union[int, float],
+        misaligned_body_words: bool=False):
     fju = FrameAlignmentUtils(word_bytes)
     return fju.get_important_byte_cnts(offset_out, offset_in,
-                                       chunk_size, chunk_cnt_min, chunk_cnt_max)
+                                       chunk_size, chunk_cnt_min, chunk_cnt_max,
+                                       misaligned_body_words)
 
 
 class FrameAlignmentUtilsTC(unittest.TestCase):
@@ -135,6 +137,22 @@ class FrameAlignmentUtilsTC(unittest.TestCase):
         res_ref = [2, 4]
         self.assertSequenceEqual(res, res_ref)
 
+    def test_get_important_chunk_cnts_misaligned_body_words(self):
+        word_bytes = 2
+        chunk_size = 1
+        chunk_cnt_min = 1
+        chunk_cnt_max = inf
+        res = get_important_byte_cnts(
+            1, 0, word_bytes, chunk_size, chunk_cnt_min, chunk_cnt_max, True)
+        res_ref = [1, 2, 3, 4, 5, 6]
+        self.assertSequenceEqual(res, res_ref)
+
+        # aligned, no extra body word required
+        res = get_important_byte_cnts(
+            0, 0, word_bytes, chunk_size, chunk_cnt_min, chunk_cnt_max, True)
+        res_ref = [1, 2, 3]
+        self.assertSequenceEqual(res, res_ref)
+
 
 if __name__ == "__main__":
     testLoader = unittest.TestLoader()
@@ -1,4 +1,5 @@
-from typing import Tuple, Dict, Set, List
+from math import ceil
+from typing import Tuple, Dict, Set, List, Optional
 
 from hwt.pyUtils.arrayQuery import iter_with_last
 from hwtLib.abstract.frame_utils.join.state_trans_info import StateTransInfo
@@ -27,11 +28,19 @@ def input_B_dst_to_fsm(word_bytes: int,
                        input_B_dst: List[List[Set[
                            Tuple[Tuple[int, int], int, int, int]
                         ]]],
-                       can_be_zero_len_frame: List[bool]):
+                       can_be_zero_len_frame: List[bool],
+                       segment_bytes: Optional[int]=None,
+                       next_frame_starts: Optional[Dict[Tuple[int, int], int]]=None):
     """
     :param word_bytes: number of bytes in output word
     :param input_cnt: number of input streams
     :param input_B_dst: list with mapping of input bytes to a output bytes in each state
+    :param segment_bytes: number of bytes in output segment if the end of the frame and the start of the next frame
+        can be packed in to a single output word (None if each frame starts in a new output word)
+    :param next_frame_starts: dictionary {state label: index of output byte where the next frame starts}
+        for output words which contain the end of the frame and the start of the next frame,
+        the words of the frame before such a word are used only to resolve the state of input registers
+        (the state transitions for them are generated from other frames)
 
     .. code-block::
 
@@ -42,6 +51,8 @@ def input_B_dst_to_fsm(word_bytes: int,
                         state label, input index, time index, output byte index, input last flag
 
     :note: input_B_dst is produced by :func:`hwtLib.amba.axis_comp.frame_utils.join.FrameJoinUtils.resolve_input_bytes_destinations`
+        or by :func:`hwtLib.amba.axis_comp.frame_utils.join.FrameJoinUtils.resolve_input_bytes_destinations_segmented`
+        (segment_bytes, next_frame_starts)
     """
     # (out_frame_format_i, out_word_i): StateTransInfo
     sub_states: Dict[Tuple[int, int], StateTransInfo] = {}
@@ -68,25 +79,71 @@ def input_B_dst_to_fsm(word_bytes: int,
                 max_lookahead_for_input[in_i] = max(
                     max_lookahead_for_input[in_i], in_B_time)
 
+    if segment_bytes is None:
+        segment_cnt = None
+        next_frame_starts = {}
+        context_only_words = set()
+    else:
+        assert word_bytes % segment_bytes == 0, (word_bytes, segment_bytes)
+        assert not any(can_be_zero_len_frame), (
+            "0B frames are not supported if frames are packed in to segments", can_be_zero_len_frame)
+        segment_cnt = word_bytes // segment_bytes
+        context_only_words = set(
+            (f_i, w_i)
+            for (f_i, shared_w_i) in next_frame_starts.keys()
+            for w_i in range(shared_w_i)
+        )
+        # bytes of input 0 which can be the first byte of the frame
+        next_frame_first_B: Set[int] = set()
+        for st_label, next_start in next_frame_starts.items():
+            (in_i, _, in_B_i, _) = sub_states[st_label].outputs[next_start]
+            assert in_i == 0, (st_label, in_i)
+            next_frame_first_B.add(in_B_i)
+
+        # for output words where the next frame could be started but it is not
+        # resolve the register of input 0 where the next frame would be
+        # (the start of the next frame is not available if this register has keep=0 on the first byte of frame)
+        next_frame_reg_i: Dict[Tuple[int, int], int] = {}
+        if next_frame_first_B:
+            for ss in sub_states.values():
+                if ss.label in next_frame_starts \
+                        or ss.label in context_only_words \
+                        or ss.get_next_substate(sub_states) is not None:
+                    continue
+                end = max(i for i, o in enumerate(ss.outputs) if o is not None) + 1
+                if ceil(end / segment_bytes) * segment_bytes >= word_bytes:
+                    continue
+                in0_times = [o[1] for o in ss.outputs if o is not None and o[0] == 0]
+                t = max(in0_times) + 1 if in0_times else 0
+                next_frame_reg_i[ss.label] = t
+                max_lookahead_for_input[0] = max(max_lookahead_for_input[0], t)
+
     # build fsm
     state_cnt = input_cnt
     tt = StateTransTable(
-        word_bytes, max_lookahead_for_input, state_cnt)
-    states_for_relict_processing: List[StateTransInfo] = []
+        word_bytes, max_lookahead_for_input, state_cnt, segment_cnt)
+    # labels of the states where the first input word is partially consumed by a previous output word
+    states_for_relict_processing: Set[Tuple[int, int]] = set()
     # for all possible in/out configurations
     for ss in sorted(sub_states.values(), key=lambda x: x.label):
         ss: StateTransInfo
-        st_i = ss.get_state_i()
+        # index of the output byte where the next frame starts (if the word contains the start of the next frame)
+        next_frame_start = next_frame_starts.get(ss.label, None)
+        st_i = ss.get_state_i(next_frame_start)
         next_ss = ss.get_next_substate(sub_states)
         if next_ss is None:
             next_st_i = 0
         else:
-            next_st_i = next_ss.get_state_i()
+            next_st_i = next_ss.get_state_i(next_frame_starts.get(next_ss.label, None))
 
-        tr = StateTransItem(tt, st_i, next_st_i, int(next_ss is None))
-        tt.state_trans[st_i].append(tr)
+        tr = StateTransItem(tt, st_i, next_st_i, int(next_ss is None or next_frame_start is not None))
+        if ss.label not in context_only_words:
+            tt.state_trans[st_i].append(tr)
         o_prev = None
         for last, (out_B_i, o) in iter_with_last(enumerate(ss.outputs)):
+            if out_B_i == next_frame_start:
+                # the bytes of the previous frame are not related to the next frame
+                o_prev = None
             if o is None:
                 o_prev = o
                 # output byte is disconnected, which is default state
@@ -106,6 +163,9 @@ def input_B_dst_to_fsm(word_bytes: int,
 
             if last:
                 o_next = next_ss.outputs[0] if next_ss is not None else None
+            elif out_B_i + 1 == next_frame_start:
+                # the end of the previous frame
+                o_next = None
             else:
                 o_next = ss.outputs[out_B_i + 1]
 
@@ -119,7 +179,7 @@ def input_B_dst_to_fsm(word_bytes: int,
 
             if is_input_word_continuing_in_next_out_word:
                 assert next_ss is not None
-                states_for_relict_processing.append(next_ss)
+                states_for_relict_processing.add(next_ss.label)
 
             is_first_input_byte = is_from_different_input(o_prev, o)
             # is last byte from input byte in this output word
@@ -183,6 +243,21 @@ def input_B_dst_to_fsm(word_bytes: int,
 
             o_prev = o
 
+        if segment_cnt is not None:
+            if next_frame_start is not None:
+                end = max(i for i, o in enumerate(ss.outputs[:next_frame_start]) if o is not None)
+                tr.out_last_B[end] = 1
+            if next_ss is None:
+                end = max(i for i, o in enumerate(ss.outputs) if o is not None)
+                tr.out_last_B[end] = 1
+
+            next_frame_t = next_frame_reg_i.get(ss.label, None)
+            if next_frame_t is not None:
+                # the next frame is not available yet, the frame has to end in this word without the next frame
+                in_rec: InputRegInputVal = tr.input[0][next_frame_t]
+                for B_i in next_frame_first_B:
+                    in_rec.keep[B_i] = 0
+
         # if we are checking the input keep==0 set keep_mask=0 as well
         # (not required, to make clear that the byte will not be used in code)
         for in_meta, in_keep_mask in zip(tr.input, tr.input_keep_mask):
@@ -192,7 +267,7 @@ def input_B_dst_to_fsm(word_bytes: int,
                         in_keep_mask[in_i][B_i] = 0
 
         # mark relict flag
-        first_input_is_relict = ss in states_for_relict_processing
+        first_input_is_relict = ss.label in states_for_relict_processing
         for o in ss.outputs:
             if o is None:
                 # skip start padding
@@ -207,6 +282,13 @@ def input_B_dst_to_fsm(word_bytes: int,
                 v.relict = int(first_input_is_relict)
             break
 
+        if next_frame_start is not None:
+            (in_i, in_t, _, _) = ss.outputs[next_frame_start]
+            v = tr.input[in_i][in_t]
+            if v.last:
+                # the first word of the next frame could not be consumed before
+                v.relict = 0
+
     if can_be_zero_len_frame[0]:
         # The previous code generates the transition starting
         # from the state corresponding to a minimal index of input used in it and the starting
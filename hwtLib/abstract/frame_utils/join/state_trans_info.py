@@ -15,11 +15,13 @@ class StateTransInfo():
         self.outputs: List[Optional[Tuple[int, int, int]]] = [None for _ in range(word_bytes)]
         self.last_per_input: List[Optional[int]] = [None for _ in range(input_cnt)]
 
-    def get_state_i(self) -> int:
+    def get_state_i(self, end: Optional[int]=None) -> int:
         """
+        :param end: index of the first output byte which should be ignored
+            (used for output words with the start of the next frame)
         :return: source state index for this state transition, min input index used when this state transition can happen
         """
-        return min([x[0] for x in self.outputs if x is not None])
+        return min([x[0] for x in self.outputs[:end] if x is not None])
 
     def get_next_substate(self, sub_states: Dict[Tuple[int, int], "StateTransInfo"]) -> Optional["StateTransInfo"]:
         return sub_states.get((self.label[0], self.label[1] + 1), None)
@@ -41,6 +41,8 @@ class StateTransItem():
     :ivar input_rd: ready for a input channel (if 1 the input stream will be shifted in)
     :ivar output_keep: output keep values
     :ivar out_byte_mux_sel: list of
+    :ivar out_last_B: list of flags for each output byte, 1 if the byte is the last byte of the frame
+        (None if the output word is not segmented and the frame end is marked only by the last flag)
     """
 
     def __init__(self, parent_table: StateTransTable, st_i: int, state_next_i: int, out_last: int):
@@ -71,6 +73,10 @@ class StateTransItem():
         self.out_byte_mux_sel: List[Optional[int]] = [None for _ in range(parent_table.word_bytes)]
         self.state_next = state_next_i
         self.last = out_last
+        if parent_table.segment_cnt is None:
+            self.out_last_B: Optional[List[int]] = None
+        else:
+            self.out_last_B = [0 for _ in range(parent_table.word_bytes)]
 
     def as_tuple(self):
         t = (
@@ -86,6 +92,7 @@ class StateTransItem():
             tuple(self.output_keep),
             tuple(self.out_byte_mux_sel),
             self.last,
+            None if self.out_last_B is None else tuple(self.out_last_B),
         )
         return t
 
@@ -135,6 +142,7 @@ class StateTransItem():
         self.input_rd = d["in.rd"]
         self.output_keep = d["out.keep"]
         self.out_byte_mux_sel = d["out.mux"]
+        self.out_last_B = d.get("out.last_B", None)
         return self
 
     def __repr__(self, as_dict=False):
@@ -144,11 +152,15 @@ class StateTransItem():
         else:
             header = f"<{self.__class__.__name__} "
             footer = ">"
+        if self.out_last_B is None:
+            last_B = ""
+        else:
+            last_B = f", 'out.last_B':{self.out_last_B!r}"
         return ("%s'st':'%r->%r', 'in':%r, \n"
                 "    'in.keep_mask':%r, 'in.rd':%r,\n"
-                "    'out.keep':%r, 'out.mux':%r, 'out.last':%r%s") % (
+                "    'out.keep':%r, 'out.mux':%r, 'out.last':%r%s%s") % (
             header,
             self.state, self.state_next, self.input, self.input_keep_mask,
             self.input_rd, self.output_keep, self.out_byte_mux_sel, self.last,
-            footer
+            last_B, footer
         )
@@ -1,14 +1,19 @@
 from itertools import islice
-from typing import List
+from typing import List, Optional
 
 from hwt.math import log2ceil
 
 
 class StateTransTable():
+    """
+    :ivar ~.segment_cnt: number of segments in output word if multiple frames
+        can be packed in to a single output word (None if only a single frame may be present in output word)
+    """
 
     def __init__(self, word_bytes: int,
                  max_lookahead_for_input: List[int],
-                 state_cnt: int):
+                 state_cnt: int,
+                 segment_cnt: Optional[int]=None):
         # List[Tuple[inputs, outputs]]
         input_cnt = len(max_lookahead_for_input)
         self.state_trans = [[] for _ in range(state_cnt)]
@@ -20,6 +25,7 @@ class StateTransTable():
         self.state_cnt = state_cnt
         # number of bytes to store state
         self.state_width = log2ceil(state_cnt)
+        self.segment_cnt = segment_cnt
 
     def assert_transitions_deterministic(self):
         for st_trans in self.state_trans:
@@ -402,6 +402,36 @@ class FrameJoinUtilsTC(unittest.TestCase):
         ]]
         self.assertSequenceEqual(tt.state_trans, ref)
 
+    def test_fsm_1x1B_on_2B_2seg(self):
+        word_bytes = 2
+        streams = [
+            HStream(HBits(8 * 1), (1, 1), [0]),
+        ]
+        sju = FrameAlignmentUtils(word_bytes, 0)
+        input_B_dst, next_frame_starts = sju.resolve_input_bytes_destinations_segmented(streams, 1)
+        tt = input_B_dst_to_fsm(word_bytes, len(streams), input_B_dst,
+                                sju.can_produce_zero_len_frame(streams),
+                                1, next_frame_starts)
+
+        def st(d):
+            return StateTransItem.from_dict(tt, d)
+
+        ref = [[
+            # next frame is not available yet, output only the first one
+            st({'st':'0->0', 'in':[[{'keep':[ 1 , 0 ], 'relict': 0 , 'last': 1 },
+                                    {'keep':[ 0 , 'X'], 'relict':'X', 'last':'X'}]],
+                'in.keep_mask':[[[0, 0], [0, 1]]], 'in.rd':[1],
+                'out.keep':[1, 0], 'out.mux':[(0, 0, 0), None], 'out.last':1,
+                'out.last_B':[1, 0]}),
+            # end of the first frame and the second frame in a single output word
+            st({'st':'0->0', 'in':[[{'keep':[ 1 , 0 ], 'relict': 0 , 'last': 1 },
+                                    {'keep':[ 1 , 0 ], 'relict': 0 , 'last': 1 }]],
+                'in.keep_mask':[[[0, 0], [0, 0]]], 'in.rd':[1],
+                'out.keep':[1, 1], 'out.mux':[(0, 0, 0), (0, 1, 0)], 'out.last':1,
+                'out.last_B':[1, 1]}),
+        ]]
+        self.assertSequenceEqual(tt.state_trans, ref)
+
 
 if __name__ == "__main__":
     testLoader = unittest.TestLoader()
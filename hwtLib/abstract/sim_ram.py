@@ -1,12 +1,15 @@
 from math import ceil
+from struct import calcsize
+from typing import Union, List, Tuple, Optional, Sequence
 
 from hwt.hdl.transTmpl import TransTmpl
-from hwt.hdl.types.array import HArray
 from hwt.hdl.types.bits import HBits
 from hwt.hdl.types.struct import HStruct
 from hwt.math import shiftIntArray
 from hwt.pyUtils.arrayQuery import grouper
-from pyMathBitPrecise.bit_utils import mask, get_bit_range, int_list_to_int
+from hwtLib.abstract.sim_ram_read_plan import TransTmplReadPlan
+from hwtLib.abstract.sim_ram_storage import SimRamPagedStorage
+from pyMathBitPrecise.bit_utils import int_list_to_int, ValidityError
 
 
 class AllocationError(Exception):
@@ -39,7 +42,8 @@ class SimRam():
     """
     Dense memory for simulation purposes with data pump interfaces
 
-    :ivar ~.data: memory dict
+    :ivar ~.data: memory storage, behaves as a dict word index -> int/HConst/None
+        (:class:`hwtLib.abstract.sim_ram_storage.SimRamPagedStorage`)
     """
 
     def __init__(self, cellSize, parent=None):
@@ -51,13 +55,52 @@ class SimRam():
         """
 
         self.parent = parent
+        self.cellSize = cellSize
         if parent is None:
-            self.data = {}
+            self.data = SimRamPagedStorage(cellSize)
         else:
             self.data = parent.data
-        self.cellSize = cellSize
         self.prevAllocatedAddrEnd = 0
 
+    @property
+    def data(self) -> SimRamPagedStorage:
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        """
+        :param data: SimRamPagedStorage or a dict word index -> value to initialize the memory with
+        """
+        if not isinstance(data, SimRamPagedStorage):
+            _data = SimRamPagedStorage(self.cellSize)
+            _data.update(data)
+            data = _data
+        else:
+            assert data.cellSize == self.cellSize, (data.cellSize, self.cellSize)
+
+        self._data = data
+
+    def _getAllocationStart(self, keepOut):
+        """
+        :return: the address behind the lastly used word (+keepOut)
+        """
+        lastIndex = self.data.maxIndex()
+        if lastIndex is None:
+            addr = self.prevAllocatedAddrEnd
+        else:
+            addr = (lastIndex + 1) * self.cellSize
+
+        if keepOut:
+            addr += keepOut
+
+        return addr
+
+    def _checkNotOccupied(self, indx: int, wordCnt: int):
+        occupied = self.data.findUsed(indx, wordCnt)
+        if occupied is not None:
+            raise AllocationError(
+                "Address 0x%x is already occupied" % (occupied * self.cellSize))
+
     def malloc(self, size, keepOut=None):
         """
         Allocates a block of memory of size and initialize it
@@ -68,28 +111,16 @@ class SimRam():
                         and lastly allocated
         :return: address of allocated memory
         """
-        addr = self.prevAllocatedAddrEnd
-        k = self.data.keys()
-        if k:
-            addr = (max(k) + 1) * self.cellSize
-
-        if keepOut:
-            addr += keepOut
+        addr = self._getAllocationStart(keepOut)
 
         indx = addr // self.cellSize
         if indx * self.cellSize != addr:
             NotImplementedError(
                 f"unaligned allocations not implemented (0x{addr:x})")
 
-        d = self.data
-        for i in range(size // self.cellSize):
-            tmp = indx + i
-
-            if tmp in d.keys():
-                raise AllocationError(
-                    "Address 0x%x is already occupied" % (tmp * self.cellSize))
-
-            d[tmp] = None
+        wordCnt = size // self.cellSize
+        self._checkNotOccupied(indx, wordCnt)
+        self.data.allocate(indx, wordCnt)
 
         self.prevAllocatedAddrEnd = addr
         return addr
@@ -106,13 +137,7 @@ class SimRam():
         :param initValues: iterable of word values to init memory with
         :return: address (byte step) of allocated memory
         """
-        addr = self.prevAllocatedAddrEnd
-        k = self.data.keys()
-        if k:
-            addr = (max(k) + 1) * self.cellSize
-
-        if keepOut:
-            addr += keepOut
+        addr = self._getAllocationStart(keepOut)
 
         indx = addr // self.cellSize
         shift = addr % self.cellSize
@@ -123,27 +148,111 @@ class SimRam():
             wordCnt += 1
 
         d = self.data
-
+        initBytes = None
         if initValues is not None:
-            if size != self.cellSize:
-                initValues = list(reshapedInitItems(
-                    size, self.cellSize, initValues))
-            assert len(initValues) == wordCnt, (len(initValues), wordCnt)
-
-        for i in range(wordCnt):
-            tmp = indx + i
-
-            if tmp in d.keys():
-                raise AllocationError(
-                    "Address 0x%x is already occupied" % (tmp * self.cellSize))
-            if initValues is None:
-                d[tmp] = 0
+            if all(isinstance(v, int) and v >= 0 for v in initValues):
+                # fast path, reshape using byte representation
+                try:
+                    initBytes = b"".join(v.to_bytes(size, "little") for v in initValues)
+                except OverflowError:
+                    pass
+
+            if initBytes is not None:
+                initBytes += bytes(-len(initBytes) % self.cellSize)
+                assert len(initBytes) == wordCnt * self.cellSize, (len(initBytes), wordCnt)
             else:
-                d[tmp] = initValues[i]
+                if size != self.cellSize:
+                    initValues = list(reshapedInitItems(
+                        size, self.cellSize, initValues))
+                assert len(initValues) == wordCnt, (len(initValues), wordCnt)
+
+        self._checkNotOccupied(indx, wordCnt)
+        if initValues is None:
+            d.fill(indx, wordCnt, 0)
+        elif initBytes is not None:
+            d.writeBytes(indx * self.cellSize, initBytes)
+        else:
+            d.setWords(indx, initValues)
 
         self.prevAllocatedAddrEnd = (indx + wordCnt) * self.cellSize
         return addr
 
+    def write_bytes(self, addr: int, buff: Union[bytes, bytearray, memoryview]):
+        """
+        Write a buffer to memory (the written bytes become valid)
+
+        :param addr: byte address where the data should be written
+        :param buff: bytes-like object with the data
+        """
+        self.data.writeBytes(addr, buff)
+
+    def read_bytes(self, addr: int, n: int, allow_invalid=False) -> bytearray:
+        """
+        Read a block of memory as bytes
+
+        :param addr: byte address of the first byte
+        :param n: number of bytes to read
+        :param allow_invalid: if False the ValidityError is raised if there is any invalid bit,
+            if True the invalid bits are read as 0
+        """
+        data, vld = self.data.readBytes(addr, n)
+        if not allow_invalid and vld.count(0xff) != n:
+            i = n - len(vld.lstrip(b"\xff"))
+            raise ValidityError(f"Invalid read of uninitialized value on addr 0x{addr + i:x}")
+        return data
+
+    def view(self, addr: int, dtype: str, count: int) -> memoryview:
+        """
+        Get read-only memoryview of a block of memory
+
+        :param addr: byte address of the first item
+        :param dtype: struct module format of an item ("B", "H", "I", "Q", ...), native byte order
+        :param count: number of items
+        :note: The view does not copy the data if the block is not spanning multiple pages of storage,
+            use numpy.frombuffer() on the result if you need a NumPy array.
+        :note: validity of data is not checked
+        """
+        return self.data.viewBytes(addr, calcsize(dtype) * count).cast(dtype)
+
+    def compare_bytes(self, addr: int, expected: Union[bytes, bytearray, memoryview]) -> List[Tuple[int, int, Optional[int]]]:
+        """
+        Compare block of memory with an expected content
+
+        :return: list of mismatches (address, expected byte, actual byte or None if byte is not fully valid)
+        """
+        expected = memoryview(expected).cast("B")
+        n = len(expected)
+        data, vld = self.data.readBytes(addr, n)
+        if data == expected and vld.count(0xff) == n:
+            return []
+
+        res = []
+        for i, (e, d, v) in enumerate(zip(expected, data, vld)):
+            if v != 0xff:
+                res.append((addr + i, e, None))
+            elif d != e:
+                res.append((addr + i, e, d))
+        return res
+
+    def compare_array(self, addr: int, item_size: int, expected: Sequence[int]) -> List[Tuple[int, int, Optional[int]]]:
+        """
+        Compare an array of integers stored in memory with an expected content
+
+        :return: list of mismatches (item index, expected value, actual value or None if item is not fully valid)
+        """
+        n = item_size * len(expected)
+        data, vld = self.data.readBytes(addr, n)
+        res = []
+        for i, e in enumerate(expected):
+            o = i * item_size
+            if vld.count(0xff, o, o + item_size) != item_size:
+                res.append((i, e, None))
+            else:
+                d = int.from_bytes(data[o:o + item_size], "little")
+                if d != e:
+                    res.append((i, e, d))
+        return res
+
     def getArray(self, addr: int, item_size: int, item_cnt: int):
         """
         Get array stored in memory
@@ -152,14 +261,8 @@ class SimRam():
         if item_size != self.cellSize or baseIndex * self.cellSize != addr:
             return self._getArray(addr * 8, TransTmpl(HBits(item_size * 8)[item_cnt]))
         else:
-            out = []
-            for i in range(baseIndex, baseIndex + item_cnt):
-                try:
-                    v = self.data[i]
-                except KeyError:
-                    v = None
-
-                out.append(v)
+            d = self.data
+            out = [d.get(i, None) for i in range(baseIndex, baseIndex + item_cnt)]
         return out
 
     def getBits(self, start, end, sign):
@@ -171,82 +274,33 @@ class SimRam():
         :return: instance of BitsVal (derived from SimBits type)
                  which contains copy of selected bits
         """
-        wordWidth = self.cellSize * 8
-
-        inFieldOffset = 0
-        allMask = mask(wordWidth)
+        assert start <= end, (start, end)
         value = HBits(end - start, signed=sign).from_py(None)
-
-        while start != end:
-            assert start < end, (start, end)
-
-            dataWordIndex = start // wordWidth
-            v = self.data.get(dataWordIndex, None)
-
-            endOfWord = (dataWordIndex + 1) * wordWidth
-            width = min(end, endOfWord) - start
-            offset = start % wordWidth
-            if v is None:
-                val = 0
-                vld_mask = 0
-            elif isinstance(v, int):
-                val = get_bit_range(v, offset, width)
-                vld_mask = allMask
-            else:
-                val = get_bit_range(v.val, offset, width)
-                vld_mask = get_bit_range(v.vld_mask, offset, width)
-
-            m = mask(width)
-            value.val |= (val & m) << inFieldOffset
-            value.vld_mask |= (vld_mask & m) << inFieldOffset
-
-            inFieldOffset += width
-            start += width
-
+        value.val, value.vld_mask = self.data.readBits(start, end)
         return value
 
+    def _readTransTmpl(self, offset: int, plan: TransTmplReadPlan):
+        """
+        Load all bits of the plan at once and decode them
+        """
+        val, vld_mask = self.data.readBits(offset, offset + plan.width)
+        return plan.decode(val, vld_mask)
+
     def _getArray(self, offset, transTmpl):
         """
         :param offset: global offset of this transTmpl (and struct)
         :param transTmpl: instance of TransTmpl which specifies items in array
         """
-        t = transTmpl.dtype
-        c = transTmpl.children
-        arr_offset = offset
-        item_width = c.bitAddrEnd - c.bitAddr
-        value = []
-        if not isinstance(t.element_t, HBits):
-            raise NotImplementedError(t.element_t)
-
-        for _ in range(t.size):
-            v = self.getBits(arr_offset, arr_offset + item_width, None)
-            value.append(v)
-            arr_offset += item_width
-        return value
+        plan = TransTmplReadPlan.fromTransTmpl(transTmpl)
+        return self._readTransTmpl(offset, plan)
 
     def _getStruct(self, offset, transTmpl):
         """
         :param offset: global offset of this transTmpl (and struct)
         :param transTmpl: instance of TransTmpl which specifies items in struct
         """
-        dataDict = {}
-        for subTmpl in transTmpl.children:
-            t = subTmpl.dtype
-            name = subTmpl.origin[-1].name
-            if isinstance(t, HBits):
-                value = self.getBits(
-                    subTmpl.bitAddr + offset, subTmpl.bitAddrEnd + offset, t.signed)
-            elif isinstance(t, HArray):
-                value = self._getArray(subTmpl.bitAddr + offset, subTmpl)
-
-            elif isinstance(t, HStruct):
-                value = self._getStruct(offset, subTmpl)
-            else:
-                raise NotImplementedError(t)
-
-            dataDict[name] = value
-
-        return transTmpl.dtype.from_py(dataDict)
+        plan = TransTmplReadPlan.fromTransTmpl(transTmpl)
+        return self._readTransTmpl(offset + transTmpl.bitAddr, plan)
 
     def getStruct(self, addr, structT, bitAddr=None):
         """
@@ -265,10 +319,9 @@ class SimRam():
             assert addr is not None
 
         if isinstance(structT, TransTmpl):
-            transTmpl = structT
-            structT = transTmpl.origin
+            return self._getStruct(bitAddr, structT)
         else:
             assert isinstance(structT, HStruct)
-            transTmpl = TransTmpl(structT)
-
-        return self._getStruct(bitAddr, transTmpl)
+            # the plan is cached for the type, TransTmpl does not have to be constructed
+            plan = TransTmplReadPlan.fromType(structT)
+            return self._readTransTmpl(bitAddr, plan)
@@ -0,0 +1,110 @@
+from functools import lru_cache
+from typing import List, Tuple, Union
+
+from hwt.hdl.const import HConst
+from hwt.hdl.transTmpl import TransTmpl
+from hwt.hdl.types.array import HArray
+from hwt.hdl.types.bits import HBits
+from hwt.hdl.types.hdlType import HdlType
+from hwt.hdl.types.struct import HStruct
+from pyMathBitPrecise.bit_utils import mask
+
+
+class TransTmplReadPlan():
+    """
+    Precompiled description of the fields of a :class:`hwt.hdl.transTmpl.TransTmpl`
+    which allows to decode the value of the whole type from a single int
+    (bits loaded from memory) using only shifts and masks.
+
+    The plans are cached per type (LRU with at most CACHE_SIZE items),
+    use :meth:`~.fromType`/:meth:`~.fromTransTmpl` to get them.
+
+    :ivar ~.dtype: the type which is decoded by this plan
+    :ivar ~.width: bit width of the data described by this plan
+    :ivar ~.fields: for HStruct a list of tuples (name, offset, sub plan),
+        offset is relative to start of this plan
+    """
+    CACHE_SIZE = 256
+
+    def __init__(self, transTmpl: TransTmpl):
+        base = transTmpl.bitAddr
+        t = self.dtype = transTmpl.dtype
+        self.width = transTmpl.bitAddrEnd - base
+        self.fields: List[Tuple[str, int, TransTmplReadPlan]] = []
+        if isinstance(t, HBits):
+            self._item_t = HBits(self.width, signed=t.signed)
+        elif isinstance(t, HArray):
+            if not isinstance(t.element_t, HBits):
+                raise NotImplementedError(t.element_t)
+            c = transTmpl.children
+            self._item_width = c.bitAddrEnd - c.bitAddr
+            self._item_cnt = int(t.size)
+            self._item_mask = mask(self._item_width)
+            self._item_t = HBits(self._item_width)
+        elif isinstance(t, HStruct):
+            for subTmpl in transTmpl.children:
+                name = subTmpl.origin[-1].name
+                sub = self.fromTransTmpl(subTmpl)
+                self.fields.append((name, subTmpl.bitAddr - base, sub))
+        else:
+            raise NotImplementedError(t)
+
+    @classmethod
+    @lru_cache(maxsize=CACHE_SIZE)
+    def _fromHashableType(cls, t: HdlType) -> "TransTmplReadPlan":
+        return cls(TransTmpl(t))
+
+    @classmethod
+    def clear_cache(cls):
+        cls._fromHashableType.cache_clear()
+
+    @classmethod
+    def fromTransTmpl(cls, transTmpl: TransTmpl) -> "TransTmplReadPlan":
+        t = transTmpl.dtype
+        try:
+            hash(t)
+        except TypeError:
+            # unhashable type, can not be cached
+            return cls(transTmpl)
+        return cls._fromHashableType(t)
+
+    @classmethod
+    def fromType(cls, t: HdlType) -> "TransTmplReadPlan":
+        try:
+            hash(t)
+        except TypeError:
+            # unhashable type, can not be cached
+            return cls(TransTmpl(t))
+        return cls._fromHashableType(t)
+
+    def decode(self, val: int, vld_mask: int) -> Union[HConst, List[HConst]]:
+        """
+        :param val: bits of the value (starting at bit 0 of this plan)
+        :param vld_mask: validity mask for val
+        :return: value of dtype of this plan (HArray is returned as a list of items)
+        """
+        t = self.dtype
+        if isinstance(t, HBits):
+            v = self._item_t.from_py(None)
+            m = mask(self.width)
+            v.val = val & m
+            v.vld_mask = vld_mask & m
+            return v
+        elif isinstance(t, HArray):
+            item_t = self._item_t
+            m = self._item_mask
+            w = self._item_width
+            value = []
+            for _ in range(self._item_cnt):
+                v = item_t.from_py(None)
+                v.val = val & m
+                v.vld_mask = vld_mask & m
+                value.append(v)
+                val >>= w
+                vld_mask >>= w
+            return value
+        else:
+            dataDict = {}
+            for name, offset, sub in self.fields:
+                dataDict[name] = sub.decode(val >> offset, vld_mask >> offset)
+            return t.from_py(dataDict)
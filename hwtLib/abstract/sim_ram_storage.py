@@ -0,0 +1,446 @@
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, Optional, Tuple, Generator, Union, Sequence
+
+from hwt.hdl.const import HConst
+from hwt.hdl.types.bits import HBits
+from pyMathBitPrecise.bit_utils import mask
+
+
+# states of the word in SimRamPage.used
+WORD_UNUSED = 0
+# allocated but not initialized, reads as None
+WORD_NONE = 1
+# contains a value (which may be only partially valid)
+WORD_VALUE = 2
+
+
+class SimRamPage():
+    """
+    Fixed-size block of simulation memory
+
+    :ivar ~.data: word data (little endian)
+    :ivar ~.vld: validity bitmap (1 bit for each bit of data)
+    :ivar ~.used: state of each word (WORD_UNUSED/WORD_NONE/WORD_VALUE)
+    """
+    __slots__ = ["data", "vld", "used"]
+
+    def __init__(self, pageWords: int, cellSize: int):
+        self.data = bytearray(pageWords * cellSize)
+        self.vld = bytearray(pageWords * cellSize)
+        self.used = bytearray(pageWords)
+
+
+class SimRamPagedStorage(MutableMapping):
+    """
+    Word addressed storage for :class:`hwtLib.abstract.sim_ram.SimRam`.
+    Behaves as a dict word index -> int/HConst/None, but the memory is stored
+    in fixed-size pages of bytearrays with a separate validity bitmap.
+    Only the pages which were touched are allocated.
+
+    :note: The values which can not be reconstructed from the bits of the word
+        (negative int, signed HConst or HConst of other width than the word) are also kept
+        in a side map, so the same object is read back as it was stored (as with dict).
+        Any later write to the word removes it from the side map.
+
+    :ivar ~.cellSize: size of the memory word in bytes
+    :ivar ~.PAGE_WORDS: number of words in a single page
+    :ivar ~.word_t: type used for words which are not fully valid
+    """
+
+    def __init__(self, cellSize: int, pageWords: int=1024):
+        assert cellSize > 0, cellSize
+        assert pageWords > 0, pageWords
+        self.cellSize = cellSize
+        self.PAGE_WORDS = pageWords
+        self.PAGE_BYTES = pageWords * cellSize
+        self.word_t = HBits(cellSize * 8)
+        self._wordBitMask = mask(cellSize * 8)
+        self._pages: Dict[int, SimRamPage] = {}
+        # {word index: value} for the values which are not plain (:meth:`~._isPlain`)
+        self._objs: Dict[int, Union[int, HConst]] = {}
+        self._len = 0
+        self._maxIndex = -1
+
+    def _getPage(self, pageIndex: int) -> SimRamPage:
+        p = self._pages.get(pageIndex, None)
+        if p is None:
+            p = self._pages[pageIndex] = SimRamPage(self.PAGE_WORDS, self.cellSize)
+        return p
+
+    def _iterChunks(self, index: int, cnt: int) -> Generator[Tuple[int, int, int], None, None]:
+        """
+        Split the range of words to parts which are in a single page
+
+        :return: generator of tuples (page index, word offset in page, word cnt)
+        """
+        PAGE_WORDS = self.PAGE_WORDS
+        while cnt > 0:
+            pi, off = divmod(index, PAGE_WORDS)
+            n = min(cnt, PAGE_WORDS - off)
+            yield pi, off, n
+            index += n
+            cnt -= n
+
+    def _splitValue(self, v: Union[int, HConst]) -> Tuple[int, int]:
+        """
+        :return: tuple (value, validity mask) for a value stored in memory
+        """
+        if isinstance(v, int):
+            val = v
+            vld = self._wordBitMask
+        else:
+            val = v.val
+            vld = v.vld_mask
+
+        if val < 0:
+            # two's complement representation of signed values
+            val &= self._wordBitMask
+        if val > self._wordBitMask or vld > self._wordBitMask:
+            raise ValueError("Value does not fit into a memory word", v, self.cellSize)
+        return val, vld
+
+    def _isPlain(self, v: Union[int, HConst]) -> bool:
+        """
+        :return: True if the value read from the bits of the word is equal to v
+            (non negative int or unsigned HBits value of the word width)
+        """
+        if isinstance(v, int):
+            return v >= 0
+        t = v._dtype
+        return isinstance(t, HBits) and not t.signed and t.bit_length() == self.cellSize * 8
+
+    def _dropObjs(self, index: int, cnt: int):
+        """
+        Remove the words in the range from the side map of non-plain values
+        """
+        objs = self._objs
+        if not objs:
+            return
+        end = index + cnt
+        if cnt <= len(objs):
+            for i in range(index, end):
+                objs.pop(i, None)
+        else:
+            for i in [i for i in objs.keys() if index <= i < end]:
+                del objs[i]
+
+    def _markUsed(self, p: SimRamPage, pi: int, off: int, n: int, state: int):
+        """
+        Set state of the words in a page and update the item counter
+        """
+        used = p.used
+        newlyUsed = used.count(WORD_UNUSED, off, off + n)
+        if newlyUsed:
+            self._len += newlyUsed
+            last = pi * self.PAGE_WORDS + off + n - 1
+            if last > self._maxIndex:
+                self._maxIndex = last
+        used[off:off + n] = bytes((state,)) * n
+
+    def __getitem__(self, index: int) -> Union[None, int, HConst]:
+        pi, off = divmod(index, self.PAGE_WORDS)
+        p = self._pages.get(pi, None)
+        if p is None:
+            raise KeyError(index)
+        st = p.used[off]
+        if st == WORD_VALUE:
+            if self._objs:
+                v = self._objs.get(index, None)
+                if v is not None:
+                    return v
+            cs = self.cellSize
+            b = off * cs
+            val = int.from_bytes(p.data[b:b + cs], "little")
+            vld = int.from_bytes(p.vld[b:b + cs], "little")
+            if vld == self._wordBitMask:
+                return val
+            else:
+                return self.word_t.from_py(val, vld)
+        elif st == WORD_NONE:
+            return None
+        else:
+            raise KeyError(index)
+
+    def get(self, index: int, default=None):
+        try:
+            return self[index]
+        except KeyError:
+            return default
+
+    def __contains__(self, index: int) -> bool:
+        p = self._pages.get(index // self.PAGE_WORDS, None)
+        return p is not None and p.used[index % self.PAGE_WORDS] != WORD_UNUSED
+
+    def __setitem__(self, index: int, v: Union[None, int, HConst]):
+        if index < 0:
+            raise IndexError(index)
+        pi, off = divmod(index, self.PAGE_WORDS)
+        p = self._getPage(pi)
+        cs = self.cellSize
+        b = off * cs
+        if v is None:
+            p.data[b:b + cs] = bytes(cs)
+            p.vld[b:b + cs] = bytes(cs)
+            self._markUsed(p, pi, off, 1, WORD_NONE)
+            self._objs.pop(index, None)
+        else:
+            val, vld = self._splitValue(v)
+            p.data[b:b + cs] = val.to_bytes(cs, "little")
+            p.vld[b:b + cs] = vld.to_bytes(cs, "little")
+            self._markUsed(p, pi, off, 1, WORD_VALUE)
+            if self._isPlain(v):
+                self._objs.pop(index, None)
+            else:
+                self._objs[index] = v
+
+    def setMasked(self, index: int, v: Union[int, HConst], bitMask: int):
+        """
+        Update only the bits of the word selected by bitMask
+        (the bits of the word which were not set yet are invalid)
+        """
+        if index < 0:
+            raise IndexError(index)
+        val, vld = self._splitValue(v)
+        pi, off = divmod(index, self.PAGE_WORDS)
+        p = self._getPage(pi)
+        cs = self.cellSize
+        b = off * cs
+        curVal = int.from_bytes(p.data[b:b + cs], "little")
+        curVld = int.from_bytes(p.vld[b:b + cs], "little")
+        nm = ~bitMask
+        curVal = (curVal & nm) | (val & bitMask)
+        curVld = (curVld & nm) | (vld & bitMask)
+        p.data[b:b + cs] = curVal.to_bytes(cs, "little")
+        p.vld[b:b + cs] = curVld.to_bytes(cs, "little")
+        self._markUsed(p, pi, off, 1, WORD_VALUE)
+        self._objs.pop(index, None)
+
+    def __delitem__(self, index: int):
+        pi, off = divmod(index, self.PAGE_WORDS)
+        p = self._pages.get(pi, None)
+        if p is None or p.used[off] == WORD_UNUSED:
+            raise KeyError(index)
+        cs = self.cellSize
+        b = off * cs
+        p.data[b:b + cs] = bytes(cs)
+        p.vld[b:b + cs] = bytes(cs)
+        p.used[off] = WORD_UNUSED
+        self._objs.pop(index, None)
+        self._len -= 1
+        if index == self._maxIndex:
+            self._maxIndex = self._findMaxIndex()
+
+    def _findMaxIndex(self) -> int:
+        for pi in sorted(self._pages.keys(), reverse=True):
+            used = self._pages[pi].used
+            n = len(used.rstrip(b"\x00"))
+            if n:
+                return pi * self.PAGE_WORDS + n - 1
+        return -1
+
+    def maxIndex(self) -> Optional[int]:
+        """
+        :return: the highest index of used word or None if memory is empty
+        """
+        if self._maxIndex < 0:
+            return None
+        return self._maxIndex
+
+    def findUsed(self, index: int, cnt: int) -> Optional[int]:
+        """
+        :return: index of the first used word in the range or None if all words are unused
+        """
+        for pi, off, n in self._iterChunks(index, cnt):
+            p = self._pages.get(pi, None)
+            if p is None:
+                continue
+            usedSuffix = p.used[off:off + n].lstrip(b"\x00")
+            if usedSuffix:
+                return pi * self.PAGE_WORDS + off + n - len(usedSuffix)
+        return None
+
+    def allocate(self, index: int, cnt: int):
+        """
+        Mark the range of words as allocated (the words will have None value)
+        """
+        cs = self.cellSize
+        for pi, off, n in self._iterChunks(index, cnt):
+            p = self._getPage(pi)
+            b0 = off * cs
+            b1 = b0 + n * cs
+            p.data[b0:b1] = bytes(b1 - b0)
+            p.vld[b0:b1] = bytes(b1 - b0)
+            self._markUsed(p, pi, off, n, WORD_NONE)
+        self._dropObjs(index, cnt)
+
+    def fill(self, index: int, cnt: int, v: Union[int, HConst]):
+        """
+        Set all words in the range to a same value
+        """
+        val, vld = self._splitValue(v)
+        cs = self.cellSize
+        val = val.to_bytes(cs, "little")
+        vld = vld.to_bytes(cs, "little")
+        for pi, off, n in self._iterChunks(index, cnt):
+            p = self._getPage(pi)
+            b0 = off * cs
+            b1 = b0 + n * cs
+            p.data[b0:b1] = val * n
+            p.vld[b0:b1] = vld * n
+            self._markUsed(p, pi, off, n, WORD_VALUE)
+        if self._isPlain(v):
+            self._dropObjs(index, cnt)
+        else:
+            self._objs.update((i, v) for i in range(index, index + cnt))
+
+    def setWords(self, index: int, values: Sequence[Union[None, int, HConst]]):
+        """
+        Set value of the consequent words starting at index
+        """
+        if values and all(isinstance(v, int) and v >= 0 for v in values):
+            cs = self.cellSize
+            try:
+                buff = b"".join(v.to_bytes(cs, "little") for v in values)
+            except OverflowError:
+                raise ValueError("Value does not fit into a memory word", values, self.cellSize) from None
+            self.writeBytes(index * cs, buff)
+        else:
+            for i, v in enumerate(values):
+                self[index + i] = v
+
+    def writeBytes(self, byteAddr: int, buff: Union[bytes, bytearray, memoryview]):
+        """
+        Write bytes to memory and mark them as valid
+        (the bytes of the touched words which are not written are left untouched)
+        """
+        if byteAddr < 0:
+            raise IndexError(byteAddr)
+        buff = memoryview(buff).cast("B")
+        byteCnt = len(buff)
+        if byteCnt == 0:
+            return
+        cs = self.cellSize
+        PAGE_BYTES = self.PAGE_BYTES
+        src = 0
+        while src < byteCnt:
+            pi, off = divmod(byteAddr + src, PAGE_BYTES)
+            n = min(byteCnt - src, PAGE_BYTES - off)
+            p = self._getPage(pi)
+            p.data[off:off + n] = buff[src:src + n]
+            p.vld[off:off + n] = b"\xff" * n
+            w0 = off // cs
+            w1 = (off + n + cs - 1) // cs
+            self._markUsed(p, pi, w0, w1 - w0, WORD_VALUE)
+            self._dropObjs(pi * self.PAGE_WORDS + w0, w1 - w0)
+            src += n
+
+    def viewBytes(self, byteAddr: int, byteCnt: int) -> memoryview:
+        """
+        :return: read-only memoryview of the data bytes of the memory,
+            the view is zero-copy if the range is in a single page, otherwise it is a copy
+        :note: the validity of the data is not checked
+        """
+        pi, off = divmod(byteAddr, self.PAGE_BYTES)
+        if off + byteCnt <= self.PAGE_BYTES:
+            p = self._pages.get(pi, None)
+            if p is not None:
+                return memoryview(p.data)[off:off + byteCnt].toreadonly()
+
+        data, _ = self.readBytes(byteAddr, byteCnt)
+        return memoryview(data).toreadonly()
+
+    def readBytes(self, byteAddr: int, byteCnt: int) -> Tuple[bytearray, bytearray]:
+        """
+        Read the data and validity bytes of the memory
+        (the words which are not used are read as invalid zeros)
+        """
+        data = bytearray(byteCnt)
+        vld = bytearray(byteCnt)
+        PAGE_BYTES = self.PAGE_BYTES
+        dst = 0
+        while dst < byteCnt:
+            pi, off = divmod(byteAddr + dst, PAGE_BYTES)
+            n = min(byteCnt - dst, PAGE_BYTES - off)
+            p = self._pages.get(pi, None)
+            if p is not None:
+                data[dst:dst + n] = p.data[off:off + n]
+                vld[dst:dst + n] = p.vld[off:off + n]
+            dst += n
+        return data, vld
+
+    def readBits(self, start: int, end: int) -> Tuple[int, int]:
+        """
+        :param start: bit address of the first bit
+        :param end: bit address of first bit behind the selected range
+        :return: tuple (value, validity mask) of the selected bits
+        """
+        assert start <= end, (start, end)
+        b0 = start // 8
+        b1 = (end + 7) // 8
+        data, vld = self.readBytes(b0, b1 - b0)
+        sh = start % 8
+        m = mask(end - start)
+        val = (int.from_bytes(data, "little") >> sh) & m
+        vld = (int.from_bytes(vld, "little") >> sh) & m
+        return val, vld
+
+    def __iter__(self):
+        PAGE_WORDS = self.PAGE_WORDS
+        for pi in sorted(self._pages.keys()):
+            used = self._pages[pi].used
+            base = pi * PAGE_WORDS
+            for i, st in enumerate(used):
+                if st != WORD_UNUSED:
+                    yield base + i
+
+    def __len__(self):
+        return self._len
+
+    def copy(self) -> dict:
+        """
+        :return: the content of the memory as a dict
+        """
+        return dict(self.items())
+
+    def __or__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        res = self.copy()
+        res.update(other)
+        return res
+
+    def __ror__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        res = dict(other)
+        res.update(self.items())
+        return res
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        self._pages.clear()
+        self._objs.clear()
+        self._len = 0
+        self._maxIndex = -1
+
+    def __reduce__(self):
+        pages = {pi: (bytes(p.data), bytes(p.vld), bytes(p.used)) for pi, p in self._pages.items()}
+        return (self.__class__, (self.cellSize, self.PAGE_WORDS), (pages, dict(self._objs)))
+
+    def __setstate__(self, state):
+        pages, objs = state
+        self.clear()
+        for pi, (data, vld, used) in pages.items():
+            p = self._getPage(pi)
+            p.data[:] = data
+            p.vld[:] = vld
+            p.used[:] = used
+            self._len += len(used) - used.count(WORD_UNUSED)
+        self._maxIndex = self._findMaxIndex()
+        self._objs.update(objs)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__:s} cellSize={self.cellSize:d}, {len(self):d} words used>"
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pickle
+import unittest
+
+from hwt.hdl.transTmpl import TransTmpl
+from hwt.hdl.types.bits import HBits
+from hwt.hdl.types.struct import HStruct
+from hwtLib.abstract.sim_ram import SimRam, AllocationError
+from hwtLib.abstract.sim_ram_read_plan import TransTmplReadPlan
+from hwtLib.abstract.sim_ram_storage import SimRamPagedStorage
+from hwtLib.abstract.sim_ram_timing import SimRamTimingModel, \
+    SimRamBankedTimingModel
+from pyMathBitPrecise.bit_utils import ValidityError
+
+
+class SimRamPagedStorageTC(unittest.TestCase):
+
+    def test_dict_like(self):
+        d = SimRamPagedStorage(4, pageWords=4)
+        self.assertEqual(len(d), 0)
+        self.assertIsNone(d.maxIndex())
+        d[0] = 1
+        d[9] = None
+        d[5] = 0xffffffff
+        self.assertEqual(len(d), 3)
+        self.assertEqual(d.maxIndex(), 9)
+        self.assertEqual(list(d.keys()), [0, 5, 9])
+        self.assertEqual(d[0], 1)
+        self.assertIsNone(d[9])
+        self.assertEqual(d[5], 0xffffffff)
+        self.assertNotIn(1, d)
+        self.assertIn(9, d)
+        self.assertIsNone(d.get(1))
+        with self.assertRaises(KeyError):
+            d[1]
+        self.assertEqual(d, {0: 1, 5: 0xffffffff, 9: None})
+
+        self.assertDictEqual(dict(d), {0: 1, 5: 0xffffffff, 9: None})
+        self.assertEqual({0: 1, 5: 0xffffffff, 9: None}, d)
+        self.assertNotEqual(d, {0: 1})
+        self.assertEqual(d.copy(), {0: 1, 5: 0xffffffff, 9: None})
+
+        del d[9]
+        self.assertEqual(d.maxIndex(), 5)
+        self.assertEqual(len(d), 2)
+
+        with self.assertRaises(ValueError):
+            d[0] = 1 << 32
+
+    def test_non_plain_values(self):
+        d = SimRamPagedStorage(4)
+        v = HBits(32, signed=True).from_py(-1)
+        d[0] = v
+        d[1] = -2
+        v8 = HBits(8).from_py(3)
+        d[2] = v8
+        self.assertIs(d[0], v)
+        self.assertEqual(d[1], -2)
+        self.assertIs(d[2], v8)
+        self.assertEqual(d.readBits(0, 32), (0xffffffff, 0xffffffff))
+
+        # overwrite of the word removes the stored object
+        d.setMasked(0, 0, 0xff)
+        self.assertEqual(d[0], 0xffffff00)
+        d.writeBytes(4, b"\x01\x00\x00\x00")
+        self.assertEqual(d[1], 1)
+        d[2] = 5
+        self.assertEqual(d[2], 5)
+
+    def test_pickle(self):
+        d = SimRamPagedStorage(4, pageWords=4)
+        d[0] = 1
+        d[6] = None
+        d[9] = HBits(32, signed=True).from_py(-1)
+        d[10] = HBits(32).from_py(0x1234, 0xff)
+        d2 = pickle.loads(pickle.dumps(d))
+        self.assertIsInstance(d2, SimRamPagedStorage)
+        self.assertEqual((d2.cellSize, d2.PAGE_WORDS), (4, 4))
+        self.assertEqual(len(d2), 4)
+        self.assertEqual(d2.maxIndex(), 10)
+        self.assertEqual(d2[0], 1)
+        self.assertIsNone(d2[6])
+        self.assertEqual(int(d2[9]), -1)
+        self.assertTrue(d2[9]._dtype.signed)
+        self.assertEqual((d2[10].val & 0xff, d2[10].vld_mask), (0x34, 0xff))
+
+    def test_partially_valid(self):
+        d = SimRamPagedStorage(2)
+        t = HBits(16)
+        d[0] = t.from_py(0x1234, 0x00ff)
+        v = d[0]
+        self.assertEqual(v.val & 0xff, 0x34)
+        self.assertEqual(v.vld_mask, 0x00ff)
+
+        d.setMasked(0, 0xab00, 0xff00)
+        self.assertEqual(d[0], 0xab34)
+
+        d.setMasked(1, 0xcd, 0xff)
+        v = d[1]
+        self.assertEqual(v.val, 0xcd)
+        self.assertEqual(v.vld_mask, 0xff)
+
+    def test_readBits(self):
+        d = SimRamPagedStorage(1, pageWords=2)
+        for i in range(6):
+            d[i] = i + 1
+        # cross page, unaligned
+        self.assertEqual(d.readBits(4, 28), ((0x04030201 >> 4) & 0xffffff, 0xffffff))
+        self.assertEqual(d.readBits(8 * 5, 8 * 7), (0x06, 0x00ff))
+
+
+class SimRamTC(unittest.TestCase):
+
+    def tearDown(self):
+        TransTmplReadPlan.clear_cache()
+
+    def test_malloc_calloc(self):
+        m = SimRam(4)
+        a0 = m.calloc(4, 4, initValues=[1, 2, 3, 4])
+        self.assertEqual(a0, 0)
+        a1 = m.malloc(8)
+        self.assertEqual(a1, 16)
+        self.assertEqual(m.getArray(a1, 4, 2), [None, None])
+        a2 = m.calloc(2, 4, keepOut=8)
+        self.assertEqual(a2, 32)
+        self.assertEqual(m.getArray(a0, 4, 4), [1, 2, 3, 4])
+        self.assertEqual(m.getArray(a2, 4, 2), [0, 0])
+        self.assertIsNone(m.data.get(6))
+
+        with self.assertRaises(AllocationError):
+            m.calloc(2, 4, keepOut=-4)
+
+    def test_shared_with_parent(self):
+        m0 = SimRam(4)
+        m1 = SimRam(4, parent=m0)
+        m1.data[3] = 10
+        self.assertEqual(m0.data[3], 10)
+        m0.data = {0: 1, 1: 2}
+        self.assertIsInstance(m0.data, SimRamPagedStorage)
+        self.assertEqual(m0.getArray(0, 4, 2), [1, 2])
+
+    def test_bytes_api(self):
+        m = SimRam(4)
+        m.data = SimRamPagedStorage(4, pageWords=4)
+        payload = bytes(range(40))
+        m.write_bytes(2, payload)
+        self.assertEqual(m.read_bytes(2, 40), payload)
+        with self.assertRaises(ValidityError):
+            m.read_bytes(0, 4)
+        self.assertEqual(m.read_bytes(0, 4, allow_invalid=True), b"\x00\x00\x00\x01")
+        # partially written word
+        v = m.data[0]
+        self.assertEqual(v.vld_mask, 0xffff0000)
+
+        # in a single page, zero-copy
+        self.assertEqual(list(m.view(4, "B", 8)), list(range(2, 10)))
+        # cross page
+        self.assertEqual(m.view(8, "I", 4).tolist(),
+                         [int.from_bytes(payload[6 + i * 4: 6 + (i + 1) * 4], "little") for i in range(4)])
+
+        self.assertEqual(m.compare_bytes(2, payload), [])
+        expected = bytearray(payload)
+        expected[3] = 0
+        self.assertEqual(m.compare_bytes(2, expected), [(5, 0, 3)])
+        self.assertEqual(m.compare_bytes(40, b"\x26\x27\x00"), [(42, 0, None)])
+
+        self.assertEqual(m.compare_array(4, 2, [0x0302, 0x0504]), [])
+        self.assertEqual(m.compare_array(40, 2, [0x2726, 0]), [(1, 0, None)])
+
+    def test_calloc_reshape(self):
+        m = SimRam(8)
+        addr = m.calloc(5, 2, initValues=[0x0100, 0x0302, 0x0504, 0x0706, 0x0908])
+        self.assertEqual(m.read_bytes(addr, 16), bytes(range(10)) + bytes(6))
+        self.assertEqual(m.getArray(addr, 8, 2), [0x0706050403020100, 0x0908])
+
+    def test_getStruct(self):
+        t = HStruct(
+            (HBits(8), "a"),
+            (HBits(16), "b"),
+            (HBits(8), "c"),
+            (HBits(32), "d"),
+        )
+        m = SimRam(4)
+        addr = m.calloc(2, 4, initValues=[0x44332211, 0x88776655])
+        v = m.getStruct(addr, t)
+        self.assertEqual(int(v.a), 0x11)
+        self.assertEqual(int(v.b), 0x3322)
+        self.assertEqual(int(v.c), 0x44)
+        self.assertEqual(int(v.d), 0x88776655)
+
+    def test_getStruct_nested(self):
+        t_inner = HStruct(
+            (HBits(4), "x"),
+            (HBits(4)[2], "arr"),
+        )
+        t = HStruct(
+            (HBits(4), "a"),
+            (HBits(4), None),
+            (t_inner, "inner"),
+            (HBits(12), "b"),
+        )
+        m = SimRam(2)
+        addr = m.calloc(2, 2, initValues=[0x2110, 0x0543])
+        v = m.getStruct(addr, t)
+        self.assertEqual(int(v.a), 0x0)
+        self.assertEqual(int(v.inner.x), 0x1)
+        self.assertEqual([int(i) for i in v.inner.arr], [0x2, 0x3])
+        self.assertEqual(int(v.b), 0x054)
+
+        plan = TransTmplReadPlan.fromType(t)
+        self.assertIs(plan, TransTmplReadPlan.fromType(t))
+        # read from the template instance has to give the same result
+        v2 = m.getStruct(addr, TransTmpl(t))
+        self.assertEqual(v, v2)
+
+    def test_read_plan_cache_size(self):
+        N = TransTmplReadPlan.CACHE_SIZE
+        types = [HBits(8 + i) for i in range(N + 1)]
+        plan0 = TransTmplReadPlan.fromType(types[0])
+        for t in types[1:]:
+            TransTmplReadPlan.fromType(t)
+        self.assertEqual(TransTmplReadPlan._fromHashableType.cache_info().currsize, N)
+        # the least recently used plan was removed
+        self.assertIsNot(TransTmplReadPlan.fromType(types[0]), plan0)
+
+
+class SimRamTimingModelTC(unittest.TestCase):
+
+    def test_fixed_latency_bandwidth(self):
+        tm = SimRamTimingModel(latency=10, max_outstanding=2, bytes_per_cycle=4)
+        self.assertTrue(tm.canAccept(1))
+        self.assertFalse(tm.canAccept(2))
+        # 4 words, 8B each, 4B per cycle
+        t0 = tm.schedule(0, 0, 4, 8, False)
+        self.assertEqual(t0, [11, 13, 15, 17])
+        # has to wait until bus is free
+        t1 = tm.schedule(1, 64, 1, 8, False)
+        self.assertEqual(t1, [19])
+        tm.stats.record(False, 32, 0, t0[-1])
+        tm.stats.record(False, 8, 1, t1[-1])
+        self.assertEqual(tm.stats.read_cnt, 2)
+        self.assertEqual(dict(tm.stats.read_latency_hist), {17: 1, 18: 1})
+        self.assertEqual(tm.stats.bandwidth(), 40 / 20)
+
+    def test_banked(self):
+        tm = SimRamBankedTimingModel(row_hit_latency=5, row_miss_latency=20,
+                                     bank_cnt=2, row_size=64)
+        self.assertEqual(tm.schedule(0, 0, 1, 8, False), [20])
+        self.assertEqual(tm.schedule(100, 8, 1, 8, False), [105])
+        # other bank
+        self.assertEqual(tm.schedule(200, 64, 1, 8, True), [220])
+        # other row in bank 0
+        self.assertEqual(tm.schedule(300, 128, 1, 8, False), [320])
+        self.assertEqual((tm.row_hits, tm.row_misses), (1, 3))
+
+
+if __name__ == '__main__':
+    testLoader = unittest.TestLoader()
+    suite = unittest.TestSuite([testLoader.loadTestsFromTestCase(tc) for tc in [
+        SimRamPagedStorageTC, SimRamTC, SimRamTimingModelTC]])
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,183 @@
+from collections import Counter
+from math import ceil
+from typing import Optional, List, Dict
+
+from hwtSimApi.constants import CLK_PERIOD
+
+
+class SimRamStats():
+    """
+    Statistics of the transactions processed by a simulation memory with a :class:`~.SimRamTimingModel`
+
+    :note: all times are in clock cycles
+    :ivar ~.latency_hist: histograms latency -> count, latency is a time from acceptance of the request
+        to the time when the last data word/write acknowledge is available
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.read_cnt = 0
+        self.write_cnt = 0
+        self.read_bytes = 0
+        self.write_bytes = 0
+        self.first_cycle: Optional[int] = None
+        self.last_cycle: Optional[int] = None
+        self.read_latency_hist: Dict[int, int] = Counter()
+        self.write_latency_hist: Dict[int, int] = Counter()
+
+    def record(self, isWrite: bool, byteCnt: int, acceptCycle: int, doneCycle: int):
+        if self.first_cycle is None or acceptCycle < self.first_cycle:
+            self.first_cycle = acceptCycle
+        if self.last_cycle is None or doneCycle > self.last_cycle:
+            self.last_cycle = doneCycle
+
+        latency = doneCycle - acceptCycle
+        if isWrite:
+            self.write_cnt += 1
+            self.write_bytes += byteCnt
+            self.write_latency_hist[latency] += 1
+        else:
+            self.read_cnt += 1
+            self.read_bytes += byteCnt
+            self.read_latency_hist[latency] += 1
+
+    def active_cycles(self) -> int:
+        if self.first_cycle is None:
+            return 0
+        return self.last_cycle - self.first_cycle + 1
+
+    def bandwidth(self) -> float:
+        """
+        :return: achieved bandwidth in bytes per clock cycle (reads + writes)
+        """
+        c = self.active_cycles()
+        if c == 0:
+            return 0.0
+        return (self.read_bytes + self.write_bytes) / c
+
+    @staticmethod
+    def _avg(hist: Dict[int, int]) -> Optional[float]:
+        cnt = sum(hist.values())
+        if cnt == 0:
+            return None
+        return sum(k * v for k, v in hist.items()) / cnt
+
+    def avg_read_latency(self) -> Optional[float]:
+        return self._avg(self.read_latency_hist)
+
+    def avg_write_latency(self) -> Optional[float]:
+        return self._avg(self.write_latency_hist)
+
+    def __repr__(self):
+        return (f"<{self.__class__.__name__:s} read_cnt={self.read_cnt:d}, write_cnt={self.write_cnt:d},"
+                f" bandwidth={self.bandwidth():.3f}B/clk, avg_read_latency={self.avg_read_latency()},"
+                f" avg_write_latency={self.avg_write_latency()}>")
+
+
+class SimRamTimingModel():
+    """
+    Timing model for simulation memories
+    (:class:`hwtLib.amba.datapump.sim_ram.AxiDpSimRam` and derived)
+    with a fixed latency, an optional limit of outstanding transactions
+    and an optional limit of the throughput.
+
+    :note: all times are in clock cycles
+    :ivar ~.LATENCY: number of clock cycles from the acceptance of the request to the first data word
+    :ivar ~.MAX_OUTSTANDING: maximal number of transactions which are processed at once
+        (for each direction, None for unlimited)
+    :ivar ~.BYTES_PER_CYCLE: maximal throughput of the memory (shared by reads and writes, None for unlimited)
+    :ivar ~.CLK_PERIOD: period of the clock of the memory in simulation time units
+    :ivar ~.stats: statistics of processed transactions
+    """
+
+    def __init__(self, latency: int=0, max_outstanding: Optional[int]=None,
+                 bytes_per_cycle: Optional[int]=None, clk_period: int=CLK_PERIOD):
+        assert latency >= 0, latency
+        assert max_outstanding is None or max_outstanding > 0, max_outstanding
+        assert bytes_per_cycle is None or bytes_per_cycle > 0, bytes_per_cycle
+        self.LATENCY = latency
+        self.MAX_OUTSTANDING = max_outstanding
+        self.BYTES_PER_CYCLE = bytes_per_cycle
+        self.CLK_PERIOD = clk_period
+        self.stats = SimRamStats()
+        self.reset()
+
+    def reset(self):
+        """
+        Reset the state of the model and statistics (for a new simulation run)
+        """
+        self._busFreeAt = 0
+        self.stats.reset()
+
+    def canAccept(self, outstandingCnt: int):
+        return self.MAX_OUTSTANDING is None or outstandingCnt < self.MAX_OUTSTANDING
+
+    def requestLatency(self, now: int, addr: int, byteCnt: int, isWrite: bool) -> int:
+        """
+        :return: number of clock cycles before the first data word of the transaction is available
+        """
+        return self.LATENCY
+
+    def schedule(self, now: int, addr: int, wordCnt: int, wordBytes: int, isWrite: bool) -> List[int]:
+        """
+        Resolve the time when each data word of the transaction is transferred
+        (the transactions are serialized on the data bus of the memory)
+
+        :param now: actual clock cycle
+        :return: list of clock cycles for each data word of the transaction
+        """
+        byteCnt = wordCnt * wordBytes
+        start = max(now + self.requestLatency(now, addr, byteCnt, isWrite), self._busFreeAt)
+        bpc = self.BYTES_PER_CYCLE
+        if bpc is None:
+            times = [start for _ in range(wordCnt)]
+            self._busFreeAt = start
+        else:
+            times = [start + ceil((i + 1) * wordBytes / bpc) - 1 for i in range(wordCnt)]
+            self._busFreeAt = times[-1] + 1
+
+        return times
+
+
+class SimRamBankedTimingModel(SimRamTimingModel):
+    """
+    DRAM-like timing model, the memory is divided to banks and each bank has a single open row.
+    The access to an open row has the row-hit latency, the access to a different row has
+    the row-miss latency (precharge + activate) and opens the row.
+
+    :ivar ~.ROW_SIZE: size of the row in bytes
+    :ivar ~.BANK_CNT: number of banks (rows are interleaved between banks)
+    """
+
+    def __init__(self, row_hit_latency: int, row_miss_latency: int,
+                 bank_cnt: int=8, row_size: int=1024,
+                 max_outstanding: Optional[int]=None,
+                 bytes_per_cycle: Optional[int]=None,
+                 clk_period: int=CLK_PERIOD):
+        assert row_miss_latency >= row_hit_latency, (row_miss_latency, row_hit_latency)
+        self.ROW_HIT_LATENCY = row_hit_latency
+        self.ROW_MISS_LATENCY = row_miss_latency
+        self.BANK_CNT = bank_cnt
+        self.ROW_SIZE = row_size
+        super(SimRamBankedTimingModel, self).__init__(
+            row_hit_latency, max_outstanding, bytes_per_cycle, clk_period)
+
+    def reset(self):
+        super(SimRamBankedTimingModel, self).reset()
+        self._openRows: List[Optional[int]] = [None for _ in range(self.BANK_CNT)]
+        self.row_hits = 0
+        self.row_misses = 0
+
+    def requestLatency(self, now: int, addr: int, byteCnt: int, isWrite: bool) -> int:
+        rowIndex = addr // self.ROW_SIZE
+        bank = rowIndex % self.BANK_CNT
+        row = rowIndex // self.BANK_CNT
+        if self._openRows[bank] == row:
+            self.row_hits += 1
+            return self.ROW_HIT_LATENCY
+        else:
+            self.row_misses += 1
+            self._openRows[bank] = row
+            return self.ROW_MISS_LATENCY
@@ -1,4 +1,5 @@
 from copy import copy
+from functools import lru_cache
 from typing import Optional, List, Callable, Generator, Tuple, Union
 
 from hwt.hdl.frameTmpl import FrameTmpl
@@ -12,6 +13,65 @@ from hwt.hdl.types.struct import HStruct
 from hwt.pyUtils.arrayQuery import iter_with_last
 
 
+FrameWord = Tuple[int, List[Union[TransPart, ChoicesOfFrameParts]], bool]
+
+
+class _FrameTemplateCacheItem():
+    """
+    Templates resolved for a specific type and data width
+
+    :ivar ~.tmpl: TransTmpl of the type
+    :ivar ~.frames: tuple of FrameTmpl for the data width
+    :ivar ~.words: tuple of words generated by :meth:`TemplateConfigured.chainFrameWords`
+        or None if not resolved yet
+    """
+
+    def __init__(self, tmpl: TransTmpl, frames: Tuple[FrameTmpl, ...]):
+        self.tmpl = tmpl
+        self.frames = frames
+        self.words: Optional[Tuple[FrameWord, ...]] = None
+
+
+def _resolve_frame_templates(tmpl: TransTmpl, dataWidth: int) -> _FrameTemplateCacheItem:
+    frames = tuple(FrameTmpl.framesFromTransTmpl(tmpl, dataWidth))
+    return _FrameTemplateCacheItem(tmpl, frames)
+
+
+# The resolution of the frame templates is expensive for large types and the same type
+# is commonly used by many components. The templates and the words are not modified by the components
+# so they can be shared. The caches are LRU so long running processes do not keep every type forever.
+FRAME_TMPL_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=FRAME_TMPL_CACHE_SIZE)
+def _get_trans_tmpl_cached(t: HdlType) -> TransTmpl:
+    return TransTmpl(t)
+
+
+@lru_cache(maxsize=FRAME_TMPL_CACHE_SIZE)
+def _get_frame_templates_cached(t: HdlType, dataWidth: int) -> _FrameTemplateCacheItem:
+    return _resolve_frame_templates(_get_trans_tmpl_cached(t), dataWidth)
+
+
+def clear_frame_template_cache():
+    _get_trans_tmpl_cached.cache_clear()
+    _get_frame_templates_cached.cache_clear()
+
+
+def _get_frame_templates(t: HdlType, dataWidth: int) -> _FrameTemplateCacheItem:
+    """
+    Get the memoized TransTmpl and FrameTmpl instances for the type and data width
+
+    :note: the offsets of the streams are part of the HStream type and thus also part of the key
+    """
+    try:
+        hash(t)
+    except TypeError:
+        # unhashable type, can not be cached
+        return _resolve_frame_templates(TransTmpl(t), dataWidth)
+    return _get_frame_templates_cached(t, dataWidth)
+
+
 class TemplateConfigured():
     """
     Class with functions for extracting metadata from frame template/HdlType.
@@ -42,8 +102,16 @@ class TemplateConfigured():
         self._structT = structT
         self._tmpl = tmpl
         self._frames = frames
+        # set if the templates were resolved from the type and can be shared with other components
+        self._frameTmplCacheItem: Optional[_FrameTemplateCacheItem] = None
 
     def parseTemplate(self):
+        if self._tmpl is None and self._frames is None:
+            c = self._frameTmplCacheItem = _get_frame_templates(self._structT, self.DATA_WIDTH)
+            self._tmpl = c.tmpl
+            self._frames = list(c.frames)
+            return
+
         if self._tmpl is None:
             self._tmpl = TransTmpl(self._structT)
 
@@ -53,7 +121,16 @@ class TemplateConfigured():
                 self.DATA_WIDTH)
             self._frames = list(frames)
 
-    def chainFrameWords(self) -> Generator[Tuple[int, List[Union[TransPart, ChoicesOfFrameParts]], bool], None, None]:
+    def chainFrameWords(self) -> Generator[FrameWord, None, None]:
+        c = self._frameTmplCacheItem
+        if c is None:
+            yield from self._chainFrameWords()
+        else:
+            if c.words is None:
+                c.words = tuple(self._chainFrameWords())
+            yield from c.words
+
+    def _chainFrameWords(self) -> Generator[FrameWord, None, None]:
         offset = 0
         for f in self._frames:
             wi = 0
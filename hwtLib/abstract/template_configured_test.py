@@ -3,14 +3,47 @@
 
 import unittest
 
+from hwt.hdl.frameTmpl import FrameTmpl
+from hwt.hdl.transTmpl import TransTmpl
 from hwt.hdl.types.bits import HBits
 from hwt.hdl.types.stream import HStream
 from hwt.hdl.types.struct import HStruct
-from hwtLib.abstract.template_configured import separate_streams
+from hwtLib.abstract.template_configured import separate_streams, \
+    TemplateConfigured, clear_frame_template_cache, FRAME_TMPL_CACHE_SIZE, \
+    _get_frame_templates_cached, _get_trans_tmpl_cached
+from hwtLib.types.ctypes import uint16_t, uint32_t, uint64_t
+
+
+structManyInts = HStruct(
+    (uint64_t, "i0"),
+    (uint64_t, None),  # dummy word
+    (uint16_t, "i1"),
+    (uint16_t, "i2"),
+    (uint32_t, "i3"),  # 3 items in one word
+    (uint32_t, None),
+    (uint64_t, "i4"),  # this word is split on two bus words
+    (uint32_t, None),
+    name="structManyInts"
+)
+
+
+class _TemplateConfiguredDW(TemplateConfigured):
+
+    def __init__(self, structT, DATA_WIDTH: int, **kwargs):
+        TemplateConfigured.__init__(self, structT, **kwargs)
+        self.DATA_WIDTH = DATA_WIDTH
+        self.parseTemplate()
+
+    def words_layout(self):
+        return [(i, [(p.startOfPart, p.endOfPart) for p in w], last)
+                for i, w, last in self.chainFrameWords()]
 
 
 class TemplateConfigured_TC(unittest.TestCase):
 
+    def tearDown(self):
+        clear_frame_template_cache()
+
     def test_separate_streams_simple(self):
         t = HStruct(
             (HStream(HBits(8)), "data"),
@@ -87,6 +120,39 @@ class TemplateConfigured_TC(unittest.TestCase):
             (False, HStruct((HBits(32), "footer"),))
         ])
 
+    def test_frame_template_cache(self):
+        clear_frame_template_cache()
+        a = _TemplateConfiguredDW(structManyInts, 64)
+        b = _TemplateConfiguredDW(structManyInts, 64)
+        c = _TemplateConfiguredDW(structManyInts, 32)
+        self.assertIs(a._tmpl, b._tmpl)
+        self.assertIs(a._tmpl, c._tmpl)
+        self.assertIs(a._frames[0], b._frames[0])
+        self.assertIsNot(a._frames[0], c._frames[0])
+
+        a_words = a.words_layout()
+        self.assertIs(a._frameTmplCacheItem.words[0][1], next(b.chainFrameWords())[1])
+
+        # explicitly specified templates are not shared
+        tmpl = TransTmpl(structManyInts)
+        frames = list(FrameTmpl.framesFromTransTmpl(tmpl, 64))
+        d = _TemplateConfiguredDW(structManyInts, 64, tmpl=tmpl, frames=frames)
+        self.assertIsNone(d._frameTmplCacheItem)
+        self.assertSequenceEqual(d.words_layout(), a_words)
+        self.assertNotEqual(c.words_layout(), a_words)
+
+    def test_frame_template_cache_size(self):
+        clear_frame_template_cache()
+        N = FRAME_TMPL_CACHE_SIZE
+        types = [HStruct((HBits(8 + i), "a")) for i in range(N + 1)]
+        a = _TemplateConfiguredDW(types[0], 64)
+        for t in types[1:]:
+            _TemplateConfiguredDW(t, 64)
+        self.assertEqual(_get_frame_templates_cached.cache_info().currsize, N)
+        self.assertEqual(_get_trans_tmpl_cached.cache_info().currsize, N)
+        # the least recently used item was removed
+        self.assertIsNot(_TemplateConfiguredDW(types[0], 64)._tmpl, a._tmpl)
+
 
 if __name__ == '__main__':
     testLoader = unittest.TestLoader()
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from math import ceil
 from typing import List, Tuple, Union, Deque, Generator, Optional, Sequence
 
@@ -194,19 +195,94 @@ def unpackAxi4SFrame(structT: HdlType, frameData: Deque[Union[HBitsConst, int]],
     return res
 
 
-def _axi4s_recieve_bytes(ag_data: Deque[Union[
+def axi4s_pack_bytes(dataWidth: int, data: Union[bytes, bytearray, memoryview], offset: int=0)\
+        ->List[Tuple[int, int, int]]:
+    """
+    Fast variant of :func:`~.packAxi4SFrame` for a frame of bytes,
+    the words are sliced directly from the bytes without construction of HConst for each word.
+
+    :param data: bytes of the frame
+    :param offset: number of empty bytes before the data in the first word
+    :return: list of tuples (data, keep, last) for each word of the frame,
+        the bytes which are not part of the frame are 0
+    """
+    D_B = dataWidth // 8
+    assert D_B * 8 == dataWidth, ("Data width has to be a multiple of 8", dataWidth)
+    assert offset >= 0 and offset < D_B, (offset, D_B)
+    if len(data) == 0:
+        return [(0, 0, 1)]
+
+    buf = bytes(offset) + data
+    frameLen = len(buf)
+    mask_all = mask(D_B)
+    from_bytes = int.from_bytes
+    # start of the last word
+    last_i = ((frameLen - 1) // D_B) * D_B
+    res = [(from_bytes(buf[i:i + D_B], "little"), mask_all, 0)
+           for i in range(0, last_i, D_B)]
+    res.append((from_bytes(buf[last_i:], "little"), mask(frameLen - last_i), 1))
+    if offset:
+        d, keep, last = res[0]
+        res[0] = (d, keep & ~mask(offset), last)
+    return res
+
+
+@lru_cache(maxsize=None)
+def _axi4s_keep_to_mask(keep: int, D_B: int) -> Tuple[int, Optional[Tuple[int, int]]]:
+    """
+    :return: tuple (bit mask of the data selected by keep, (index of first byte, index behind the last byte))
+        the range is None if the set bits in keep are not contiguous
+    """
+    bitMask = 0
+    for i in range(D_B):
+        if get_bit(keep, i):
+            bitMask |= 0xff << (i * 8)
+
+    lo = (keep & -keep).bit_length() - 1
+    hi = keep.bit_length()
+    if keep == mask(hi) & ~mask(lo):
+        byteRange = (lo, hi)
+    else:
+        byteRange = None
+    return bitMask, byteRange
+
+
+def _axi4s_word_bytes(data: Union[HBitsConst, int], keep: int, D_B: int) -> bytes:
+    """
+    :return: bytes of the data word selected by the keep mask
+    """
+    if keep == 0:
+        return b""
+
+    bitMask, byteRange = _axi4s_keep_to_mask(keep, D_B)
+    if isinstance(data, int):
+        val = data
+    else:
+        val = data.val
+        if data.vld_mask & bitMask != bitMask:
+            raise AssertionError(
+                "Data not valid but it should be"
+                f" based on strb/keep 0x{keep:x}, 0x{data.vld_mask:x}")
+
+    word = (val & bitMask).to_bytes(D_B, "little")
+    if byteRange is None:
+        return bytes(B for i, B in enumerate(word) if get_bit(keep, i))
+    else:
+        lo, hi = byteRange
+        return word[lo:hi]
+
+
+def _axi4s_recieve_bytearray(ag_data: Deque[Union[
                                         Tuple[HBitsConst, HBitsConst, HBitsConst, HBitsConst],
                                         Tuple[HBitsConst, HBitsConst, HBitsConst],
                                         Tuple[HBitsConst, HBitsConst]]],
-                        D_B: int, use_keep: bool, use_id: bool) -> Tuple[int, List[int]]:
+                             D_B: int, use_keep: bool, use_id: bool) -> Tuple[int, int, bytearray]:
     """
-    :param ag_data: list of axi stream words, number of item in tuple depends on use_keep and use_id
-    :param use_keep: specifies if input tuples contain keep mask
-    :param use_id: specifies if input tuples contain axi stream id
-    :param D_B: number of bytes in word
+    :see: :func:`~._axi4s_recieve_bytes`
+    :return: tuple (offset, id, data)
     """
     offset = None
-    data_B = []
+    data_B = bytearray()
     last = False
     first = True
     current_id = 0
@@ -238,26 +314,13 @@ def _axi4s_recieve_bytes(ag_data: Deque[Union[
 
         if offset is None:
             # first iteration
-            # expecting potential 0s in keep and the rest 1
-            for i in range(D_B):
-                # i represents number of 0 from te beginning of of the keep
-                # value
-                if keep & (1 << i):
-                    offset = i
-                    break
-            assert offset is not None, keep
-        for i in range(D_B):
-            if get_bit(keep, i):
-                d = get_bit_range(data.val, i * 8, 8)
-                if get_bit_range(data.vld_mask, i * 8, 8) != 0xff:
-                    raise AssertionError(
-                        "Data not valid but it should be"
-                        f" based on strb/keep B_i:{i:d}, 0x{keep:x}, 0x{data.vld_mask:x}")
-                data_B.append(d)
+            # expecting potential 0s in keep and the rest 1,
+            # offset is the number of 0 from the beginning of of the keep
+            offset = (keep & -keep).bit_length() - 1
+
+        data_B.extend(_axi4s_word_bytes(data, keep, D_B))
 
         if first:
-            offset_mask = mask(offset)
-            assert offset_mask & keep == 0, (offset_mask, keep)
             first = False
             current_id = id_
         elif not last:
@@ -269,14 +332,40 @@ def _axi4s_recieve_bytes(ag_data: Deque[Union[
 
     if not last:
         if data_B:
-            raise ValueError("Unfinished frame", data_B)
+            raise ValueError("Unfinished frame", list(data_B))
         else:
             raise ValueError("No frame available")
 
+    return offset, id_, data_B
+
+
+def _axi4s_recieve_bytes(ag_data: Deque[Union[
+                                        Tuple[HBitsConst, HBitsConst, HBitsConst, HBitsConst],
+                                        Tuple[HBitsConst, HBitsConst, HBitsConst],
+                                        Tuple[HBitsConst, HBitsConst]]],
+                        D_B: int, use_keep: bool, use_id: bool) -> Tuple[int, List[int]]:
+    """
+    :param ag_data: list of axi stream words, number of item in tuple depends on use_keep and use_id
+    :param use_keep: specifies if input tuples contain keep mask
+    :param use_id: specifies if input tuples contain axi stream id
+    :param D_B: number of bytes in word
+    """
+    offset, id_, data_B = _axi4s_recieve_bytearray(ag_data, D_B, use_keep, use_id)
     if use_id:
-        return offset, id_, data_B
+        return offset, id_, list(data_B)
     else:
-        return offset, data_B
+        return offset, list(data_B)
+
+
+def axi4s_unpack_bytes(dataWidth: int, frameData: Deque[Tuple[Union[HBitsConst, int], int, int]]) -> Tuple[int, bytes]:
+    """
+    Opposite of :func:`~.axi4s_pack_bytes`, the words of the first frame are poped from frameData
+
+    :param frameData: deque of tuples (data, keep, last)
+    :return: tuple (offset, data of the frame)
+    """
+    offset, _, data_B = _axi4s_recieve_bytearray(frameData, dataWidth // 8, True, False)
+    return offset, bytes(data_B)
 
 
 def axi4s_recieve_bytes(axis: Axi4Stream) -> Tuple[int, List[int]]:
@@ -324,7 +413,7 @@ def axi4s_send_bytes(axis: Axi4Stream, data_B: Union[List[int], bytes], offset=0
     if axis.USE_KEEP and axis.USE_STRB:
         raise NotImplementedError()
     withStrb = axis.USE_KEEP | axis.USE_STRB
-    if isinstance(data_B, bytes):
+    if isinstance(data_B, (bytes, bytearray, memoryview)):
         data_B = [int(x) for x in data_B]
     f = _axi4s_send_bytes(axis, data_B, withStrb, offset)
     axis._ag.data.extend(f)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from collections import deque
+from random import Random
+import unittest
+
+from hwt.hdl.types.bits import HBits
+from hwtLib.amba.axi4s import axi4s_pack_bytes, axi4s_unpack_bytes, \
+    packAxi4SFrame, _axi4s_recieve_bytes
+from pyMathBitPrecise.bit_utils import mask
+
+
+class Axi4SBytesTC(unittest.TestCase):
+
+    def test_pack_empty(self):
+        self.assertSequenceEqual(axi4s_pack_bytes(32, b""), [(0, 0, 1)])
+
+    def test_pack(self):
+        self.assertSequenceEqual(axi4s_pack_bytes(32, b"\x01\x02\x03\x04\x05"), [
+            (0x04030201, 0xf, 0),
+            (0x05, 0x1, 1),
+        ])
+        self.assertSequenceEqual(axi4s_pack_bytes(32, b"\x01\x02\x03", offset=2), [
+            (0x02010000, 0xc, 0),
+            (0x03, 0x1, 1),
+        ])
+        self.assertSequenceEqual(axi4s_pack_bytes(32, memoryview(b"\x01\x02"), offset=1), [
+            (0x020100, 0x6, 1),
+        ])
+
+    def test_pack_same_as_packAxi4SFrame(self):
+        rand = Random(0)
+        for DW in (8, 32, 64):
+            for size in (1, DW // 8, DW // 8 + 1, 100):
+                data = bytes(rand.getrandbits(8) for _ in range(size))
+                ref = list(packAxi4SFrame(DW, data, withStrb=True))
+                fast = axi4s_pack_bytes(DW, data)
+                self.assertEqual(len(fast), len(ref), (DW, size))
+                for w_i, ((ref_d, ref_m, ref_last), (d, m, last)) in enumerate(zip(ref, fast)):
+                    ref_m = int(ref_m)
+                    self.assertEqual(m, ref_m, (DW, size, w_i))
+                    self.assertEqual(last, int(ref_last), (DW, size, w_i))
+                    # compare only the bytes selected by keep (the rest may be invalid in ref)
+                    bit_m = 0
+                    for b_i in range(DW // 8):
+                        if (ref_m >> b_i) & 1:
+                            bit_m |= 0xff << (b_i * 8)
+                    if isinstance(ref_d, int):
+                        ref_val, ref_vld = ref_d, mask(DW)
+                    else:
+                        ref_val, ref_vld = ref_d.val, ref_d.vld_mask
+                    self.assertEqual(ref_vld & bit_m, bit_m, (DW, size, w_i))
+                    self.assertEqual(d & bit_m, ref_val & bit_m, (DW, size, w_i))
+
+    def test_pack_unpack(self):
+        rand = Random(0)
+        for DW in (8, 16, 64, 512):
+            D_B = DW // 8
+            for size in (0, 1, D_B - 1, D_B, D_B + 1, 9000):
+                for offset in sorted({0, D_B // 2, D_B - 1}):
+                    if size == 0 and offset:
+                        continue
+                    data = bytes(rand.getrandbits(8) for _ in range(size))
+                    words = axi4s_pack_bytes(DW, data, offset)
+                    # an other frame behind
+                    words.append((0, mask(D_B), 1))
+                    words = deque(words)
+                    self.assertEqual(axi4s_unpack_bytes(DW, words), (offset, data))
+                    self.assertEqual(len(words), 1)
+
+    def test_recieve_invalid_bytes_outside_of_keep(self):
+        t = HBits(32)
+        frame = deque([
+            (t.from_py(0x0201ffff, vld_mask=0xffff0000), 0xc, 0),
+            (t.from_py(0x03, vld_mask=0xff), 0x1, 1),
+        ])
+        self.assertEqual(axi4s_unpack_bytes(32, frame), (2, b"\x01\x02\x03"))
+
+        frame = deque([
+            (t.from_py(0x0201ffff, vld_mask=0xff000000), 0xc, 1),
+        ])
+        with self.assertRaises(AssertionError):
+            axi4s_unpack_bytes(32, frame)
+
+    def test_recieve_non_contiguous_last_word(self):
+        t = HBits(32)
+        frame = deque([
+            (t.from_py(0x04030201), 0xf, 0),
+            (t.from_py(0x07000005, vld_mask=0xff0000ff), 0x9, 1),
+        ])
+        self.assertEqual(_axi4s_recieve_bytes(frame, 4, True, False), (0, [1, 2, 3, 4, 5, 7]))
+
+    def test_recieve_unfinished(self):
+        with self.assertRaises(ValueError):
+            axi4s_unpack_bytes(32, deque(axi4s_pack_bytes(32, b"\x01" * 8)[:1]))
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    # suite = unittest.TestSuite([Axi4SBytesTC("test_pack_unpack")])
+    suite = testLoader.loadTestsFromTestCase(Axi4SBytesTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
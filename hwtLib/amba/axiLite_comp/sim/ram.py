@@ -18,7 +18,7 @@ class Axi4LiteSimRam(Axi4SimRam):
 
     def add_r_ag_data(self, _id, data, isLast):
         assert isLast
-        self.rAg.data.append((data, RESP_OKAY))
+        self._pushRData((data, RESP_OKAY))
 
     def pop_w_ag_data(self, _id):
         data, strb = self.wAg.data.popleft()
@@ -26,4 +26,4 @@ class Axi4LiteSimRam(Axi4SimRam):
         return (data, strb, last)
 
     def doWriteAck(self, _id):
-        self.wAckAg.data.append(RESP_OKAY)
+        self._pushWAck(RESP_OKAY)
@@ -4,6 +4,7 @@
 from hwt.hwIOs.utils import addClkRstn
 from hwt.pyUtils.typingFuture import override
 from hwt.simulator.simTestCase import SimTestCase
+from hwtLib.abstract.sim_ram_timing import SimRamTimingModel
 from hwtLib.amba.axiLite_comp.sim.utils import axi_randomize_per_channel
 from hwtLib.amba.axiLite_comp.to_axi import AxiLite_to_Axi
 from hwtLib.amba.axi_comp.sim.ram import Axi4SimRam
@@ -51,11 +52,11 @@ class AxiLite_to_Axi_TC(SimTestCase):
         strb = mask(self.dut.DATA_WIDTH // 8)
         return (data, strb)
 
-    def test_read(self):
+    def test_read(self, batch_requests=False, timing_model=None):
         N = self.TRANSACTION_CNT
         dut = self.dut
 
-        m = Axi4SimRam(dut.m)
+        m = Axi4SimRam(dut.m, batch_requests=batch_requests, timing_model=timing_model)
 
         expected_data = []
         allocated_wods = list(range(N))
@@ -67,18 +68,30 @@ class AxiLite_to_Axi_TC(SimTestCase):
             dut.s.ar._ag.data.append(a_t)
             expected_data.append((rand_data, RESP_OKAY))
 
-        self.runSim(N * 3 * CLK_PERIOD)
+        t = N * 3
+        if timing_model is not None:
+            t += N * timing_model.LATENCY
+        self.runSim(t * CLK_PERIOD)
 
         self.assertValSequenceEqual(
             dut.s.r._ag.data,
             expected_data
         )
 
-    def test_write(self):
+    def test_read_batch_requests(self):
+        self.test_read(batch_requests=True)
+
+    def test_read_timing_model(self):
+        tm = SimRamTimingModel(latency=10, max_outstanding=2)
+        self.test_read(timing_model=tm)
+        self.assertEqual(tm.stats.read_cnt, self.TRANSACTION_CNT)
+        self.assertEqual(dict(tm.stats.read_latency_hist), {10: self.TRANSACTION_CNT})
+
+    def test_write(self, batch_requests=False):
         N = self.TRANSACTION_CNT
         dut = self.dut
 
-        m = Axi4SimRam(dut.m)
+        m = Axi4SimRam(dut.m, batch_requests=batch_requests)
 
         expected_data = []
         allocated_wods = list(range(N))
@@ -100,6 +113,9 @@ class AxiLite_to_Axi_TC(SimTestCase):
             d = m.data.get(word_i, None)
             self.assertValEqual(d, expected)
 
+    def test_write_batch_requests(self):
+        self.test_write(batch_requests=True)
+
 
 if __name__ == "__main__":
     import unittest
@@ -17,8 +17,12 @@ from hwt.math import log2ceil, isPow2
 from hwt.pyUtils.typingFuture import override
 from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
 from hwtLib.amba.axi4 import Axi4, Axi4_r, Axi4_addr, Axi4_w, Axi4_b
+from hwtLib.amba.axi4Lite import Axi4Lite
+from hwtLib.amba.axiLite_comp.endpoint import AxiLiteEndpoint
 from hwtLib.amba.axi_comp.cache.addrTypeConfig import CacheAddrTypeConfig
 from hwtLib.amba.axi_comp.cache.lru_array import AxiCacheLruArray, HwIOIndexWayRdVld
+from hwtLib.amba.axi_comp.cache.mshr import AxiCacheMshr
+from hwtLib.amba.axi_comp.cache.pseudo_lru import PseudoLru
 from hwtLib.amba.axi_comp.cache.tag_array import AxiCacheTagArray, \
     HwIOAxiCacheTagArrayLookupRes, HwIOAxiCacheTagArrayUpdate
 from hwtLib.amba.axis_comp.builder import Axi4SBuilder
@@ -31,8 +35,22 @@ from hwtLib.handshaked.streamNode import StreamNode
 from hwtLib.logic.binToOneHot import binToOneHot
 from hwtLib.mem.ramTransactional import RamTransactional
 from hwtLib.mem.ramTransactional_io import TransRamHsR, TransRamHsW
+from hwtLib.types.ctypes import uint32_t
 from pyMathBitPrecise.bit_utils import mask
 
+# register map of the performance counters of the cache
+# (all counters are cleared by a write of 1 to bit 0 of "control" register)
+CACHE_PERF_COUNTERS_T = HStruct(
+    (uint32_t, "control"),
+    (uint32_t, "read_hit"),
+    (uint32_t, "read_miss"),
+    (uint32_t, "write_hit"),
+    (uint32_t, "write_miss"),
+    (uint32_t, "eviction"),  # a valid cacheline was replaced by a write miss
+    (uint32_t, "write_back"),  # a write transaction on "m" (flush of the victim)
+    (uint32_t, "stall"),  # number of clock cycles when request on s.ar or s.aw was stalled
+)
+
 
 # https://chipress.co/category/job-roles-titles/page/16/
 # https://chipress.co/2019/04/13/can-you-show-the-state-transition-for-snoop-based-scheme-using-msi-protocol/
@@ -63,6 +81,14 @@ class AxiCacheWriteAllocWawOnlyWritePropagating(CacheAddrTypeConfig):
     :see: :class:`hwtLib.amba.axi_comp.cache.CacheAddrTypeConfig`
     :ivar DATA_WIDTH: data width of interfaces
     :ivar WAY_CNT: number of places where one cache line can be stored
+    :ivar REPLACEMENT_POLICY: a class of the cacheline replacement policy, :class:`~.PseudoLru` or any other from
+        :mod:`hwtLib.amba.axi_comp.cache.replacement_policy` (e.g. TrueLru, Srrip, Brrip, RandomReplacement)
+    :ivar MSHR_CNT: if > 0 the read misses are passed trough :class:`~.AxiCacheMshr`
+        which limits the number of outstanding read misses to MSHR_CNT and merges the read misses
+        to a cache line which is already being read (0 = read misses are forwarded directly to "m")
+    :ivar MSHR_MAX_MERGED: max number of secondary read misses merged to a single MSHR
+    :ivar PERF_COUNTERS: if True the performance counters (:data:`~.CACHE_PERF_COUNTERS_T`)
+        are accessible using "perf" Axi4Lite interface
 
     :note: 1-way associative = directly mapped
     :note: This cache does not check access collision with a requests to main (slave) memory.
@@ -70,7 +96,8 @@ class AxiCacheWriteAllocWawOnlyWritePropagating(CacheAddrTypeConfig):
         between main memory and this cache (= on master port where slave should be connected).
 
     * The tag_array contains tags and cache line status flags for cache lines.
-    * The lsu_array contains the data for data for pseudo LRU (Last Recently Used) cache replacement policy.
+    * The lsu_array contains the data for data for pseudo LRU (Last Recently Used) cache replacement policy
+      (or other policy selected by REPLACEMENT_POLICY).
       It is stored in a separate array due to high requirements for concurrent access which results
       in increased memory consumption.
     * The data_array is a RAM where data for cache lines is stored.
@@ -86,8 +113,12 @@ class AxiCacheWriteAllocWawOnlyWritePropagating(CacheAddrTypeConfig):
     def hwConfig(self):
         Axi4.hwConfig(self)
         self.WAY_CNT = HwParam(4)
+        self.REPLACEMENT_POLICY = HwParam(PseudoLru)
         self.MAX_BLOCK_DATA_WIDTH = HwParam(None)
         self.IS_PREINITIALIZED = HwParam(False)
+        self.MSHR_CNT = HwParam(0)
+        self.MSHR_MAX_MERGED = HwParam(2)
+        self.PERF_COUNTERS = HwParam(False)
         CacheAddrTypeConfig.hwConfig(self)
 
     @override
@@ -112,6 +143,11 @@ class AxiCacheWriteAllocWawOnlyWritePropagating(CacheAddrTypeConfig):
             for a in [self.tag_array, self.lru_array]:
                 a.PORT_CNT = 2  # r+w
 
+            if self.MSHR_CNT:
+                mshr = self.mshr = AxiCacheMshr()
+                mshr.MSHR_CNT = self.MSHR_CNT
+                mshr.MAX_MERGED = self.MSHR_MAX_MERGED
+
         da = RamTransactional()
         da.MAX_BLOCK_DATA_WIDTH = self.MAX_BLOCK_DATA_WIDTH
         da.WORD_WIDTH = self.CACHE_LINE_SIZE * 8
@@ -125,6 +161,13 @@ class AxiCacheWriteAllocWawOnlyWritePropagating(CacheAddrTypeConfig):
         )
         self.data_array = da
 
+        if self.PERF_COUNTERS:
+            perf = self.perf = Axi4Lite()
+            perf_regs = self.perf_regs = AxiLiteEndpoint(CACHE_PERF_COUNTERS_T)
+            for i in (perf, perf_regs):
+                i.ADDR_WIDTH = log2ceil(CACHE_PERF_COUNTERS_T.bit_length() // 8)
+                i.DATA_WIDTH = 32
+
         # self.flush = HandshakeSync()
         # self.init = HandshakeSync()
 
@@ -431,6 +474,41 @@ class AxiCacheWriteAllocWawOnlyWritePropagating(CacheAddrTypeConfig):
 
         axi_m_b.ready(1)
 
+    def perf_counters_handler(self,
+                              ar_tagRes: HwIOAxiCacheTagArrayLookupRes,  # in
+                              aw_tagRes: HwIOAxiCacheTagArrayLookupRes,  # in
+                              ):
+        """
+        Count the events in cache and connect the counters to "perf" Axi4Lite interface.
+        """
+        regs = self.perf_regs
+        regs.bus(self.perf)
+        s, m = self.s, self.m
+        da_w_addr = self.data_array.w.addr
+        ar_ack = ar_tagRes.vld & ar_tagRes.rd
+        aw_ack = aw_tagRes.vld & aw_tagRes.rd
+        events = {
+            "read_hit": ar_ack & ar_tagRes.found,
+            "read_miss": ar_ack & ~ar_tagRes.found,
+            "write_hit": aw_ack & aw_tagRes.found,
+            "write_miss": aw_ack & ~aw_tagRes.found,
+            "eviction": da_w_addr.vld & da_w_addr.rd & da_w_addr.flush,
+            "write_back": m.aw.valid & m.aw.ready,
+            "stall": (s.ar.valid & ~s.ar.ready) | (s.aw.valid & ~s.aw.ready),
+        }
+
+        control = regs.decoded.control
+        clear = rename_signal(self, control.dout.vld & control.dout.data[0], "perf_clear")
+        control.din(0)
+        for name, ev in events.items():
+            cntr = self._reg(f"perf_{name:s}", uint32_t, def_val=0)
+            If(clear,
+               cntr(0),
+            ).Elif(ev,
+               cntr(cntr + 1),
+            )
+            getattr(regs.decoded, name).din(cntr)
+
     @override
     def hwImpl(self):
         """
@@ -440,6 +518,8 @@ class AxiCacheWriteAllocWawOnlyWritePropagating(CacheAddrTypeConfig):
         * if tag matches return cacheline else dispatch read request
           (the transaction is dispatched with original id, upon data receive the transaction
           is passed to master without any synchronization with the cache )
+        * if MSHR_CNT > 0 the read request is dispatched trough :class:`~.AxiCacheMshr`
+          (the id on "m" is then an index of MSHR)
 
         Write operation:
 
@@ -453,13 +533,21 @@ class AxiCacheWriteAllocWawOnlyWritePropagating(CacheAddrTypeConfig):
         self.connect_tag_lookup(init_in_progress)
         ar_tagRes, aw_tagRes = self.tag_array.lookupRes
 
+        if self.MSHR_CNT:
+            mshr = self.mshr
+            self.m.ar(mshr.m_ar)
+            mshr.m_r(self.m.r)
+            miss_ar, miss_r = mshr.s_ar, mshr.s_r
+        else:
+            miss_ar, miss_r = self.m.ar, self.m.r
+
         self.read_handler(
             ar_tagRes,
             self.s.r,
             self.lru_array.incr[0],
             self.data_array.r,
-            self.m.ar,
-            self.m.r,
+            miss_ar,
+            miss_r,
         )
 
         self.write_handler(
@@ -478,6 +566,8 @@ class AxiCacheWriteAllocWawOnlyWritePropagating(CacheAddrTypeConfig):
             self.m.w,
             self.m.b,
         )
+        if self.PERF_COUNTERS:
+            self.perf_counters_handler(ar_tagRes, aw_tagRes)
 
         propagateClkRstn(self)
 
@@ -5,11 +5,16 @@ from hwt.hdl.types.bits import HBits
 from hwt.serializer.combLoopAnalyzer import CombLoopAnalyzer
 from hwt.simulator.simTestCase import SimTestCase
 from hwtLib.amba.axiLite_comp.sim.utils import axi_randomize_per_channel
-from hwtLib.amba.axi_comp.cache.cacheWriteAllocWawOnlyWritePropagating import AxiCacheWriteAllocWawOnlyWritePropagating
+from hwtLib.amba.axi_comp.cache.cacheWriteAllocWawOnlyWritePropagating import AxiCacheWriteAllocWawOnlyWritePropagating, \
+    CACHE_PERF_COUNTERS_T
+from hwtLib.amba.axi_comp.cache.pseudo_lru import PseudoLru
+from hwtLib.amba.axi_comp.cache.replacement_policy import TrueLru, Brrip
+from hwtLib.amba.axi_comp.cache.trace_model import AxiCacheTraceModel
 from hwtLib.amba.constants import RESP_OKAY
 from hwtLib.examples.errors.combLoops import freeze_set_of_sets
 from hwtLib.mem.sim.segmentedArrayProxy import SegmentedArrayProxy
 from hwtSimApi.constants import CLK_PERIOD
+from hwtSimApi.triggers import Timer
 from pyMathBitPrecise.bit_utils import set_bit_range, mask, int_list_to_int
 from hwt.hdl.types.bitsConst import HBitsConst
 
@@ -17,11 +22,15 @@ from hwt.hdl.types.bitsConst import HBitsConst
 class AxiCacheWriteAllocWawOnlyWritePropagatingTC(SimTestCase):
     # number of words in transaction - 1
     LEN = 0
+    PERF_COUNTERS = False
+    REPLACEMENT_POLICY = PseudoLru
 
     @classmethod
     def setUpClass(cls):
         cls.dut = dut = AxiCacheWriteAllocWawOnlyWritePropagating()
         dut.IS_PREINITIALIZED = True
+        dut.PERF_COUNTERS = cls.PERF_COUNTERS
+        dut.REPLACEMENT_POLICY = cls.REPLACEMENT_POLICY
         dut.DATA_WIDTH = 32
         dut.CACHE_LINE_SIZE = 4 * (cls.LEN + 1)
         dut.CACHE_LINE_CNT = 16
@@ -302,14 +311,133 @@ class AxiCacheWriteAllocWawOnlyWritePropagatingTC(SimTestCase):
 
     # write victim flush
 
+    def _test_victim(self, used_way: int, victim_way: int, MAGIC=99):
+        """
+        Fill both ways of a cache set, read the item in used_way and then write to a new address
+        in the same set, check that the item in victim_way was replaced (and flushed)
+        """
+        dut = self.dut
+        self.TAGS.clean()
+        self.DATA.clean()
+        assert dut.WAY_CNT == 2
+        index = 3
+        addrs = [(w * self.WAY_CACHELINES + index) * self.ADDR_STEP for w in range(dut.WAY_CNT + 1)]
+        cachelines = {}
+        for w in range(dut.WAY_CNT):
+            d = self.build_cacheline([MAGIC + w + w_i for w_i in range(self.LEN + 1)])
+            self.cacheline_insert(addrs[w], w, d)
+            cachelines[addrs[w]] = d
+
+        dut.s.ar._ag.data.append(dut.s.ar._ag.create_addr_req(addr=addrs[used_way], _len=self.LEN, _id=0))
+        M = mask(dut.DATA_WIDTH // 8)
+        new_data = [2 * MAGIC + w_i for w_i in range(self.LEN + 1)]
+
+        def write_after_read():
+            # the write has to be resolved after the read hit
+            yield Timer((2 ** dut.INDEX_W + 10 * (self.LEN + 1)) * CLK_PERIOD)
+            aw = dut.s.aw._ag
+            aw.data.append(aw.create_addr_req(addr=addrs[-1], _len=self.LEN, _id=1))
+            for w_i, d in enumerate(new_data):
+                dut.s.w._ag.data.append((d, M, int(w_i == self.LEN)))
+
+        self.procs.append(write_after_read())
+        self.runSim((2 ** dut.INDEX_W + 30 * (self.LEN + 1)) * CLK_PERIOD)
+
+        self.assertEqual(len(dut.s.r._ag.data), self.LEN + 1)
+        self.assertValSequenceEqual([int(a[1]) for a in dut.m.aw._ag.data], [addrs[victim_way]])
+        cachelines.pop(addrs[victim_way])
+        cachelines[addrs[-1]] = self.build_cacheline(new_data)
+        self.assertDictEqual(self.get_cachelines(), cachelines)
+
 
 class AxiCacheWriteAllocWawOnlyWritePropagating_len1TC(AxiCacheWriteAllocWawOnlyWritePropagatingTC):
     LEN = 1
 
 
+class AxiCacheWriteAllocWawOnlyWritePropagating_TrueLruTC(AxiCacheWriteAllocWawOnlyWritePropagatingTC):
+    REPLACEMENT_POLICY = TrueLru
+
+    def test_victim_is_lru(self):
+        # way 0 was used, way 1 is the least recently used
+        self._test_victim(0, 1)
+
+    def test_victim_is_lru_1(self):
+        self._test_victim(1, 0)
+
+
+class AxiCacheWriteAllocWawOnlyWritePropagating_BrripTC(AxiCacheWriteAllocWawOnlyWritePropagatingTC):
+    REPLACEMENT_POLICY = Brrip
+
+    def test_victim_is_first_with_max_rrpv(self):
+        # all items have RRPV=0 (the hit does not change it),
+        # the first item with max RRPV is replaced even if it was used recently
+        self._test_victim(0, 0)
+
+    def test_victim_is_first_with_max_rrpv_1(self):
+        self._test_victim(1, 0)
+
+
+class AxiCacheWriteAllocWawOnlyWritePropagating_perfTC(AxiCacheWriteAllocWawOnlyWritePropagatingTC):
+    PERF_COUNTERS = True
+
+    def read_perf_counters(self, delay: int):
+        dut = self.dut
+        yield Timer(delay)
+        ar = dut.perf.ar._ag
+        for i, _ in enumerate(CACHE_PERF_COUNTERS_T.fields):
+            ar.data.append(ar.create_addr_req(i * 4))
+
+    def test_perf_counters(self):
+        dut = self.dut
+        self.TAGS.clean()
+        self.DATA.clean()
+        model = AxiCacheTraceModel(dut)
+
+        M = mask(dut.DATA_WIDTH // 8)
+        trace = []
+        for i in range(4):
+            # hit
+            addr = i * self.ADDR_STEP
+            self.cacheline_insert(addr, 0, i)
+            model.insert(addr, 0)
+            trace.append((False, addr))
+            if i % 2:
+                trace.append((True, addr))
+        for i in range(4, 8):
+            # read miss, write to empty way
+            addr = i * self.ADDR_STEP
+            trace.append((i % 2 == 1, addr))
+
+        ar, aw = dut.s.ar._ag, dut.s.aw._ag
+        for isWrite, addr in trace:
+            if isWrite:
+                aw.data.append(aw.create_addr_req(addr=addr, _len=self.LEN, _id=0))
+                for w_i in range(self.LEN + 1):
+                    dut.s.w._ag.data.append((w_i, M, int(w_i == self.LEN)))
+            else:
+                ar.data.append(ar.create_addr_req(addr=addr, _len=self.LEN, _id=0))
+        model.run_trace(trace)
+
+        t = (len(trace) * (self.LEN + 1) + 20) * CLK_PERIOD
+        self.procs.append(self.read_perf_counters(t))
+        self.runSim(t + 40 * CLK_PERIOD)
+
+        r = dut.perf.r._ag.data
+        self.assertEqual(len(r), len(CACHE_PERF_COUNTERS_T.fields))
+        counters = {f.name: int(d) for f, (d, _) in zip(CACHE_PERF_COUNTERS_T.fields, r)}
+        self.assertEqual(counters.pop("control"), 0)
+        counters.pop("stall")
+        expected = model.stats.as_dict()
+        expected.pop("stall")
+        self.assertDictEqual(counters, expected)
+
+
 AxiCacheWriteAllocWawOnlyWritePropagatingTCs = [
     AxiCacheWriteAllocWawOnlyWritePropagatingTC,
     AxiCacheWriteAllocWawOnlyWritePropagating_len1TC,
+    AxiCacheWriteAllocWawOnlyWritePropagating_TrueLruTC,
+    AxiCacheWriteAllocWawOnlyWritePropagating_BrripTC,
+    AxiCacheWriteAllocWawOnlyWritePropagating_perfTC,
 ]
 
 if __name__ == "__main__":
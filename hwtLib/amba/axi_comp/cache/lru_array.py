@@ -5,6 +5,7 @@ from hwt.code import If, Or, Concat
 from hwt.code_utils import rename_signal
 from hwt.constants import WRITE, READ
 from hwt.hObjList import HObjList
+from hwt.hdl.types.bits import HBits
 from hwt.hdl.types.defs import BIT
 from hwt.hdl.types.struct import HStruct
 from hwt.hwIOs.std import HwIOVectSignal, HwIODataRdVld, HwIORdVldSync
@@ -18,6 +19,7 @@ from hwtLib.amba.axi_comp.cache.pseudo_lru import PseudoLru
 from hwtLib.commonHwIO.addr import HwIOAddrRdVld
 from hwtLib.commonHwIO.addr_data import HwIOAddrDataRdVld
 from hwtLib.logic.binToOneHot import binToOneHot
+from hwtLib.logic.lfsr import Lfsr
 from hwtLib.mem.ramXor import RamXorSingleClock
 
 
@@ -48,6 +50,10 @@ class AxiCacheLruArray(CacheAddrTypeConfig):
     The set port disables all discards all pending updates
     and it is meant to be used for an initialization of the array/cache.
 
+    :ivar REPLACEMENT_POLICY: a class of the replacement policy
+        (:class:`~.PseudoLru` or other :class:`hwtLib.amba.axi_comp.cache.replacement_policy.CacheReplacementPolicy`),
+        the records in memory are the states of this policy
+
     .. figure:: ./_static/AxiCacheLruArray.png
 
     .. hwt-autodoc::
@@ -58,11 +64,13 @@ class AxiCacheLruArray(CacheAddrTypeConfig):
         CacheAddrTypeConfig.hwConfig(self)
         self.INCR_PORT_CNT = HwParam(2)
         self.WAY_CNT = HwParam(4)
+        self.REPLACEMENT_POLICY = HwParam(PseudoLru)
 
     def _compute_constants(self):
         assert self.WAY_CNT >= 1, self.WAY_CNT
         self._compupte_tag_index_offset_widths()
-        self.LRU_WIDTH = PseudoLru.lru_reg_width(self.WAY_CNT)
+        self.LRU_WIDTH = self.REPLACEMENT_POLICY.lru_reg_width(self.WAY_CNT)
+        self.RANDOM_BITS = self.REPLACEMENT_POLICY.random_bits(self.WAY_CNT)
 
     @override
     def hwDeclr(self):
@@ -97,6 +105,11 @@ class AxiCacheLruArray(CacheAddrTypeConfig):
             #  incr preload, incr write back...
             *flatten((READ, WRITE) for _ in range(self.INCR_PORT_CNT))
         )
+        if self.RANDOM_BITS:
+            self.lfsr = Lfsr()
+
+    def replacement_policy(self, lru_reg):
+        return self.REPLACEMENT_POLICY(lru_reg, self._random)
 
     def merge_successor_writes_into_incr_one_hot(self, succ_writes, incr_val_oh):
         if succ_writes:
@@ -107,6 +120,16 @@ class AxiCacheLruArray(CacheAddrTypeConfig):
 
     @override
     def hwImpl(self):
+        if self.RANDOM_BITS:
+            # collect random bits from LFSR
+            random = self._random = self._reg("random", HBits(self.RANDOM_BITS, force_vector=True), def_val=0)
+            if self.RANDOM_BITS == 1:
+                random[0](self.lfsr.dataOut)
+            else:
+                random(Concat(random[self.RANDOM_BITS - 1:], self.lfsr.dataOut))
+        else:
+            self._random = None
+
         m = self.lru_mem
         victim_req_r, victim_req_w = m.port[:2]
 
@@ -152,7 +175,7 @@ class AxiCacheLruArray(CacheAddrTypeConfig):
             incr_val_oh = rename_signal(self, binToOneHot(incr_in.way), f"incr_val{i:d}_oh")
             incr_tmp_mask_oh.append((incr_tmp, incr_val_oh))
 
-        lru = PseudoLru(victim_req_r.dout)
+        lru = self.replacement_policy(victim_req_r.dout)
         victim = rename_signal(self, lru.get_lru(), "victim")
         victim_oh = rename_signal(self, binToOneHot(victim), "victim_oh")
 
@@ -163,8 +186,8 @@ class AxiCacheLruArray(CacheAddrTypeConfig):
             (incr2_tmp.vld & incr2_tmp.index._eq(victim_req_tmp.index), incr2_val_oh)
             for incr2_tmp, incr2_val_oh in incr_tmp_mask_oh
         ]
-        _victim_oh = self.merge_successor_writes_into_incr_one_hot(succ_writes, victim_oh)
-        _victim_oh = rename_signal(self, _victim_oh, f"victim_val{i:d}_oh_final")
+        succ_used_oh = self.merge_successor_writes_into_incr_one_hot(succ_writes, victim_oh._dtype.from_py(0))
+        succ_used_oh = rename_signal(self, succ_used_oh, "victim_succ_used_oh")
 
         set_.rd(1)
         If(set_.vld,
@@ -176,7 +199,7 @@ class AxiCacheLruArray(CacheAddrTypeConfig):
             # use victim_req_w port for a victim req write back as usuall
             victim_req_w.en(victim_req_tmp.vld),
             victim_req_w.addr(victim_req_tmp.index),
-            victim_req_w.din(lru.mark_use_many(_victim_oh)),
+            victim_req_w.din(lru.mark_victim_use(victim_oh, succ_used_oh)),
         )
 
         for i, (incr_in, (incr_r, incr_w), (incr_tmp, incr_val_oh)) in enumerate(zip(self.incr, incr_rw, incr_tmp_mask_oh)):
@@ -204,7 +227,7 @@ class AxiCacheLruArray(CacheAddrTypeConfig):
             # if collides with others merge the incr_val_oh
             incr_val_oh = self.merge_successor_writes_into_incr_one_hot(succ_writes, incr_val_oh)
             incr_val_oh = rename_signal(self, incr_val_oh, f"incr_val{i:d}_oh_final")
-            incr_w.din(PseudoLru(incr_r.dout).mark_use_many(incr_val_oh))
+            incr_w.din(self.replacement_policy(incr_r.dout).mark_use_many(incr_val_oh))
 
         propagateClkRstn(self)
 
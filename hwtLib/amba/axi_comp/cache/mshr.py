@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import List
+
+from hwt.code import If, Or, SwitchLogic, Concat
+from hwt.code_utils import rename_signal
+from hwt.hdl.types.bits import HBits
+from hwt.hdl.types.enum import HEnum
+from hwt.hdl.types.struct import HStruct
+from hwt.hwIOs.utils import addClkRstn
+from hwt.hwModule import HwModule
+from hwt.hwParam import HwParam
+from hwt.math import log2ceil, isPow2
+from hwt.pyUtils.typingFuture import override
+from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
+from hwtLib.amba.axi4 import Axi4, Axi4_addr, Axi4_r
+
+
+MSHR_STATE = HEnum("MSHR_STATE", ["FREE", "WAIT", "REPLAY"])
+
+
+class AxiCacheMshr(HwModule):
+    """
+    Miss status holding registers (MSHR) for read misses of a cache.
+
+    Each read request (a whole cache line) is dispatched to "m_ar" with an id of the MSHR
+    (the original id is stored in MSHR). The read data from "m_r" is passed to "s_r"
+    with the original id and it is also stored in the data buffer of MSHR.
+    If a read request with the same address and length as a request which is already being read
+    arrives (secondary miss), it is not dispatched to "m_ar" but its id is stored in the MSHR
+    and the data is replayed from the data buffer of MSHR once the data of the primary request is received.
+
+    * MSHR_CNT limits the number of outstanding reads on "m_ar".
+    * Up to MAX_MERGED secondary misses can be merged to a single MSHR,
+      if there is no space for a secondary miss the request is blocked until the MSHR is free again.
+    * A request to the same line with a different start offset or length is not merged,
+      it allocates a new MSHR.
+    * The order of the responses for requests with the same id is preserved,
+      a request is blocked if there is an MSHR (other than the one the request merges to)
+      with a request of the same id.
+    * The bursts on "s_r" are never interleaved, the data from "m_r" have priority over
+      the replayed data, but only between the bursts.
+    * The MSHR can not be merged to in the clock cycle when it receives its last data beat
+      (the request then allocates a new MSHR).
+
+    :note: The request on "s_ar" is expected to read at most a whole cache line
+        (as the cache generates it for a read miss).
+
+    :ivar ~.MSHR_CNT: number of miss status holding registers (max number of outstanding reads)
+    :ivar ~.MAX_MERGED: max number of secondary misses merged to a single MSHR
+
+    .. hwt-autodoc:: _example_AxiCacheMshr
+    """
+
+    @override
+    def hwConfig(self):
+        Axi4.hwConfig(self)
+        self.CACHE_LINE_SIZE = HwParam(64)
+        self.MSHR_CNT = HwParam(4)
+        self.MAX_MERGED = HwParam(2)
+
+    @override
+    def hwDeclr(self):
+        assert self.MSHR_CNT > 0, self.MSHR_CNT
+        assert self.MAX_MERGED > 0, self.MAX_MERGED
+        assert log2ceil(self.MSHR_CNT) <= self.ID_WIDTH, ("MSHR index is used as id on m_ar", self.MSHR_CNT, self.ID_WIDTH)
+        assert isPow2(self.CACHE_LINE_SIZE // (self.DATA_WIDTH // 8)), (self.CACHE_LINE_SIZE, self.DATA_WIDTH)
+        addClkRstn(self)
+        with self._hwParamsShared():
+            self.s_ar = Axi4_addr()
+            self.s_r = Axi4_r()._m()
+            self.m_ar = Axi4_addr()._m()
+            self.m_r = Axi4_r()
+
+    def first_one_hot(self, name: str, flags: List[RtlSignal]):
+        """
+        :return: one hot encoded index of the first flag which is 1
+        """
+        res = []
+        for i, f in enumerate(flags):
+            if i == 0:
+                res.append(rename_signal(self, f, f"{name:s}{i:d}"))
+            else:
+                res.append(rename_signal(self, f & ~Or(*flags[:i]), f"{name:s}{i:d}"))
+        return res
+
+    def mux(self, name: str, sel: List[RtlSignal], values: List[RtlSignal]):
+        """
+        Select a value by one hot encoded sel
+        """
+        res = self._sig(name, values[0]._dtype)
+        SwitchLogic([(s, res(v)) for s, v in zip(sel, values)],
+                    default=res(None))
+        return res
+
+    @override
+    def hwImpl(self):
+        s_ar, s_r, m_ar, m_r = self.s_ar, self.s_r, self.m_ar, self.m_r
+        MSHR_CNT = self.MSHR_CNT
+        MAX_MERGED = self.MAX_MERGED
+        BEATS = self.CACHE_LINE_SIZE // (self.DATA_WIDTH // 8)
+        beat_t = HBits(max(1, log2ceil(BEATS)))
+        sec_cnt_t = HBits(log2ceil(MAX_MERGED + 1))
+        id_t = s_ar.id._dtype
+        word_t = HStruct(
+            (m_r.data._dtype, "data"),
+            (m_r.resp._dtype, "resp"),
+        )
+        mshr_t = HStruct(
+            (MSHR_STATE, "state"),
+            (s_ar.addr._dtype, "addr"),
+            (s_ar.len._dtype, "len"),
+            (id_t, "id"),
+            (beat_t, "beat"),
+            (sec_cnt_t, "sec_cnt"),
+            (id_t[MAX_MERGED], "sec_id"),
+            (word_t[BEATS], "buff"),
+        )
+        mshrs = [self._reg(f"mshr{i:d}", mshr_t, def_val={"state": MSHR_STATE.FREE})
+                 for i in range(MSHR_CNT)]
+
+        # m_r -> s_r forward of the data for primary miss
+        # (the s_r is owned by the m_r until the end of the burst once the first beat is transferred)
+        m_r_inBurst = self._reg("m_r_inBurst", def_val=0)
+        useReplay = self._sig("useReplay")
+        m_r_sel = [m_r.id._eq(i) for i in range(MSHR_CNT)]
+        m_r_ack = rename_signal(self, m_r.valid & s_r.ready & ~useReplay, "m_r_ack")
+        m_r_done = [rename_signal(self, m_r_ack & m_r.last & sel, f"m_r_done{i:d}")
+                    for i, sel in enumerate(m_r_sel)]
+        If(m_r_ack,
+           m_r_inBurst(~m_r.last)
+        )
+
+        # s_ar -> m_ar, allocation of MSHR or merging to existing one
+        match = [rename_signal(self, m.state._eq(MSHR_STATE.WAIT) & m.addr._eq(s_ar.addr) & m.len._eq(s_ar.len) & ~done,
+                               f"ar_match{i:d}")
+                 for i, (m, done) in enumerate(zip(mshrs, m_r_done))]
+        mergeable = [m_i & (m.sec_cnt != MAX_MERGED) for m_i, m in zip(match, mshrs)]
+        # the MSHR has a pending request with the same id as the request on s_ar
+        idBusy = []
+        for m_i, m in enumerate(mshrs):
+            secIdMatch = [(m.sec_cnt > sec_i) & m.sec_id[sec_i]._eq(s_ar.id) for sec_i in range(MAX_MERGED)]
+            idBusy.append(rename_signal(
+                self, ~m.state._eq(MSHR_STATE.FREE) & Or(m.id._eq(s_ar.id), *secIdMatch),
+                f"ar_idBusy{m_i:d}"))
+        # the response would be reordered with the response of the request with the same id in other MSHR
+        idConflict = rename_signal(self, Or(*(b & ~mg for b, mg in zip(idBusy, mergeable))), "ar_idConflict")
+        anyMatch = rename_signal(self, Or(*match), "ar_anyMatch")
+        anyMergeable = rename_signal(self, Or(*mergeable) & ~idConflict, "ar_anyMergeable")
+        alloc = self.first_one_hot("ar_alloc", [m.state._eq(MSHR_STATE.FREE) for m in mshrs])
+        hasFree = rename_signal(self, Or(*alloc) & ~idConflict, "ar_hasFree")
+
+        allocIndex = self._sig("ar_allocIndex", id_t)
+        SwitchLogic([(a, allocIndex(i)) for i, a in enumerate(alloc)],
+                    default=allocIndex(None))
+        m_ar(s_ar, exclude={s_ar.id, s_ar.valid, s_ar.ready})
+        m_ar.id(allocIndex)
+        m_ar.valid(s_ar.valid & ~anyMatch & hasFree)
+        s_ar.ready(anyMergeable | (~anyMatch & hasFree & m_ar.ready))
+        allocAck = rename_signal(self, s_ar.valid & ~anyMatch & hasFree & m_ar.ready, "ar_allocAck")
+        mergeAck = rename_signal(self, s_ar.valid & anyMergeable, "ar_mergeAck")
+
+        # replay of the data for secondary misses
+        replaying = self._reg("replaying", def_val=0)
+        replayOH = self._reg("replayOH", HBits(MSHR_CNT, force_vector=MSHR_CNT == 1), def_val=0)
+        replayBeat = self._reg("replayBeat", beat_t, def_val=0)
+        replaySec = self._reg("replaySec", sec_cnt_t, def_val=0)
+        replaySel = [replayOH[i] for i in range(MSHR_CNT)]
+        replayMshrSecCnt = self.mux("replay_sec_cnt", replaySel, [m.sec_cnt for m in mshrs])
+        replayId = self.mux("replay_id", replaySel, [
+            self.mux(f"replay_id{m_i:d}", [replaySec._eq(i) for i in range(MAX_MERGED)], [m.sec_id[i] for i in range(MAX_MERGED)])
+            for m_i, m in enumerate(mshrs)
+        ])
+        replayWord = self.mux("replay_word", replaySel, [
+            self.mux(f"replay_word{m_i:d}", [replayBeat._eq(i) for i in range(BEATS)], [m.buff[i] for i in range(BEATS)])
+            for m_i, m in enumerate(mshrs)
+        ])
+        replayLen = self.mux("replay_len", replaySel, [m.len for m in mshrs])
+        replayLast = rename_signal(self, replayBeat._eq(replayLen[beat_t.bit_length():0]), "replayLast")
+        # the replay has the s_r if it is in the middle of the burst or if m_r is idle
+        useReplay(replaying & ((replayBeat != 0) | (~m_r.valid & ~m_r_inBurst)))
+        replayAck = rename_signal(self, useReplay & s_r.ready, "replayAck")
+        replayDone = rename_signal(self, replayAck & replayLast & (replaySec + 1)._eq(replayMshrSecCnt), "replayDone")
+        replayStart = self.first_one_hot("replayStart", [m.state._eq(MSHR_STATE.REPLAY) for m in mshrs])
+
+        If(~replaying,
+            replaying(Or(*replayStart)),
+            replayOH(Concat(*reversed(replayStart))),
+            replayBeat(0),
+            replaySec(0),
+        ).Elif(replayAck,
+            If(replayLast,
+               replayBeat(0),
+               replaySec(replaySec + 1),
+               If(replayDone,
+                  replaying(0),
+               )
+            ).Else(
+               replayBeat(replayBeat + 1),
+            )
+        )
+
+        # s_r output
+        m_r.ready(s_r.ready & ~useReplay)
+        primaryId = self.mux("primary_id", m_r_sel, [m.id for m in mshrs])
+        If(useReplay,
+           s_r.id(replayId),
+           s_r.data(replayWord.data),
+           s_r.resp(replayWord.resp),
+           s_r.last(replayLast),
+        ).Else(
+           s_r.id(primaryId),
+           s_r.data(m_r.data),
+           s_r.resp(m_r.resp),
+           s_r.last(m_r.last),
+        )
+        s_r.valid(useReplay | m_r.valid)
+
+        # MSHR state update
+        for i, (m, a, merge, sel) in enumerate(zip(mshrs, alloc, mergeable, m_r_sel)):
+            If(allocAck & a,
+               m.state(MSHR_STATE.WAIT),
+               m.addr(s_ar.addr),
+               m.len(s_ar.len),
+               m.id(s_ar.id),
+               m.beat(0),
+               m.sec_cnt(0),
+            ).Else(
+                If(mergeAck & merge,
+                   SwitchLogic([
+                       (m.sec_cnt._eq(sec_i), m.sec_id[sec_i](s_ar.id))
+                       for sec_i in range(MAX_MERGED)
+                   ]),
+                   m.sec_cnt(m.sec_cnt + 1),
+                ),
+                If(m_r_ack & sel,
+                   SwitchLogic([
+                       (m.beat._eq(b_i), [
+                           m.buff[b_i].data(m_r.data),
+                           m.buff[b_i].resp(m_r.resp),
+                       ])
+                       for b_i in range(BEATS)
+                   ]),
+                   If(m_r.last,
+                      m.beat(0),
+                      If(m.sec_cnt != 0,
+                         m.state(MSHR_STATE.REPLAY),
+                      ).Else(
+                         m.state(MSHR_STATE.FREE),
+                      )
+                   ).Else(
+                      m.beat(m.beat + 1),
+                   )
+                ).Elif(replayDone & replayOH[i],
+                   m.state(MSHR_STATE.FREE),
+                )
+            )
+
+
+def _example_AxiCacheMshr():
+    m = AxiCacheMshr()
+    m.DATA_WIDTH = 32
+    m.CACHE_LINE_SIZE = 8
+    return m
+
+
+if __name__ == "__main__":
+    from hwt.synth import to_rtl_str
+
+    m = _example_AxiCacheMshr()
+    print(to_rtl_str(m))
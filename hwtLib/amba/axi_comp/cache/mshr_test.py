@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from hwt.simulator.simTestCase import SimTestCase
+from hwtLib.amba.axi_comp.cache.mshr import AxiCacheMshr
+from hwtLib.amba.constants import RESP_OKAY
+from hwtSimApi.constants import CLK_PERIOD
+from hwtSimApi.triggers import Timer
+
+
+class AxiCacheMshrTC(SimTestCase):
+    # latency of the main memory in clk
+    LATENCY = 5
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dut = dut = AxiCacheMshr()
+        dut.DATA_WIDTH = 32
+        dut.ID_WIDTH = 4
+        dut.CACHE_LINE_SIZE = 8
+        dut.MSHR_CNT = 2
+        dut.MAX_MERGED = 2
+        cls.BEATS = dut.CACHE_LINE_SIZE // (dut.DATA_WIDTH // 8)
+        cls.compileSim(dut)
+
+    def setUp(self):
+        SimTestCase.setUp(self)
+        self.m_ar_log = []
+
+    def line_data(self, addr: int, beat: int):
+        return addr + beat
+
+    def memory_responder(self):
+        """
+        Simple main memory model which responds to a read requests from m_ar on m_r
+        """
+        dut = self.dut
+        ar = dut.m_ar._ag.data
+        r = dut.m_r._ag.data
+        while True:
+            yield Timer(CLK_PERIOD)
+            while ar:
+                req = ar.popleft()
+                _id, addr, _len = int(req[0]), int(req[1]), int(req[4])
+                self.m_ar_log.append((_id, addr))
+                yield Timer(self.LATENCY * CLK_PERIOD)
+                for i in range(_len + 1):
+                    r.append((_id, self.line_data(addr, i), RESP_OKAY, int(i == _len)))
+
+    def add_read(self, addr: int, _id: int, _len: int=None):
+        if _len is None:
+            _len = self.BEATS - 1
+        ar = self.dut.s_ar._ag
+        ar.data.append(ar.create_addr_req(addr, _len, _id))
+
+    def expected_r(self, addr: int, _id: int, _len: int=None):
+        if _len is None:
+            _len = self.BEATS - 1
+        return [(_id, self.line_data(addr, i), RESP_OKAY, int(i == _len))
+                for i in range(_len + 1)]
+
+    def s_r_by_id(self):
+        res = {}
+        for (_id, data, resp, last) in self.dut.s_r._ag.data:
+            res.setdefault(int(_id), []).append((int(_id), int(data), int(resp), int(last)))
+        return res
+
+    def assertNoBurstInterleaving(self):
+        curId = None
+        for (_id, _, _, last) in self.dut.s_r._ag.data:
+            _id = int(_id)
+            if curId is not None:
+                self.assertEqual(_id, curId, "burst interleaved with other burst")
+            curId = None if int(last) else _id
+
+    def test_nop(self):
+        dut = self.dut
+        self.procs.append(self.memory_responder())
+        self.runSim(20 * CLK_PERIOD)
+        self.assertEmpty(self.m_ar_log)
+        self.assertEmpty(dut.s_r._ag.data)
+
+    def test_read_different_lines(self):
+        dut = self.dut
+        LINE = dut.CACHE_LINE_SIZE
+        N = 4
+        expected = []
+        for i in range(N):
+            self.add_read(i * LINE, i)
+            expected.extend(self.expected_r(i * LINE, i))
+
+        self.procs.append(self.memory_responder())
+        self.runSim((N * (self.LATENCY + self.BEATS + 2) + 10) * CLK_PERIOD)
+
+        self.assertSequenceEqual([a for (_, a) in self.m_ar_log], [i * LINE for i in range(N)])
+        for _id, _ in self.m_ar_log:
+            self.assertLess(_id, dut.MSHR_CNT)
+        self.assertValSequenceEqual(dut.s_r._ag.data, expected)
+
+    def test_secondary_miss_merge(self):
+        dut = self.dut
+        addr = 3 * dut.CACHE_LINE_SIZE
+        ids = [1, 2, 3]
+        for _id in ids:
+            self.add_read(addr, _id)
+
+        self.procs.append(self.memory_responder())
+        self.runSim((self.LATENCY + len(ids) * self.BEATS + 10) * CLK_PERIOD)
+
+        # only the primary miss is dispatched to main memory
+        self.assertSequenceEqual(self.m_ar_log, [(0, addr)])
+        expected = []
+        for _id in ids:
+            expected.extend(self.expected_r(addr, _id))
+        self.assertValSequenceEqual(dut.s_r._ag.data, expected)
+
+    def test_merge_overflow(self):
+        dut = self.dut
+        addr = 2 * dut.CACHE_LINE_SIZE
+        ids = [1, 2, 3, 4]
+        for _id in ids:
+            self.add_read(addr, _id)
+
+        self.procs.append(self.memory_responder())
+        self.runSim((2 * (self.LATENCY + 2) + len(ids) * self.BEATS + 10) * CLK_PERIOD)
+
+        # the MSHR is full, last request has to allocate a new MSHR
+        self.assertSequenceEqual([a for (_, a) in self.m_ar_log], [addr, addr])
+        self.assertDictEqual(self.s_r_by_id(), {
+            _id: self.expected_r(addr, _id) for _id in ids
+        })
+
+    def test_same_id_different_lines(self):
+        dut = self.dut
+        LINE = dut.CACHE_LINE_SIZE
+        self.add_read(0, 1)
+        self.add_read(LINE, 1)
+
+        self.procs.append(self.memory_responder())
+        self.runSim((2 * (self.LATENCY + self.BEATS + 2) + 10) * CLK_PERIOD)
+
+        self.assertSequenceEqual([a for (_, a) in self.m_ar_log], [0, LINE])
+        self.assertValSequenceEqual(dut.s_r._ag.data,
+                                    self.expected_r(0, 1) + self.expected_r(LINE, 1))
+
+    def test_same_id_not_merged_over_other_mshr(self):
+        dut = self.dut
+        A = 1 * dut.CACHE_LINE_SIZE
+        B = 2 * dut.CACHE_LINE_SIZE
+        self.add_read(A, 1)
+        self.add_read(B, 2)
+        # can not be merged to A because the response for B has to be the first for id 2
+        self.add_read(A, 2)
+
+        self.procs.append(self.memory_responder())
+        self.runSim((3 * (self.LATENCY + self.BEATS + 2) + 10) * CLK_PERIOD)
+
+        self.assertDictEqual(self.s_r_by_id(), {
+            1: self.expected_r(A, 1),
+            2: self.expected_r(B, 2) + self.expected_r(A, 2),
+        })
+        self.assertNoBurstInterleaving()
+
+    def test_replay_not_interleaved(self):
+        dut = self.dut
+        self.randomize(dut.s_r)
+        self.randomize(dut.m_r)
+        LINE = dut.CACHE_LINE_SIZE
+        A = 1 * LINE
+        self.add_read(A, 1)
+        self.add_read(A, 2)
+        self.add_read(A, 3)
+        for i in range(4):
+            self.add_read((i + 2) * LINE, i + 4)
+
+        self.procs.append(self.memory_responder())
+        self.runSim(20 * (self.LATENCY + self.BEATS + 2) * CLK_PERIOD)
+
+        ref = {_id: self.expected_r(A, _id) for _id in (1, 2, 3)}
+        for i in range(4):
+            ref[i + 4] = self.expected_r((i + 2) * LINE, i + 4)
+        self.assertDictEqual(self.s_r_by_id(), ref)
+        self.assertNoBurstInterleaving()
+
+    def test_different_offset_not_merged(self):
+        dut = self.dut
+        addr = 3 * dut.CACHE_LINE_SIZE
+        self.add_read(addr, 1)
+        self.add_read(addr + dut.DATA_WIDTH // 8, 2, self.BEATS - 2)
+
+        self.procs.append(self.memory_responder())
+        self.runSim((2 * (self.LATENCY + self.BEATS + 2) + 10) * CLK_PERIOD)
+
+        self.assertSequenceEqual([a for (_, a) in self.m_ar_log], [addr, addr + dut.DATA_WIDTH // 8])
+        self.assertDictEqual(self.s_r_by_id(), {
+            1: self.expected_r(addr, 1),
+            2: self.expected_r(addr + dut.DATA_WIDTH // 8, 2, self.BEATS - 2),
+        })
+
+    def test_outstanding_limit(self):
+        dut = self.dut
+        for i in range(4):
+            self.add_read(i * dut.CACHE_LINE_SIZE, i)
+
+        # main memory does not respond
+        self.runSim(20 * CLK_PERIOD)
+        self.assertEqual(len(dut.m_ar._ag.data), dut.MSHR_CNT)
+        self.assertEqual(len(dut.s_ar._ag.data), 4 - dut.MSHR_CNT)
+        self.assertEmpty(dut.s_r._ag.data)
+
+
+if __name__ == "__main__":
+    import unittest
+    testLoader = unittest.TestLoader()
+    # suite = unittest.TestSuite([AxiCacheMshrTC("test_secondary_miss_merge")])
+    suite = testLoader.loadTestsFromTestCase(AxiCacheMshrTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
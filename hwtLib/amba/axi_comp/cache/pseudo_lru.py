@@ -1,10 +1,11 @@
 from operator import ne
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from hwt.code import Concat, And, Or
 from hwt.code_utils import _mkOp
 from hwt.math import isPow2, log2ceil
 from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
+from hwtLib.amba.axi_comp.cache.replacement_policy import CacheReplacementPolicy
 
 
 def parity(bit_vector):
@@ -12,7 +13,7 @@ def parity(bit_vector):
 
 
 # https://chipress.co/2019/07/09/how-to-implement-pseudo-lru/
-class PseudoLru():
+class PseudoLru(CacheReplacementPolicy):
     """
     Tree-PLRU, Pseudo Last Recently Used (LRU) algorithm
     * Often used to select least used value in caches etc.
@@ -45,6 +46,7 @@ class PseudoLru():
 
 
     :note: that there is a 6-bit encoding for true LRU for four-way set associative
+      (implemented in :class:`hwtLib.amba.axi_comp.cache.replacement_policy.TrueLru`)
       bit 0: bank[1] more recently used than bank[0]
       bit 1: bank[2] more recently used than bank[0]
       bit 2: bank[2] more recently used than bank[1]
@@ -66,9 +68,9 @@ class PseudoLru():
     def lru_reg_items(width):
         return 2 ** log2ceil(width + 1)
 
-    def __init__(self, lru_reg: RtlSignal):
+    def __init__(self, lru_reg: RtlSignal, random: Optional[RtlSignal]=None):
         assert isPow2(lru_reg._dtype.bit_length() - 1) or lru_reg._dtype.bit_length() == 1, lru_reg._dtype.bit_length()
-        self.lru_regs = lru_reg
+        super(PseudoLru, self).__init__(lru_reg, random)
 
     def node_selected_mask(self, lru_tree, node_i):
         """
@@ -0,0 +1,245 @@
+from typing import List, Optional
+
+from hwt.code import And, Or, Concat
+from hwt.hdl.types.bits import HBits
+from hwt.math import log2ceil, isPow2
+from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
+
+
+class CacheReplacementPolicy():
+    """
+    Base class of cache replacement policies used in :class:`hwtLib.amba.axi_comp.cache.lru_array.AxiCacheLruArray`
+    (and in :class:`hwtLib.amba.axi_comp.cache.trace_model.AxiCacheTraceModel`).
+
+    The policy is a set of combinational functions on a state of a single cache set,
+    the state is stored in a memory and it is initialized to 0.
+    The functions work on signals and also on constants (for the simulation models).
+
+    :note: this is not a component in order to make this alg independent on lru reg storage type
+    :ivar lru_regs: the state of the cache set
+    :ivar random: random bits or None if the policy does not require them (:meth:`~.random_bits`)
+    """
+
+    @staticmethod
+    def lru_reg_width(items: int) -> int:
+        """
+        :return: number of bits of the state for a cache set with specified number of items
+        """
+        raise NotImplementedError()
+
+    @staticmethod
+    def random_bits(items: int) -> int:
+        """
+        :return: number of random bits required by this policy (0 if the policy is deterministic),
+            random bits are generated by :class:`hwtLib.logic.lfsr.Lfsr` in the array
+        """
+        return 0
+
+    def __init__(self, lru_reg: RtlSignal, random: Optional[RtlSignal]=None):
+        self.lru_regs = lru_reg
+        self.random = random
+
+    def mark_use_many(self, used_item_mask: RtlSignal) -> RtlSignal:
+        """
+        Mark items as used just now (cache hit)
+
+        :return: the next value of the state
+        """
+        raise NotImplementedError()
+
+    def mark_victim_use(self, victim_item_mask: RtlSignal, used_item_mask: RtlSignal) -> RtlSignal:
+        """
+        Mark the victim (returned from :meth:`~.get_lru`) as newly inserted
+        and items in used_item_mask as used just now.
+
+        :return: the next value of the state
+        """
+        return self.mark_use_many(victim_item_mask | used_item_mask)
+
+    def get_lru(self) -> RtlSignal:
+        """
+        :return: binary encoded index of the item which should be replaced
+        """
+        raise NotImplementedError()
+
+    @staticmethod
+    def _one_hot_to_bin(one_hot: List[RtlSignal]) -> RtlSignal:
+        """
+        :return: MSB..LSB binary index of the bit which is set in one_hot
+        """
+        res = []
+        for b in range(log2ceil(len(one_hot))):
+            res.append(Or(*(oh for i, oh in enumerate(one_hot) if (i >> b) & 1)))
+        return Concat(*reversed(res))
+
+    @staticmethod
+    def _first_one(flags: List[RtlSignal]) -> List[RtlSignal]:
+        """
+        :return: one hot encoded flags where only the first set flag is left
+        """
+        return [f if i == 0 else f & ~Or(*flags[:i]) for i, f in enumerate(flags)]
+
+
+class TrueLru(CacheReplacementPolicy):
+    """
+    True LRU (Last Recently Used) in matrix encoding,
+    for each pair of items there is a bit which specifies which of them was used more recently.
+
+    Example for 4 items (6 bits):
+
+    * bit 0: item[1] more recently used than item[0]
+    * bit 1: item[2] more recently used than item[0]
+    * bit 2: item[2] more recently used than item[1]
+    * bit 3: item[3] more recently used than item[0]
+    * bit 4: item[3] more recently used than item[1]
+    * bit 5: item[3] more recently used than item[2]
+
+    :note: The state is O(items^2), suitable for small number of ways.
+    """
+
+    @staticmethod
+    def lru_reg_width(items: int) -> int:
+        return items * (items - 1) // 2
+
+    @staticmethod
+    def _pairs(items: int):
+        """
+        :return: generator of (bit index, i, j) where bit specifies if item[i] was used after item[j]
+        """
+        b = 0
+        for i in range(1, items):
+            for j in range(i):
+                yield b, i, j
+                b += 1
+
+    def _items(self):
+        w = self.lru_regs._dtype.bit_length()
+        items = 2
+        while self.lru_reg_width(items) < w:
+            items += 1
+        assert self.lru_reg_width(items) == w, w
+        return items
+
+    def mark_use_many(self, used_item_mask: RtlSignal) -> RtlSignal:
+        used = [*used_item_mask]
+        regs = [*self.lru_regs]
+        res = []
+        for b, i, j in self._pairs(self._items()):
+            ui, uj = used[i], used[j]
+            # if both or none was used keep the order
+            res.append((ui & ~uj) | (regs[b] & ~(uj & ~ui)))
+        return Concat(*reversed(res))
+
+    def get_lru(self) -> RtlSignal:
+        items = self._items()
+        regs = [*self.lru_regs]
+        # is_older[i][j] = item[i] was used before item[j]
+        is_lru = [[] for _ in range(items)]
+        for b, i, j in self._pairs(items):
+            is_lru[i].append(~regs[b])
+            is_lru[j].append(regs[b])
+        is_lru = self._first_one([And(*c) for c in is_lru])
+        return self._one_hot_to_bin(is_lru)
+
+
+class Srrip(CacheReplacementPolicy):
+    """
+    SRRIP (Static Re-Reference Interval Prediction), scan resistant replacement policy.
+    Each item has a RRPV (re-reference prediction value), the item with max RRPV is replaced,
+    item on hit has RRPV set to 0, newly inserted item has RRPV = RRPV_MAX - 1.
+    If there is no item with RRPV_MAX all items are aged so the victim has RRPV_MAX.
+
+    :see: Jaleel et al., High Performance Cache Replacement Using Re-Reference Interval Prediction (RRIP), ISCA 2010
+    :cvar RRPV_WIDTH: number of bits of RRPV of each item
+    """
+    RRPV_WIDTH = 2
+
+    @classmethod
+    def lru_reg_width(cls, items: int) -> int:
+        return cls.RRPV_WIDTH * items
+
+    def _rrpvs(self) -> List[RtlSignal]:
+        W = self.RRPV_WIDTH
+        regs = self.lru_regs
+        items = regs._dtype.bit_length() // W
+        return [regs[(i + 1) * W:i * W] for i in range(items)]
+
+    def _max_rrpv(self, rrpvs: List[RtlSignal]) -> RtlSignal:
+        rrpv_t = rrpvs[0]._dtype
+        res = rrpv_t.from_py(0)
+        for v in range(1, 2 ** self.RRPV_WIDTH):
+            res = Or(*(r._eq(v) for r in rrpvs))._ternary(rrpv_t.from_py(v), res)
+        return res
+
+    def insertion_rrpv(self, rrpv_t: HBits) -> RtlSignal:
+        return rrpv_t.from_py(2 ** self.RRPV_WIDTH - 2)
+
+    def mark_use_many(self, used_item_mask: RtlSignal) -> RtlSignal:
+        rrpvs = self._rrpvs()
+        rrpv_t = rrpvs[0]._dtype
+        res = [u._ternary(rrpv_t.from_py(0), r)
+               for u, r in zip(used_item_mask, rrpvs)]
+        return Concat(*reversed(res))
+
+    def mark_victim_use(self, victim_item_mask: RtlSignal, used_item_mask: RtlSignal) -> RtlSignal:
+        rrpvs = self._rrpvs()
+        rrpv_t = rrpvs[0]._dtype
+        age = rrpv_t.from_py(2 ** self.RRPV_WIDTH - 1) - self._max_rrpv(rrpvs)
+        ins = self.insertion_rrpv(rrpv_t)
+        res = []
+        for victim, used, r in zip(victim_item_mask, used_item_mask, rrpvs):
+            res.append(used._ternary(rrpv_t.from_py(0), victim._ternary(ins, r + age)))
+        return Concat(*reversed(res))
+
+    def get_lru(self) -> RtlSignal:
+        rrpvs = self._rrpvs()
+        m = self._max_rrpv(rrpvs)
+        return self._one_hot_to_bin(self._first_one([r._eq(m) for r in rrpvs]))
+
+
+class Brrip(Srrip):
+    """
+    BRRIP (Bimodal RRIP), same as :class:`~.Srrip` but newly inserted item has RRPV_MAX
+    (it is the first candidate for replacement) and only with a probability 1/2^BIMODAL_BITS
+    it has RRPV_MAX - 1. This protects the cache content against thrashing by access patterns
+    with working set larger than the cache.
+    """
+    BIMODAL_BITS = 5
+
+    @classmethod
+    def random_bits(cls, items: int) -> int:
+        return cls.BIMODAL_BITS
+
+    def insertion_rrpv(self, rrpv_t: HBits) -> RtlSignal:
+        return self.random._eq(0)._ternary(rrpv_t.from_py(2 ** self.RRPV_WIDTH - 2),
+                                           rrpv_t.from_py(2 ** self.RRPV_WIDTH - 1))
+
+
+class RandomReplacement(CacheReplacementPolicy):
+    """
+    The victim is selected randomly (using random bits from LFSR), there is no per set state.
+
+    :note: The state has 1 bit which is unused, this is to keep the interface
+        of the array same for all policies.
+    :attention: The number of items has to be a power of 2 and > 1 (there is no choice in direct-mapped cache),
+        the random value is used directly as an index.
+    """
+
+    @staticmethod
+    def lru_reg_width(items: int) -> int:
+        return 1
+
+    @staticmethod
+    def random_bits(items: int) -> int:
+        assert items > 1, ("Random replacement requires more than 1 item", items)
+        assert isPow2(items), ("Random value would be out of range of items", items)
+        return log2ceil(items)
+
+    def mark_use_many(self, used_item_mask: RtlSignal) -> RtlSignal:
+        return self.lru_regs
+
+    def mark_victim_use(self, victim_item_mask: RtlSignal, used_item_mask: RtlSignal) -> RtlSignal:
+        return self.lru_regs
+
+    def get_lru(self) -> RtlSignal:
+        return self.random
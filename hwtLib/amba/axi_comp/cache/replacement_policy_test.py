@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from random import Random
+import unittest
+
+from hwt.hdl.types.bits import HBits
+from hwtLib.amba.axi_comp.cache.replacement_policy import TrueLru, Srrip, \
+    Brrip, RandomReplacement
+
+
+def vec(width: int, val: int):
+    return HBits(width, force_vector=True).from_py(val)
+
+
+class ReplacementPolicy_TC(unittest.TestCase):
+    """
+    The policies are evaluated on constants
+    """
+
+    def test_TrueLru_width(self):
+        self.assertEqual(TrueLru.lru_reg_width(2), 1)
+        self.assertEqual(TrueLru.lru_reg_width(4), 6)
+        self.assertEqual(TrueLru.lru_reg_width(8), 28)
+
+    def test_TrueLru(self, N=4):
+        W = TrueLru.lru_reg_width(N)
+        state = 0
+        # initial state is a valid order
+        self.assertEqual(int(TrueLru(vec(W, state)).get_lru()), N - 1)
+
+        order = []
+        rand = Random(0)
+        for _ in range(100):
+            way = rand.randrange(N)
+            state = int(TrueLru(vec(W, state)).mark_use_many(vec(N, 1 << way)))
+            if way in order:
+                order.remove(way)
+            order.append(way)
+            if len(order) == N:
+                self.assertEqual(int(TrueLru(vec(W, state)).get_lru()), order[0])
+
+    def test_TrueLru_8(self):
+        self.test_TrueLru(N=8)
+
+    def rrip_victim(self, policy, state: int, N: int, rnd=None):
+        W = policy.lru_reg_width(N)
+        if rnd is not None:
+            rnd = vec(policy.random_bits(N), rnd)
+        p = policy(vec(W, state), rnd)
+        v = int(p.get_lru())
+        return v, int(p.mark_victim_use(vec(N, 1 << v), vec(N, 0)))
+
+    def rrpvs(self, state: int, N: int):
+        W = Srrip.RRPV_WIDTH
+        return [(state >> (i * W)) & ((1 << W) - 1) for i in range(N)]
+
+    def test_Srrip(self, N=4):
+        state = 0
+        victims = []
+        for _ in range(N):
+            v, state = self.rrip_victim(Srrip, state, N)
+            victims.append(v)
+        # all ways were aged and then inserted with RRPV_MAX - 1
+        self.assertSequenceEqual(victims, list(range(N)))
+        self.assertSequenceEqual(self.rrpvs(state, N), [2 for _ in range(N)])
+
+        # hit protects the item
+        state = int(Srrip(vec(Srrip.lru_reg_width(N), state)).mark_use_many(vec(N, 1 << 0)))
+        self.assertSequenceEqual(self.rrpvs(state, N), [0] + [2 for _ in range(N - 1)])
+        v, state = self.rrip_victim(Srrip, state, N)
+        self.assertEqual(v, 1)
+        self.assertSequenceEqual(self.rrpvs(state, N), [1, 2, 3, 3])
+
+    def test_Brrip(self, N=4):
+        state = 0
+        _, state = self.rrip_victim(Brrip, state, N, rnd=1)
+        # inserted as distant
+        self.assertSequenceEqual(self.rrpvs(state, N), [3, 3, 3, 3])
+        v, state = self.rrip_victim(Brrip, state, N, rnd=0)
+        self.assertEqual(v, 0)
+        # with low probability inserted as long
+        self.assertSequenceEqual(self.rrpvs(state, N), [2, 3, 3, 3])
+
+    def test_RandomReplacement(self, N=4):
+        W = RandomReplacement.lru_reg_width(N)
+        R = RandomReplacement.random_bits(N)
+        self.assertEqual(R, 2)
+        for rnd in range(N):
+            p = RandomReplacement(vec(W, 0), vec(R, rnd))
+            self.assertEqual(int(p.get_lru()), rnd)
+            self.assertEqual(int(p.mark_victim_use(vec(N, 1 << rnd), vec(N, 0))), 0)
+
+    def test_RandomReplacement_non_pow2(self):
+        for items in (1, 3):
+            with self.assertRaises(AssertionError):
+                RandomReplacement.random_bits(items)
+
+
+if __name__ == '__main__':
+    unittest.main()
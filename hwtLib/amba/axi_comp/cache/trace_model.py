@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from collections import deque
+from random import Random
+from typing import Optional, List, Dict, Tuple, Iterable
+
+from hwt.hdl.types.bits import HBits
+from hwtLib.amba.axi_comp.cache.addrTypeConfig import CacheAddrTypeConfig
+from hwtLib.amba.axi_comp.cache.pseudo_lru import PseudoLru
+
+
+class AxiCacheTraceStats():
+    """
+    Statistics collected by :class:`~.AxiCacheTraceModel`,
+    the names of counters are the same as in
+    :data:`hwtLib.amba.axi_comp.cache.cacheWriteAllocWawOnlyWritePropagating.CACHE_PERF_COUNTERS_T`
+
+    :ivar ~.cycles: total number of clock cycles required to process the trace
+    """
+
+    COUNTERS = ("read_hit", "read_miss", "write_hit", "write_miss", "eviction", "write_back", "stall")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        for name in self.COUNTERS:
+            setattr(self, name, 0)
+        self.cycles = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.COUNTERS}
+
+    def hit_rate(self) -> Optional[float]:
+        hits = self.read_hit + self.write_hit
+        total = hits + self.read_miss + self.write_miss
+        if total == 0:
+            return None
+        return hits / total
+
+    def __repr__(self):
+        counters = ", ".join(f"{k:s}={v:d}" for k, v in self.as_dict().items())
+        return f"<{self.__class__.__name__:s} {counters:s}, cycles={self.cycles:d}, hit_rate={self.hit_rate()}>"
+
+
+class AxiCacheTraceModel():
+    """
+    Pure python cycle-approximate model of
+    :class:`hwtLib.amba.axi_comp.cache.cacheWriteAllocWawOnlyWritePropagating.AxiCacheWriteAllocWawOnlyWritePropagating`
+    for a fast evaluation of the cache configuration on address traces.
+
+    The address is parsed by :meth:`hwtLib.amba.axi_comp.cache.addrTypeConfig.CacheAddrTypeConfig.parse_addr_int`
+    of the cache component and the victim selection uses REPLACEMENT_POLICY of the cache
+    (:class:`hwtLib.amba.axi_comp.cache.pseudo_lru.PseudoLru` by default, evaluated on constants and memoized)
+    so the replacement decisions are the same as in hardware
+    (except for the random bits which are generated by python random generator instead of LFSR).
+
+    Same as in hardware:
+
+    * read miss does not allocate the cacheline
+    * write miss allocates the first empty way or the victim from the replacement policy
+      (the victim is then marked as used), the replaced valid cacheline is written back
+    * hit marks the way as used
+
+    Timing:
+
+    * the cache accepts one request per clock cycle
+    * each transaction occupies the data channel for one cacheline (BEATS clock cycles)
+    * the read miss data are available after MEM_LATENCY clock cycles, if the cache has MSHR_CNT > 0
+      the read miss waits for a free MSHR (the secondary miss to a same cacheline is merged
+      if the MSHR has space for it)
+
+    :note: The conflicts which are supposed to be resolved by LSU are not modeled
+        (the requests are processed sequentially).
+
+    :ivar ~.MEM_LATENCY: latency of the main memory in clock cycles
+    """
+
+    def __init__(self, cache: CacheAddrTypeConfig, MEM_LATENCY: int=20, seed: int=0):
+        if not hasattr(cache, "TAG_W"):
+            cache._compupte_tag_index_offset_widths()
+        self.cache = cache
+        self.WAY_CNT = cache.WAY_CNT
+        self.SETS = 2 ** cache.INDEX_W
+        self.BEATS = max(1, cache.CACHE_LINE_SIZE // (cache.DATA_WIDTH // 8))
+        self.MSHR_CNT = getattr(cache, "MSHR_CNT", 0)
+        self.MSHR_MAX_MERGED = getattr(cache, "MSHR_MAX_MERGED", 0)
+        self.MEM_LATENCY = MEM_LATENCY
+        self.POLICY = getattr(cache, "REPLACEMENT_POLICY", PseudoLru)
+        if self.WAY_CNT > 1:
+            self.LRU_WIDTH = self.POLICY.lru_reg_width(self.WAY_CNT)
+            self.RANDOM_BITS = self.POLICY.random_bits(self.WAY_CNT)
+        else:
+            self.LRU_WIDTH = 0
+            self.RANDOM_BITS = 0
+        self._rand = Random(seed)
+
+        # replacement policy evaluation cache
+        self._lru_victim: Dict[Tuple[int, Optional[int]], int] = {}
+        self._lru_use: Dict[Tuple[int, int], int] = {}
+        self._lru_victim_use: Dict[Tuple[int, int, Optional[int]], int] = {}
+        self.stats = AxiCacheTraceStats()
+        self.reset()
+
+    def reset(self):
+        """
+        Invalidate all cachelines and reset the statistics
+        """
+        # tags[index][way] = tag or None if invalid
+        self.tags: List[List[Optional[int]]] = [[None for _ in range(self.WAY_CNT)] for _ in range(self.SETS)]
+        self.lru: List[int] = [0 for _ in range(self.SETS)]
+        self.now = 0
+        self._r_free = 0
+        self._w_free = 0
+        # [line, done cycle, number of merged]
+        self._mshrs: deque = deque()
+        self.stats.reset()
+
+    def insert(self, addr: int, way: int):
+        """
+        Store the cacheline for address in cache (without any effect on statistics or LRU)
+        """
+        tag, index, _ = self.cache.parse_addr_int(addr)
+        self.tags[index][way] = tag
+
+    def _policy(self, lru: int, rnd: Optional[int]):
+        lru_reg = HBits(self.LRU_WIDTH, force_vector=True).from_py(lru)
+        if rnd is not None:
+            rnd = HBits(self.RANDOM_BITS, force_vector=True).from_py(rnd)
+        return self.POLICY(lru_reg, rnd)
+
+    def _way_mask(self, way: int):
+        return HBits(self.WAY_CNT).from_py(1 << way)
+
+    def lru_get_victim(self, lru: int, rnd: Optional[int]=None) -> int:
+        k = (lru, rnd)
+        v = self._lru_victim.get(k, None)
+        if v is None:
+            v = self._lru_victim[k] = int(self._policy(lru, rnd).get_lru())
+        return v
+
+    def lru_mark_use(self, lru: int, way: int) -> int:
+        k = (lru, way)
+        v = self._lru_use.get(k, None)
+        if v is None:
+            v = self._lru_use[k] = int(self._policy(lru, None).mark_use_many(self._way_mask(way)))
+        return v
+
+    def lru_mark_victim_use(self, lru: int, way: int, rnd: Optional[int]=None) -> int:
+        k = (lru, way, rnd)
+        v = self._lru_victim_use.get(k, None)
+        if v is None:
+            p = self._policy(lru, rnd)
+            v = self._lru_victim_use[k] = int(p.mark_victim_use(self._way_mask(way),
+                                                                HBits(self.WAY_CNT).from_py(0)))
+        return v
+
+    def _mark_use(self, index: int, way: int):
+        if self.LRU_WIDTH:
+            self.lru[index] = self.lru_mark_use(self.lru[index], way)
+
+    def _find(self, tag: int, index: int) -> Optional[int]:
+        for way, t in enumerate(self.tags[index]):
+            if t == tag:
+                return way
+        return None
+
+    def _issue(self):
+        """
+        Resolve the clock cycle when the request is accepted
+        """
+        t = self.now
+        self.now += 1
+        return t
+
+    def _read_miss_data_ready(self, t: int, addr: int) -> int:
+        line = addr >> self.cache.OFFSET_W
+        if not self.MSHR_CNT:
+            return t + self.MEM_LATENCY
+
+        mshrs = self._mshrs
+        while mshrs and mshrs[0][1] <= t:
+            mshrs.popleft()
+
+        for m in mshrs:
+            if m[0] == line and m[2] < self.MSHR_MAX_MERGED:
+                m[2] += 1
+                return m[1]
+
+        if len(mshrs) == self.MSHR_CNT:
+            # wait for the oldest MSHR to be free
+            free_at = mshrs.popleft()[1]
+            self.stats.stall += free_at - t
+            self.now += free_at - t
+            t = free_at
+
+        done = t + self.MEM_LATENCY
+        mshrs.append([line, done, 0])
+        return done
+
+    def read(self, addr: int) -> bool:
+        """
+        :return: True if the read was a hit
+        """
+        st = self.stats
+        t = self._issue()
+        tag, index, _ = self.cache.parse_addr_int(addr)
+        way = self._find(tag, index)
+        if way is None:
+            st.read_miss += 1
+            data_ready = self._read_miss_data_ready(t, addr)
+        else:
+            st.read_hit += 1
+            self._mark_use(index, way)
+            data_ready = t + 1
+
+        start = max(data_ready, self._r_free)
+        self._r_free = start + self.BEATS
+        st.cycles = max(st.cycles, self._r_free, self.now)
+        return way is not None
+
+    def write(self, addr: int) -> bool:
+        """
+        :return: True if the write was a hit
+        """
+        st = self.stats
+        t = self._issue()
+        tag, index, _ = self.cache.parse_addr_int(addr)
+        tags = self.tags[index]
+        way = self._find(tag, index)
+        hit = way is not None
+        if hit:
+            st.write_hit += 1
+            self._mark_use(index, way)
+        else:
+            st.write_miss += 1
+            try:
+                way = tags.index(None)
+            except ValueError:
+                # no empty way, replace the victim
+                if self.LRU_WIDTH:
+                    lru = self.lru[index]
+                    if self.RANDOM_BITS:
+                        rnd = self._rand.getrandbits(self.RANDOM_BITS)
+                    else:
+                        rnd = None
+                    way = self.lru_get_victim(lru, rnd)
+                    self.lru[index] = self.lru_mark_victim_use(lru, way, rnd)
+                else:
+                    way = 0
+                st.eviction += 1
+                st.write_back += 1
+            tags[way] = tag
+
+        start = max(t + 1, self._w_free)
+        if start > t + 1:
+            # data channel is busy with previous write
+            st.stall += start - (t + 1)
+        self._w_free = start + self.BEATS
+        st.cycles = max(st.cycles, self._w_free, self.now)
+        return hit
+
+    def run_trace(self, trace: Iterable[Tuple[bool, int]]) -> AxiCacheTraceStats:
+        """
+        :param trace: iterable of tuples (is_write, address)
+        """
+        for isWrite, addr in trace:
+            if isWrite:
+                self.write(addr)
+            else:
+                self.read(addr)
+        return self.stats
+
+
+def parse_trace_file(file_name: str):
+    """
+    Parse a trace file where each line is "r <addr>" or "w <addr>"
+    (the address is in any format accepted by python int(x, 0), "#" starts a comment)
+    """
+    with open(file_name) as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            op, addr = line.split()
+            op = op.lower()
+            assert op in ("r", "w"), line
+            yield op == "w", int(addr, 0)
+
+
+if __name__ == "__main__":
+    import argparse
+    from hwtLib.amba.axi_comp.cache.cacheWriteAllocWawOnlyWritePropagating import AxiCacheWriteAllocWawOnlyWritePropagating
+
+    parser = argparse.ArgumentParser(description="Evaluate cache configurations on an address trace")
+    parser.add_argument("trace", help='file with "r <addr>"/"w <addr>" on each line')
+    parser.add_argument("--data-width", type=int, default=64)
+    parser.add_argument("--cache-line-size", type=int, default=64)
+    parser.add_argument("--cache-line-cnt", type=int, nargs="+", default=[256, 1024, 4096])
+    parser.add_argument("--way-cnt", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--mem-latency", type=int, default=20)
+    args = parser.parse_args()
+
+    trace = list(parse_trace_file(args.trace))
+    for line_cnt in args.cache_line_cnt:
+        for way_cnt in args.way_cnt:
+            c = AxiCacheWriteAllocWawOnlyWritePropagating()
+            c.DATA_WIDTH = args.data_width
+            c.CACHE_LINE_SIZE = args.cache_line_size
+            c.CACHE_LINE_CNT = line_cnt
+            c.WAY_CNT = way_cnt
+            m = AxiCacheTraceModel(c, MEM_LATENCY=args.mem_latency)
+            print(f"CACHE_LINE_CNT={line_cnt:d} WAY_CNT={way_cnt:d}", m.run_trace(trace))
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from hwtLib.amba.axi_comp.cache.cacheWriteAllocWawOnlyWritePropagating import AxiCacheWriteAllocWawOnlyWritePropagating
+from hwtLib.amba.axi_comp.cache.pseudo_lru import PseudoLru
+from hwtLib.amba.axi_comp.cache.replacement_policy import TrueLru, Srrip, Brrip
+from hwtLib.amba.axi_comp.cache.trace_model import AxiCacheTraceModel
+
+
+class AxiCacheTraceModel_TC(unittest.TestCase):
+    MEM_LATENCY = 20
+
+    def mkModel(self, MSHR_CNT=0, MSHR_MAX_MERGED=2, REPLACEMENT_POLICY=PseudoLru):
+        c = AxiCacheWriteAllocWawOnlyWritePropagating()
+        c.REPLACEMENT_POLICY = REPLACEMENT_POLICY
+        c.DATA_WIDTH = 32
+        c.CACHE_LINE_SIZE = 4
+        c.CACHE_LINE_CNT = 16
+        c.WAY_CNT = 2
+        c.MSHR_CNT = MSHR_CNT
+        c.MSHR_MAX_MERGED = MSHR_MAX_MERGED
+        self.WAY_CACHELINES = c.CACHE_LINE_CNT // c.WAY_CNT
+        self.ADDR_STEP = c.CACHE_LINE_SIZE
+        return AxiCacheTraceModel(c, MEM_LATENCY=self.MEM_LATENCY)
+
+    def test_read_does_not_allocate(self):
+        m = self.mkModel()
+        self.assertFalse(m.read(0))
+        self.assertFalse(m.read(0))
+        self.assertDictEqual(m.stats.as_dict(), {
+            "read_hit": 0, "read_miss": 2, "write_hit": 0, "write_miss": 0,
+            "eviction": 0, "write_back": 0, "stall": 0})
+
+    def test_write_allocate(self):
+        m = self.mkModel()
+        self.assertFalse(m.write(0))
+        self.assertTrue(m.write(0))
+        self.assertTrue(m.read(0))
+        st = m.stats
+        self.assertEqual((st.write_miss, st.write_hit, st.read_hit), (1, 1, 1))
+        self.assertEqual(st.eviction, 0)
+
+    def test_eviction(self):
+        m = self.mkModel()
+        # all addresses have the same index
+        addrs = [i * self.WAY_CACHELINES * self.ADDR_STEP for i in range(3)]
+        for a in addrs:
+            self.assertFalse(m.write(a))
+
+        st = m.stats
+        self.assertEqual(st.eviction, 1)
+        self.assertEqual(st.write_back, 1)
+        hits = [m.read(a) for a in addrs]
+        self.assertTrue(hits[-1])
+        self.assertEqual(sum(hits), 2)
+
+    def test_insert(self):
+        m = self.mkModel()
+        m.insert(5 * self.ADDR_STEP, 1)
+        self.assertTrue(m.read(5 * self.ADDR_STEP))
+        self.assertEqual(m.stats.read_hit, 1)
+
+    def test_mshr_merge_and_stall(self):
+        m = self.mkModel(MSHR_CNT=1, MSHR_MAX_MERGED=1)
+        m.run_trace([
+            (False, 0),
+            (False, 0),  # merged to MSHR of previous read
+            (False, self.ADDR_STEP),  # has to wait on MSHR
+        ])
+        self.assertEqual(m.stats.read_miss, 3)
+        self.assertEqual(m.stats.stall, self.MEM_LATENCY - 2)
+
+    def test_lru_memoization(self):
+        m = self.mkModel()
+        for i in range(4):
+            m.write(i * self.WAY_CACHELINES * self.ADDR_STEP)
+            m.read(i * self.WAY_CACHELINES * self.ADDR_STEP)
+        # the PseudoLru is evaluated only once for each state
+        self.assertLessEqual(len(m._lru_victim), 2 ** m.LRU_WIDTH)
+        self.assertLessEqual(len(m._lru_use), 2 ** m.LRU_WIDTH * m.WAY_CNT)
+
+    def test_scan_resistance(self):
+        # hot set which fits in to the cache interleaved with a scan over cold data
+        models = {p: self.mkModel(REPLACEMENT_POLICY=p) for p in (TrueLru, Srrip, Brrip)}
+        trace = []
+        for r in range(50):
+            for _ in range(3):
+                trace.extend((True, i * self.ADDR_STEP) for i in range(8))
+            trace.extend((True, (1000 + r * 16 + i) * self.ADDR_STEP) for i in range(16))
+
+        hit_rate = {p: m.run_trace(trace).hit_rate() for p, m in models.items()}
+
+        self.assertGreater(hit_rate[Srrip], hit_rate[TrueLru])
+        self.assertGreater(hit_rate[Brrip], hit_rate[TrueLru])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,46 @@
 from itertools import chain
-from typing import Optional
+from typing import Optional, Union, Tuple, FrozenSet
 
+from hwt.code import SwitchLogic
+from hwt.hdl.types.bits import HBits
 from hwt.hwIOs.utils import addClkRstn
 from hwt.hObjList import HObjList
 from hwt.hwParam import HwParam
 from hwt.math import log2ceil
+from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
 from hwtLib.abstract.busInterconnect import BusInterconnect
+from hwtLib.amba.axi_common import Axi_hs
+from hwtLib.amba.axis_comp.builder import Axi4SBuilder
 
 
 class AxiInterconnectCommon(BusInterconnect):
+    """
+    :ivar ~.MASTER_WEIGHTS: None or tuple of weights for each master, if specified the master
+        which has the priority gets up to weight consecutive grants on the address channel of the slave
+        (weighted round-robin), if None the priority changes in every clock cycle (round-robin)
+    :ivar ~.QOS_ARBITRATION: if True the transaction with the highest AXI QoS value wins the arbitration,
+        the round-robin is used only for transactions with the same QoS value
+    :ivar ~.MASTER_MAX_OUTSTANDING: None or tuple of limits of pending transactions for each master
+        (None for the master without limit), the address channel of the master is blocked
+        if the master has this number of pending transactions (read and write separately)
+    :ivar ~.DECODE_REG_CHANNELS: set of names of address channels ("ar", "aw") which have a register slice
+        between the master and the address decoder
+    :ivar ~.ARBITRATION_REG_CHANNELS: set of names of address channels ("ar", "aw") which have a register slice
+        between the arbiter and the slave
+    :ivar ~.DATA_MUX_REG_CHANNELS: set of names of data channels ("r", "w", "b") which have a register slice
+        on the output of the data multiplexer
+
+    :note: Each register slice cuts the combinational path (including the ready) at the cost of 1 clock cycle of latency
+        on the channel. The throughput is not affected.
+    """
+    # parameters with a value for each master
+    PER_MASTER_PARAMS = ("MASTER_WEIGHTS", "MASTER_MAX_OUTSTANDING")
+    # parameters with a set of channel names for each optional register stage and channels allowed for it
+    REG_STAGE_PARAMS = (
+        ("DECODE_REG_CHANNELS", ("ar", "aw")),
+        ("ARBITRATION_REG_CHANNELS", ("ar", "aw")),
+        ("DATA_MUX_REG_CHANNELS", ("r", "w", "b")),
+    )
 
     def __init__(self, hwIOCls, hdlName:Optional[str]=None):
         self.hwIOCls = hwIOCls
@@ -18,8 +50,48 @@ class AxiInterconnectCommon(BusInterconnect):
         super(AxiInterconnectCommon, self).hwConfig()
         self.HWIO_CLS = HwParam(self.hwIOCls)
         self.MAX_TRANS_OVERLAP = HwParam(16)
+        self.MASTER_WEIGHTS = HwParam(None)
+        self.QOS_ARBITRATION = HwParam(False)
+        self.MASTER_MAX_OUTSTANDING = HwParam(None)
+        self.DECODE_REG_CHANNELS = HwParam(frozenset())
+        self.ARBITRATION_REG_CHANNELS = HwParam(frozenset())
+        self.DATA_MUX_REG_CHANNELS = HwParam(frozenset())
         self.hwIOCls.hwConfig(self)
 
+    @staticmethod
+    def _normalize_per_master_config(val: Union[None, int, Tuple[Optional[int], ...]],
+                                     master_cnt: int) -> Optional[Tuple[Optional[int], ...]]:
+        """
+        :return: None or tuple with a value for each master
+        """
+        if val is None:
+            return None
+        elif isinstance(val, int):
+            return tuple(val for _ in range(master_cnt))
+        else:
+            val = tuple(val)
+            assert len(val) == master_cnt, (val, master_cnt)
+            return val
+
+    def _normalize_arbitration_config(self):
+        M_CNT = len(self.MASTERS)
+        self.MASTER_WEIGHTS = self._normalize_per_master_config(self.MASTER_WEIGHTS, M_CNT)
+        if self.MASTER_WEIGHTS is not None:
+            for w in self.MASTER_WEIGHTS:
+                assert w >= 1, ("Weight has to be a positive integer", self.MASTER_WEIGHTS)
+        self.MASTER_MAX_OUTSTANDING = self._normalize_per_master_config(self.MASTER_MAX_OUTSTANDING, M_CNT)
+        if self.MASTER_MAX_OUTSTANDING is not None:
+            for lim in self.MASTER_MAX_OUTSTANDING:
+                assert lim is None or lim >= 1, ("Limit has to be None or a positive integer", self.MASTER_MAX_OUTSTANDING)
+
+    def _normalize_reg_stage_config(self):
+        for name, allowed_channels in self.REG_STAGE_PARAMS:
+            channels = frozenset(getattr(self, name))
+            for ch in channels:
+                assert ch in allowed_channels, ("Register slice is not supported on this channel in this stage",
+                                                name, ch, allowed_channels)
+            setattr(self, name, channels)
+
     def hwDeclr(self, has_r=True, has_w=True):
         addClkRstn(self)
         AXI = self.hwIOCls
@@ -35,3 +107,60 @@ class AxiInterconnectCommon(BusInterconnect):
 
         for s, (_, size) in zip(self.m, self.SLAVES):
             s.ADDR_WIDTH = log2ceil(size - 1)
+
+    def connect_master_addr_channels(self, master_addr_channels: HObjList, addr_crossbar_s: HObjList,
+                                     trans_done_flags: Tuple[RtlSignal, ...]):
+        """
+        Connect the address channels of masters to an address crossbar
+        and block the masters which have MASTER_MAX_OUTSTANDING transactions pending
+
+        :param trans_done_flags: for each master a flag which is 1 if transaction of this master was finished
+        """
+        limits = self.MASTER_MAX_OUTSTANDING
+        if limits is None:
+            addr_crossbar_s(master_addr_channels)
+            return
+
+        for m_i, (src, dst, done, limit) in enumerate(zip(master_addr_channels, addr_crossbar_s,
+                                                         trans_done_flags, limits)):
+            if limit is None:
+                dst(src)
+                continue
+
+            pending = self._reg(f"master_{m_i:d}_pending", HBits(log2ceil(limit + 1)), def_val=0)
+            en = pending != limit
+            dst(src, exclude={src.valid, src.ready})
+            dst.valid(src.valid & en)
+            src.ready(dst.ready & en)
+
+            start = src.valid & dst.ready & en
+            SwitchLogic([
+                (start & ~done, pending(pending + 1)),
+                (~start & done, pending(pending - 1)),
+            ])
+
+    def reg_stage(self, stage_channels: FrozenSet[str], ch_name: str, hwIOs: HObjList,
+                  master_to_slave: bool, name: str) -> HObjList:
+        """
+        Optionally insert a register slice on each channel in hwIOs
+        (the same register buffer as in :class:`hwtLib.amba.axi_comp.buff.AxiBuff`)
+
+        :param stage_channels: channels which should have the register slice in this stage
+        :param ch_name: name of the channel in hwIOs
+        :param master_to_slave: if True hwIOs are the sources of the data and the register slices are appended
+            behind them, if False hwIOs are the destinations and the register slices are prepended in front of them
+        :param name: name prefix for the register slices
+        :return: the channels which should be used instead of the hwIOs
+            (the other end of the register slices or the hwIOs if this channel has no register slice)
+        """
+        if ch_name not in stage_channels:
+            return hwIOs
+
+        return HObjList(
+            Axi4SBuilder(self, hwIO, name=f"{name:s}_{i:d}", master_to_slave=master_to_slave).buff(1).end
+            for i, hwIO in enumerate(hwIOs)
+        )
+
+    @staticmethod
+    def _ack(hwIO: Axi_hs) -> RtlSignal:
+        return hwIO.valid & hwIO.ready
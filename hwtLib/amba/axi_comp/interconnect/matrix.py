@@ -29,6 +29,12 @@ class AxiInterconnectMatrix(AxiInterconnectCommon):
         on this index
     :ivar ~.AW_AND_W_WORD_TOGETHER: configures if supports AXI AW and W first word in a single clock cycle
         (if False the W first word must arrive after AW word)
+    :ivar ~.MASTER_WEIGHTS: :see: :class:`hwtLib.amba.axi_comp.interconnect.common.AxiInterconnectCommon`
+    :ivar ~.QOS_ARBITRATION: :see: :class:`hwtLib.amba.axi_comp.interconnect.common.AxiInterconnectCommon`
+    :ivar ~.MASTER_MAX_OUTSTANDING: :see: :class:`hwtLib.amba.axi_comp.interconnect.common.AxiInterconnectCommon`
+    :ivar ~.DECODE_REG_CHANNELS: :see: :class:`hwtLib.amba.axi_comp.interconnect.common.AxiInterconnectCommon`
+    :ivar ~.ARBITRATION_REG_CHANNELS: :see: :class:`hwtLib.amba.axi_comp.interconnect.common.AxiInterconnectCommon`
+    :ivar ~.DATA_MUX_REG_CHANNELS: :see: :class:`hwtLib.amba.axi_comp.interconnect.common.AxiInterconnectCommon`
 
     :note: s[x] port should be connected to a AXI master,
            m[x] port should be connected to outside AXI slave
@@ -76,6 +82,11 @@ class AxiInterconnectMatrix(AxiInterconnectCommon):
 
         sub_interconnect.MASTERS = tuple(connected_slaves_per_master)
         sub_interconnect.SLAVES = tuple(self.SLAVES[s_i] for s_i in slave_indexes)
+        for p in self.PER_MASTER_PARAMS:
+            v = getattr(self, p)
+            if v is not None:
+                v = tuple(v[m_i] for m_i in sorted(master_indexes))
+            setattr(sub_interconnect, p, v)
         if isinstance(sub_interconnect, AxiInterconnectMatrixW):
             sub_interconnect.AW_AND_W_WORD_TOGETHER = self.AW_AND_W_WORD_TOGETHER
 
@@ -93,6 +104,8 @@ class AxiInterconnectMatrix(AxiInterconnectCommon):
     @override
     def hwDeclr(self):
         BusInterconnect._normalize_config(self)
+        self._normalize_arbitration_config()
+        self._normalize_reg_stage_config()
         self.connection_groups_r = BusInterconnectUtils._extract_separable_groups(
             self.MASTERS, self.SLAVES, READ)
         self.connection_groups_w = BusInterconnectUtils._extract_separable_groups(
@@ -130,7 +143,7 @@ class AxiInterconnectMatrix(AxiInterconnectCommon):
             w_interconnects.append(inter)
             self.sub_interconnect_connections.extend(con)
 
-        with self._hwParamsShared(exclude=({"SLAVES", "MASTERS"}, set())):
+        with self._hwParamsShared(exclude=({"SLAVES", "MASTERS", *self.PER_MASTER_PARAMS}, set())):
             self.r_interconnects = r_interconnects
             self.w_interconnects = w_interconnects
 
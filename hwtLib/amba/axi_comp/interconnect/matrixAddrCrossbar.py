@@ -3,11 +3,12 @@
 
 from typing import List, Tuple
 
-from hwt.code import Concat, SwitchLogic, Or
+from hwt.code import Concat, SwitchLogic, Or, And, If, rol
 from hwt.code_utils import rename_signal
 from hwt.hObjList import HObjList
 from hwt.hdl.statements.assignmentContainer import HdlAssignmentContainer
 from hwt.hdl.transTmpl import TransTmpl
+from hwt.hdl.types.bits import HBits
 from hwt.hdl.types.defs import BIT
 from hwt.hwIOs.std import HwIODataRdVld
 from hwt.hwModule import HwModule
@@ -29,6 +30,11 @@ class AxiInterconnectMatrixAddrCrossbar(HwModule):
     Component which implements N to M crossbar for AXI address channel.
     If there are multiple masters connected to any slave the access is mannaged by round-robin.
 
+    :ivar ~.MASTER_WEIGHTS: None or tuple of weights for each master for weighted round-robin
+        (the master with priority keeps it for weight grants)
+    :ivar ~.QOS_ARBITRATION: if True only the masters with the highest QoS value of the valid transaction
+        are participating in the round-robin
+
     :ivar ~.order_s_index_for_m_data_out: handshaked interface with index of slave for each master,
         data is send on start of the transaction
     :ivar ~.order_m_index_for_s_data_out: handshaked interface with index of master for each slave,
@@ -50,11 +56,15 @@ class AxiInterconnectMatrixAddrCrossbar(HwModule):
         self.HWIO_CLS = HwParam(self.hwIOCls)
         self.SLAVES = HwParam(tuple())
         self.MASTERS = HwParam(tuple())
+        self.MASTER_WEIGHTS = HwParam(None)
+        self.QOS_ARBITRATION = HwParam(False)
         self.hwIOCls.hwConfig(self)
 
     @override
     def hwDeclr(self):
         AxiInterconnectCommon.hwDeclr(self, has_r=False, has_w=False)
+        if self.QOS_ARBITRATION:
+            assert hasattr(self.s[0], "qos"), ("QOS_ARBITRATION requires qos signal in address channel", self.hwIOCls)
         self.MASTERS_FOR_SLAVE = AxiInterconnectMatrixCrossbar._masters_for_slave(
             self.MASTERS, len(self.SLAVES))
         MASTER_INDEX_WIDTH = log2ceil(len(self.MASTERS))
@@ -138,6 +148,77 @@ class AxiInterconnectMatrixAddrCrossbar(HwModule):
 
         return SwitchLogic(dataCases, dataDefault)
 
+    def qos_filter(self, master_addr_channels, master_vld: List[RtlSignal]) -> List[RtlSignal]:
+        """
+        :return: flags for each master, 1 if there is no other valid transaction with a higher QoS value
+        """
+        res = []
+        for m_i, m_addr in enumerate(master_addr_channels):
+            res.append(And(*(
+                ~(vld & (other.qos > m_addr.qos))
+                for other_i, (other, vld) in enumerate(zip(master_addr_channels, master_vld))
+                if other_i != m_i
+            )))
+        return res
+
+    def weighted_round_robin_logic(self, name: str, master_vld: List[RtlSignal],
+                                   slv_rd: RtlSignal) -> List[RtlSignal]:
+        """
+        Same as :meth:`hwtLib.handshaked.joinFair.HsJoinFairShare.isSelectedLogic`
+        but the prioritized master keeps the priority until it gets MASTER_WEIGHTS[m_i] grants
+        or until it has no valid transaction
+
+        :return: isSelected flags for each master
+        """
+        weights = self.MASTER_WEIGHTS
+        priority = self._reg(f"{name:s}_priority", HBits(len(master_vld)), def_val=1)
+        # number of grants of the prioritized master
+        grants = self._reg(f"{name:s}_grants", HBits(log2ceil(max(weights) + 1)), def_val=0)
+
+        isSelectedFlags = []
+        for m_i in range(len(master_vld)):
+            isSelected = self._sig(f"{name:s}_isSelected_{m_i:d}")
+            isSelected(self.priorityAck(priority, master_vld, m_i))
+            isSelectedFlags.append(isSelected)
+
+        prio_vld = Or(*(priority[m_i] & vld for m_i, vld in enumerate(master_vld)))
+        prio_ack = Or(*(priority[m_i] & vld & slv_rd for m_i, vld in enumerate(master_vld)))
+        prio_last = Or(*(priority[m_i] & grants._eq(w - 1) for m_i, w in enumerate(weights)))
+        If(~prio_vld | (prio_ack & prio_last),
+           priority(rol(priority, 1)),
+           grants(0),
+        ).Elif(prio_ack,
+           grants(grants + 1),
+        )
+        return isSelectedFlags
+
+    def arbitration_logic(self, slv_i: int, master_addr_channels,
+                          master_vld: List[RtlSignal], slv_rd: RtlSignal) -> List[RtlSignal]:
+        """
+        Resolve which master can access the slave
+
+        :param master_vld: for each master flag which tells that the master has a valid transaction for this slave
+        :param slv_rd: ready of the slave
+        :return: isSelected flags for each master (the master can make a transaction if isSelected and master_vld)
+        """
+        if self.QOS_ARBITRATION and len(master_vld) > 1:
+            qos_ok = self.qos_filter(master_addr_channels, master_vld)
+            master_vld = [vld & ok for vld, ok in zip(master_vld, qos_ok)]
+        else:
+            qos_ok = None
+
+        if self.MASTER_WEIGHTS is None or len(master_vld) == 1:
+            isSelectedFlags = HsJoinFairShare.isSelectedLogic(
+                self, master_vld, slv_rd, None)
+        else:
+            isSelectedFlags = self.weighted_round_robin_logic(
+                f"slave_{slv_i:d}", master_vld, slv_rd)
+
+        if qos_ok is not None:
+            isSelectedFlags = [isSel & ok for isSel, ok in zip(isSelectedFlags, qos_ok)]
+
+        return isSelectedFlags
+
     def addr_handler_N_to_M(self, master_addr_channels, slave_addr_channels,
                             order_m_index_for_s_data_in,
                             order_s_index_for_m_data_in):
@@ -181,8 +262,11 @@ class AxiInterconnectMatrixAddrCrossbar(HwModule):
 
             # multiple masters can access the slave
             # instantiate round-robin arbiter to select master
-            isSelectedFlags = HsJoinFairShare.isSelectedLogic(
-                self, master_vld_slave, slv_addr.ready, None)
+            slv_rd = slv_addr.ready
+            if order_m_for_s is not None:
+                slv_rd = slv_rd & order_m_for_s.rd
+            isSelectedFlags = self.arbitration_logic(
+                slv_i, master_addr_channels, master_vld_slave, slv_rd)
 
             slv_valid = []
             for m_i, (en, vld) in enumerate(zip(isSelectedFlags, master_vld_slave)):
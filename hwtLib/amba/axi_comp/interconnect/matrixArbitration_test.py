@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import List, Optional, Tuple
+
+from hwt.math import log2ceil
+from hwt.simulator.simTestCase import SimTestCase
+from hwtLib.abstract.sim_ram_timing import SimRamTimingModel
+from hwtLib.amba.axi4 import Axi4
+from hwtLib.amba.axi_comp.interconnect.matrixCrossbar_test import axi_r_data_transaction
+from hwtLib.amba.axi_comp.interconnect.matrixR import AxiInterconnectMatrixR
+from hwtLib.amba.axi_comp.sim.ram import Axi4SimRam
+from hwtSimApi.constants import CLK_PERIOD
+from hwtSimApi.triggers import Timer, WaitCombStable
+
+# {test case name: {metric name: value}} filled by the tests, printed in __main__
+BENCHMARK_RESULTS = {}
+
+
+class AxiInterconnectMatrixArbitration_rr_TC(SimTestCase):
+    """
+    Benchmark of the arbitration of 2 masters which are accessing a single slave
+    (:class:`hwtLib.amba.axi_comp.sim.ram.Axi4SimRam` with a timing model).
+
+    * bandwidth share: both masters are saturating the slave with the bursts of same size,
+      the share is the ratio of the data beats of the master until the first master is finished
+    * latency: master 0 is saturating the slave with long bursts, master 1 periodically
+      issues single beat reads, the latency is the number of clock cycles from the time
+      when the request was accepted by the interconnect (ar valid & ready) to the last data beat
+
+    :cvar QOS: AxQOS value of the transactions for each master
+    :cvar EXPECTED_SHARE: (min, max) of the bandwidth share of master 0
+    :cvar MAX_CTRL_LATENCY: upper bound of the latency of master 1 transactions or None
+    """
+    MASTER_WEIGHTS = None
+    QOS_ARBITRATION = False
+    MASTER_MAX_OUTSTANDING = None
+    QOS = (0, 0)
+    EXPECTED_SHARE = (0.35, 0.65)
+    MAX_CTRL_LATENCY = None
+
+    MEM_LATENCY = 8
+    MEM_MAX_OUTSTANDING = 4
+    BULK_LEN = 8
+    BULK_CNT = 12
+    CTRL_CNT = 8
+    CTRL_PERIOD = 16
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dut = dut = AxiInterconnectMatrixR(Axi4)
+        dut.MASTERS = ({0}, {0})
+        dut.SLAVES = (
+            (0x0000, 0x1000),
+        )
+        dut.ADDR_WIDTH = log2ceil(0x1000 - 1)
+        dut.MASTER_WEIGHTS = cls.MASTER_WEIGHTS
+        dut.QOS_ARBITRATION = cls.QOS_ARBITRATION
+        dut.MASTER_MAX_OUTSTANDING = cls.MASTER_MAX_OUTSTANDING
+        cls.compileSim(dut)
+
+    def setUp(self):
+        SimTestCase.setUp(self)
+        dut = self.dut
+        self.timing_model = SimRamTimingModel(
+            latency=self.MEM_LATENCY, max_outstanding=self.MEM_MAX_OUTSTANDING)
+        self.memory = Axi4SimRam(axi=dut.m[0], timing_model=self.timing_model)
+        # for each master list of (clock cycle, last) for each received data beat
+        self.r_log = [[] for _ in dut.s]
+        # for each master list of clock cycles when the transaction was accepted on ar channel
+        self.issued = [[] for _ in dut.s]
+
+    def now(self) -> int:
+        return self.hdl_simulator.now // CLK_PERIOD
+
+    def r_monitor(self):
+        """
+        Record the clock cycle of each data beat received by masters
+        """
+        dut = self.dut
+        seen = [0 for _ in dut.s]
+        yield Timer(CLK_PERIOD // 2)
+        while True:
+            yield Timer(CLK_PERIOD)
+            now = self.now()
+            for i, s in enumerate(dut.s):
+                d = s.r._ag.data
+                for beat in list(d)[seen[i]:]:
+                    self.r_log[i].append((now, int(beat[3])))
+                seen[i] = len(d)
+
+    def ar_monitor(self):
+        """
+        Record the clock cycle of each transaction accepted on ar channel of masters
+        (the time when the transaction is put to the agent is not used because
+        the agent may not be able to send it immediately)
+        """
+        dut = self.dut
+        while True:
+            yield Timer(CLK_PERIOD)
+            # the value of the signals before the rising edge of the clk
+            yield WaitCombStable()
+            now = self.now()
+            for i, s in enumerate(dut.s):
+                vld = s.ar.valid.read()
+                rd = s.ar.ready.read()
+                if vld.vld_mask and rd.vld_mask and int(vld) and int(rd):
+                    self.issued[i].append(now)
+
+    def prepare_reads(self, master_i: int, base_addr: int, trans_cnt: int, len_: int) -> Tuple[List[int], list]:
+        """
+        :return: list of addresses of the transactions and list of expected data beats
+        """
+        m = self.memory
+        addrs = []
+        expected = []
+        for t in range(trans_cnt):
+            addr = base_addr + t * (len_ + 1) * m.cellSize
+            data = []
+            for i in range(len_ + 1):
+                d = (master_i << 16) | (t << 8) | i
+                m.data[addr // m.cellSize + i] = d
+                data.append(d)
+            addrs.append(addr)
+            expected.extend(axi_r_data_transaction(master_i, data))
+        return addrs, expected
+
+    def issue_reads(self, master_i: int, addrs: List[int], len_: int, period: int, delay: int=0):
+        ar = self.dut.s[master_i].ar._ag
+        if delay:
+            yield Timer(delay * CLK_PERIOD)
+        for addr in addrs:
+            ar.data.append(ar.create_addr_req(addr, len_, _id=master_i, qos=self.QOS[master_i]))
+            if period:
+                yield Timer(period * CLK_PERIOD)
+
+    def bandwidth_share(self) -> List[float]:
+        end = min(log[-1][0] for log in self.r_log)
+        beats = [len([b for b in log if b[0] <= end]) for log in self.r_log]
+        total = sum(beats)
+        return [b / total for b in beats]
+
+    def latencies(self, master_i: int) -> List[int]:
+        done = [t for (t, last) in self.r_log[master_i] if last]
+        return [d - i for d, i in zip(done, self.issued[master_i])]
+
+    def report(self, **metrics):
+        BENCHMARK_RESULTS.setdefault(self.__class__.__name__, {}).update(metrics)
+
+    def test_bandwidth_share(self):
+        dut = self.dut
+        expected = []
+        for m_i in range(len(dut.s)):
+            addrs, _expected = self.prepare_reads(m_i, m_i * 0x800, self.BULK_CNT, self.BULK_LEN - 1)
+            expected.append(_expected)
+            self.procs.append(self.issue_reads(m_i, addrs, self.BULK_LEN - 1, 0))
+        self.procs.append(self.r_monitor())
+
+        self.runSim((len(dut.s) * self.BULK_CNT * (self.BULK_LEN + 2) + 4 * self.MEM_LATENCY + 20) * CLK_PERIOD)
+        for s, _expected in zip(dut.s, expected):
+            self.assertValSequenceEqual(s.r._ag.data, _expected)
+
+        share = self.bandwidth_share()
+        self.report(share=share[0], bandwidth=self.timing_model.stats.bandwidth())
+        s_min, s_max = self.EXPECTED_SHARE
+        self.assertGreaterEqual(share[0], s_min)
+        self.assertLessEqual(share[0], s_max)
+
+    def test_ctrl_latency(self):
+        dut = self.dut
+        bulk_addrs, bulk_expected = self.prepare_reads(0, 0x0, self.BULK_CNT, self.BULK_LEN - 1)
+        ctrl_addrs, ctrl_expected = self.prepare_reads(1, 0x800, self.CTRL_CNT, 0)
+        self.procs.extend([
+            self.issue_reads(0, bulk_addrs, self.BULK_LEN - 1, 0),
+            self.issue_reads(1, ctrl_addrs, 0, self.CTRL_PERIOD, delay=self.MEM_LATENCY),
+            self.ar_monitor(),
+            self.r_monitor(),
+        ])
+
+        self.runSim((self.BULK_CNT * (self.BULK_LEN + 2) + self.CTRL_CNT * self.CTRL_PERIOD
+                     + 4 * self.MEM_LATENCY + 20) * CLK_PERIOD)
+        self.assertValSequenceEqual(dut.s[0].r._ag.data, bulk_expected)
+        self.assertValSequenceEqual(dut.s[1].r._ag.data, ctrl_expected)
+
+        self.assertEqual(len(self.issued[1]), self.CTRL_CNT)
+        lat = self.latencies(1)
+        self.assertEqual(len(lat), self.CTRL_CNT)
+        self.report(ctrl_latency_avg=sum(lat) / len(lat), ctrl_latency_max=max(lat))
+        if self.MAX_CTRL_LATENCY is not None:
+            self.assertLessEqual(max(lat), self.MAX_CTRL_LATENCY)
+
+
+class AxiInterconnectMatrixArbitration_weighted_TC(AxiInterconnectMatrixArbitration_rr_TC):
+    MASTER_WEIGHTS = (3, 1)
+    EXPECTED_SHARE = (0.65, 0.85)
+
+
+class AxiInterconnectMatrixArbitration_qos_TC(AxiInterconnectMatrixArbitration_rr_TC):
+    QOS_ARBITRATION = True
+    QOS = (0, 8)
+    # master 1 has the priority, master 0 gets only the transactions
+    # which were accepted before master 1 had a valid request
+    EXPECTED_SHARE = (0.0, 0.2)
+    # master 1 is not starved by master 0, its request waits only for the bursts
+    # which are already in the queue of the slave
+    MAX_CTRL_LATENCY = (AxiInterconnectMatrixArbitration_rr_TC.MEM_LATENCY
+                        + AxiInterconnectMatrixArbitration_rr_TC.MEM_MAX_OUTSTANDING
+                        * AxiInterconnectMatrixArbitration_rr_TC.BULK_LEN + 8)
+
+
+class AxiInterconnectMatrixArbitration_outstandingLimit_TC(AxiInterconnectMatrixArbitration_rr_TC):
+    # master 0 can not fill the transaction queue of the slave
+    MASTER_MAX_OUTSTANDING = (1, None)
+    MAX_CTRL_LATENCY = (AxiInterconnectMatrixArbitration_rr_TC.MEM_LATENCY
+                        + 2 * AxiInterconnectMatrixArbitration_rr_TC.BULK_LEN + 8)
+    # master 0 has to wait for the data before next request
+    EXPECTED_SHARE = (0.1, 0.5)
+
+
+AxiInterconnectMatrixArbitration_TCs = [
+    AxiInterconnectMatrixArbitration_rr_TC,
+    AxiInterconnectMatrixArbitration_weighted_TC,
+    AxiInterconnectMatrixArbitration_qos_TC,
+    AxiInterconnectMatrixArbitration_outstandingLimit_TC,
+]
+
+
+if __name__ == "__main__":
+    import unittest
+    testLoader = unittest.TestLoader()
+    # suite = unittest.TestSuite([AxiInterconnectMatrixArbitration_rr_TC("test_ctrl_latency")])
+    loadedTcs = [testLoader.loadTestsFromTestCase(tc) for tc in AxiInterconnectMatrixArbitration_TCs]
+    suite = unittest.TestSuite(loadedTcs)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
+
+    for name, metrics in BENCHMARK_RESULTS.items():
+        print(name, ", ".join(f"{k:s}={v}" for k, v in sorted(metrics.items())))
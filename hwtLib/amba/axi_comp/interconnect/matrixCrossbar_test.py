@@ -12,6 +12,18 @@ from hwtLib.amba.constants import RESP_OKAY
 from hwtSimApi.constants import CLK_PERIOD
 
 
+def axi_r_data_transaction(id_: int, data):
+    """
+    :return: list of tuples (id, data, resp, last) for AXI r channel
+    """
+    r_transactions = []
+    for is_last, d in iter_with_last(data):
+        r_transactions.append(
+            (id_, d, RESP_OKAY, int(is_last))
+        )
+    return r_transactions
+
+
 class AxiInterconnectMatrixCrossbar_1to1TC(SimTestCase):
     LEN_MAX = 4
 
@@ -23,12 +35,7 @@ class AxiInterconnectMatrixCrossbar_1to1TC(SimTestCase):
         cls.compileSim(dut)
 
     def data_transaction(self, id_, data):
-        r_transactions = []
-        for is_last, d in iter_with_last(data):
-            r_transactions.append(
-                (id_, d, RESP_OKAY, int(is_last))
-            )
-        return r_transactions
+        return axi_r_data_transaction(id_, data)
 
     def rand_transaction(self, magic, input_i, output_i, expected_outputs):
         dut = self.dut
@@ -29,6 +29,8 @@ class AxiInterconnectMatrixR(AxiInterconnectCommon):
 
     @override
     def hwDeclr(self):
+        self._normalize_arbitration_config()
+        self._normalize_reg_stage_config()
         AxiInterconnectCommon.hwDeclr(self, has_r=True, has_w=False)
         masters_for_slave = AxiInterconnectMatrixCrossbar._masters_for_slave(
             self.MASTERS, len(self.SLAVES))
@@ -75,10 +77,18 @@ class AxiInterconnectMatrixR(AxiInterconnectCommon):
         data_crossbar = self.data_crossbar
 
         master_addr_channels = HObjList([m.ar for m in self.s])
+        master_addr_channels = self.reg_stage(
+            self.DECODE_REG_CHANNELS, "ar", master_addr_channels, True, "decode_ar")
         slave_addr_channels = HObjList([s.ar for s in self.m])
-        addr_crossbar.s(master_addr_channels)
+        slave_addr_channels = self.reg_stage(
+            self.ARBITRATION_REG_CHANNELS, "ar", slave_addr_channels, False, "arbitration_ar")
+        self.connect_master_addr_channels(
+            master_addr_channels, addr_crossbar.s,
+            [self._ack(m.r) & m.r.last for m in self.s])
         slave_addr_channels(addr_crossbar.m)
         master_r_channels = HObjList([m.r for m in self.s])
+        master_r_channels = self.reg_stage(
+            self.DATA_MUX_REG_CHANNELS, "r", master_r_channels, False, "data_mux_r")
         master_r_channels(data_crossbar.dataOut)
         slave_r_channels = HObjList([s.r for s in self.m])
         data_crossbar.dataIn(slave_r_channels)
@@ -159,11 +159,29 @@ class AxiInterconnectMatrixR_3to3TC(AxiInterconnectMatrixR_1to1TC):
         cls.compileSim(dut)
 
 
+class AxiInterconnectMatrixR_2to2_regTC(AxiInterconnectMatrixR_1to1TC):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dut = dut = AxiInterconnectMatrixR(Axi4)
+        dut.MASTERS = ({0, 1}, {0, 1})
+        dut.SLAVES = (
+            (0x0000, 0x1000),
+            (0x1000, 0x1000),
+        )
+        dut.ADDR_WIDTH = log2ceil(0x4000 - 1)
+        dut.DECODE_REG_CHANNELS = {"ar"}
+        dut.ARBITRATION_REG_CHANNELS = {"ar"}
+        dut.DATA_MUX_REG_CHANNELS = {"r"}
+        cls.compileSim(dut)
+
+
 AxiInterconnectMatrixR_TCs = [
     AxiInterconnectMatrixR_1to1TC,
     AxiInterconnectMatrixR_1to3TC,
     AxiInterconnectMatrixR_3to1TC,
-    AxiInterconnectMatrixR_3to3TC
+    AxiInterconnectMatrixR_3to3TC,
+    AxiInterconnectMatrixR_2to2_regTC,
 ]
 
 if __name__ == "__main__":
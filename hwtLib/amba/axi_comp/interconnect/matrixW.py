@@ -38,6 +38,8 @@ class AxiInterconnectMatrixW(AxiInterconnectCommon):
 
     @override
     def hwDeclr(self):
+        self._normalize_arbitration_config()
+        self._normalize_reg_stage_config()
         AxiInterconnectCommon.hwDeclr(self, has_r=False, has_w=True)
         masters_for_slave = AxiInterconnectMatrixCrossbar._masters_for_slave(
             self.MASTERS, len(self.SLAVES))
@@ -107,11 +109,17 @@ class AxiInterconnectMatrixW(AxiInterconnectCommon):
         b_crossbar = self.b_crossbar
 
         master_addr_channels = HObjList([m.aw for m in self.s])
+        master_addr_channels = self.reg_stage(
+            self.DECODE_REG_CHANNELS, "aw", master_addr_channels, True, "decode_aw")
         slave_addr_channels = HObjList([s.aw for s in self.m])
+        slave_addr_channels = self.reg_stage(
+            self.ARBITRATION_REG_CHANNELS, "aw", slave_addr_channels, False, "arbitration_aw")
         if self.AW_AND_W_WORD_TOGETHER:
             slave_addr_channels = HObjList([Axi4SBuilder(self, aw, master_to_slave=False).buff(1).end for aw in slave_addr_channels])
 
-        addr_crossbar.s(master_addr_channels)
+        self.connect_master_addr_channels(
+            master_addr_channels, addr_crossbar.s,
+            [self._ack(m.b) for m in self.s])
         slave_addr_channels(addr_crossbar.m)
 
         master_w_channels = HObjList([m.w for m in self.s])
@@ -120,10 +128,13 @@ class AxiInterconnectMatrixW(AxiInterconnectCommon):
 
         data_crossbar.dataIn(master_w_channels)
         slave_w_channels = HObjList([s.w for s in self.m])
-
+        slave_w_channels = self.reg_stage(
+            self.DATA_MUX_REG_CHANNELS, "w", slave_w_channels, False, "data_mux_w")
         slave_w_channels(data_crossbar.dataOut)
 
         master_b_channels = HObjList([m.b for m in self.s])
+        master_b_channels = self.reg_stage(
+            self.DATA_MUX_REG_CHANNELS, "b", master_b_channels, False, "data_mux_b")
         master_b_channels(b_crossbar.dataOut)
         slave_b_channels = HObjList([s.b for s in self.m])
         b_crossbar.dataIn(slave_b_channels)
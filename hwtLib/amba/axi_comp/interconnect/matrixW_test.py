@@ -182,11 +182,30 @@ class AxiInterconnectMatrixW_3to3TC(AxiInterconnectMatrixW_1to1TC):
         cls.compileSim(dut)
 
 
+class AxiInterconnectMatrixW_3to3_regTC(AxiInterconnectMatrixW_1to1TC):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dut = dut = AxiInterconnectMatrixW(Axi4)
+        dut.MASTERS = ({0, 1, 2}, {0, 1, 2}, {0, 1, 2})
+        dut.SLAVES = (
+            (0x0000, 0x1000),
+            (0x1000, 0x1000),
+            (0x2000, 0x1000),
+        )
+        dut.ADDR_WIDTH = log2ceil(0x4000 - 1)
+        dut.DECODE_REG_CHANNELS = {"aw"}
+        dut.ARBITRATION_REG_CHANNELS = {"aw"}
+        dut.DATA_MUX_REG_CHANNELS = {"w", "b"}
+        cls.compileSim(dut)
+
+
 AxiInterconnectMatrixW_TCs = [
     AxiInterconnectMatrixW_1to1TC,
     AxiInterconnectMatrixW_1to3TC,
     AxiInterconnectMatrixW_3to1TC,
     AxiInterconnectMatrixW_3to3TC,
+    AxiInterconnectMatrixW_3to3_regTC,
 ]
 
 if __name__ == "__main__":
@@ -1,12 +1,13 @@
 from collections import deque
+from typing import Optional
 
 from hwt.hdl.const import HConst
 from hwt.hdl.types.bits import HBits
 from hwtLib.abstract.sim_ram import SimRam
+from hwtLib.abstract.sim_ram_timing import SimRamTimingModel
 from hwtLib.amba.constants import RESP_OKAY
 from hwtLib.amba.datapump.sim_ram import AxiDpSimRam
-from pyMathBitPrecise.bit_utils import mask, set_bit_range, get_bit, \
-    get_bit_range
+from pyMathBitPrecise.bit_utils import mask, mask_bytes
 
 
 class Axi4SimRam(AxiDpSimRam):
@@ -15,7 +16,8 @@ class Axi4SimRam(AxiDpSimRam):
     """
 
     def __init__(self, axi=None, axiAR=None, axiR=None, axiAW=None,
-                 axiW=None, axiB=None, parent=None, allow_unaligned_addr=False):
+                 axiW=None, axiB=None, parent=None, allow_unaligned_addr=False,
+                 batch_requests=False, timing_model: Optional[SimRamTimingModel]=None):
         """
         :param clk: clk which should this memory use in simulation
         :param axi: axi (Axi3/4 master) interface to listen on
@@ -26,6 +28,8 @@ class Axi4SimRam(AxiDpSimRam):
             with same memory as parent one
         :attention: memories are commiting into memory in "data" property
             after transaction is complete
+        :param batch_requests: see :class:`hwtLib.amba.datapump.sim_ram.AxiDpSimRam`
+        :param timing_model: see :class:`hwtLib.amba.datapump.sim_ram.AxiDpSimRam`
         """
         if axi is not None:
             assert axiAR is None
@@ -75,11 +79,14 @@ class Axi4SimRam(AxiDpSimRam):
         SimRam.__init__(self, DW // 8, parent=parent)
 
         self.allMask = mask(self.cellSize)
+        self.wordBitMask = mask(self.cellSize * 8)
         self.word_t = HBits(self.cellSize * 8)
 
         self.rPending = deque()
         self.wPending = deque()
         self.clk = clk
+        self._initBatchMode(batch_requests)
+        self._initTimingModel(timing_model)
         self._registerOnClock()
 
     def parseReq(self, req):
@@ -95,7 +102,7 @@ class Axi4SimRam(AxiDpSimRam):
         return (_id, addr, size, self.allMask)
 
     def add_r_ag_data(self, _id, data, isLast):
-        self.rAg.data.append((_id, data, RESP_OKAY, isLast))
+        self._pushRData((_id, data, RESP_OKAY, isLast))
 
     def doRead(self):
         _id, addr, size, _ = self.rPending.popleft()
@@ -153,30 +160,11 @@ class Axi4SimRam(AxiDpSimRam):
     def _write_single_word(self, data: HConst, strb: int, word_i: int):
         if strb == 0:
             return
-        if strb != self.allMask:
-            cur = self.data.get(word_i, None)
-            if cur is None:
-                cur_val = 0
-                cur_mask = 0
-            elif isinstance(cur, int):
-                cur_val = cur
-                cur_mask = self.allMask
-            else:
-                cur_val = cur.val
-                cur_mask = cur.vld_mask
-
-            for i in range(self.cellSize):
-                if get_bit(strb, i):
-                    cur_val = set_bit_range(
-                        cur_val, i * 8, 8, get_bit_range(data.val, i * 8, 8))
-                    cur_mask = set_bit_range(
-                        cur_mask, i * 8, 8, get_bit_range(data.vld_mask, i * 8, 8))
-            if cur_mask == self.allMask:
-                data = cur_val
-            else:
-                data = self.word_t.from_py(cur_val, cur_mask)
-        # print(f"data[{word_i:d}] = {data}")
-        self.data[word_i] = data
+        if strb == self.allMask:
+            self.data[word_i] = data
+        else:
+            # the bytes of the word which were never written are invalid
+            self.data.setMasked(word_i, data, mask_bytes(self.wordBitMask, strb, self.cellSize))
 
     def doWrite(self):
         _id, addr, size, _ = self.wPending.popleft()
@@ -207,4 +195,4 @@ class Axi4SimRam(AxiDpSimRam):
         self.doWriteAck(_id)
 
     def doWriteAck(self, _id):
-        self.wAckAg.data.append((_id, RESP_OKAY))
+        self._pushWAck((_id, RESP_OKAY))
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import List, Optional
+
+from hwt.code import If, Concat, Switch, SwitchLogic, Or
+from hwt.code_utils import rename_signal
+from hwt.hdl.const import HConst
+from hwt.hdl.types.bits import HBits
+from hwt.hdl.types.defs import BIT
+from hwt.hwIOs.std import HwIODataRdVld, HwIOSignal
+from hwt.hwIOs.utils import addClkRstn
+from hwt.hwModule import HwModule
+from hwt.hwParam import HwParam
+from hwt.math import log2ceil
+from hwt.pyUtils.typingFuture import override
+from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
+from hwt.synthesizer.vectorUtils import iterBits
+from hwtLib.amba.axi4s import Axi4Stream
+from hwtLib.commonHwIO.data_mask_last_hs import HwIODataMaskLastRdVld
+from hwtLib.logic.crcComb import CrcComb
+from hwtLib.logic.crcPoly import CRC_32
+from hwtLib.logic.crcUtils import gf2_matrix_powers, gf2_matrix_vect_mul
+
+
+class Axi4S_crc_partial():
+    """
+    Partial CRC of a continuous sequence of byte lanes
+    (the CRC of the sequence computed from zero state)
+
+    :ivar ~.c: number of valid bytes in the sequence
+        (after the last reset of the state)
+    :ivar ~.v: the partial CRC value
+    :ivar ~.r: flag which tells that the state was reset in this sequence
+        (v is then an absolute value of the state and not just a partial CRC),
+        None if it is known that the reset can not happen
+    :ivar ~.k: number of frame ends in this sequence (None if not used)
+    :ivar ~.c_max: maximum value of c (number of lanes in this sequence)
+    """
+
+    def __init__(self, c: RtlSignal, v: RtlSignal, r: Optional[RtlSignal],
+                 k: Optional[RtlSignal], c_max: int):
+        self.c = c
+        self.v = v
+        self.r = r
+        self.k = k
+        self.c_max = c_max
+
+
+class Axi4S_crc(HwModule):
+    """
+    CRC of frames on :class:`hwtLib.amba.axi4s.Axi4Stream`
+    (polynome and other CRC parameters same as for :class:`hwtLib.logic.crcComb.CrcComb`)
+
+    The CRC of each byte lane is computed in parallel from zero state,
+    the partial CRCs of the lanes are then combined in a tree
+    (in a parallel prefix network if MAX_FRAMES_PER_BEAT > 1)
+    using the CRC shift matrices (:math:`crc(a, b) = A^{len(b)} crc(a) \\oplus crc(b)`).
+    The state from previous words is applied only at the end of the pipeline.
+    The lanes which are not marked as valid by keep (or strb if keep is not used) are skipped.
+    Because of this any byte mask can be used in any word of the frame
+    (e.g. the frame may start in the middle of the word and end in the middle of the word).
+
+    :ivar ~.MAX_FRAMES_PER_BEAT: if 1 the "last" signal marks the end of the frame,
+        if > 1 the "user" signal of dataIn contains end-of-frame flag for each byte lane
+        ("last" is ignored) and up to MAX_FRAMES_PER_BEAT frames may end in a single input word,
+        the dataOut then contains MAX_FRAMES_PER_BEAT CRC slots and mask which specifies which slots are valid
+        (frames are in slots in the order of the end in input word)
+    :ivar ~.LEVELS_PER_STAGE: number of levels of the combining network between the pipeline registers,
+        0 means that the output is combinational from the input
+    :ivar ~.errorFramesOverflow: (only if MAX_FRAMES_PER_BEAT > 1) stays high when there was an input word with
+        more than MAX_FRAMES_PER_BEAT ends of frames (the CRCs of the frames over the limit were not sent)
+    :note: dataOut is skipped if there is no end of frame in input word
+
+    .. hwt-autodoc:: _example_Axi4S_crc
+    """
+
+    @override
+    def hwConfig(self):
+        Axi4Stream.hwConfig(self)
+        self.USE_KEEP = True
+        self.MAX_FRAMES_PER_BEAT = HwParam(1)
+        self.LEVELS_PER_STAGE = HwParam(2)
+        CrcComb.setConfig(self, CRC_32)
+
+    def setConfig(self, crcConfigCls):
+        """
+        Apply configuration from CRC configuration class
+        """
+        CrcComb.setConfig(self, crcConfigCls)
+
+    @override
+    def hwDeclr(self):
+        assert self.DATA_WIDTH % 8 == 0, self.DATA_WIDTH
+        assert self.MAX_FRAMES_PER_BEAT >= 1 and self.MAX_FRAMES_PER_BEAT <= self.DATA_WIDTH // 8, self.MAX_FRAMES_PER_BEAT
+        assert self.LEVELS_PER_STAGE >= 0, self.LEVELS_PER_STAGE
+        addClkRstn(self)
+        with self._hwParamsShared(exclude=({"USER_WIDTH"}, set())):
+            self.dataIn = Axi4Stream()
+
+        if self.MAX_FRAMES_PER_BEAT == 1:
+            self.dataIn.USER_WIDTH = self.USER_WIDTH
+            o = HwIODataRdVld()._m()
+            o.DATA_WIDTH = self.POLY_WIDTH
+        else:
+            self.dataIn.USER_WIDTH = self.DATA_WIDTH // 8
+            o = HwIODataMaskLastRdVld()._m()
+            o.DATA_WIDTH = self.POLY_WIDTH * self.MAX_FRAMES_PER_BEAT
+            o.MASK_GRANULARITY = self.POLY_WIDTH
+            o.USE_LAST = False
+            self.errorFramesOverflow = HwIOSignal()._m()
+        self.dataOut = o
+
+    def _gf2_mul(self, matrix: List[int], v: RtlSignal) -> RtlSignal:
+        """
+        :return: matrix * v over GF(2) (matrix in format of :func:`hwtLib.logic.crcUtils.gf2_matrix_mul`)
+        """
+        vBits = list(iterBits(v))
+        outBits = []
+        for row in matrix:
+            b = BIT.from_py(0)  # neutral value for XOR
+            for i, vb in enumerate(vBits):
+                if (row >> i) & 1:
+                    b = b ^ vb
+            outBits.append(b)
+        return Concat(*reversed(outBits))
+
+    def _crc_shift(self, name: str, v: RtlSignal, c: RtlSignal, c_max: int) -> RtlSignal:
+        """
+        :return: A^c * v, where A is a matrix for CRC of a single zero byte
+            (the effect of c bytes appended after the data of the partial CRC v)
+        """
+        if c_max == 0:
+            return v
+        if isinstance(c, HConst):
+            return self._gf2_mul(self._shiftMatrices[int(c)], v)
+
+        res = self._sig(name, v._dtype)
+        Switch(c).add_cases(
+            (i, res(self._gf2_mul(self._shiftMatrices[i], v)))
+            for i in range(1, c_max + 1)
+        ).Default(
+            res(v)
+        )
+        return res
+
+    def _rename(self, sig, name: str):
+        if sig is None or isinstance(sig, HConst):
+            return sig
+        return rename_signal(self, sig, name)
+
+    def _crc_partial_combine(self, name: str, a: Axi4S_crc_partial, b: Axi4S_crc_partial) -> Axi4S_crc_partial:
+        """
+        :return: partial CRC of the sequence a followed by b
+        """
+        v = self._crc_shift(f"{name:s}_a_shifted", a.v, b.c, b.c_max) ^ b.v
+        c = a.c + b.c
+        if b.r is None:
+            r = a.r
+        else:
+            v = b.r._ternary(b.v, v)
+            c = b.r._ternary(b.c, c)
+            r = b.r if a.r is None else a.r | b.r
+
+        k = None if a.k is None else a.k + b.k
+
+        return Axi4S_crc_partial(
+            self._rename(c, f"{name:s}_c"),
+            self._rename(v, f"{name:s}_v"),
+            self._rename(r, f"{name:s}_r"),
+            self._rename(k, f"{name:s}_k"),
+            a.c_max + b.c_max)
+
+    def _crc_apply(self, name: str, p: Axi4S_crc_partial, state: RtlSignal) -> RtlSignal:
+        """
+        :return: the CRC state after processing of the sequence described by the partial CRC
+        """
+        res = self._crc_shift(f"{name:s}_state_shifted", state, p.c, p.c_max) ^ p.v
+        if p.r is not None:
+            res = p.r._ternary(p.v, res)
+        return rename_signal(self, res, name)
+
+    def _crc_finalize(self, state: RtlSignal) -> RtlSignal:
+        if self.REFOUT:
+            state = Concat(*iterBits(state))
+        return state ^ self.XOROUT
+
+    def _pipeline_reg(self, name: str, sig: Optional[RtlSignal], en: RtlSignal) -> Optional[RtlSignal]:
+        if sig is None or isinstance(sig, HConst):
+            return sig
+        r = self._reg(name, sig._dtype)
+        If(en,
+           r(sig)
+        )
+        return r
+
+    def _pipeline_stage(self, stage_i: int, parts: List[Axi4S_crc_partial],
+                        other: List[RtlSignal], en: RtlSignal):
+        """
+        Register all signals of the stage (the data part, valid is handled separately)
+        """
+        _parts = []
+        for i, p in enumerate(parts):
+            name = f"st{stage_i:d}_p{i:d}"
+            _parts.append(Axi4S_crc_partial(
+                self._pipeline_reg(f"{name:s}_c", p.c, en),
+                self._pipeline_reg(f"{name:s}_v", p.v, en),
+                self._pipeline_reg(f"{name:s}_r", p.r, en),
+                self._pipeline_reg(f"{name:s}_k", p.k, en),
+                p.c_max,
+            ))
+        _other = [self._pipeline_reg(f"st{stage_i:d}_o{i:d}", s, en) for i, s in enumerate(other)]
+        return _parts, _other
+
+    @override
+    def hwImpl(self):
+        din = self.dataIn
+        dout = self.dataOut
+        BYTE_CNT = self.DATA_WIDTH // 8
+        MAX_FRAMES = self.MAX_FRAMES_PER_BEAT
+        MULTI_FRAME = MAX_FRAMES > 1
+
+        polyBits, PW = CrcComb.parsePoly(self.POLY, self.POLY_WIDTH)
+        crcMatrix = CrcComb.buildCrcXorMatrixMasks(8, polyBits)
+        # matrix for a single byte lane with zero state (only data part)
+        laneMatrix = [(0, dataMask) for (_, dataMask) in crcMatrix]
+        # A^i for i in 0..BYTE_CNT, A is a matrix for a single byte with zero data (only state part)
+        self._shiftMatrices = gf2_matrix_powers([stateMask for (stateMask, _) in crcMatrix], BYTE_CNT)
+
+        refin = bool(self.REFIN)
+        state_t = HBits(PW)
+        INIT = int(self.INIT)
+        # the state after the first byte after reset without data (INIT shifted by one byte)
+        INIT_SHIFTED = state_t.from_py(gf2_matrix_vect_mul(self._shiftMatrices[1], INIT))
+        INIT = state_t.from_py(INIT)
+        cnt_t = HBits(log2ceil(BYTE_CNT + 1))
+
+        if self.USE_KEEP:
+            byte_vld = din.keep
+        elif self.USE_STRB:
+            byte_vld = din.strb
+        else:
+            byte_vld = None
+
+        # stage 0 - partial CRC of each byte lane
+        parts: List[Axi4S_crc_partial] = []
+        frame_ends: List[RtlSignal] = []
+        zeroBits = [BIT.from_py(0) for _ in range(PW)]
+        for i in range(BYTE_CNT):
+            p = CrcComb.applyCrcXorMatrix(
+                laneMatrix, list(iterBits(din.data[(i + 1) * 8: i * 8])),
+                zeroBits, refin)
+            p = rename_signal(self, Concat(*reversed(p)), f"crc_lane{i:d}")
+            if byte_vld is None:
+                lane_vld = BIT.from_py(1)
+            else:
+                lane_vld = byte_vld[i]
+            c = lane_vld._ternary(cnt_t.from_py(1), cnt_t.from_py(0))
+            v = lane_vld._ternary(p, state_t.from_py(0))
+
+            if MULTI_FRAME:
+                eof = din.user[i]
+                if byte_vld is not None:
+                    eof = eof & byte_vld[i]
+                eof = rename_signal(self, eof, f"eof_lane{i:d}")
+                k = eof._ternary(cnt_t.from_py(1), cnt_t.from_py(0))
+                if i == 0:
+                    r = None
+                else:
+                    # previous lane was the end of the frame, the state is reset to INIT
+                    r = frame_ends[-1]
+                    c = r._ternary(cnt_t.from_py(0), c)
+                    v = r._ternary(lane_vld._ternary(p ^ INIT_SHIFTED, INIT), v)
+                frame_ends.append(eof)
+            else:
+                r = None
+                k = None
+
+            parts.append(Axi4S_crc_partial(
+                self._rename(c, f"lane{i:d}_c"),
+                self._rename(v, f"lane{i:d}_v"),
+                r, k, 1))
+
+        if MULTI_FRAME:
+            other = frame_ends
+        else:
+            other = [din.last]
+
+        # the pipeline uses a global stall, the valid flag is propagated with the data
+        en = self._sig("pipeline_en")
+        vld = din.vld
+        stage_i = 0
+        level_i = 0
+
+        def level_done():
+            nonlocal level_i, stage_i, parts, other, vld
+            level_i += 1
+            if self.LEVELS_PER_STAGE and level_i % self.LEVELS_PER_STAGE == 0:
+                stage_i += 1
+                parts, other = self._pipeline_stage(stage_i, parts, other, en)
+                _vld = self._reg(f"st{stage_i:d}_vld", def_val=0)
+                If(en,
+                   _vld(vld)
+                )
+                vld = _vld
+
+        if MULTI_FRAME:
+            # Kogge-Stone parallel prefix, parts[i] is partial CRC of lanes 0..i
+            d = 1
+            while d < BYTE_CNT:
+                parts = [
+                    p if i < d else self._crc_partial_combine(f"l{level_i:d}_p{i:d}", parts[i - d], p)
+                    for i, p in enumerate(parts)
+                ]
+                d *= 2
+                level_done()
+        else:
+            # reduction tree
+            while len(parts) > 1:
+                _parts = [
+                    self._crc_partial_combine(f"l{level_i:d}_p{i:d}", parts[i], parts[i + 1])
+                    for i in range(0, len(parts) - 1, 2)
+                ]
+                if len(parts) % 2:
+                    _parts.append(parts[-1])
+                parts = _parts
+                level_done()
+
+        # final stage - apply the state from previous words
+        state = self._reg("state", state_t, def_val=INIT)
+        total = parts[-1]
+        if MULTI_FRAME:
+            frame_ends = other
+            has_frame_end = rename_signal(self, Or(*frame_ends), "has_frame_end")
+            state_next = frame_ends[-1]._ternary(INIT, self._crc_apply("state_next", total, state))
+            # the first frame uses the state from previous words, the others start in this word
+            first_c = self._sig("first_c", cnt_t)
+            first_v = self._sig("first_v", state_t)
+            SwitchLogic([
+                (eof, [first_c(p.c), first_v(p.v)])
+                for eof, p in zip(frame_ends, parts)
+            ], default=[first_c(None), first_v(None)])
+            first = Axi4S_crc_partial(first_c, first_v, None, None, BYTE_CNT)
+            slots = [self._crc_finalize(self._crc_apply("slot0_state", first, state))]
+            slots_vld = [has_frame_end]
+            for slot_i in range(1, MAX_FRAMES):
+                slot = self._sig(f"slot{slot_i:d}", state_t)
+                cases = []
+                for lane_i, (eof, p) in enumerate(zip(frame_ends, parts)):
+                    if lane_i < slot_i:
+                        # not enough lanes before this lane to fill this slot
+                        continue
+                    cases.append((eof & p.k._eq(slot_i + 1), slot(self._crc_finalize(p.v))))
+                SwitchLogic(cases, default=slot(None))
+                slots.append(slot)
+                slots_vld.append(Or(*(c for c, _ in cases)))
+
+            dout.data(Concat(*reversed(slots)))
+            dout.mask(Concat(*reversed(slots_vld)))
+        else:
+            last, = other
+            has_frame_end = last
+            state_cur = self._crc_apply("state_cur", total, state)
+            state_next = last._ternary(INIT, state_cur)
+            dout.data(self._crc_finalize(state_cur))
+
+        dout.vld(vld & has_frame_end)
+        ack = rename_signal(self, vld & (~has_frame_end | dout.rd), "ack")
+        en(~vld | ack)
+        din.rd(en)
+        If(ack,
+           state(state_next)
+        )
+
+        if MULTI_FRAME:
+            errorFramesOverflow = self._reg("errorFramesOverflow", def_val=0)
+            If(ack & (total.k > MAX_FRAMES),
+               errorFramesOverflow(1)
+            )
+            self.errorFramesOverflow(errorFramesOverflow)
+
+
+def _example_Axi4S_crc():
+    m = Axi4S_crc()
+    m.DATA_WIDTH = 32
+    return m
+
+
+if __name__ == "__main__":
+    from hwt.synth import to_rtl_str
+
+    m = _example_Axi4S_crc()
+    print(to_rtl_str(m))
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from binascii import crc32
+
+from hwt.simulator.simTestCase import SimTestCase
+from hwtLib.amba.axis_comp.crc import Axi4S_crc
+from hwtSimApi.constants import CLK_PERIOD
+
+
+def bytes_to_beats(data: bytes, byte_cnt: int, offset: int=0):
+    """
+    Convert frame to a list of (data, keep, last) tuples,
+    the frame starts at byte offset in the first word
+    """
+    data = bytes(offset) + data
+    keep_all = [0 for _ in range(offset)] + [1 for _ in range(len(data) - offset)]
+    beats = []
+    for i in range(0, len(data), byte_cnt):
+        w = data[i:i + byte_cnt]
+        keep = 0
+        for b_i, k in enumerate(keep_all[i:i + byte_cnt]):
+            keep |= k << b_i
+        beats.append([int.from_bytes(w, "little"), keep, int(i + byte_cnt >= len(data))])
+    return beats
+
+
+class Axi4S_crc_TC(SimTestCase):
+    LEVELS_PER_STAGE = 2
+
+    @classmethod
+    def setUpClass(cls):
+        dut = cls.dut = Axi4S_crc()
+        dut.DATA_WIDTH = 32
+        dut.LEVELS_PER_STAGE = cls.LEVELS_PER_STAGE
+        cls.compileSim(dut)
+
+    def test_frames(self):
+        dut = self.dut
+        frames = [b"a", b"abcd", b"abcdefg", b"123456789", bytes(range(33))]
+        for i, f in enumerate(frames):
+            dut.dataIn._ag.data.extend(bytes_to_beats(f, 4, offset=i % 4))
+
+        self.runSim((sum(len(f) // 4 + 2 for f in frames) + 5) * CLK_PERIOD)
+        self.assertValSequenceEqual(dut.dataOut._ag.data, [crc32(f) for f in frames])
+
+    def test_sparse_keep(self):
+        dut = self.dut
+        dut.dataIn._ag.data.extend([
+            (int.from_bytes(b"a_b_", "little"), 0b0101, 0),
+            (int.from_bytes(b"__cd", "little"), 0b1100, 1),
+        ])
+        self.runSim(10 * CLK_PERIOD)
+        self.assertValSequenceEqual(dut.dataOut._ag.data, [crc32(b"abcd")])
+
+    def test_randomized(self):
+        dut = self.dut
+        self.randomize(dut.dataIn)
+        self.randomize(dut.dataOut)
+        frames = [bytes((i * 3 + j) & 0xff for j in range(i * 5 + 1)) for i in range(8)]
+        for i, f in enumerate(frames):
+            dut.dataIn._ag.data.extend(bytes_to_beats(f, 4, offset=i % 4))
+
+        self.runSim(4 * (sum(len(f) // 4 + 2 for f in frames) + 5) * CLK_PERIOD)
+        self.assertValSequenceEqual(dut.dataOut._ag.data, [crc32(f) for f in frames])
+
+
+class Axi4S_crc_comb_TC(Axi4S_crc_TC):
+    LEVELS_PER_STAGE = 0
+
+
+class Axi4S_crc_multiframe_TC(SimTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        dut = cls.dut = Axi4S_crc()
+        dut.DATA_WIDTH = 64
+        dut.MAX_FRAMES_PER_BEAT = 3
+        cls.compileSim(dut)
+
+    def test_multiple_frames_in_beat(self):
+        dut = self.dut
+        # (data, keep, user=end of frame flags for each byte, last)
+        dut.dataIn._ag.data.extend([
+            (int.from_bytes(b"ab12cdef", "little"), 0xff, 0b00000010, 0),
+            (int.from_bytes(b"ghXYZ_Q_", "little"), 0b01011111, 0b01010010, 1),
+        ])
+        self.runSim(10 * CLK_PERIOD)
+        self.assertSequenceEqual(self._get_slots(), [
+            [crc32(b"ab")],
+            [crc32(b"12cdefgh"), crc32(b"XYZ"), crc32(b"Q")],
+        ])
+        self.assertValEqual(self.rtl_simulator.io.errorFramesOverflow, 0)
+
+    def _get_slots(self):
+        res = []
+        for d, m in self.dut.dataOut._ag.data:
+            m = int(m)
+            res.append([int(d[(i + 1) * 32: i * 32]) for i in range(3) if (m >> i) & 1])
+        return res
+
+    def test_too_many_frames_in_beat(self):
+        dut = self.dut
+        dut.dataIn._ag.data.extend([
+            (int.from_bytes(b"abcdefgh", "little"), 0xff, 0b10101010, 0),
+            (int.from_bytes(b"12345678", "little"), 0xff, 0b10000000, 1),
+        ])
+        self.runSim(10 * CLK_PERIOD)
+        # the CRC of the 4th frame in the first word is lost and the error flag is set
+        self.assertSequenceEqual(self._get_slots(), [
+            [crc32(b"ab"), crc32(b"cd"), crc32(b"ef")],
+            [crc32(b"12345678")],
+        ])
+        self.assertValEqual(self.rtl_simulator.io.errorFramesOverflow, 1)
+
+
+if __name__ == "__main__":
+    import unittest
+    testLoader = unittest.TestLoader()
+    # suite = unittest.TestSuite([Axi4S_crc_TC("test_frames")])
+    suite = unittest.TestSuite([testLoader.loadTestsFromTestCase(tc) for tc in [
+        Axi4S_crc_TC, Axi4S_crc_comb_TC, Axi4S_crc_multiframe_TC]])
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -41,6 +41,15 @@ class Axi4S_FrameJoin(HwModule):
 
     .. figure:: ./_static/Axi4S_FrameJoin.png
 
+    :ivar ~.OUT_OFFSET: offset of the first byte of the output frame in the output word
+    :ivar ~.SEGMENT_CNT: if > 1 the output word is divided in to SEGMENT_CNT segments
+        and the next output frame may start in the first free segment behind the end of the previous frame
+        (if the first word of the next frame is already available) so the end of the frame and the start
+        of the next frame can be packed in to a single output word (e.g. 65B frames on 512b bus).
+        The "user" signal of dataOut then contains end-of-frame flag for each byte of output word
+        (same format as dataIn of :class:`hwtLib.amba.axis_comp.crc.Axi4S_crc` with MAX_FRAMES_PER_BEAT > 1),
+        "last" signal is 1 if any frame ends in the word.
+
     .. hwt-autodoc::
     """
 
@@ -55,6 +64,7 @@ class Axi4S_FrameJoin(HwModule):
         self.DATA_WIDTH = 16
         self.USE_KEEP = True
         self.OUT_OFFSET = HwParam(0)
+        self.SEGMENT_CNT = HwParam(1)
 
     @override
     def hwDeclr(self):
@@ -65,19 +75,38 @@ class Axi4S_FrameJoin(HwModule):
         input_cnt = self.input_cnt = len(t.fields)
         streams = [f.dtype for f in t.fields]
         fju = FrameAlignmentUtils(word_bytes, self.OUT_OFFSET)
-        input_B_dst = fju.resolve_input_bytes_destinations(
-            streams)
+        if self.SEGMENT_CNT > 1:
+            assert word_bytes % self.SEGMENT_CNT == 0, (word_bytes, self.SEGMENT_CNT)
+            assert self.OUT_OFFSET == 0, ("Frames have to start at the segment boundary", self.OUT_OFFSET)
+            segment_bytes = word_bytes // self.SEGMENT_CNT
+            input_B_dst, next_frame_starts = fju.resolve_input_bytes_destinations_segmented(
+                streams, segment_bytes)
+        else:
+            segment_bytes = None
+            next_frame_starts = None
+            input_B_dst = fju.resolve_input_bytes_destinations(
+                streams)
         self.state_trans_table = input_B_dst_to_fsm(
-            word_bytes, input_cnt, input_B_dst, fju.can_produce_zero_len_frame(streams))
+            word_bytes, input_cnt, input_B_dst, fju.can_produce_zero_len_frame(streams),
+            segment_bytes, next_frame_starts)
         addClkRstn(self)
-        with self._hwParamsShared():
+        with self._hwParamsShared(exclude=({"USER_WIDTH"}, set())):
             self.dataOut = Axi4Stream()._m()
+        with self._hwParamsShared():
             self.dataIn = HObjList(Axi4Stream() for _ in range(self.input_cnt))
 
+        if self.SEGMENT_CNT > 1:
+            # end of frame flag for each byte
+            self.dataOut.USER_WIDTH = word_bytes
+        else:
+            self.dataOut.USER_WIDTH = self.USER_WIDTH
+
     def generate_input_register(self, input_i: int, reg_cnt: int) -> Tuple[List[UnalignedJoinRegIntf], List[RtlSignal], RtlSignal]:
         in_reg = FrameJoinInputReg()
         in_reg._updateHwParamsFrom(self)
         in_reg.REG_CNT = reg_cnt
+        # the next frame may be loaded while the previous one is not consumed yet
+        in_reg.COLLAPSE_BUBBLES = self.SEGMENT_CNT > 1
         setattr(self, f"in_reg{input_i:d}", in_reg)
         in_reg.dataIn(self.dataIn[input_i])
         return in_reg.regs, in_reg.keep_masks, in_reg.ready
@@ -270,6 +299,14 @@ class Axi4S_FrameJoin(HwModule):
             lambda v: self.dataOut.last(v),
             lambda: self.dataOut.last(None)
         )
+        if self.SEGMENT_CNT > 1:
+            # out.user driver (end of frame flags for each byte)
+            self.generate_driver_for_state_trans_dependent_out(
+                state, state_trans, input_regs,
+                lambda stt: tuple(stt.out_last_B),
+                lambda v: self.dataOut.user(bit_list_to_int(v)),
+                lambda: self.dataOut.user(None)
+            )
         # out.valid
         self.generate_driver_for_state_trans_dependent_out(
             state, state_trans, input_regs,
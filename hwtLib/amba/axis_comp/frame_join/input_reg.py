@@ -1,3 +1,5 @@
+from typing import List
+
 from hwt.code import If
 from hwt.code_utils import rename_signal
 from hwt.hObjList import HObjList
@@ -12,6 +14,7 @@ from hwt.hwParam import HwParam
 from hwt.pyUtils.arrayQuery import iter_with_last
 from hwt.pyUtils.typingFuture import override
 from hwt.serializer.mode import serializeParamsUniq
+from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
 from hwtLib.amba.axi4s import Axi4Stream
 from pyMathBitPrecise.bit_utils import mask
 
@@ -40,12 +43,19 @@ class FrameJoinInputReg(HwModule):
     """
     Pipeline of registers for Axi4Stream with keep mask and flushing
 
+    :ivar ~.COLLAPSE_BUBBLES: if True a register loads from its predecessor if it is empty
+        or if the next register loads (the bubbles in pipeline of any length are collapsed),
+        a word moved without consumption keeps all its bytes and the relict flag is set
+        if any byte of the last word was consumed
+        (required by the segmented output of :class:`hwtLib.amba.axis_comp.frame_join._join.Axi4S_FrameJoin`)
+
     .. hwt-autodoc::
     """
 
     @override
     def hwConfig(self):
         self.REG_CNT = HwParam(2)
+        self.COLLAPSE_BUBBLES = HwParam(False)
         Axi4Stream.hwConfig(self)
         self.USE_KEEP = True
 
@@ -69,36 +79,9 @@ class FrameJoinInputReg(HwModule):
             raise NotImplementedError("It is not clear how id/user/dest"
                                       " should be managed between the frames")
 
-    @override
-    def hwImpl(self):
-        mask_t = HBits(self.DATA_WIDTH // 8, force_vector=self.DATA_WIDTH==8)
-        data_fieds = [
-            (HBits(self.DATA_WIDTH), "data"),
-            (mask_t, "keep"),  # valid= keep != 0
-            (BIT, "relict"),  # flag for partially consumed word
-            (BIT, "last"),  # flag for end of frame
-        ]
-        if self.USE_STRB:
-            data_fieds.append((mask_t, "strb"),
-)
-        data_t = HStruct(*data_fieds)
-        # regs[0] connected to output as first, regs[-1] connected to input
-        regs = [
-            self._reg(f"r{r_i:d}", data_t, def_val={"keep": 0,
-                                                    "last": 0,
-                                                    "relict": 0})
-            for r_i in range(self.REG_CNT)
-        ]
+    def _impl_shifting(self, regs: List[RtlSignal], fully_consumed_flags: List[RtlSignal]):
         ready = self.ready
         keep_masks = self.keep_masks
-        fully_consumed_flags = []
-        for i, r in enumerate(regs):
-            _fully_consumed = (r.keep & keep_masks[i])._eq(0)
-            if i == 0:
-                _fully_consumed = _fully_consumed & self.ready
-
-            fully_consumed_flags.append(rename_signal(self, _fully_consumed, f"r{i:d}_fully_consumed"))
-
         for i, (is_first_on_input_r, r) in enumerate(iter_with_last(regs)):
             keep_mask_all = mask(r.keep._dtype.bit_length())
             prev_keep_mask = self._sig(f"prev_keep_mask_{i:d}_tmp", r.keep._dtype)
@@ -176,6 +159,113 @@ class FrameJoinInputReg(HwModule):
                    r.relict(is_relict)
                 )
 
+    def _impl_collapsing(self, regs: List[RtlSignal], fully_consumed_flags: List[RtlSignal]):
+        ready = self.ready
+        keep_masks = self.keep_masks
+        # some bytes were consumed but not all of them
+        partially_consumed_flags = []
+        for i, (r, fully_consumed) in enumerate(zip(regs, fully_consumed_flags)):
+            _partially_consumed = ready & ((r.keep & ~keep_masks[i]) != 0) & ~fully_consumed
+            partially_consumed_flags.append(rename_signal(self, _partially_consumed, f"r{i:d}_partially_consumed"))
+
+        is_empty_flags = [
+            rename_signal(self, r.keep._eq(0) & ~(r.last & r.relict), f"r{i:d}_is_empty")
+            for i, r in enumerate(regs)
+        ]
+        # the register loads the value from the previous register (or dataIn)
+        # if it is empty or if its value is moved to the next register
+        # (the bubbles in pipeline are collapsed)
+        load_flags = []
+        for i, is_empty in enumerate(is_empty_flags):
+            if i == 0:
+                _load = fully_consumed_flags[0] | is_empty
+            else:
+                _load = load_flags[i - 1] | is_empty
+            load_flags.append(rename_signal(self, _load, f"r{i:d}_load"))
+
+        for i, (is_first_on_input_r, r) in enumerate(iter_with_last(regs)):
+            keep_mask_all = mask(r.keep._dtype.bit_length())
+            prev_keep_mask = self._sig(f"prev_keep_mask_{i:d}_tmp", r.keep._dtype)
+            prev_last_mask = self._sig(f"prev_last_mask_{i:d}_tmp")
+            is_empty = is_empty_flags[i]
+
+            if is_first_on_input_r:
+                # is register connected directly to dataIn
+                r_prev = self.dataIn
+                If(r_prev.valid,
+                   prev_keep_mask(keep_mask_all),
+                   prev_last_mask(1)
+                ).Else(
+                   # flush (invalid input but the data can be dispersed
+                   # in registers so we need to collapse it)
+                   prev_keep_mask(0),
+                   prev_last_mask(0),
+                )
+                r_prev.ready(load_flags[i])
+                is_relict = r_prev.valid & r_prev.keep._eq(0)
+            else:
+                r_prev = regs[i + 1]
+                prev_last_mask(1)
+                If(is_empty | ~ready,
+                   # flush or shift without consumption
+                   prev_keep_mask(keep_mask_all),
+                ).Else(
+                   prev_keep_mask(keep_masks[i + 1]),
+                )
+                # became relict if only a part of the word was consumed
+                is_relict = r_prev.relict | (r_prev.last & partially_consumed_flags[i + 1])
+
+            data_drive = [r.data(r_prev.data), ]
+            if self.USE_STRB:
+                data_drive.append(r.strb(r_prev.strb))
+
+            load = If(load_flags[i],
+               *data_drive,
+               r.keep(r_prev.keep & prev_keep_mask),
+               r.last(r_prev.last & prev_last_mask),
+               r.relict(is_relict)
+            )
+            if i == 0:
+                # last register in path
+                load.Elif(ready,
+                   r.keep(r.keep & keep_masks[i]),
+                   r.relict(1),  # became relict if there is some 1 in keep (== not fully consumed)
+                )
+
+    @override
+    def hwImpl(self):
+        mask_t = HBits(self.DATA_WIDTH // 8, force_vector=self.DATA_WIDTH==8)
+        data_fieds = [
+            (HBits(self.DATA_WIDTH), "data"),
+            (mask_t, "keep"),  # valid= keep != 0
+            (BIT, "relict"),  # flag for partially consumed word
+            (BIT, "last"),  # flag for end of frame
+        ]
+        if self.USE_STRB:
+            data_fieds.append((mask_t, "strb"),
+)
+        data_t = HStruct(*data_fieds)
+        # regs[0] connected to output as first, regs[-1] connected to input
+        regs = [
+            self._reg(f"r{r_i:d}", data_t, def_val={"keep": 0,
+                                                    "last": 0,
+                                                    "relict": 0})
+            for r_i in range(self.REG_CNT)
+        ]
+        keep_masks = self.keep_masks
+        fully_consumed_flags = []
+        for i, r in enumerate(regs):
+            _fully_consumed = (r.keep & keep_masks[i])._eq(0)
+            if i == 0:
+                _fully_consumed = _fully_consumed & self.ready
+
+            fully_consumed_flags.append(rename_signal(self, _fully_consumed, f"r{i:d}_fully_consumed"))
+
+        if self.COLLAPSE_BUBBLES:
+            self._impl_collapsing(regs, fully_consumed_flags)
+        else:
+            self._impl_shifting(regs, fully_consumed_flags)
+
         for rout, rin in zip(self.regs, regs):
             rout.data(rin.data)
             if self.USE_STRB:
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from hwt.simulator.simTestCase import SimTestCase
+from hwtLib.amba.axis_comp.frame_join.input_reg import FrameJoinInputReg
+from hwtSimApi.constants import CLK_PERIOD
+from hwtSimApi.triggers import Timer, WaitWriteOnly, WaitCombRead
+
+
+class FrameJoinInputReg_3reg_TC(SimTestCase):
+    """
+    Test of pipeline of more than 2 registers with COLLAPSE_BUBBLES
+    (bubble collapse without consumption, order of the words)
+    """
+    REG_CNT = 3
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dut = dut = FrameJoinInputReg()
+        dut.DATA_WIDTH = 16
+        dut.REG_CNT = cls.REG_CNT
+        dut.COLLAPSE_BUBBLES = True
+        cls.compileSim(dut)
+
+    def runSim(self, ready, keep_masks, until):
+        """
+        :param ready: constant value of ready signal
+        :param keep_masks: constant values of keep_masks signals
+        :return: list of (data, keep, relict, last) for each register for each clock cycle
+        """
+        dut = self.dut
+        dut.ready._ag = None
+        for km in dut.keep_masks:
+            km._ag = None
+
+        def driver():
+            yield WaitWriteOnly()
+            dut.ready.write(ready)
+            for km, v in zip(dut.keep_masks, keep_masks):
+                km.write(v)
+
+        collected = []
+
+        def collector():
+            yield Timer(CLK_PERIOD + 1)
+            while True:
+                yield WaitCombRead()
+                collected.append([
+                    (r.data.read(), r.keep.read(), r.relict.read(), r.last.read())
+                    for r in dut.regs
+                ])
+                yield Timer(CLK_PERIOD)
+
+        self.procs.extend([driver(), collector()])
+        super(FrameJoinInputReg_3reg_TC, self).runSim(until)
+        return collected
+
+    def test_fill_without_consumption(self):
+        dut = self.dut
+        # (data, keep, last)
+        dut.dataIn._ag.data.extend([
+            (0x0201, 0b11, 0),
+            (0x0403, 0b11, 0),
+            (0x0605, 0b11, 1),
+            (0x0807, 0b11, 1),
+        ])
+        # nothing is consumed, the words have to stay in the registers
+        # in the original order and the last word has to stay in the input
+        regs = self.runSim(0, [0, 0, 0], 12 * CLK_PERIOD)
+        self.assertValSequenceEqual(regs[-1], [
+            (0x0201, 0b11, 0, 0),
+            (0x0403, 0b11, 0, 0),
+            (0x0605, 0b11, 0, 1),
+        ])
+        self.assertValSequenceEqual(dut.dataIn._ag.data, [(0x0807, 0b11, 1)])
+
+    def test_pass_data(self):
+        dut = self.dut
+        ref = [
+            (0x0201, 0b11, 0),
+            (0x0403, 0b11, 0),
+            (0x0605, 0b11, 1),
+            (0x0807, 0b11, 1),
+        ]
+        dut.dataIn._ag.data.extend(ref)
+        # the word in regs[0] is consumed in every clock cycle
+        # the others are not consumed
+        regs = self.runSim(1, [0, 0b11, 0b11], 12 * CLK_PERIOD)
+        out = [(data, keep, last)
+               for ((data, keep, _, last), _, _) in regs
+               if keep.vld_mask and int(keep)]
+        self.assertValSequenceEqual(out, ref)
+        self.assertEmpty(dut.dataIn._ag.data)
+
+
+FrameJoinInputReg_TCs = [
+    FrameJoinInputReg_3reg_TC,
+]
+
+if __name__ == '__main__':
+    testLoader = unittest.TestLoader()
+    # suite = unittest.TestSuite([FrameJoinInputReg_3reg_TC("test_fill_without_consumption")])
+    loadedTcs = [testLoader.loadTestsFromTestCase(tc) for tc in FrameJoinInputReg_TCs]
+    suite = unittest.TestSuite(loadedTcs)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
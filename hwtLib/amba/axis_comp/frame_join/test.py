@@ -15,6 +15,7 @@ from hwtSimApi.constants import CLK_PERIOD
 
 class Axi4S_FrameJoin_1x_1B_TC(SimTestCase):
     D_B = 1
+    SEGMENT_CNT = 1
     T = HStruct(
         (HStream(HBits(8 * D_B), (1, inf), [0]), "frame0"),
     )
@@ -24,13 +25,54 @@ class Axi4S_FrameJoin_1x_1B_TC(SimTestCase):
         dut = cls.dut = Axi4S_FrameJoin()
         dut.T = cls.T
         dut.DATA_WIDTH = cls.D_W = cls.D_B * 8
+        dut.SEGMENT_CNT = cls.SEGMENT_CNT
         cls.compileSim(dut)
 
     def send(self, input_i, data_B, offset):
         axi4s_send_bytes(self.dut.dataIn[input_i], data_B, offset=offset)
 
     def recive(self):
-        return axi4s_recieve_bytes(self.dut.dataOut)
+        if self.SEGMENT_CNT == 1:
+            return axi4s_recieve_bytes(self.dut.dataOut)
+        else:
+            return self.recive_segmented()
+
+    def recive_segmented(self):
+        """
+        Pop a single frame from dataOut agent if the output frames may share the output word,
+        the end of frame is marked by user bit for the last byte and the next frame
+        may start in the same word on the segment boundary
+
+        :return: tuple (offset in segment, frame data)
+        """
+        ag_data = self.dut.dataOut._ag.data
+        seg_B = self.D_B // self.SEGMENT_CNT
+        # index of the first byte of the word which was not consumed yet
+        B_i = getattr(self, "_recive_B_i", 0)
+        offset = None
+        frame = []
+        while True:
+            data, keep, user, last = ag_data[0]
+            keep = int(keep)
+            user = int(user)
+            for B_i in range(B_i, self.D_B):
+                if (keep >> B_i) & 1:
+                    if offset is None:
+                        offset = B_i % seg_B
+                    frame.append(int(data[(B_i + 1) * 8:B_i * 8]))
+                if (user >> B_i) & 1:
+                    self.assertEqual(int(last), 1)
+                    B_i += 1
+                    if keep >> B_i == 0:
+                        # there is not a start of the next frame in this word
+                        ag_data.popleft()
+                        B_i = 0
+                    self._recive_B_i = B_i
+                    return offset, frame
+
+            self.assertEqual(user, 0)
+            ag_data.popleft()
+            B_i = 0
 
     def randomize_all(self):
         for din in self.dut.dataIn:
@@ -62,7 +104,7 @@ class Axi4S_FrameJoin_1x_1B_TC(SimTestCase):
         self.runSim(CLK_PERIOD * (
             len(IN_FRAMES) * len(OUT_FRAMES[0]) * 20 + 100))
         for (ref_offset, ref_frame) in OUT_FRAMES:
-            offset, frame = axi4s_recieve_bytes(self.dut.dataOut)
+            offset, frame = self.recive()
 
             self.assertEqual(offset, ref_offset)
             self.assertSequenceEqual(frame, ref_frame)
@@ -335,6 +377,76 @@ class Axi4S_FrameJoin_3x_in_1B_on_5B_TC(Axi4S_FrameJoin_1x_1B_TC):
     )
 
 
+class Axi4S_FrameJoin_1x_1B_on_4B_2seg_TC(Axi4S_FrameJoin_1x_1B_TC):
+    D_B = 4
+    SEGMENT_CNT = 2
+    T = HStruct(
+        (HStream(HBits(8 * 1), (1, inf), [0]), "frame0"),
+    )
+
+    def test_frame_packing(self, N=16):
+        # frames of min size which should be packed 2 in to a single output word
+        seg_B = self.D_B // self.SEGMENT_CNT
+        frame_size = sum(f.dtype.element_t.bit_length() // 8 * f.dtype.len_min for f in self.T.fields)
+        frame_segs = (frame_size + seg_B - 1) // seg_B
+        self.assertLessEqual(2 * frame_segs, self.SEGMENT_CNT)
+
+        IN_FRAMES = [[] for _ in self.dut.dataIn]
+        data_cntr = 0
+        for _ in range(N):
+            for f, frames in zip(self.T.fields, IN_FRAMES):
+                size = f.dtype.element_t.bit_length() // 8 * f.dtype.len_min
+                frames.append((0, self.gen_data(data_cntr, size)))
+                data_cntr += size
+
+        for i, frames in enumerate(IN_FRAMES):
+            for f_offset, frame in frames:
+                self.send(i, frame, offset=f_offset)
+
+        self.runSim(CLK_PERIOD * (N * 2 + 20))
+        self.assertEqual(len(self.dut.dataOut._ag.data), N // 2)
+        data_cntr = 0
+        for _ in range(N):
+            offset, frame = self.recive()
+            self.assertEqual(offset, 0)
+            self.assertSequenceEqual(frame, self.gen_data(data_cntr, frame_size))
+            data_cntr += frame_size
+        self.assertEmpty(self.dut.dataOut._ag.data)
+
+
+class Axi4S_FrameJoin_1x_2B_on_4B_2seg_TC(Axi4S_FrameJoin_1x_1B_on_4B_2seg_TC):
+    D_B = 4
+    SEGMENT_CNT = 2
+    T = HStruct(
+        (HStream(HBits(8 * 2), (1, inf), [0]), "frame0"),
+    )
+
+
+class Axi4S_FrameJoin_1x_1B_on_4B_4seg_TC(Axi4S_FrameJoin_1x_1B_on_4B_2seg_TC):
+    D_B = 4
+    SEGMENT_CNT = 4
+    T = HStruct(
+        (HStream(HBits(8 * 1), (1, inf), [0]), "frame0"),
+    )
+
+
+class Axi4S_FrameJoin_1x_4B_on_8B_2seg_TC(Axi4S_FrameJoin_1x_1B_on_4B_2seg_TC):
+    D_B = 8
+    SEGMENT_CNT = 2
+    T = HStruct(
+        (HStream(HBits(8 * 4), (1, 4), [0]), "frame0"),
+    )
+
+
+class Axi4S_FrameJoin_2x_1B_on_4B_2seg_TC(Axi4S_FrameJoin_1x_1B_on_4B_2seg_TC):
+    D_B = 4
+    SEGMENT_CNT = 2
+    T = HStruct(
+        (HStream(HBits(8 * 1), (1, 3), [0]), "frame0"),
+        (HStream(HBits(8 * 1), (1, 1), [0]), "frame1"),
+    )
+
+
 Axi4S_FrameJoin_TCs = [
    Axi4S_FrameJoin_1x_1B_TC,
    Axi4S_FrameJoin_2x_1B_TC,
@@ -362,6 +474,11 @@ Axi4S_FrameJoin_TCs = [
    Axi4S_FrameJoin_3x_in_2B_TC,
    Axi4S_FrameJoin_3x_in_1B_on_2B_TC,
    Axi4S_FrameJoin_3x_in_1B_on_5B_TC,
+   Axi4S_FrameJoin_1x_1B_on_4B_2seg_TC,
+   Axi4S_FrameJoin_1x_2B_on_4B_2seg_TC,
+   Axi4S_FrameJoin_1x_1B_on_4B_4seg_TC,
+   Axi4S_FrameJoin_1x_4B_on_8B_2seg_TC,
+   Axi4S_FrameJoin_2x_1B_on_4B_2seg_TC,
 ]
 
 if __name__ == "__main__":
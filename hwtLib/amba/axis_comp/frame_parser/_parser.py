@@ -87,6 +87,8 @@ class Axi4S_frameParser(Axi4SCompBase, TemplateConfigured):
     .. figure:: ./_static/Axi4S_frameParser.png
 
     :note: names in the figure are just illustrative
+    :see: :class:`hwtLib.amba.axis_comp.frame_parser.header_parser.Axi4S_frameHeaderParser`
+        for a constant size header which is needed as a whole and a payload which should be passed through
 
     :ivar ~.dataIn: the Axi4Stream interface for input frame
     :ivar ~.dataOut: output field interface generated from input type description
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the elaboration time of :class:`~.Axi4S_frameParser` and :class:`~.Axi4S_frameDeparser`
+for the types used in the tests and some larger types.
+
+Each configuration is elaborated multiple times. The first "cold" run has to resolve
+the frame templates (TransTmpl, FrameTmpl, words), the next "warm" runs reuse
+the templates from the cache in :mod:`hwtLib.abstract.template_configured`.
+
+usage: python3 -m hwtLib.amba.axis_comp.frame_parser.elaboration_benchmark [REPETITIONS]
+"""
+
+import sys
+from time import perf_counter
+from typing import Callable, List, Tuple
+
+from hwt.hdl.types.hdlType import HdlType
+from hwt.hdl.types.struct import HStruct
+from hwt.hwModule import HwModule
+from hwt.synth import synthesised
+from hwtLib.abstract.template_configured import clear_frame_template_cache
+from hwtLib.amba.axis_comp.frame_deparser import Axi4S_frameDeparser
+from hwtLib.amba.axis_comp.frame_deparser.test_types import s1field, s3field, \
+    s2Pading, s1field_composit0, unionOfStructs, unionSimple
+from hwtLib.amba.axis_comp.frame_parser import Axi4S_frameParser
+from hwtLib.amba.axis_comp.frame_parser.test_types import structManyInts
+from hwtLib.types.net.dpdk import rte_mbuf
+from hwtLib.types.net.ethernet import Eth2Header_t
+from hwtLib.types.net.ip import IPv4Header_t
+from hwtLib.types.net.tcp import TCP_header_t
+
+Eth_IPv4_TCP_header_t = HStruct(
+    (Eth2Header_t, "eth"),
+    (IPv4Header_t, "ipv4"),
+    (TCP_header_t, "tcp"),
+    name="Eth_IPv4_TCP_header_t"
+)
+
+BENCHMARK_TYPES: List[Tuple[str, HdlType]] = [
+    ("structManyInts", structManyInts),
+    ("s1field", s1field),
+    ("s3field", s3field),
+    ("s2Pading", s2Pading),
+    ("s1field_composit0", s1field_composit0),
+    ("unionOfStructs", unionOfStructs),
+    ("unionSimple", unionSimple),
+    ("rte_mbuf", rte_mbuf),
+    ("Eth_IPv4_TCP_header_t", Eth_IPv4_TCP_header_t),
+]
+BENCHMARK_DATA_WIDTHS = [32, 64, 512]
+
+
+def _mk_parser(t: HdlType, DW: int):
+    m = Axi4S_frameParser(t)
+    m.DATA_WIDTH = DW
+    return m
+
+
+def _mk_deparser(t: HdlType, DW: int):
+    m = Axi4S_frameDeparser(t)
+    m.DATA_WIDTH = DW
+    return m
+
+
+def time_elaboration(mk_component: Callable[[], HwModule]) -> float:
+    """
+    :return: time in seconds spend in the elaboration of the component
+    """
+    m = mk_component()
+    start = perf_counter()
+    synthesised(m)
+    return perf_counter() - start
+
+
+def run_benchmark(repetitions: int=3):
+    """
+    :return: list of tuples (component name, type name, DATA_WIDTH, cold time, average warm time)
+    """
+    res = []
+    for c_name, mk_component in [("Axi4S_frameParser", _mk_parser),
+                                 ("Axi4S_frameDeparser", _mk_deparser)]:
+        for t_name, t in BENCHMARK_TYPES:
+            for DW in BENCHMARK_DATA_WIDTHS:
+                clear_frame_template_cache()
+                mk = lambda: mk_component(t, DW)
+                cold = time_elaboration(mk)
+                warm = [time_elaboration(mk) for _ in range(repetitions)]
+                res.append((c_name, t_name, DW, cold, sum(warm) / len(warm)))
+    clear_frame_template_cache()
+    return res
+
+
+if __name__ == "__main__":
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    total_cold = 0.0
+    total_warm = 0.0
+    print(f"{'component':20s} {'type':22s} {'DW':>4s} {'cold [ms]':>10s} {'warm [ms]':>10s}")
+    for c_name, t_name, DW, cold, warm in run_benchmark(repetitions):
+        total_cold += cold
+        total_warm += warm
+        print(f"{c_name:20s} {t_name:22s} {DW:4d} {cold * 1e3:10.1f} {warm * 1e3:10.1f}")
+    print(f"{'total':20s} {'':22s} {'':4s} {total_cold * 1e3:10.1f} {total_warm * 1e3:10.1f}")
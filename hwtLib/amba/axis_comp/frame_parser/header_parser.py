@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from math import ceil
+from typing import Optional
+
+from hwt.code import If, Concat
+from hwt.code_utils import rename_signal
+from hwt.hdl.types.bits import HBits
+from hwt.hdl.types.struct import HStruct
+from hwt.hwIOs.hwIOStruct import HwIOStructRdVld, HwIOStruct
+from hwt.hwIOs.utils import addClkRstn, propagateClkRstn
+from hwt.hwModule import HwModule
+from hwt.hwParam import HwParam
+from hwt.math import log2ceil
+from hwt.pyUtils.typingFuture import override
+from hwt.serializer.mode import serializeParamsUniq
+from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
+from hwtLib.amba.axis_comp.base import Axi4SCompBase
+from hwtLib.amba.axis_comp.fifo import Axi4SFifo
+from hwtLib.amba.axis_comp.reg import Axi4SReg
+from hwtLib.handshaked.fifo import HandshakedFifo
+from hwtLib.handshaked.reg import HandshakedReg
+from hwtLib.handshaked.streamNode import StreamNode
+from hwtLib.types.net.ethernet import Eth2Header_t
+from hwtLib.types.net.ip import IPv4Header_t
+from pyMathBitPrecise.bit_utils import mask
+
+
+def connect_struct_bits(bits: RtlSignal, dst: HwIOStruct, T: HStruct, offset: int=0):
+    """
+    Connect the fields of the struct interface to a bit slices of a flat little-endian bit vector
+
+    :return: offset behind the struct
+    """
+    for f in T.fields:
+        w = f.dtype.bit_length()
+        if f.name is not None:
+            if isinstance(f.dtype, HStruct):
+                connect_struct_bits(bits, getattr(dst, f.name), f.dtype, offset)
+            elif isinstance(f.dtype, HBits):
+                if w == 1 and not f.dtype.force_vector:
+                    v = bits[offset]
+                else:
+                    v = bits[offset + w:offset]
+                if v._dtype != f.dtype:
+                    v = v._reinterpret_cast(f.dtype)
+                getattr(dst, f.name)(v)
+            else:
+                raise NotImplementedError(f.dtype)
+        offset += w
+
+    return offset
+
+
+@serializeParamsUniq
+class Axi4S_frameHeaderParser(Axi4SCompBase):
+    """
+    Parse a constant size header from the beginning of the frame and output
+    all header fields at once on a single wide registered interface with a single valid/ready.
+    The rest of the frame (payload) is passed to payloadOut.
+
+    Unlike :class:`hwtLib.amba.axis_comp.frame_parser._parser.Axi4S_frameParser`
+    there is not an interface for each field and the fields do not need to be synchronized,
+    the header is just a snapshot of the header words. Both outputs have its own buffer
+    (skid buffer by default) so a slow consumer of one output does not stall
+    the input until the buffer is full and the ready signal of the outputs does not have
+    a combinational path to dataIn.ready.
+
+    .. code-block:: python
+
+        HStruct(
+            (T, "dataOut"),
+            (HStream(uint8_t, frame_len=(0, inf)), "payloadOut"),
+        )
+
+    :note: There is not any inter-frame delay, if the header fits in to a single word
+        the throughput is 1 frame per clock cycle.
+    :note: The payload is not realigned, the header bytes in the first payload word
+        have keep/strb set to 0. If the frame contains only the header,
+        a 0B frame (keep/strb=0, last=1) is send on payloadOut so there is always
+        exactly one payload frame for each header.
+    :note: Frames shorter than the header are discarded.
+
+    :ivar ~.T: HStruct type of the header (constant size, size has to be a multiple of 8b)
+    :ivar ~.HEADER_BUFF_DEPTH: number of items in the buffer of dataOut
+        (0 - no buffer, 1 - register, 2 - skid buffer, >2 - FIFO)
+    :ivar ~.PAYLOAD_BUFF_DEPTH: same as HEADER_BUFF_DEPTH for payloadOut
+
+    .. hwt-autodoc:: _example_Axi4S_frameHeaderParser
+    """
+
+    def __init__(self, structT: HStruct, hdlName:Optional[str]=None):
+        self._structT = structT
+        Axi4SCompBase.__init__(self, hdlName=hdlName)
+
+    @override
+    def hwConfig(self):
+        Axi4SCompBase.hwConfig(self)
+        self.T = HwParam(self._structT)
+        self.HEADER_BUFF_DEPTH = HwParam(2)
+        self.PAYLOAD_BUFF_DEPTH = HwParam(2)
+
+    @staticmethod
+    def _mk_buff(depth: int, regCls, fifoCls, hwIOCls) -> Optional[HwModule]:
+        if depth == 0:
+            return None
+        elif depth <= 2:
+            b = regCls(hwIOCls)
+            # LATENCY=(1, 2) is the ready chain break (skid buffer)
+            b.LATENCY = 1 if depth == 1 else (1, 2)
+        else:
+            b = fifoCls(hwIOCls)
+            b.DEPTH = depth
+        return b
+
+    @override
+    def hwDeclr(self):
+        if self.ID_WIDTH or self.DEST_WIDTH:
+            raise NotImplementedError("Header parsing of interleaved frames")
+        assert self.USE_KEEP or self.USE_STRB, (
+            "keep/strb is required to mark the payload bytes in the header word")
+        HW = self.T.bit_length()
+        assert HW > 0 and HW % 8 == 0, ("Header has to have the size of whole bytes", self.T, HW)
+
+        addClkRstn(self)
+        with self._hwParamsShared():
+            self.dataIn = self.hwIOCls()
+            self.payloadOut = self.hwIOCls()._m()
+
+        o = self.dataOut = HwIOStructRdVld()._m()
+        o.T = self.T
+
+        hb = self._mk_buff(self.HEADER_BUFF_DEPTH, HandshakedReg, HandshakedFifo, HwIOStructRdVld)
+        if hb is not None:
+            hb.T = self.T
+            self.header_buff = hb
+
+        with self._hwParamsShared():
+            pb = self._mk_buff(self.PAYLOAD_BUFF_DEPTH, Axi4SReg, Axi4SFifo, self.hwIOCls)
+            if pb is not None:
+                self.payload_buff = pb
+
+    @override
+    def hwImpl(self):
+        propagateClkRstn(self)
+        din = self.dataIn
+        DW = self.DATA_WIDTH
+        D_B = DW // 8
+        HW = self.T.bit_length()
+        HDR_WORDS = ceil(HW / DW)
+        # index of the last word which contains some header bytes
+        L = HDR_WORDS - 1
+        # number of header bytes in the last header word
+        HDR_LAST_B = (HW - L * DW) // 8
+
+        if self.HEADER_BUFF_DEPTH:
+            hdr_out = self.header_buff.dataIn
+            self.dataOut(self.header_buff.dataOut)
+        else:
+            hdr_out = self.dataOut
+
+        if self.PAYLOAD_BUFF_DEPTH:
+            payload = self.payload_buff.dataIn
+            self.payloadOut(self.payload_buff.dataOut)
+        else:
+            payload = self.payloadOut
+
+        in_mask = din.keep if self.USE_KEEP else din.strb
+        # L + 1 means that all header words were already consumed
+        wordIndex = self._reg("wordIndex", HBits(log2ceil(L + 2)), def_val=0)
+        isHdrLast = rename_signal(self, wordIndex._eq(L), "isHdrLast")
+        isPayloadOnly = rename_signal(self, wordIndex._eq(L + 1), "isPayloadOnly")
+        # the frame is not shorter than the header
+        # (the mask is expected to be contiguous so it is enough to check the last header byte)
+        hdrComplete = ~din.last | in_mask[HDR_LAST_B - 1]
+        # bytes behind the header in the last header word
+        hdrLastPayloadMask = in_mask._dtype.from_py(mask(D_B) & ~mask(HDR_LAST_B))
+        hdrLastHasPayload = (in_mask & hdrLastPayloadMask) != 0
+
+        hdrEn = rename_signal(self, isHdrLast & hdrComplete, "hdrEn")
+        payloadEn = rename_signal(self, isPayloadOnly | (hdrEn & (hdrLastHasPayload | din.last)), "payloadEn")
+        StreamNode(
+            [din], [hdr_out, payload],
+            extraConds={hdr_out: hdrEn, payload: payloadEn},
+            skipWhen={hdr_out: ~hdrEn, payload: ~payloadEn},
+        ).sync()
+        din_ack = rename_signal(self, din.valid & din.ready, "din_ack")
+
+        If(din_ack,
+           If(din.last,
+              wordIndex(0)
+           ).Elif(~isPayloadOnly,
+              wordIndex(wordIndex + 1)
+           )
+        )
+
+        # snapshot of the header words, the last one is taken directly from dataIn
+        hdr_words = []
+        for i in range(L):
+            r = self._reg(f"header_w{i:d}", din.data._dtype)
+            If(din_ack & wordIndex._eq(i),
+               r(din.data)
+            )
+            hdr_words.append(r)
+        hdr_words.append(din.data[HDR_LAST_B * 8:0])
+        hdr = rename_signal(self, Concat(*reversed(hdr_words)), "header")
+        connect_struct_bits(hdr, hdr_out.data, self.T)
+
+        mask_names = [n for n, en in (("keep", self.USE_KEEP), ("strb", self.USE_STRB)) if en]
+        payload(din, exclude=[din.valid, din.ready, *(getattr(din, n) for n in mask_names)])
+        for n in mask_names:
+            in_m = getattr(din, n)
+            out_m = getattr(payload, n)
+            If(isPayloadOnly,
+               out_m(in_m)
+            ).Else(
+               out_m(in_m & hdrLastPayloadMask)
+            )
+
+
+def _example_Axi4S_frameHeaderParser():
+    T = HStruct(
+        (Eth2Header_t, "eth"),
+        (IPv4Header_t, "ipv4"),
+    )
+    m = Axi4S_frameHeaderParser(T)
+    m.DATA_WIDTH = 512
+    m.USE_KEEP = True
+    return m
+
+
+if __name__ == "__main__":
+    from hwt.synth import to_rtl_str
+    m = _example_Axi4S_frameHeaderParser()
+    print(to_rtl_str(m))
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from hwt.hdl.types.struct import HStruct
+from hwt.simulator.simTestCase import SimTestCase
+from hwtLib.amba.axi4s import axi4s_send_bytes, axi4s_recieve_bytes
+from hwtLib.amba.axis_comp.frame_parser.header_parser import Axi4S_frameHeaderParser
+from hwtLib.types.net.ethernet import Eth2Header_t
+from hwtLib.types.net.ip import IPv4Header_t
+from hwtSimApi.constants import CLK_PERIOD
+from pyMathBitPrecise.bit_utils import get_bit_range
+
+
+def struct_from_bytes(T: HStruct, data: bytes):
+    """
+    :return: tuple of field values (nested tuple for nested structs)
+    """
+    v = int.from_bytes(data, "little")
+
+    def _get(T: HStruct, offset: int):
+        res = []
+        for f in T.fields:
+            w = f.dtype.bit_length()
+            if f.name is not None:
+                if isinstance(f.dtype, HStruct):
+                    res.append(_get(f.dtype, offset))
+                else:
+                    res.append(get_bit_range(v, offset, w))
+            offset += w
+        return tuple(res)
+
+    return _get(T, 0)
+
+
+class Axi4S_frameHeaderParser_32b_TC(SimTestCase):
+    T = HStruct(
+        (Eth2Header_t, "eth"),
+        (IPv4Header_t, "ipv4"),
+    )
+    DATA_WIDTH = 32
+    HEADER_BUFF_DEPTH = 2
+    PAYLOAD_BUFF_DEPTH = 2
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dut = dut = Axi4S_frameHeaderParser(cls.T)
+        dut.DATA_WIDTH = cls.DATA_WIDTH
+        dut.USE_KEEP = True
+        dut.HEADER_BUFF_DEPTH = cls.HEADER_BUFF_DEPTH
+        dut.PAYLOAD_BUFF_DEPTH = cls.PAYLOAD_BUFF_DEPTH
+        cls.compileSim(dut)
+
+    def randBytes(self, n: int):
+        return bytes(self._rand.getrandbits(8) for _ in range(n))
+
+    def _test_frames(self, payload_sizes, randomize=False, short_frames=()):
+        dut = self.dut
+        HDR_B = self.T.bit_length() // 8
+        D_B = self.DATA_WIDTH // 8
+        HDR_LAST_B = HDR_B - ((HDR_B - 1) // D_B) * D_B
+
+        expected_hdr = []
+        expected_payload = []
+        word_cnt = 0
+        for i, size in enumerate(payload_sizes):
+            if i in short_frames:
+                f = self.randBytes(self._rand.randint(1, HDR_B - 1))
+                axi4s_send_bytes(dut.dataIn, f)
+                word_cnt += (len(f) + D_B - 1) // D_B
+
+            hdr = self.randBytes(HDR_B)
+            payload = self.randBytes(size)
+            axi4s_send_bytes(dut.dataIn, hdr + payload)
+            word_cnt += (HDR_B + size + D_B - 1) // D_B
+            expected_hdr.append(struct_from_bytes(self.T, hdr))
+            if size and HDR_LAST_B < D_B:
+                off = HDR_LAST_B
+            else:
+                off = 0
+            expected_payload.append((off, list(payload)))
+
+        if randomize:
+            self.randomize(dut.dataIn)
+            self.randomize(dut.dataOut)
+            self.randomize(dut.payloadOut)
+            t = int(word_cnt * 4)
+        else:
+            t = word_cnt
+        self.runSim((t + 20) * CLK_PERIOD)
+
+        self.assertValSequenceEqual(dut.dataOut._ag.data, expected_hdr)
+        for ref in expected_payload:
+            self.assertEqual(axi4s_recieve_bytes(dut.payloadOut), ref)
+        self.assertEmpty(dut.payloadOut._ag.data)
+
+    def test_nop(self):
+        self.runSim(10 * CLK_PERIOD)
+        self.assertEmpty(self.dut.dataOut._ag.data)
+        self.assertEmpty(self.dut.payloadOut._ag.data)
+
+    def test_frames(self):
+        D_B = self.DATA_WIDTH // 8
+        self._test_frames([0, 1, D_B - 1, D_B, D_B + 1, 3 * D_B + 5, 0, 0])
+
+    def test_frames_randomized(self):
+        D_B = self.DATA_WIDTH // 8
+        self._test_frames([self._rand.randint(0, 3 * D_B) for _ in range(20)], randomize=True)
+
+    def test_short_frames_are_dropped(self):
+        D_B = self.DATA_WIDTH // 8
+        self._test_frames([5, 0, 2 * D_B, 1], short_frames=(0, 2, 3))
+
+    def test_throughput(self):
+        # frames where the header and payload fits in to a single word (if possible)
+        # are processed with the throughput of 1 frame per clock cycle
+        # (the simulation time in _test_frames is the number of words + a constant latency)
+        HDR_B = self.T.bit_length() // 8
+        D_B = self.DATA_WIDTH // 8
+        WORDS = (HDR_B + D_B - 1) // D_B
+        payload_size = WORDS * D_B - HDR_B
+        N = 32
+        self._test_frames([payload_size for _ in range(N)])
+
+
+class Axi4S_frameHeaderParser_512b_TC(Axi4S_frameHeaderParser_32b_TC):
+    DATA_WIDTH = 512
+
+
+class Axi4S_frameHeaderParser_fifo_TC(Axi4S_frameHeaderParser_32b_TC):
+    HEADER_BUFF_DEPTH = 4
+    PAYLOAD_BUFF_DEPTH = 6
+
+
+class Axi4S_frameHeaderParser_noBuff_TC(Axi4S_frameHeaderParser_32b_TC):
+    DATA_WIDTH = 64
+    HEADER_BUFF_DEPTH = 0
+    PAYLOAD_BUFF_DEPTH = 0
+
+
+Axi4S_frameHeaderParser_TCs = [
+    Axi4S_frameHeaderParser_32b_TC,
+    Axi4S_frameHeaderParser_512b_TC,
+    Axi4S_frameHeaderParser_fifo_TC,
+    Axi4S_frameHeaderParser_noBuff_TC,
+]
+
+if __name__ == '__main__':
+    testLoader = unittest.TestLoader()
+    # suite = unittest.TestSuite([Axi4S_frameHeaderParser_32b_TC("test_frames")])
+    loadedTcs = [testLoader.loadTestsFromTestCase(tc) for tc in Axi4S_frameHeaderParser_TCs]
+    suite = unittest.TestSuite(loadedTcs)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from itertools import cycle
+import struct
+from typing import BinaryIO, Generator, Iterable, Optional, Sequence, Union
+
+from hwtLib.amba.axi4s import Axi4Stream, axi4s_pack_bytes, axi4s_recieve_bytes
+from hwtSimApi.agents.base import NOP
+from hwtSimApi.constants import CLK_PERIOD, Time
+from hwtSimApi.triggers import Timer
+
+# https://www.tcpdump.org/linktypes.html
+PCAP_LINKTYPE_ETHERNET = 1
+
+PCAP_MAGIC_US = 0xa1b2c3d4
+PCAP_MAGIC_NS = 0xa1b23c4d
+
+PCAPNG_BLOCK_SHB = 0x0A0D0D0A
+PCAPNG_BLOCK_PB = 0x00000002
+PCAPNG_BLOCK_SPB = 0x00000003
+PCAPNG_BLOCK_EPB = 0x00000006
+PCAPNG_BYTE_ORDER_MAGIC = 0x1A2B3C4D
+
+
+def _read_exactly(f: BinaryIO, size: int) -> Optional[bytes]:
+    """
+    :return: the bytes or None if the file ended before the first byte
+    """
+    d = f.read(size)
+    if not d:
+        return None
+    if len(d) != size:
+        raise ValueError("Truncated capture file", size, len(d))
+    return d
+
+
+def _iter_pcap_frames(f: BinaryIO, first_hdr: bytes) -> Generator[bytes, None, None]:
+    if struct.unpack("<I", first_hdr[:4])[0] in (PCAP_MAGIC_US, PCAP_MAGIC_NS):
+        endian = "<"
+    else:
+        endian = ">"
+    # rest of the global header
+    _read_exactly(f, 24 - len(first_hdr))
+    record_hdr = struct.Struct(endian + "IIII")
+    while True:
+        hdr = _read_exactly(f, record_hdr.size)
+        if hdr is None:
+            return
+        _, _, incl_len, _ = record_hdr.unpack(hdr)
+        yield _read_exactly(f, incl_len) if incl_len else b""
+
+
+def _iter_pcapng_frames(f: BinaryIO, first_block_hdr: bytes) -> Generator[bytes, None, None]:
+    block_hdr = first_block_hdr
+    endian = None
+    while block_hdr is not None:
+        if block_hdr[:4] == struct.pack("<I", PCAPNG_BLOCK_SHB):
+            # section header block, resolve the byte order of this section
+            bom = _read_exactly(f, 4)
+            if struct.unpack("<I", bom)[0] == PCAPNG_BYTE_ORDER_MAGIC:
+                endian = "<"
+            elif struct.unpack(">I", bom)[0] == PCAPNG_BYTE_ORDER_MAGIC:
+                endian = ">"
+            else:
+                raise ValueError("Invalid pcapng byte order magic", bom)
+            _, total_len = struct.unpack(endian + "II", block_hdr)
+            _read_exactly(f, total_len - 12)
+        else:
+            assert endian is not None, "pcapng file has to start with section header block"
+            block_type, total_len = struct.unpack(endian + "II", block_hdr)
+            body = _read_exactly(f, total_len - 8)
+            if block_type == PCAPNG_BLOCK_EPB:
+                _, _, _, cap_len, _ = struct.unpack_from(endian + "IIIII", body)
+                yield body[20:20 + cap_len]
+            elif block_type == PCAPNG_BLOCK_SPB:
+                orig_len, = struct.unpack_from(endian + "I", body)
+                cap_len = min(orig_len, total_len - 16)
+                yield body[4:4 + cap_len]
+            elif block_type == PCAPNG_BLOCK_PB:
+                _, _, _, _, cap_len, _ = struct.unpack_from(endian + "HHIIII", body)
+                yield body[20:20 + cap_len]
+            # other blocks do not contain packets
+
+        block_hdr = _read_exactly(f, 8)
+
+
+def iter_pcap_frames(file: Union[str, BinaryIO]) -> Generator[bytes, None, None]:
+    """
+    Lazily read the packets from pcap or pcapng file
+    (the file is read block by block, the whole file is never loaded in to memory)
+
+    :param file: file name or binary file object
+    :return: generator of bytes of captured packets
+    """
+    if isinstance(file, str):
+        with open(file, "rb") as f:
+            yield from iter_pcap_frames(f)
+        return
+
+    hdr = _read_exactly(file, 8)
+    if hdr is None:
+        return
+    magic = hdr[:4]
+    if magic == struct.pack("<I", PCAPNG_BLOCK_SHB):
+        yield from _iter_pcapng_frames(file, hdr)
+    elif struct.unpack("<I", magic)[0] in (PCAP_MAGIC_US, PCAP_MAGIC_NS) or\
+            struct.unpack(">I", magic)[0] in (PCAP_MAGIC_US, PCAP_MAGIC_NS):
+        yield from _iter_pcap_frames(file, hdr)
+    else:
+        raise ValueError("Not a pcap/pcapng file", magic)
+
+
+class PcapWriter():
+    """
+    Writer of classic pcap files (little endian, nanosecond timestamps)
+
+    :ivar ~.frames_written: number of written packets
+    """
+
+    def __init__(self, file: Union[str, BinaryIO], linktype: int=PCAP_LINKTYPE_ETHERNET, snaplen: int=0x40000):
+        if isinstance(file, str):
+            self.f = open(file, "wb")
+            self._owns_file = True
+        else:
+            self.f = file
+            self._owns_file = False
+        self.snaplen = snaplen
+        self.f.write(struct.pack("<IHHiIII", PCAP_MAGIC_NS, 2, 4, 0, 0, snaplen, linktype))
+        self.frames_written = 0
+
+    def write(self, frame: Union[bytes, bytearray, memoryview], timestamp_ns: int=0):
+        frame = bytes(frame)
+        incl_len = min(len(frame), self.snaplen)
+        sec, ns = divmod(timestamp_ns, 10 ** 9)
+        self.f.write(struct.pack("<IIII", sec, ns, incl_len, len(frame)))
+        self.f.write(frame[:incl_len])
+        self.frames_written += 1
+
+    def close(self):
+        if self._owns_file:
+            self.f.close()
+        else:
+            self.f.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def agent_enable_pattern(agent, pattern: Sequence[bool], clk_period: int=CLK_PERIOD):
+    """
+    Simulation process which enables/disables the agent in every clock cycle according to the pattern
+    which is repeated (for a driver this creates the gaps in valid, for a monitor the back-pressure)
+
+    :see: :meth:`hwt.simulator.simTestCase.SimTestCase.randomize`
+    """
+    # small space at start to modify agents when they are inactive
+    yield Timer(clk_period // 4)
+    for en in cycle(pattern):
+        en = bool(en)
+        if agent.getEnable() != en:
+            agent.setEnable(en)
+        yield Timer(clk_period)
+
+
+class Axi4SPcapSource():
+    """
+    Sends the packets from pcap/pcapng file (or any iterable of bytes) to a :class:`hwtLib.amba.axi4s.Axi4Stream`
+    using its simulation agent. The frames are read lazily and only a limited number of the words
+    is queued in the agent so a capture of any size can be replayed.
+
+    :note: add :meth:`~.proc` to simulation processes
+    :note: if the stream has no keep/strb the length of each frame has to be a non-zero multiple
+        of the word size (otherwise ValueError is raised when the frame is sent)
+    :ivar ~.GAP: number of clock cycles between the last word of the frame and the first word of the next frame
+        (if 0 the frames are send back to back)
+    :ivar ~.MAX_BUFFERED_WORDS: the frames are queued in the agent only if it has less than this number of words
+    :ivar ~.frames_sent: number of frames which were passed to the agent
+    :ivar ~.done: True if all frames were passed to the agent
+    """
+
+    def __init__(self, axis: Axi4Stream, frames: Union[str, BinaryIO, Iterable[bytes]], gap: int=0,
+                 max_buffered_words: int=64, clk_period: int=CLK_PERIOD):
+        if axis.ID_WIDTH or axis.DEST_WIDTH or axis.USER_WIDTH:
+            raise NotImplementedError()
+        if axis.USE_KEEP and axis.USE_STRB:
+            raise NotImplementedError()
+        assert gap >= 0, gap
+        assert max_buffered_words > 0, max_buffered_words
+        self.axis = axis
+        if isinstance(frames, str) or hasattr(frames, "read"):
+            frames = iter_pcap_frames(frames)
+        self.frames = frames
+        self.GAP = gap
+        self.MAX_BUFFERED_WORDS = max_buffered_words
+        self.CLK_PERIOD = clk_period
+        self.frames_sent = 0
+        self.done = False
+
+    def _words(self, frame: bytes):
+        axis = self.axis
+        if axis.USE_KEEP or axis.USE_STRB:
+            return axi4s_pack_bytes(axis.DATA_WIDTH, frame)
+        else:
+            word_bytes = axis.DATA_WIDTH // 8
+            if not frame or len(frame) % word_bytes:
+                # the word can not be padded because there is no mask which would mark the padding
+                raise ValueError("Axi4Stream without keep/strb can transfer only frames"
+                                 " with length which is a non-zero multiple of the word size",
+                                 len(frame), word_bytes)
+            return [(d, last) for d, _, last in axi4s_pack_bytes(axis.DATA_WIDTH, frame)]
+
+    def proc(self):
+        ag = self.axis._ag
+        clk_period = self.CLK_PERIOD
+        yield Timer(clk_period // 4)
+        for frame in self.frames:
+            while len(ag.data) >= self.MAX_BUFFERED_WORDS:
+                yield Timer(clk_period)
+
+            ag.data.extend(self._words(frame))
+            self.frames_sent += 1
+
+            if self.GAP:
+                # wait until the frame is send
+                while ag.data or ag.actualData is not NOP:
+                    yield Timer(clk_period)
+                yield Timer(self.GAP * clk_period)
+
+        self.done = True
+
+
+class Axi4SPcapSink():
+    """
+    Collects the frames received by the monitor agent of :class:`hwtLib.amba.axi4s.Axi4Stream`
+    and writes them to pcap file (the timestamp of the packet is the simulation time of the last word).
+    The words are removed from the agent once the frame is complete.
+
+    :note: use :func:`~.agent_enable_pattern` or :meth:`hwt.simulator.simTestCase.SimTestCase.randomize`
+        on the agent for back-pressure
+    :ivar ~.writer: :class:`~.PcapWriter` instance
+    """
+
+    def __init__(self, axis: Axi4Stream, file: Union[str, BinaryIO, PcapWriter]):
+        if axis.DEST_WIDTH or axis.USER_WIDTH:
+            raise NotImplementedError()
+        self.axis = axis
+        if isinstance(file, PcapWriter):
+            self.writer = file
+        else:
+            self.writer = PcapWriter(file)
+
+        ag = axis._ag
+        prevAfterRead = ag._afterRead
+
+        def afterRead():
+            if prevAfterRead is not None:
+                prevAfterRead()
+            self._onWordReceived()
+
+        ag._afterRead = afterRead
+
+    def _onWordReceived(self):
+        ag = self.axis._ag
+        if int(ag.data[-1][-1]):
+            # last word of the frame
+            frame = axi4s_recieve_bytes(self.axis)[-1]
+            self.writer.write(bytes(frame), ag.sim.now // Time.ns)
+
+    def close(self):
+        self.writer.close()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from io import BytesIO
+import os
+import struct
+from tempfile import TemporaryDirectory
+import unittest
+
+from hwt.simulator.simTestCase import SimTestCase
+from hwtLib.amba.axi4s import Axi4Stream
+from hwtLib.amba.axis_comp.reg import Axi4SReg
+from hwtLib.amba.axis_comp.sim.pcap import PcapWriter, iter_pcap_frames, \
+    Axi4SPcapSource, Axi4SPcapSink, agent_enable_pattern, PCAPNG_BLOCK_SHB, \
+    PCAPNG_BYTE_ORDER_MAGIC, PCAPNG_BLOCK_EPB, PCAPNG_BLOCK_SPB, PCAP_MAGIC_US
+from hwtSimApi.constants import CLK_PERIOD
+
+
+def pcapng_block(block_type: int, body: bytes, endian: str):
+    body += bytes((-len(body)) % 4)
+    total_len = len(body) + 12
+    return struct.pack(endian + "II", block_type, total_len) + body + struct.pack(endian + "I", total_len)
+
+
+class PcapFile_TC(unittest.TestCase):
+    FRAMES = [b"abc", b"", bytes(range(200)), b"x" * 9000]
+
+    def test_write_read(self):
+        f = BytesIO()
+        with PcapWriter(f) as w:
+            for i, frame in enumerate(self.FRAMES):
+                w.write(frame, i * 1500)
+        self.assertEqual(w.frames_written, len(self.FRAMES))
+        f.seek(0)
+        self.assertSequenceEqual(list(iter_pcap_frames(f)), self.FRAMES)
+
+    def test_read_big_endian_pcap(self):
+        d = struct.pack(">IHHiIII", PCAP_MAGIC_US, 2, 4, 0, 0, 0xffff, 1)
+        for frame in self.FRAMES:
+            d += struct.pack(">IIII", 1, 2, len(frame), len(frame)) + frame
+        self.assertSequenceEqual(list(iter_pcap_frames(BytesIO(d))), self.FRAMES)
+
+    def test_read_pcapng(self):
+        for endian in "<>":
+            d = pcapng_block(PCAPNG_BLOCK_SHB, struct.pack(endian + "IHHq", PCAPNG_BYTE_ORDER_MAGIC, 1, 0, -1), endian)
+            # interface description block
+            d += pcapng_block(1, struct.pack(endian + "HHI", 1, 0, 0xffff), endian)
+            d += pcapng_block(PCAPNG_BLOCK_EPB, struct.pack(endian + "IIIII", 0, 0, 0, 3, 3) + b"abc", endian)
+            d += pcapng_block(PCAPNG_BLOCK_SPB, struct.pack(endian + "I", 5) + b"hello", endian)
+            d += pcapng_block(PCAPNG_BLOCK_EPB, struct.pack(endian + "IIIII", 0, 0, 0, 0, 0), endian)
+            self.assertSequenceEqual(list(iter_pcap_frames(BytesIO(d))), [b"abc", b"hello", b""], endian)
+
+    def test_read_invalid(self):
+        with self.assertRaises(ValueError):
+            list(iter_pcap_frames(BytesIO(b"\x00" * 32)))
+
+    def test_source_without_keep(self):
+        axis = Axi4Stream()
+        axis.DATA_WIDTH = 32
+        src = Axi4SPcapSource(axis, [])
+        self.assertSequenceEqual(src._words(b"abcdefgh"), [
+            (int.from_bytes(b"abcd", "little"), 0),
+            (int.from_bytes(b"efgh", "little"), 1),
+        ])
+        for frame in [b"", b"abc", b"abcde"]:
+            with self.assertRaises(ValueError):
+                src._words(frame)
+
+
+class Axi4SPcap_TC(SimTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dut = dut = Axi4SReg()
+        dut.USE_KEEP = True
+        dut.DATA_WIDTH = 32
+        cls.compileSim(dut)
+
+    def frames(self, cnt: int):
+        return [bytes(self._rand.getrandbits(8) for _ in range(self._rand.randint(1, 70)))
+                for _ in range(cnt)]
+
+    def _test_replay(self, frames, gap, pattern, max_buffered_words=64):
+        dut = self.dut
+        with TemporaryDirectory() as d:
+            src_file = os.path.join(d, "src.pcap")
+            with PcapWriter(src_file) as w:
+                for f in frames:
+                    w.write(f)
+
+            dst = BytesIO()
+            src = Axi4SPcapSource(dut.dataIn, src_file, gap=gap, max_buffered_words=max_buffered_words)
+            sink = Axi4SPcapSink(dut.dataOut, dst)
+            self.procs.extend([
+                src.proc(),
+                agent_enable_pattern(dut.dataOut._ag, pattern),
+            ])
+            words = sum((len(f) + 3) // 4 for f in frames)
+            self.runSim((len(frames) * (gap + 4) + words * len(pattern) + 20) * CLK_PERIOD)
+            sink.close()
+
+        self.assertTrue(src.done)
+        self.assertEqual(src.frames_sent, len(frames))
+        self.assertEqual(sink.writer.frames_written, len(frames))
+        self.assertEmpty(dut.dataOut._ag.data)
+        dst.seek(0)
+        self.assertSequenceEqual(list(iter_pcap_frames(dst)), frames)
+
+    def test_replay(self):
+        self._test_replay(self.frames(20), 0, (1,), max_buffered_words=4)
+
+    def test_replay_gap_backpressure(self):
+        self._test_replay(self.frames(20), 3, (1, 0, 0, 1))
+
+
+Axi4SPcap_TCs = [
+    PcapFile_TC,
+    Axi4SPcap_TC,
+]
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    # suite = unittest.TestSuite([Axi4SPcap_TC("test_replay")])
+    loadedTcs = [testLoader.loadTestsFromTestCase(tc) for tc in Axi4SPcap_TCs]
+    suite = unittest.TestSuite(loadedTcs)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
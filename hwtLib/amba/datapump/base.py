@@ -172,7 +172,10 @@ class AxiDatapumpBase(HwModule):
 
         self.axiAddrDefaults(axiA)
         if self.ID_WIDTH:
-            axiA.id(self.ID_VAL)
+            if req.ID_WIDTH:
+                axiA.id(req.id)
+            else:
+                axiA.id(self.ID_VAL)
 
         alignmentError = self.hasAlignmentError(req.addr)
 
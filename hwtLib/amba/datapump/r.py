@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+from typing import NamedTuple, Union
+
 from hwt.code import If, Switch, SwitchLogic
 from hwt.hdl.const import HConst
 from hwt.hdl.types.bits import HBits
@@ -8,6 +10,7 @@ from hwt.hdl.types.defs import BIT
 from hwt.hdl.types.stream import HStream
 from hwt.hdl.types.struct import HStruct
 from hwt.hwIOs.std import HwIOSignal, HwIORdVldSync, HwIOVectSignal
+from hwt.hObjList import HObjList
 from hwt.hwIOs.utils import propagateClkRstn
 from hwt.hwParam import HwParam
 from hwt.math import log2ceil
@@ -49,6 +52,16 @@ class TransEndInfo(HwIORdVldSync):
         HwIORdVldSync.hwDeclr(self)
 
 
+class TransEndInfoSelected(NamedTuple):
+    """
+    Signals of :class:`~.TransEndInfo` selected from multiple :class:`~.TransEndInfo` interfaces
+    """
+    vld: RtlSignal
+    rd: RtlSignal
+    rem: RtlSignal
+    propagateLast: RtlSignal
+
+
 @serializeParamsUniq
 class Axi_rDatapump(AxiDatapumpBase):
     """
@@ -68,11 +81,21 @@ class Axi_rDatapump(AxiDatapumpBase):
       transactions and on AXI side it has to be same to assert that the transactions
       will be finished in-order.
 
+    :ivar ~.PROPAGATE_ID: if True the driver has an id signal, driver.req.id is used as AXI ar.id
+        and AXI r.id is propagated to driver.r.id, the transactions with a different id
+        may finish out of order (the transaction info is stored in a FIFO for each id,
+        only for ALIGNAS == DATA_WIDTH)
+
     :see: :class:`hwtLib.amba.datapump.base.AxiDatapumpBase`
 
     .. hwt-autodoc::
     """
 
+    @override
+    def hwConfig(self):
+        super().hwConfig()
+        self.PROPAGATE_ID = HwParam(False)
+
     @override
     def hwDeclr(self):
         super().hwDeclr()  # add clk, rst, axi addr channel and req channel
@@ -84,13 +107,28 @@ class Axi_rDatapump(AxiDatapumpBase):
         with self._hwParamsShared():
             self.axi.HAS_W = False
             d = self.driver = HwIOAxiRDatapump()
-            d.ID_WIDTH = 0
             d.MAX_BYTES = self.MAX_CHUNKS * (self.CHUNK_WIDTH // 8)
 
             f = self.sizeRmFifo = HandshakedFifo(TransEndInfo)
-            f.ID_WIDTH = 0
-            f.DEPTH = self.MAX_TRANS_OVERLAP
             f.SHIFT_OPTIONS = self.getShiftOptions()
+            if self.PROPAGATE_ID:
+                assert self.ID_WIDTH > 0, ("PROPAGATE_ID requires AXI with id signal", self.ID_WIDTH)
+                assert self.isAlwaysAligned(), ("PROPAGATE_ID is supported only for aligned transactions", self.ALIGNAS, self.DATA_WIDTH)
+                # the sizeRmFifo is only an input buffer, the info is stored in sizeRmFifoPerId
+                f.DEPTH = 2
+            else:
+                d.ID_WIDTH = 0
+                f.ID_WIDTH = 0
+                f.DEPTH = self.MAX_TRANS_OVERLAP
+
+        if self.PROPAGATE_ID:
+            self.sizeRmFifoPerId = HObjList()
+            for _ in range(2 ** self.ID_WIDTH):
+                f = HandshakedFifo(TransEndInfo)
+                f._updateHwParamsFrom(self.sizeRmFifo)
+                f.ID_WIDTH = 0
+                f.DEPTH = self.MAX_TRANS_OVERLAP
+                self.sizeRmFifoPerId.append(f)
 
     def storeTransInfo(self, transInfo: TransEndInfo, isLast: bool):
         if isLast:
@@ -100,6 +138,7 @@ class Axi_rDatapump(AxiDatapumpBase):
 
         offset = self.driver.req.addr[self.getSizeAlignBits():]
         return [
+            *([transInfo.id(self.driver.req.id), ] if transInfo.ID_WIDTH else []),
             transInfo.rem(rem),
             transInfo.propagateLast(int(isLast)),
             *([]
@@ -175,7 +214,7 @@ class Axi_rDatapump(AxiDatapumpBase):
                     default=strb(None)
                 )
 
-    def dataHandler(self, rErrFlag: RtlSignal, rmSizeOut: TransEndInfo):
+    def dataHandler(self, rErrFlag: RtlSignal, rmSizeOut: Union[TransEndInfo, TransEndInfoSelected]):
         rIn = self.axi.r
         rOut = self.driver.r
 
@@ -194,6 +233,8 @@ class Axi_rDatapump(AxiDatapumpBase):
             * ([self.remSizeToStrb(rmSizeOut.rem, rOut.strb, False, rIn.valid & last), ] if self.USE_STRB else []),
             rOut.data(rIn.data)
             rOut.last(last)
+            if self.PROPAGATE_ID:
+                rOut.id(rIn.id)
             StreamNode(
                 masters=[rIn, rmSizeOut],
                 slaves=[rOut],
@@ -253,6 +294,39 @@ class Axi_rDatapump(AxiDatapumpBase):
                 }
             ).sync()
 
+    def sizeRmPerIdHandler(self, rmSizeIn: TransEndInfo, rId: RtlSignal) -> TransEndInfoSelected:
+        """
+        Store the transaction info to a FIFO for the id of the transaction
+        and select the output of the FIFO for the id of the actual read data
+        (the transactions with the same id are finished in order)
+        """
+        fifos = self.sizeRmFifoPerId
+        for i, f in enumerate(fifos):
+            f.dataIn(rmSizeIn, exclude=[f.dataIn.vld, f.dataIn.rd])
+            f.dataIn.vld(rmSizeIn.vld & rmSizeIn.id._eq(i))
+        Switch(rmSizeIn.id).add_cases(
+            (i, rmSizeIn.rd(f.dataIn.rd))
+            for i, f in enumerate(fifos)
+        )
+
+        proto = fifos[0].dataOut
+        sel = TransEndInfoSelected(
+            self._sig("rmSizeOut_vld"),
+            self._sig("rmSizeOut_rd"),
+            self._sig("rmSizeOut_rem", proto.rem._dtype),
+            self._sig("rmSizeOut_propagateLast"),
+        )
+        Switch(rId).add_cases(
+            (i, [sel.vld(f.dataOut.vld),
+                 sel.rem(f.dataOut.rem),
+                 sel.propagateLast(f.dataOut.propagateLast)])
+            for i, f in enumerate(fifos)
+        )
+        for i, f in enumerate(fifos):
+            f.dataOut.rd(sel.rd & rId._eq(i))
+
+        return sel
+
     @override
     def hwImpl(self):
         r = self.axi.r
@@ -273,7 +347,11 @@ class Axi_rDatapump(AxiDatapumpBase):
             err = err | errorAlignment
 
         self.addrHandler(self.driver.req, self.axi.ar, self.sizeRmFifo.dataIn, err)
-        self.dataHandler(err, self.sizeRmFifo.dataOut)
+        if self.PROPAGATE_ID:
+            rmSizeOut = self.sizeRmPerIdHandler(self.sizeRmFifo.dataOut, self.axi.r.id)
+        else:
+            rmSizeOut = self.sizeRmFifo.dataOut
+        self.dataHandler(err, rmSizeOut)
 
         propagateClkRstn(self)
 
@@ -286,10 +286,63 @@ class Axi3Lite_rDatapumpTC(Axi4_rDatapumpTC):
         return (data, strb, int(last))
 
 
+class Axi4_rDatapump_propagateIdTC(Axi_datapumpTC):
+    DATA_WIDTH = 64
+
+    @classmethod
+    def setUpClass(cls):
+        dut = cls.dut = Axi_rDatapump(axiCls=Axi4)
+        dut.DATA_WIDTH = cls.DATA_WIDTH
+        dut.CHUNK_WIDTH = cls.DATA_WIDTH
+        dut.MAX_CHUNKS = 4
+        dut.ALIGNAS = cls.DATA_WIDTH
+        dut.ID_WIDTH = 2
+        dut.PROPAGATE_ID = True
+        cls.compileSim(dut)
+
+    def test_outOfOrder(self):
+        dut = self.dut
+        STRB = mask(self.DATA_WIDTH // 8)
+        # (id, addr, len, rem)
+        dut.driver.req._ag.data.extend([
+            (0, 0x100, 1, 0),
+            (1, 0x200, 0, 0),
+            (2, 0x300, 0, 0),
+            (1, 0x400, 0, 0),
+        ])
+        # (id, data, resp, last), the transaction with id 1 finishes first
+        dut.axi.r._ag.data.extend([
+            (1, 10, RESP_OKAY, 1),
+            (2, 20, RESP_OKAY, 1),
+            (0, 1, RESP_OKAY, 0),
+            (1, 11, RESP_OKAY, 1),
+            (0, 2, RESP_OKAY, 1),
+        ])
+        self.runSim(20 * CLK_PERIOD)
+
+        ar = dut.axi.ar._ag
+        self.assertValSequenceEqual(dut.axi.ar._ag.data, [
+            ar.create_addr_req(0x100, 1, _id=0),
+            ar.create_addr_req(0x200, 0, _id=1),
+            ar.create_addr_req(0x300, 0, _id=2),
+            ar.create_addr_req(0x400, 0, _id=1),
+        ])
+        # (id, data, strb, last)
+        self.assertValSequenceEqual(dut.driver.r._ag.data, [
+            (1, 10, STRB, 1),
+            (2, 20, STRB, 1),
+            (0, 1, STRB, 0),
+            (1, 11, STRB, 1),
+            (0, 2, STRB, 1),
+        ])
+        self.assertEmpty(dut.axi.r._ag.data)
+
+
 Axi_rDatapump_alignedTCs = [
     Axi3_rDatapumpTC,
     Axi4_rDatapumpTC,
     Axi3Lite_rDatapumpTC,
+    Axi4_rDatapump_propagateIdTC,
 ]
 
 if __name__ == "__main__":
@@ -1,6 +1,8 @@
 from collections import deque
+from typing import Optional
 
 from hwtLib.abstract.sim_ram import SimRam
+from hwtLib.abstract.sim_ram_timing import SimRamTimingModel
 from hwtSimApi.triggers import WaitWriteOnly
 from pyMathBitPrecise.bit_utils import mask, ValidityError
 
@@ -13,12 +15,18 @@ class AxiDpSimRam(SimRam):
     """
 
     def __init__(self, cellWidth, clk, rDatapumpHwIO=None,
-                 wDatapumpHwIO=None, parent=None):
+                 wDatapumpHwIO=None, parent=None, batch_requests=False,
+                 timing_model: Optional[SimRamTimingModel]=None):
         """
         :param cellWidth: width of items in memory
         :param clk: clk signal for synchronization
         :param parent: parent instance of SimRam
                        (memory will be shared with this instance)
+        :param batch_requests: if True all queued requests are resolved at once
+            and the memory is woken up by the agents only if there is something to do
+            (instead of checking the agents in every clock cycle)
+        :param timing_model: optional model of the latency and throughput of the memory,
+            if None the requests are resolved as fast as the agents allow
         """
         assert cellWidth % 8 == 0
         super(AxiDpSimRam, self).__init__(cellWidth // 8, parent=parent)
@@ -63,9 +71,49 @@ class AxiDpSimRam(SimRam):
         self.ID_WIDTH = hwIO.ID_WIDTH
         self.MAX_LEN = hwIO.MAX_LEN
 
+        self._initBatchMode(batch_requests)
+        self._initTimingModel(timing_model)
         self._registerOnClock()
 
+    def _initTimingModel(self, timing_model: Optional[SimRamTimingModel]):
+        self.timing_model = timing_model
+        # if not None the R data/write acks are collected in this list instead of agent
+        self._rStaged = None
+        self._bStaged = None
+        # (clock cycle, transaction, (accept cycle, byte cnt) for last word else None)
+        self._rTimed = deque()
+        # (clock cycle, transaction, accept cycle, byte cnt)
+        self._bTimed = deque()
+        self._wAcceptCycles = deque()
+        self._rOutstanding = 0
+        self._wOutstanding = 0
+        self._arEnabled = True
+        self._awEnabled = True
+
+    def _initBatchMode(self, batch_requests: bool):
+        self.batch_requests = batch_requests
+        self._isRegisteredOnClock = False
+        if batch_requests:
+            for ag in (self.arAg, self.awAg, self.wAg):
+                if ag is not None:
+                    self._wakeUpOnAgentData(ag)
+
+    def _wakeUpOnAgentData(self, ag):
+        """
+        Register this memory on clock when agent receives new data
+        """
+        prevAfterRead = ag._afterRead
+
+        def afterRead():
+            if prevAfterRead is not None:
+                prevAfterRead()
+            if not self._isRegisteredOnClock:
+                self._registerOnClock()
+
+        ag._afterRead = afterRead
+
     def _registerOnClock(self):
+        self._isRegisteredOnClock = True
         self.clk._sigInside.wait(self.checkRequests())
 
     def checkRequests(self):
@@ -73,6 +121,17 @@ class AxiDpSimRam(SimRam):
         Check if any request has appeared on interfaces
         """
         yield WaitWriteOnly()
+        self._isRegisteredOnClock = False
+        if self.timing_model is not None:
+            if self.checkRequestsTimed() or not self.batch_requests:
+                self._registerOnClock()
+            return
+
+        if self.batch_requests:
+            if self.checkRequestsBatch():
+                self._registerOnClock()
+            return
+
         if self.arAg is not None:
             if self.arAg.data:
                 self.onReadReq()
@@ -88,6 +147,129 @@ class AxiDpSimRam(SimRam):
                 self.doWrite()
         self._registerOnClock()
 
+    def checkRequestsBatch(self) -> bool:
+        """
+        Resolve all queued requests at once
+
+        :return: True if there is a request waiting for data
+        """
+        if self.arAg is not None:
+            reqs = self.arAg.data
+            while reqs:
+                self.rPending.append(self.parseReq(reqs.popleft()))
+
+            while self.rPending:
+                self.doRead()
+
+        if self.awAg is not None:
+            reqs = self.awAg.data
+            while reqs:
+                self.wPending.append(self.parseReq(reqs.popleft()))
+
+            while self.wPending and self.wPending[0][2] <= len(self.wAg.data):
+                self.doWrite()
+
+            return bool(self.wPending)
+
+        return False
+
+    def _nowCycle(self) -> int:
+        ag = self.arAg if self.arAg is not None else self.awAg
+        return ag.sim.now // self.timing_model.CLK_PERIOD
+
+    def checkRequestsTimed(self) -> bool:
+        """
+        Resolve requests and release the responses in time specified by the timing model
+
+        :return: True if there is some transaction in progress
+        """
+        tm = self.timing_model
+        now = self._nowCycle()
+        workRemains = False
+        if self.arAg is not None:
+            reqs = self.arAg.data
+            while reqs and tm.canAccept(self._rOutstanding):
+                req = self.parseReq(reqs.popleft())
+                _, addr, size, _ = req
+                self.rPending.append(req)
+                self._rStaged = beats = []
+                try:
+                    self.doRead()
+                finally:
+                    self._rStaged = None
+                times = tm.schedule(now, addr, size, self.cellSize, False)
+                self._rOutstanding += 1
+                lastI = len(beats) - 1
+                for i, (t, b) in enumerate(zip(times, beats)):
+                    self._rTimed.append((t, b, (now, size * self.cellSize) if i == lastI else None))
+
+            rTimed = self._rTimed
+            while rTimed and rTimed[0][0] <= now:
+                _, b, last = rTimed.popleft()
+                self.rAg.data.append(b)
+                if last is not None:
+                    acceptCycle, byteCnt = last
+                    self._rOutstanding -= 1
+                    tm.stats.record(False, byteCnt, acceptCycle, now)
+
+            en = tm.canAccept(self._rOutstanding)
+            if en != self._arEnabled:
+                self.arAg.setEnable(en)
+                self._arEnabled = en
+            workRemains |= bool(rTimed)
+
+        if self.awAg is not None:
+            reqs = self.awAg.data
+            while reqs and tm.canAccept(len(self.wPending) + self._wOutstanding):
+                self.wPending.append(self.parseReq(reqs.popleft()))
+                self._wAcceptCycles.append(now)
+
+            while self.wPending and self.wPending[0][2] <= len(self.wAg.data):
+                _, addr, size, _ = self.wPending[0]
+                self._bStaged = acks = []
+                try:
+                    self.doWrite()
+                finally:
+                    self._bStaged = None
+                times = tm.schedule(now, addr, size, self.cellSize, True)
+                self._wOutstanding += 1
+                acceptCycle = self._wAcceptCycles.popleft()
+                for ack in acks:
+                    self._bTimed.append((times[-1], ack, acceptCycle, size * self.cellSize))
+
+            bTimed = self._bTimed
+            while bTimed and bTimed[0][0] <= now:
+                _, ack, acceptCycle, byteCnt = bTimed.popleft()
+                self.wAckAg.data.append(ack)
+                self._wOutstanding -= 1
+                tm.stats.record(True, byteCnt, acceptCycle, now)
+
+            en = tm.canAccept(len(self.wPending) + self._wOutstanding)
+            if en != self._awEnabled:
+                self.awAg.setEnable(en)
+                self._awEnabled = en
+            workRemains |= bool(bTimed) or bool(self.wPending)
+
+        return workRemains
+
+    def _pushRData(self, read_trans):
+        """
+        Send the read data word to the R channel agent
+        """
+        if self._rStaged is None:
+            self.rAg.data.append(read_trans)
+        else:
+            self._rStaged.append(read_trans)
+
+    def _pushWAck(self, ack):
+        """
+        Send the write acknowledge to the write response channel agent
+        """
+        if self._bStaged is None:
+            self.wAckAg.data.append(ack)
+        else:
+            self._bStaged.append(ack)
+
     def parseReq(self, req):
         for i, v in enumerate(req):
             assert v._is_full_valid(), (i, v)
@@ -169,10 +351,10 @@ class AxiDpSimRam(SimRam):
                 else:
                     read_trans = (data, isLast)
 
-            self.rAg.data.append(read_trans)
+            self._pushRData(read_trans)
 
     def doWriteAck(self, _id):
-        self.wAckAg.data.append(_id)
+        self._pushWAck(_id)
 
     def doWrite(self):
         _id, addr, size, lastWordBitmask = self.wPending.popleft()
@@ -36,7 +36,7 @@ class AvalonMmBuff_TC(SimTestCase):
         m = AvalonMmSimRam(self.dut.m)
         self.assertEmpty(s.rDataAg.data)
         self.assertEmpty(s.wRespAg.data)
-        self.assertDictEqual(m.data, {})
+        self.assertDictEqual(dict(m.data), {})
 
     def test_read(self):
         N = 0
@@ -4,8 +4,7 @@ from hwt.hdl.types.bits import HBits
 from hwtLib.abstract.sim_ram import SimRam
 from hwtLib.avalon.mm import AvalonMM, RESP_OKAY
 from hwtSimApi.triggers import WaitWriteOnly
-from pyMathBitPrecise.bit_utils import mask, set_bit_range, get_bit, \
-    get_bit_range
+from pyMathBitPrecise.bit_utils import mask, mask_bytes
 
 
 class AvalonMmSimRam(SimRam):
@@ -29,6 +28,7 @@ class AvalonMmSimRam(SimRam):
         SimRam.__init__(self, DW // 8, parent=parent)
 
         self.allMask = mask(self.cellSize)
+        self.wordBitMask = mask(self.cellSize * 8)
         self.word_t = HBits(self.cellSize * 8)
 
         if clk is None:
@@ -133,31 +133,11 @@ class AvalonMmSimRam(SimRam):
     def _write_single_word(self, data: HConst, strb: int, word_i: int):
         if strb == 0:
             return
-
-        if strb != self.allMask:
-            cur = self.data.get(word_i, None)
-            if cur is None:
-                cur_val = 0
-                cur_mask = 0
-            elif isinstance(cur, int):
-                cur_val = cur
-                cur_mask = self.allMask
-            else:
-                cur_val = cur.val
-                cur_mask = cur.vld_mask
-
-            for i in range(self.cellSize):
-                if get_bit(strb, i):
-                    cur_val = set_bit_range(
-                        cur_val, i * 8, 8, get_bit_range(data.val, i * 8, 8))
-                    cur_mask = set_bit_range(
-                        cur_mask, i * 8, 8, get_bit_range(data.vld_mask, i * 8, 8))
-            if cur_mask == self.allMask:
-                data = cur_val
-            else:
-                data = self.word_t.from_py(cur_val, cur_mask)
-        # print(f"data[{word_i:d}] = {data}")
-        self.data[word_i] = data
+        if strb == self.allMask:
+            self.data[word_i] = data
+        else:
+            # the bytes of the word which were never written are invalid
+            self.data.setMasked(word_i, data, mask_bytes(self.wordBitMask, strb, self.cellSize))
 
     def doWrite(self, addr, data_words):
         baseIndex = addr // self.cellSize
@@ -9,11 +9,14 @@ class HwIODataMaskLastRdVld(HwIODataRdVld):
     """
     HwIODataRdVld interface with data, mask, last signal.
 
+    :ivar ~.USE_LAST: if False the "last" signal is not present
+
     .. hwt-autodoc::
     """
     @override
     def hwConfig(self):
         self.MASK_GRANULARITY = HwParam(8)
+        self.USE_LAST = HwParam(True)
         HwIODataRdVld.hwConfig(self)
 
     @override
@@ -24,7 +27,8 @@ class HwIODataMaskLastRdVld(HwIODataRdVld):
         self.USE_MASK = self.MASK_GRANULARITY != self.DATA_WIDTH
         if self.USE_MASK:
             self.mask = HwIOVectSignal(self.DATA_WIDTH // self.MASK_GRANULARITY)
-        self.last = HwIOSignal()
+        if self.USE_LAST:
+            self.last = HwIOSignal()
 
     @override
     def _initSimAgent(self, sim: HdlSimulator):
@@ -34,21 +38,32 @@ class HwIODataMaskLastRdVld(HwIODataRdVld):
 class HwIODataMaskRdVldAgent(HwIODataRdVldAgent):
     """
     Simulation agent for :class:`.HwIODataMaskLastRdVld` interface.
+
+    :note: data format is tuple (data, mask, last) or (data, mask) if USE_LAST=False
     """
 
     @override
     def set_data(self, data):
         i = self.hwIO
-        if data is None:
-            d, m, last = None, None, None
+        if i.USE_LAST:
+            if data is None:
+                d, m, last = None, None, None
+            else:
+                d, m, last = data
+            i.last.write(last)
         else:
-            d, m, last = data
+            if data is None:
+                d, m = None, None
+            else:
+                d, m = data
 
         i.mask.write(m)
         i.data.write(d)
-        i.last.write(last)
 
     @override
     def get_data(self):
         i = self.hwIO
-        return i.data.read(), i.mask.read(), i.last.read()
+        if i.USE_LAST:
+            return i.data.read(), i.mask.read(), i.last.read()
+        else:
+            return i.data.read(), i.mask.read()
@@ -65,7 +65,7 @@ class Crc(HwModule):
         """
         build xor tree for CRC computation
         """
-        crcMatrix = CrcComb.buildCrcXorMatrix(len(data_in_bits), poly_bits)
+        crcMatrix = CrcComb.buildCrcXorMatrixMasks(len(data_in_bits), poly_bits)
         res = CrcComb.applyCrcXorMatrix(
             crcMatrix, data_in_bits,
             state_in_bits, self.REFIN)
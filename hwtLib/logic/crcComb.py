@@ -2,7 +2,9 @@
 # -*- coding: utf-8 -*-
 
 from collections import deque
-from typing import List, Tuple, Union
+import json
+import os
+from typing import Dict, List, Optional, Tuple, Union
 
 from hwt.hdl.types.bits import HBits
 from hwt.hdl.types.bitsConst import HBitsConst
@@ -16,7 +18,7 @@ from hwt.synthesizer.vectorUtils import iterBits
 from hwtLib.logic.crcPoly import CRC_5_USB
 from hwtLib.logic.crcUtils import parsePolyStr
 from pyMathBitPrecise.bit_utils import get_bit, bit_list_reversed_bits_in_bytes, \
-    bit_list_reversed_endianity
+    bit_list_reversed_endianity, bit_list_to_int
 from hwt.pyUtils.typingFuture import override
 
 
@@ -38,9 +40,14 @@ class CrcComb(HwModule):
         each byte is reflected before being processed.
     :ivar ~.REFOUT: Same as REFIN except for output
     :ivar ~.XOROUT: value to xor result with
+    :cvar ~.XOR_MATRIX_CACHE_DIR: optional directory where the XOR matrices
+        from :meth:`~.buildCrcXorMatrixMasks` are stored to speed up the elaboration
+        in next runs (None to use only in-process cache)
 
     .. hwt-autodoc::
     """
+    XOR_MATRIX_CACHE_DIR: Optional[str] = None
+    _XOR_MATRIX_CACHE: Dict[Tuple[int, int, int], List[Tuple[int, int]]] = {}
 
     @override
     def hwConfig(self):
@@ -88,50 +95,91 @@ class CrcComb(HwModule):
 
     # based on
     # hhttps://github.com/alexforencich/fpga-utils/blob/master/crcgen.py
-    @staticmethod
-    def buildCrcXorMatrix(data_width: int,
-                          polyBits: List[bool]) -> List[Tuple[List[bool],
-                                                              List[bool]]]:
+    @classmethod
+    def buildCrcXorMatrixMasks(cls, data_width: int,
+                               polyBits: List[bool]) -> List[Tuple[int, int]]:
         """
-        :param data_width: number of bits in input
-            (excluding bits of signal wit current crc state)
-        :param polyBits: list of bits in specified polynome
-        :note: all bits are in format LSB downto MSB
-        :return: crc_mask contains rows where each row describes which bits
-            should be XORed to get bit of resut
-            row is [mask_for_state_reg, mask_for_data]
+        Same as :meth:`~.buildCrcXorMatrix` but the masks are int bitmasks
+        (bit i of mask corresponds to item i in list format)
+
+        :note: The result is cached in memory and optionally also on disk
+            in :attr:`~.XOR_MATRIX_CACHE_DIR` (if it is not None).
+            The matrix depends only on the polynome and widths, REFIN/REFOUT/INIT/XOROUT
+            are applied later, the key is (POLY, POLY_WIDTH, DATA_WIDTH).
         """
         DW = data_width
         PW = len(polyBits)
-        # list index is output bit index
-        # initial state is 1:1 mapping from previous state to next state
-        crc_mask = deque([
-            [[int(x == y) for y in range(PW)], [0] * DW]
-            for x in range(PW)
-        ])
+        poly = bit_list_to_int(polyBits)
+        k = (poly, PW, DW)
+        try:
+            return cls._XOR_MATRIX_CACHE[k]
+        except KeyError:
+            pass
+
+        cacheDir = cls.XOR_MATRIX_CACHE_DIR
+        fileName = None
+        if cacheDir is not None:
+            fileName = os.path.join(cacheDir, f"crc_xor_matrix_{poly:x}_{PW:d}_{DW:d}.json")
+            try:
+                with open(fileName) as f:
+                    crc_mask = [tuple(row) for row in json.load(f)]
+            except (OSError, ValueError):
+                crc_mask = None
+            if crc_mask is not None and len(crc_mask) == PW:
+                cls._XOR_MATRIX_CACHE[k] = crc_mask
+                return crc_mask
 
+        # list index is output bit index, item is [mask_for_state_reg, mask_for_data]
+        # initial state is 1:1 mapping from previous state to next state
+        rows = deque([[1 << x, 0] for x in range(PW)])
+        polyRowIndexes = [i for i, pb in enumerate(polyBits) if pb and i != 0]
         for i in range(DW - 1, -1, -1):
             # determine shift in value
             # current value in last FF, XOR with input data bit (MSB first)
-            val = crc_mask[-1]
-            val[1][i] = int(not val[1][i])
+            val = rows.pop()
+            val[1] ^= 1 << i
 
             # shift
-            crc_mask.appendleft(val)
-            crc_mask.pop()
+            rows.appendleft(val)
 
             # add XOR inputs at correct indicies
-            first = True
             val_s, val_d = val
-            for cm, pb in zip(crc_mask, polyBits):
-                if first:
-                    first = False
-                elif pb:
-                    cm[0] = [a ^ b for a, b in zip(cm[0], val_s)]
-                    cm[1] = [a ^ b for a, b in zip(cm[1], val_d)]
+            for ri in polyRowIndexes:
+                cm = rows[ri]
+                cm[0] ^= val_s
+                cm[1] ^= val_d
+
+        crc_mask = [tuple(row) for row in rows]
+        cls._XOR_MATRIX_CACHE[k] = crc_mask
+        if fileName is not None:
+            os.makedirs(cacheDir, exist_ok=True)
+            tmpName = f"{fileName:s}.{os.getpid():d}.tmp"
+            with open(tmpName, "w") as f:
+                json.dump(crc_mask, f)
+            os.replace(tmpName, fileName)
 
         return crc_mask
 
+    @classmethod
+    def buildCrcXorMatrix(cls, data_width: int,
+                          polyBits: List[bool]) -> List[Tuple[List[bool],
+                                                              List[bool]]]:
+        """
+        :param data_width: number of bits in input
+            (excluding bits of signal wit current crc state)
+        :param polyBits: list of bits in specified polynome
+        :note: all bits are in format LSB downto MSB
+        :return: crc_mask contains rows where each row describes which bits
+            should be XORed to get bit of resut
+            row is [mask_for_state_reg, mask_for_data]
+        """
+        PW = len(polyBits)
+        return [
+            [[get_bit(s, i) for i in range(PW)],
+             [get_bit(d, i) for i in range(data_width)]]
+            for s, d in cls.buildCrcXorMatrixMasks(data_width, polyBits)
+        ]
+
     @classmethod
     def applyCrcXorMatrix(cls, crcMatrix: List[List[List[int]]],
                           inBits: List[RtlSignal], stateBits: List[Union[RtlSignal, HBitsConst]],
@@ -141,15 +189,27 @@ class CrcComb(HwModule):
         outBits = []
         for (stateMask, dataMask) in crcMatrix:
             v = BIT.from_py(0)  # neutral value for XOR
-            assert len(stateMask) == len(stateBits)
-            for useBit, b in zip(stateMask, stateBits):
-                if useBit:
-                    v = v ^ b
+            if isinstance(stateMask, int):
+                # int bitmask format from buildCrcXorMatrixMasks
+                assert (stateMask >> len(stateBits)) == 0
+                for i, b in enumerate(stateBits):
+                    if (stateMask >> i) & 1:
+                        v = v ^ b
+
+                assert (dataMask >> len(inBits)) == 0, (dataMask, len(inBits))
+                for i, b in enumerate(inBits):
+                    if (dataMask >> i) & 1:
+                        v = v ^ b
+            else:
+                assert len(stateMask) == len(stateBits)
+                for useBit, b in zip(stateMask, stateBits):
+                    if useBit:
+                        v = v ^ b
 
-            assert len(dataMask) == len(inBits), (len(dataMask), len(inBits))
-            for useBit, b in zip(dataMask, inBits):
-                if useBit:
-                    v = v ^ b
+                assert len(dataMask) == len(inBits), (len(dataMask), len(inBits))
+                for useBit, b in zip(dataMask, inBits):
+                    if useBit:
+                        v = v ^ b
 
             outBits.append(v)
 
@@ -176,7 +236,7 @@ class CrcComb(HwModule):
             # we need to process lower byte first
             inBits = bit_list_reversed_endianity(inBits, extend=False)
 
-        crcMatrix = self.buildCrcXorMatrix(DW, polyBits)
+        crcMatrix = self.buildCrcXorMatrixMasks(DW, polyBits)
         res = self.applyCrcXorMatrix(
             crcMatrix, inBits,
             initBits, bool(self.REFIN))
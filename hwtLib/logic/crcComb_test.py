@@ -3,6 +3,7 @@
 
 from binascii import crc32, crc_hqx
 import os
+from tempfile import TemporaryDirectory
 
 from hwt.constants import Time
 from hwt.hdl.types.bits import HBits
@@ -13,7 +14,7 @@ from hwtLib.logic.crcPoly import CRC_1, CRC_8_CCITT, CRC_16_CCITT, CRC_32, \
 from hwtLib.logic.crc_test_utils import NaiveCrcAccumulator, naive_crc
 from hwtSimApi.constants import CLK_PERIOD
 from pyMathBitPrecise.bit_utils import get_bit, mask, \
-    reverse_bits
+    reverse_bits, bit_list_to_int
 
 
 def stoi(s):
@@ -129,6 +130,29 @@ class CrcCombTC(SimTestCase):
         self.runSim((len(expected_crc) + 1) * CLK_PERIOD)
         self.assertValSequenceEqual(dut.dataOut._ag.data, expected_crc)
 
+    def test_buildCrcXorMatrixMasks_cache(self):
+        polyBits = crcToBf(CRC_32)
+        m = CrcComb.buildCrcXorMatrixMasks(64, polyBits)
+        self.assertIs(m, CrcComb.buildCrcXorMatrixMasks(64, polyBits))
+        m_list = CrcComb.buildCrcXorMatrix(64, polyBits)
+        self.assertEqual(len(m_list), 32)
+        for (s, d), (s_l, d_l) in zip(m, m_list):
+            self.assertEqual(s, bit_list_to_int(s_l))
+            self.assertEqual(d, bit_list_to_int(d_l))
+
+        orig_dir = CrcComb.XOR_MATRIX_CACHE_DIR
+        with TemporaryDirectory() as d:
+            try:
+                CrcComb.XOR_MATRIX_CACHE_DIR = d
+                CrcComb._XOR_MATRIX_CACHE.pop((CRC_32.POLY, 32, 64), None)
+                self.assertEqual(CrcComb.buildCrcXorMatrixMasks(64, polyBits), m)
+                self.assertEqual(len(os.listdir(d)), 1)
+                # loaded from disk
+                CrcComb._XOR_MATRIX_CACHE.pop((CRC_32.POLY, 32, 64), None)
+                self.assertEqual(CrcComb.buildCrcXorMatrixMasks(64, polyBits), m)
+            finally:
+                CrcComb.XOR_MATRIX_CACHE_DIR = orig_dir
+
     def test_crc32_py(self):
         self.assertEqual(crc32(b"aa"), crc32(b"a", crc32(b"a")))
         # ! self.assertEqual(crc32(b"abcdefgh"),
@@ -1,4 +1,5 @@
 import re
+from typing import List
 
 
 def parsePolyStr_parse_n(string):
@@ -57,3 +58,47 @@ def parsePolyStr(polyStr, width):
         coefs[key] = value
 
     return coefs
+
+
+def gf2_matrix_mul(a: List[int], b: List[int]) -> List[int]:
+    """
+    Multiply two matrices over GF(2)
+
+    :param a: rows of matrix a, bit j of row i is the item (i, j)
+    :param b: rows of matrix b, the number of rows is the number of columns of a
+    :return: rows of matrix a * b (same format as the input)
+    """
+    res = []
+    for row_a in a:
+        r = 0
+        j = 0
+        while row_a:
+            if row_a & 1:
+                r ^= b[j]
+            row_a >>= 1
+            j += 1
+        res.append(r)
+    return res
+
+
+def gf2_matrix_vect_mul(a: List[int], v: int) -> int:
+    """
+    Multiply matrix and vector over GF(2)
+
+    :param a: rows of matrix (same format as in :func:`~.gf2_matrix_mul`)
+    :param v: vector, bit j is the item j
+    """
+    res = 0
+    for i, row in enumerate(a):
+        res |= (bin(row & v).count("1") & 1) << i
+    return res
+
+
+def gf2_matrix_powers(a: List[int], max_exponent: int) -> List[List[int]]:
+    """
+    :return: list of matrices a^0 (identity), a^1, ... a^max_exponent
+    """
+    res = [[1 << i for i in range(len(a))], ]
+    for _ in range(max_exponent):
+        res.append(gf2_matrix_mul(a, res[-1]))
+    return res
@@ -4,7 +4,8 @@
 import unittest
 
 from hwtLib.logic.crcPoly import CRC_32
-from hwtLib.logic.crcUtils import parsePolyStr
+from hwtLib.logic.crcUtils import parsePolyStr, gf2_matrix_mul, \
+    gf2_matrix_vect_mul, gf2_matrix_powers
 from pyMathBitPrecise.bit_utils import get_bit
 
 
@@ -17,6 +18,32 @@ class CrcUtilsTC(unittest.TestCase):
         expected = [get_bit(CRC_32.POLY, i) for i in range(CRC_32.WIDTH)]
         self.assertEqual(poly, expected)
 
+    def test_gf2_matrix_mul(self):
+        a = [0b011, 0b110, 0b101]
+        identity = [0b001, 0b010, 0b100]
+        self.assertEqual(gf2_matrix_mul(a, identity), a)
+        self.assertEqual(gf2_matrix_mul(identity, a), a)
+        # row 0 = row0(a) ^ row1(a), row 1 = row1(a) ^ row2(a), row 2 = row0(a) ^ row2(a)
+        self.assertEqual(gf2_matrix_mul(a, a), [0b101, 0b011, 0b110])
+
+    def test_gf2_matrix_vect_mul(self):
+        a = [0b011, 0b110, 0b101]
+        self.assertEqual(gf2_matrix_vect_mul(a, 0b000), 0b000)
+        self.assertEqual(gf2_matrix_vect_mul(a, 0b001), 0b101)
+        self.assertEqual(gf2_matrix_vect_mul(a, 0b111), 0b000)
+
+    def test_gf2_matrix_powers(self):
+        a = [0b011, 0b110, 0b101, 0b1001]
+        powers = gf2_matrix_powers(a, 5)
+        self.assertEqual(len(powers), 6)
+        self.assertEqual(powers[0], [0b0001, 0b0010, 0b0100, 0b1000])
+        self.assertEqual(powers[1], a)
+        for v in range(16):
+            ref = v
+            for p in powers:
+                self.assertEqual(gf2_matrix_vect_mul(p, v), ref)
+                ref = gf2_matrix_vect_mul(a, ref)
+
 
 if __name__ == "__main__":
     testLoader = unittest.TestLoader()
@@ -107,6 +107,142 @@ class NaiveCrcAccumulator:
         return v
 
 
+class TableCrcAccumulator(NaiveCrcAccumulator):
+    """
+    Table driven variant of :class:`~.NaiveCrcAccumulator` which processes
+    the input data by whole bytes (and optionally by N bytes at once, "slice-by-N").
+    The results are the same as for :class:`~.NaiveCrcAccumulator`,
+    words which are not a multiple of 8 bits are processed bit by bit.
+
+    :ivar ~.SLICE_BY: number of bytes processed in a single step
+    :note: the lookup tables are cached per (POLY, WIDTH, REFIN, SLICE_BY)
+    :note: In CPython the byte-by-byte variant (SLICE_BY=1) is usually the fastest one
+        because the slice-by-N requires more operations on Python int per byte.
+    """
+    _TABLE_CACHE = {}
+    _BYTE_REVERSED = [reverse_bits(i, 8) for i in range(256)]
+
+    def __init__(self, params: CRC_POLY, value: Optional[int]=None, slice_by: int=1):
+        assert slice_by >= 1, slice_by
+        self.SLICE_BY = slice_by
+        super(TableCrcAccumulator, self).__init__(params, value)
+        # the order of bits in the input byte differs from the direction of the register shift
+        self._reverseInBytes = bool(params.REFIN) != bool(params.REFOUT)
+        if params.REFIN:
+            # the register is shifted to the right, the lowest bit is the first one
+            self._regShift = 0
+        else:
+            # the register is shifted to the left, for the width which is not
+            # sufficient for the whole slice the register is extended on lower bits
+            self._regShift = max(0, 8 * slice_by - params.WIDTH)
+        self._regWidth = params.WIDTH + self._regShift
+        self._tables = self._getTables(params.POLY & self.bitMask, params.WIDTH,
+                                       bool(params.REFIN), slice_by)
+
+    @classmethod
+    def _getTables(cls, poly: int, width: int, refin: bool, slice_by: int):
+        k = (poly, width, refin, slice_by)
+        try:
+            return cls._TABLE_CACHE[k]
+        except KeyError:
+            pass
+
+        if refin:
+            poly = reverse_bits(poly, width)
+            t0 = []
+            for b in range(256):
+                v = b
+                for _ in range(8):
+                    if v & 1:
+                        v = (v >> 1) ^ poly
+                    else:
+                        v >>= 1
+                t0.append(v)
+            tables = [t0]
+            for _ in range(slice_by - 1):
+                prev = tables[-1]
+                tables.append([(v >> 8) ^ t0[v & 0xff] for v in prev])
+        else:
+            regShift = max(0, 8 * slice_by - width)
+            regWidth = width + regShift
+            poly <<= regShift
+            regMask = mask(regWidth)
+            topBit = 1 << (regWidth - 1)
+            t0 = []
+            for b in range(256):
+                v = b << (regWidth - 8)
+                for _ in range(8):
+                    if v & topBit:
+                        v = ((v << 1) & regMask) ^ poly
+                    else:
+                        v = (v << 1) & regMask
+                t0.append(v)
+            tables = [t0]
+            for _ in range(slice_by - 1):
+                prev = tables[-1]
+                tables.append([((v << 8) & regMask) ^ t0[v >> (regWidth - 8)] for v in prev])
+
+        cls._TABLE_CACHE[k] = tables
+        return tables
+
+    def takeBytes(self, data: bytes):
+        """
+        Process input bytes, same as :meth:`~.takeWord` (b, 8) for each byte.
+        """
+        if self._reverseInBytes:
+            br = self._BYTE_REVERSED
+            data = bytes(br[b] for b in data)
+
+        tables = self._tables
+        t0 = tables[0]
+        N = self.SLICE_BY
+        N8 = N * 8
+        if N > 1:
+            end = len(data) - len(data) % N
+        else:
+            end = 0
+
+        if self.params.REFIN:
+            v = self.value
+            tablesForBytes = tables[::-1]
+            for off in range(0, end, N):
+                x = v ^ int.from_bytes(data[off:off + N], "little")
+                v = x >> N8
+                # the first byte of the slice is followed by N-1 bytes and uses the last table
+                for t in tablesForBytes:
+                    v ^= t[x & 0xff]
+                    x >>= 8
+            for b in data[end:]:
+                v = (v >> 8) ^ t0[(v ^ b) & 0xff]
+            self.value = v
+        else:
+            regWidth = self._regWidth
+            regMask = mask(regWidth)
+            topShift = regWidth - 8
+            v = self.value << self._regShift
+            sliceShift = regWidth - N8
+            for off in range(0, end, N):
+                x = v ^ (int.from_bytes(data[off:off + N], "big") << sliceShift)
+                v = (x << N8) & regMask
+                # the last byte of the slice is the lowest one and uses the first table
+                for t in tables:
+                    v ^= t[(x >> sliceShift) & 0xff]
+                    x >>= 8
+            for b in data[end:]:
+                v = ((v << 8) & regMask) ^ t0[(v >> topShift) ^ b]
+            self.value = v >> self._regShift
+
+    def takeWord(self, word: int, width: int):
+        """
+        :see: :meth:`NaiveCrcAccumulator.takeWord`
+        """
+        assert (word >> width) == 0, (word, width)
+        if width % 8:
+            return super(TableCrcAccumulator, self).takeWord(word, width)
+
+        self.takeBytes(word.to_bytes(width // 8, "little" if self.REFOUT else "big"))
+
+
 def naive_crc(dataBits, crcBits, polyBits,
               refin=False, refout=False):
     crc_mask = CrcComb.buildCrcXorMatrix(len(dataBits), polyBits)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from binascii import crc32
+import unittest
+
+from hwtLib.logic.crcPoly import CRC_32, CRC_5_USB, CRC_16_USB, \
+    CRC_16_CCITT, CRC_8_CCITT, CRC_64_ECMA, CRC_3_GSM
+from hwtLib.logic.crc_test_utils import NaiveCrcAccumulator, \
+    TableCrcAccumulator
+
+
+class TableCrcAccumulatorTC(unittest.TestCase):
+    DATA = bytes((i * 7 + 3) & 0xff for i in range(67))
+
+    def _naive(self, poly, data):
+        r = NaiveCrcAccumulator(poly)
+        for d in data:
+            r.takeWord(d, 8)
+        return r
+
+    def test_same_as_naive(self):
+        for poly in [CRC_32, CRC_5_USB, CRC_16_USB, CRC_16_CCITT, CRC_8_CCITT, CRC_64_ECMA, CRC_3_GSM]:
+            for refin in (False, True):
+                for refout in (False, True):
+                    p = type(poly.__name__, (poly,), {"REFIN": refin, "REFOUT": refout})
+                    ref = self._naive(p, self.DATA).getFinalValue()
+                    for slice_by in (1, 4, 8):
+                        r = TableCrcAccumulator(p, slice_by=slice_by)
+                        r.takeBytes(self.DATA)
+                        self.assertEqual(r.getFinalValue(), ref, (poly, refin, refout, slice_by))
+
+    def test_takeWord(self):
+        for slice_by in (1, 4):
+            r = TableCrcAccumulator(CRC_5_USB, slice_by=slice_by)
+            # not a multiple of 8b, processed bit by bit
+            r.takeWord(0x15, 7)
+            r.takeWord(0xE, 4)
+            self.assertEqual(r.getFinalValue(), 0b10111)
+
+            r0 = NaiveCrcAccumulator(CRC_32)
+            r1 = TableCrcAccumulator(CRC_32, slice_by=slice_by)
+            for w in (0x01020304, 0xdeadbeef, 0):
+                r0.takeWord(w, 32)
+                r1.takeWord(w, 32)
+            self.assertEqual(r1.getValue(), r0.getValue())
+
+    def test_crc32_binascii(self):
+        for slice_by in (1, 4, 8):
+            r = TableCrcAccumulator(CRC_32, slice_by=slice_by)
+            r.takeBytes(self.DATA)
+            self.assertEqual(r.getValue() ^ 0xffffffff, crc32(self.DATA))
+
+            # continue from previous value
+            r = TableCrcAccumulator(CRC_32, slice_by=slice_by)
+            r.takeBytes(self.DATA[:10])
+            r = TableCrcAccumulator(CRC_32, r.getValue() ^ CRC_32.XOROUT, slice_by=slice_by)
+            r.takeBytes(self.DATA[10:])
+            self.assertEqual(r.getValue() ^ 0xffffffff, crc32(self.DATA))
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(TableCrcAccumulatorTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -7,6 +7,7 @@ from hwt.pyUtils.typingFuture import override
 from hwtLib.handshaked.builder import HsBuilder
 from hwtLib.logic.crcPoly import CRC_32, CRC_32C
 from hwtLib.mem.cuckooHashTable import CuckooHashTable
+from hwtLib.mem.hashTableCoreBucketized import HashTableCoreBucketized
 from hwtLib.mem.hashTableCoreWithRam import HashTableCoreWithRam
 from hwtLib.mem.hashTable_intf import HwIOHashTable
 
@@ -15,6 +16,9 @@ class CuckooHashTableWithRam(CuckooHashTable):
     """
     A cuckoo hash table core with integrated memory
 
+    :ivar ~.BUCKET_SLOTS: if > 1 each table is :class:`hwtLib.mem.hashTableCoreBucketized.HashTableCoreBucketized`
+        with this number of items in bucket (higher load factor, shorter reinsert chains)
+
     .. hwt-autodoc:: _example_CuckooHashTableWithRam
     """
 
@@ -24,14 +28,19 @@ class CuckooHashTableWithRam(CuckooHashTable):
 
     @override
     def hwConfig(self):
-        CuckooHashTable.hwConfig(self)
+        super(CuckooHashTableWithRam, self).hwConfig()
         self.TABLE_CNT = len(self.polynomials)
         self.POLYNOMIALS = HwParam(tuple(self.polynomials))
+        self.BUCKET_SLOTS = HwParam(1)
 
     @override
     def hwDeclr(self):
         self._declr_outer_io()
-        tables = HObjList(HashTableCoreWithRam(p) for p in self.polynomials)
+        if self.BUCKET_SLOTS == 1:
+            table_cls = HashTableCoreWithRam
+        else:
+            table_cls = HashTableCoreBucketized
+        tables = HObjList(table_cls(p) for p in self.polynomials)
         self.configure_tables(tables)
         self.table_cores = tables
 
@@ -44,7 +53,7 @@ class CuckooHashTableWithRam(CuckooHashTable):
             t_io.lookupRes(HsBuilder(self, t.io.lookupRes).buff(latency=(1, 2)).end)
 
         self.tables = list(self.tables_tmp)
-        CuckooHashTable.hwImpl(self)
+        super(CuckooHashTableWithRam, self).hwImpl()
 
 
 def _example_CuckooHashTableWithRam():
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import List
+
+from hwt.code import FsmBuilder, Or, If, SwitchLogic, Concat
+from hwt.code_utils import rename_signal
+from hwt.hdl.types.bits import HBits
+from hwt.hdl.types.enum import HEnum
+from hwt.hdl.types.struct import HStruct
+from hwt.hwIOs.std import HwIODataRdVld
+from hwt.hwIOs.utils import propagateClkRstn
+from hwt.hwParam import HwParam
+from hwt.math import log2ceil
+from hwt.pyUtils.typingFuture import override
+from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
+from hwtLib.handshaked.builder import HsBuilder
+from hwtLib.handshaked.streamNode import StreamNode
+from hwtLib.logic.crcPoly import CRC_32, CRC_32C
+from hwtLib.mem.cuckooHashTablWithRam import CuckooHashTableWithRam
+from hwtLib.mem.cuckooHashTable import CuckooHashTable
+from hwtLib.mem.hashTableCore import HashTableCore
+
+
+STASH_ITEM_STATE = HEnum("STASH_ITEM_STATE", ["FREE", "PENDING", "PARKED", "LINGER"])
+
+
+class CuckooHashTableStash(CuckooHashTable):
+    """
+    Cuckoo hash table with a stash (victim buffer) where the lookups are never blocked by inserts.
+
+    * Insert only stores the item into a free stash slot (or updates the data of the item with
+      same key which is already in stash), one insert can be accepted each clock cycle
+      while there is a free stash slot.
+    * The insert engine (FSM) moves the items from stash to tables in background, the item which is
+      swapped out of the table during reinsert is stored in to the same stash slot
+      in the same clock cycle as the write to table. Because of this the item is always
+      in table or in stash.
+    * Lookup is performed in the tables and in the stash (parallel key compare on the output of tables).
+      One lookup can be accepted each clock cycle (up to MAX_LOOKUP_OVERLAP lookups in flight).
+      The lookups have priority on lookup ports of tables, if the insert engine was blocked by a lookup
+      it gets the lookup ports in next cycle. Because of this the lookup is delayed at most by 1 clock cycle
+      for each step of the insert engine, it never waits on a whole reinsert chain.
+    * The item moved from stash to the table stays visible in the stash ("LINGER" state) for
+      the lookups which were in flight at the time of the write to table (the table read of such a lookup
+      may have happened before the write).
+    * If the item can not be placed in to tables in MAX_REINSERT swaps it stays in the stash ("PARKED" state),
+      where it is still visible for lookups and "insertRes" with pop=1 is produced.
+      If there is no free stash slot the insert is blocked.
+
+    The priority of the lookup result is: pending/parked item in stash, item in table, lingering item in stash.
+
+    :ivar ~.STASH_SIZE: number of slots in stash (max number of items which are waiting for insert or parked)
+    :note: "insertRes" is produced for each item which was placed into tables or parked in the stash,
+        an insert which only updated the data of the item in stash does not produce an "insertRes".
+    :note: The lookups are not blocked during the cleaning, the lookup executed during the cleaning
+        may found an item which is being cleaned.
+
+    .. hwt-autodoc::
+    """
+
+    @override
+    def hwConfig(self):
+        super(CuckooHashTableStash, self).hwConfig()
+        self.STASH_SIZE = HwParam(4)
+
+    @override
+    def configure_tables(self, tables: List[HashTableCore]):
+        super(CuckooHashTableStash, self).configure_tables(tables)
+        for t in tables:
+            # lookupId[0] = 1 for lookups from "lookup" interface, 0 for the insert engine
+            t.LOOKUP_ID_WIDTH = 1
+
+    def stash_item_active(self, item: RtlSignal):
+        """
+        :return: flag which tells that item in stash is not in tables yet
+        """
+        return item.state._eq(STASH_ITEM_STATE.PENDING) | item.state._eq(STASH_ITEM_STATE.PARKED)
+
+    def stash_item_lingering(self, item: RtlSignal):
+        """
+        :return: flag which tells that the item was already written into table but it has to be still visible
+            for the lookups which were in progress at the time of the write
+        """
+        return item.state._eq(STASH_ITEM_STATE.LINGER) & (item.linger_cnt != 0)
+
+    def stash_item_free(self, item: RtlSignal):
+        return item.state._eq(STASH_ITEM_STATE.FREE) | \
+            (item.state._eq(STASH_ITEM_STATE.LINGER) & item.linger_cnt._eq(0))
+
+    def stash_mux(self, name: str, sel: List[RtlSignal], items: List[RtlSignal], field_name: str):
+        """
+        Select a field from stash item selected by one hot encoded sel
+        """
+        t = getattr(items[0], field_name)._dtype
+        res = self._sig(name, t)
+        SwitchLogic([(s, res(getattr(item, field_name))) for s, item in zip(sel, items)],
+                    default=res(None))
+        return res
+
+    def first_one_hot(self, name: str, flags: List[RtlSignal]):
+        """
+        :return: one hot encoded index of the first flag which is 1
+        """
+        res = []
+        for i, f in enumerate(flags):
+            if i == 0:
+                res.append(f)
+            else:
+                res.append(rename_signal(self, f & ~Or(*flags[:i]), f"{name:s}{i:d}"))
+        return res
+
+    def lookupRes_driver_with_stash(self, lookupKey: HwIODataRdVld, stash: List[RtlSignal],
+                                    lookupFoundOH: List[RtlSignal], headIsLookup: RtlSignal):
+        """
+        Resolve result of the lookup from the result of lookup in tables and from the stash
+        """
+        lookupRes = self.lookupRes
+        tableResVld = StreamNode(masters=[t.lookupRes for t in self.tables]).ack()
+        lookupRes.vld(tableResVld & headIsLookup & lookupKey.vld)
+
+        stashActiveHit = [self.stash_item_active(item) & item.key._eq(lookupKey.data)
+                          for item in stash]
+        stashActiveHit = self.first_one_hot("stashActiveHit", stashActiveHit)
+        stashLingerHit = [self.stash_item_lingering(item) & item.key._eq(lookupKey.data)
+                          for item in stash]
+        stashLingerHit = self.first_one_hot("stashLingerHit", stashLingerHit)
+
+        def fromStash(item: RtlSignal):
+            res = [
+                lookupRes.found(1),
+                lookupRes.occupied(1),
+            ]
+            if self.LOOKUP_KEY:
+                res.append(lookupRes.key(item.key))
+            if self.DATA_WIDTH:
+                res.append(lookupRes.data(item.data))
+            return res
+
+        def fromTable(t):
+            return lookupRes(t.lookupRes, exclude={lookupRes.vld, lookupRes.rd})
+
+        SwitchLogic(
+            [(hit, fromStash(item)) for hit, item in zip(stashActiveHit, stash)] +
+            [(found, fromTable(t)) for found, t in zip(lookupFoundOH, self.tables)] +
+            [(hit, fromStash(item)) for hit, item in zip(stashLingerHit, stash)],
+            default=fromTable(self.tables[0])
+        )
+
+    @override
+    def hwImpl(self):
+        propagateClkRstn(self)
+        STASH_SIZE = self.STASH_SIZE
+        assert STASH_SIZE > 0, STASH_SIZE
+        assert self.MAX_REINSERT > 0, self.MAX_REINSERT
+        insert = self.insert
+        delete = self.delete
+        lookup = self.lookup
+        lookupRes = self.lookupRes
+        insertRes = self.insertRes
+
+        lookup_in_progress = self.lookup_trans_cntr()
+        stash_item_t = HStruct(
+            (HBits(self.KEY_WIDTH), "key"),
+            (HBits(self.DATA_WIDTH), "data"),
+            (HBits(log2ceil(self.MAX_REINSERT + 1)), "reinsert_cntr"),
+            (lookup_in_progress._dtype, "linger_cnt"),
+            (STASH_ITEM_STATE, "state"),
+        )
+        stash = [self._reg(f"stash{i:d}", stash_item_t, def_val={"state": STASH_ITEM_STATE.FREE})
+                 for i in range(STASH_SIZE)]
+        # one hot encoded index of stash item which is processed by insert engine
+        curOH = self._reg("curOH", HBits(STASH_SIZE, force_vector=STASH_SIZE == 1), def_val=0)
+        curOH_bits = [curOH[i] for i in range(STASH_SIZE)]
+        curKey = self.stash_mux("curKey", curOH_bits, stash, "key")
+        curData = self.stash_mux("curData", curOH_bits, stash, "data")
+        curReinsertCntr = self.stash_mux("curReinsertCntr", curOH_bits, stash, "reinsert_cntr")
+        # delete is processed by insert engine
+        isDelete = self._reg("isDelete", def_val=0)
+        deleteKey = self._reg("deleteKey", HBits(self.KEY_WIDTH))
+
+        # keys of lookups in progress for the check in the stash
+        lookupKeyIn = HwIODataRdVld()
+        lookupKeyIn.DATA_WIDTH = self.KEY_WIDTH
+        self.lookupKeyIn = lookupKeyIn
+        lookupKey = HsBuilder(self, lookupKeyIn).buff(self.MAX_LOOKUP_OVERLAP).end
+
+        cleanAck = self._sig("cleanAck")
+        cleanAddr, cleanLast = self.clean_addr_iterator(cleanAck)
+        lookupResRead = self._sig("lookupResRead")
+        (tableResVld,
+         insertFinal,
+         lookupFoundOH,
+         insertTargetOH) = self.tables_lookupRes_resolver(lookupResRead)
+        headIsLookup = rename_signal(self, self.tables[0].lookupRes.lookupId[0], "headIsLookup")
+        tableLookupRd = StreamNode(slaves=[t.lookup for t in self.tables]).ack()
+        insertAck = StreamNode(slaves=[t.insert for t in self.tables]).ack()
+
+        stashPending = [item.state._eq(STASH_ITEM_STATE.PENDING) for item in stash]
+        hasPending = rename_signal(self, Or(*stashPending), "hasPending")
+
+        # the item swapped out of the table, if there is a newer version of this item in stash
+        # the item from table is discarded
+        victimKey = self._sig("victimKey", HBits(self.KEY_WIDTH))
+        SwitchLogic([(insertTargetOH[i], victimKey(t.lookupRes.key))
+                     for i, t in enumerate(self.tables)],
+                    default=victimKey(None))
+        victimObsolete = rename_signal(self, Or(*(
+            self.stash_item_active(item) & ~curOH[i] & item.key._eq(victimKey)
+            for i, item in enumerate(stash))), "victimObsolete")
+        insertDone = rename_signal(self, insertFinal | victimObsolete, "insertDone")
+        lookupFound = Or(*lookupFoundOH)
+
+        fsm_t = HEnum("insertFsm_t", ["idle", "cleaning",
+                                      "lookup", "lookupResWaitRd",
+                                      "lookupResAck"])
+        engineResVld = rename_signal(self, tableResVld & ~headIsLookup, "engineResVld")
+        engineLookupAck = self._sig("engineLookupAck")
+        state = FsmBuilder(self, fsm_t, "insertFsm")\
+            .Trans(fsm_t.idle,
+                (self.clean.vld, fsm_t.cleaning),
+                (delete.vld | hasPending, fsm_t.lookup)
+            ).Trans(fsm_t.cleaning,
+                (insertAck & cleanLast, fsm_t.idle),
+            ).Trans(fsm_t.lookup,
+                # the item can not be placed, keep it in stash
+                (~isDelete & curReinsertCntr._eq(0) & insertRes.rd, fsm_t.idle),
+                (((curReinsertCntr != 0) | isDelete) & engineLookupAck, fsm_t.lookupResWaitRd)
+            ).Trans(fsm_t.lookupResWaitRd,
+                (engineResVld, fsm_t.lookupResAck)
+            ).Trans(fsm_t.lookupResAck,
+                (isDelete & (~lookupFound | insertAck), fsm_t.idle),
+                (~isDelete & insertAck & insertDone & insertRes.rd, fsm_t.idle),
+                (~isDelete & insertAck & ~insertDone, fsm_t.lookup)
+            ).stateReg
+        st_idle = state._eq(fsm_t.idle)
+        st_lookup = state._eq(fsm_t.lookup)
+        st_lookupResAck = state._eq(fsm_t.lookupResAck)
+
+        cleanAck(insertAck & state._eq(fsm_t.cleaning))
+        lookupResRead(state._eq(fsm_t.lookupResWaitRd) & ~headIsLookup)
+
+        # commands for insert engine
+        cleanStart = rename_signal(self, st_idle & self.clean.vld, "cleanStart")
+        self.clean.rd(st_idle)
+        deleteStart = rename_signal(self, st_idle & ~self.clean.vld & delete.vld, "deleteStart")
+        delete.rd(st_idle & ~self.clean.vld)
+        insertPick = self.first_one_hot("insertPick", stashPending)
+        If(st_idle,
+           isDelete(delete.vld),
+           deleteKey(delete.key),
+           curOH(Concat(*reversed(insertPick))),
+        )
+
+        # insert into stash
+        insertMatch = [self.stash_item_active(item) & item.key._eq(insert.key)
+                       for item in stash]
+        insertMatchBusy = Or(*(m & curOH[i] & ~st_idle for i, m in enumerate(insertMatch)))
+        insertMatchAny = Or(*insertMatch)
+        insertAlloc = self.first_one_hot("insertAlloc", [self.stash_item_free(item) for item in stash])
+        insert.rd(~cleanStart &
+                  ~(deleteStart & delete.key._eq(insert.key)) &
+                  ~insertMatchBusy &
+                  (insertMatchAny | Or(*insertAlloc)))
+        stashInsertAck = rename_signal(self, insert.vld & insert.rd, "stashInsertAck")
+
+        # write the item processed by insert engine to table
+        placed = rename_signal(self, st_lookupResAck & ~isDelete & insertAck & insertDone & insertRes.rd, "placed")
+        swapped = rename_signal(self, st_lookupResAck & ~isDelete & insertAck & ~insertDone, "swapped")
+        parked = rename_signal(self, st_lookup & ~isDelete & curReinsertCntr._eq(0) & insertRes.rd, "parked")
+        lookupResTrans = lookupRes.vld & lookupRes.rd
+
+        for i, item in enumerate(stash):
+            If(cleanStart,
+               item.state(STASH_ITEM_STATE.FREE),
+            ).Elif(deleteStart & self.stash_item_active(item) & item.key._eq(delete.key),
+               item.state(STASH_ITEM_STATE.FREE),
+            ).Elif(curOH[i] & parked,
+               item.state(STASH_ITEM_STATE.PARKED),
+            ).Elif(curOH[i] & placed,
+               item.state(STASH_ITEM_STATE.LINGER),
+               # the lookups in progress (including the one which is starting now)
+               # may have been read the table before this write
+               item.linger_cnt(lookup_in_progress.next),
+            ).Elif(curOH[i] & swapped,
+               SwitchLogic([
+                   (insertTargetOH[t_i], [
+                       # load stash from item found previously
+                       # :note: happens in same time as write to table
+                       #     so the stash and item in table is swapped
+                       item.key(t.lookupRes.key),
+                       item.data(t.lookupRes.data),
+                       item.reinsert_cntr(item.reinsert_cntr - 1),
+                    ])
+                    for t_i, t in enumerate(self.tables)
+               ]),
+            ).Elif(stashInsertAck & insertMatch[i],
+               # update of the item which is not in table yet
+               item.data(insert.data),
+            ).Elif(stashInsertAck & ~insertMatchAny & insertAlloc[i],
+               item.key(insert.key),
+               item.data(insert.data),
+               item.reinsert_cntr(self.MAX_REINSERT),
+               item.state(STASH_ITEM_STATE.PENDING),
+            ).Elif(lookupResTrans & self.stash_item_lingering(item),
+               item.linger_cnt(item.linger_cnt - 1),
+            )
+
+        # lookup ports of tables, lookups from "lookup" interface have priority
+        # but if the insert engine was blocked it gets the next cycle
+        engineLookupReq = rename_signal(self, st_lookup & ((curReinsertCntr != 0) | isDelete), "engineLookupReq")
+        enginePriority = self._reg("enginePriority", def_val=0)
+        anotherLookupPossible = lookup_in_progress != self.MAX_LOOKUP_OVERLAP - 1
+        lookupAllowed = rename_signal(
+            self,
+            anotherLookupPossible & lookupKeyIn.rd & ~(enginePriority & engineLookupReq),
+            "lookupAllowed")
+        lookupEn = rename_signal(self, lookup.vld & lookupAllowed, "lookupEn")
+        lookup.rd(lookupAllowed & tableLookupRd)
+        lookupKeyIn.data(lookup.key)
+        lookupKeyIn.vld(lookupEn & tableLookupRd)
+        engineLookupEn = rename_signal(self, ~lookupEn & engineLookupReq, "engineLookupEn")
+        engineLookupAck(engineLookupEn & tableLookupRd)
+        If(engineLookupAck,
+           enginePriority(0)
+        ).Elif(engineLookupReq & lookupEn,
+           enginePriority(1)
+        )
+        tableKey = self._sig("tableKey", HBits(self.KEY_WIDTH))
+        If(lookupEn,
+           tableKey(lookup.key)
+        ).Elif(isDelete,
+           tableKey(deleteKey)
+        ).Else(
+           tableKey(curKey)
+        )
+        for t in self.tables:
+            t.lookup.lookupId(lookupEn)
+        self.tables_lookup_driver(state, tableKey, lookupEn | engineLookupEn)
+
+        # results of lookups from tables
+        engineResNext = st_lookupResAck & (state.next != fsm_t.lookupResAck)
+        StreamNode(masters=[t.lookupRes for t in self.tables]).sync(
+            (headIsLookup & lookupKey.vld & lookupRes.rd) | engineResNext)
+        lookupKey.rd(tableResVld & headIsLookup & lookupRes.rd)
+        self.lookupRes_driver_with_stash(lookupKey, stash, lookupFoundOH, headIsLookup)
+
+        # table insert ports
+        insertIndex = self.insert_addr_select(insertTargetOH, state, cleanAddr)
+        isCleaning = state._eq(fsm_t.cleaning)
+        for i, t in enumerate(self.tables):
+            ins = t.insert
+            ins.hash(insertIndex)
+            ins.key(isDelete._ternary(deleteKey, curKey))
+            if self.DATA_WIDTH:
+                ins.data(curData)
+            ins.item_vld(~isCleaning & ~isDelete)
+            ins.vld(isCleaning |
+                    (st_lookupResAck & insertTargetOH[i] &
+                     isDelete._ternary(lookupFound, ~insertDone | insertRes.rd)))
+
+        insertRes.vld(~isDelete & (
+            (st_lookup & curReinsertCntr._eq(0)) |
+            (st_lookupResAck & insertAck & insertDone)
+        ))
+        insertRes.key(curKey)
+        if self.DATA_WIDTH:
+            insertRes.data(curData)
+        insertRes.pop(st_lookup)
+
+
+class CuckooHashTableStashWithRam(CuckooHashTableWithRam, CuckooHashTableStash):
+    """
+    :class:`~.CuckooHashTableStash` with integrated memory
+
+    .. hwt-autodoc:: _example_CuckooHashTableStashWithRam
+    """
+
+
+def _example_CuckooHashTableStashWithRam():
+    return CuckooHashTableStashWithRam([CRC_32, CRC_32C])
+
+
+if __name__ == "__main__":
+    from hwt.synth import to_rtl_str
+
+    m = _example_CuckooHashTableStashWithRam()
+    print(to_rtl_str(m))
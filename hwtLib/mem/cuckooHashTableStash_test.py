@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from hwt.constants import NOP
+from hwtLib.logic.crcPoly import CRC_32, CRC_32C
+from hwtLib.mem.cuckooHashTableStash import CuckooHashTableStashWithRam
+from hwtLib.mem.cuckooHashTableWithRam_test import CuckooHashTableWithRamTC, \
+    CuckooHashTableWithRam_common_TC
+from hwtSimApi.constants import CLK_PERIOD
+
+
+class CuckooHashTableStashWithRamTC(CuckooHashTableWithRamTC):
+
+    @classmethod
+    def setUpClass(cls):
+        dut = CuckooHashTableStashWithRam([CRC_32, CRC_32])
+        dut.KEY_WIDTH = 16
+        dut.DATA_WIDTH = 8
+        dut.LOOKUP_KEY = True
+        dut.TABLE_SIZE = 32 * 2
+        cls.compileSim(dut)
+
+    def test_lookupDuringInsert(self, randomize=False):
+        dut = self.dut
+        self.cleanupMemory()
+        reference = {i * 7 + 1: i + 2 for i in range(12)}
+        for k, v in sorted(reference.items(), key=lambda x: x[0]):
+            # the lookup is executed in the same clock cycle as the insert
+            # and the item has to be found (in stash or in table)
+            dut.insert._ag.data.append((k, v))
+            dut.lookup._ag.data.append(k)
+
+        t = 80
+        if randomize:
+            self.randomize_all()
+            t *= 3
+
+        self.runSim(t * CLK_PERIOD)
+        self.checkContains(reference)
+        self.assertValSequenceEqual(dut.lookupRes._ag.data,
+                                    [(k, v, 1, 1) for k, v in sorted(reference.items(), key=lambda x: x[0])])
+
+    def test_lookupDuringInsert_randomized(self):
+        self.test_lookupDuringInsert(randomize=True)
+
+    def test_lookupThroughput(self):
+        dut = self.dut
+        self.cleanupMemory()
+        reference = {i + 1: i + 2 for i in range(16)}
+        LOOKUP_CNT = 64
+        for k, v in sorted(reference.items(), key=lambda x: x[0]):
+            dut.insert._ag.data.append((k, v))
+
+        expected = []
+        for i in range(LOOKUP_CNT):
+            k = (i % len(reference)) + 1
+            dut.lookup._ag.data.append(k)
+            expected.append((k, reference[k], 1, 1))
+
+        # lookups are delayed at most by 1 clk for each lookup of insert engine
+        self.runSim((LOOKUP_CNT + 2 * len(reference) + 10) * CLK_PERIOD)
+        self.assertValSequenceEqual(dut.lookupRes._ag.data, expected)
+        self.checkContains(reference)
+
+
+class CuckooHashTableStashWithRam_2Table_collisionTC(CuckooHashTableWithRam_common_TC):
+
+    @classmethod
+    def setUpClass(cls):
+        dut = CuckooHashTableStashWithRam([CRC_32, CRC_32C])
+        dut.KEY_WIDTH = 8
+        dut.DATA_WIDTH = 8
+        dut.LOOKUP_KEY = True
+        dut.TABLE_SIZE = 2 * 2
+        dut.MAX_REINSERT = 4
+        dut.STASH_SIZE = 4
+        cls.compileSim(dut)
+
+    def test_insert_coliding(self, N=6, randomized=False):
+        if randomized:
+            self.randomize_all()
+        self.cleanupMemory()
+
+        dut = self.dut
+        reference = {i + 1: i + 2 for i in range(N)}
+        for k, v in sorted(reference.items(), key=lambda x: x[0]):
+            dut.insert._ag.data.append((k, v))
+
+        t = N
+        if randomized:
+            t *= 3
+
+        lookup_delay = 15 * t
+        dut.lookup._ag.data.extend([NOP for _ in range(lookup_delay)])
+        dut.lookup._ag.data.extend(sorted(reference.keys()))
+
+        self.runSim((15 * t + 2 * N + 20) * CLK_PERIOD)
+        self.assertEqual(len(dut.insertRes._ag.data), N)
+        table = self.hashTableAsDict()
+        self.assertGreater(len(table), 0)
+        for pop, key, data in dut.insertRes._ag.data:
+            if pop:
+                # the item is parked in stash
+                key = int(key)
+                self.assertNotIn(key, table)
+                table[key] = data
+
+        self.checkContains(reference, table)
+        # items from tables and stash have to be found
+        self.assertValSequenceEqual(dut.lookupRes._ag.data,
+                                    [(k, v, 1, 1) for k, v in sorted(reference.items(), key=lambda x: x[0])])
+
+    def test_insert_coliding_randomized(self, N=6):
+        self.test_insert_coliding(N=N, randomized=True)
+
+
+CuckooHashTableStashWithRamTCs = [
+    CuckooHashTableStashWithRamTC,
+    CuckooHashTableStashWithRam_2Table_collisionTC,
+]
+
+if __name__ == "__main__":
+    import unittest
+    testLoader = unittest.TestLoader()
+    # suite = unittest.TestSuite([CuckooHashTableStashWithRamTC("test_lookupDuringInsert")])
+    loadedTcs = [testLoader.loadTestsFromTestCase(tc) for tc in CuckooHashTableStashWithRamTCs]
+    suite = unittest.TestSuite(loadedTcs)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -264,10 +264,44 @@ class CuckooHashTableWithRam_2Table_collisionTC(CuckooHashTableWithRam_common_TC
         self.test_insert_coliding(N=N, randomized=True)
 
 
+class CuckooHashTableWithRam_bucketizedTC(CuckooHashTableWithRam_common_TC):
+
+    @classmethod
+    def setUpClass(cls):
+        dut = CuckooHashTableWithRam([CRC_32, CRC_32C])
+        dut.KEY_WIDTH = 16
+        dut.DATA_WIDTH = 8
+        dut.LOOKUP_KEY = True
+        dut.TABLE_SIZE = 32 * 2
+        dut.BUCKET_SLOTS = 4
+        cls.compileSim(dut)
+
+    def setUp(self):
+        SimTestCase.setUp(self)
+        m = self.rtl_simulator.model
+        self.TABLE_MEMS = [getattr(getattr(m, f"table_cores_{i:d}_inst"), f"table_{s_i:d}_inst").io.ram_memory
+                           for i in range(len(self.dut.POLYNOMIALS))
+                           for s_i in range(self.dut.BUCKET_SLOTS)]
+
+    def test_90p_fill(self):
+        dut = self.dut
+        self.cleanupMemory()
+        CNT = int(self.dut.TABLE_SIZE * 0.9)
+        reference = {i + 1: i + 2 for i in range(CNT)}
+        for k, v in sorted(reference.items(), key=lambda x: x[0]):
+            dut.insert._ag.data.append((k, v))
+
+        self.runSim(CNT * 10 * CLK_PERIOD)
+        self.assertValSequenceEqual([d[0] for d in dut.insertRes._ag.data],
+                                    [0 for _ in range(CNT)])
+        self.checkContains(reference)
+
+
 CuckooHashTableWithRamTCs = [
     CuckooHashTableWithRamTC,
     CuckooHashTableWithRam_1TableTC,
     CuckooHashTableWithRam_2Table_collisionTC,
+    CuckooHashTableWithRam_bucketizedTC,
 ]
 
 if __name__ == "__main__":
@@ -110,6 +110,7 @@ class HashTableCore(HwModule):
         # tmp storage for original key and hash for later check
         origKeyIn = HwIOLookupKey()
         origKeyIn.KEY_WIDTH = self.KEY_WIDTH
+        origKeyIn.LOOKUP_ID_WIDTH = self.LOOKUP_ID_WIDTH
         self.origKeyIn = origKeyIn
 
         origKeyIn.key(lookup.key)
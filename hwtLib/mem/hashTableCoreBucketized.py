@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import List
+
+from hwt.code import If, Or, SwitchLogic, Concat
+from hwt.hdl.types.bits import HBits
+from hwt.hObjList import HObjList
+from hwt.hwIOs.std import HwIODataRdVld
+from hwt.hwIOs.utils import propagateClkRstn
+from hwt.hwParam import HwParam
+from hwt.math import log2ceil, isPow2
+from hwt.pyUtils.typingFuture import override
+from hwtLib.commonHwIO.addr_data import HwIOAddrDataRdVld
+from hwtLib.handshaked.builder import HsBuilder
+from hwtLib.handshaked.ramAsAddrDataRdVld import RamAsAddrDataRdVld, \
+    HwIORamRdVldR
+from hwtLib.handshaked.streamNode import StreamNode
+from hwtLib.logic.crcPoly import CRC_32
+from hwtLib.mem.hashTableCore import HashTableCore
+from hwtLib.mem.hashTable_intf import HwIOLookupKey
+from hwtLib.mem.ram import RamSingleClock
+
+
+class HashTableCoreBucketized(HashTableCore):
+    """
+    Hash table where the hash selects a bucket of BUCKET_SLOTS items,
+    all items in bucket are read and compared with the key in parallel.
+    This allows higher load factor than :class:`~.HashTableCoreWithRam`
+    because the items with colliding hash are stored in the same bucket.
+
+    The memory has a separate column for each slot of the bucket (all columns use the same address),
+    which is equivalent to a single memory with a bucket in each word and with write enable for each slot.
+    Because of this the insert writes only a single slot without read-modify-write.
+
+    The "hash" on the io interface is an index of the item in table (Concat(bucket index, slot index)),
+    the interface is the same as for :class:`~.HashTableCore` so this component can be used in
+    :class:`hwtLib.mem.cuckooHashTable.CuckooHashTable`.
+    The lookupRes contains:
+
+    * the found item (found=1, occupied=1)
+    * or the first empty slot in bucket (found=0, occupied=0)
+    * or if the bucket is full, the victim slot (found=0, occupied=1),
+      the victim slot is selected in round-robin manner
+
+    :ivar ~.BUCKET_SLOTS: number of items in bucket (power of 2), ITEMS_CNT is total number of items
+
+    .. hwt-autodoc:: _example_HashTableCoreBucketized
+    """
+
+    @override
+    def hwConfig(self):
+        super(HashTableCoreBucketized, self).hwConfig()
+        self.BUCKET_SLOTS = HwParam(4)
+
+    @override
+    def hwDeclr(self):
+        assert self.BUCKET_SLOTS > 1 and isPow2(self.BUCKET_SLOTS), self.BUCKET_SLOTS
+        assert self.ITEMS_CNT % self.BUCKET_SLOTS == 0, (self.ITEMS_CNT, self.BUCKET_SLOTS)
+        self._declr_common()
+        self.BUCKET_CNT = self.ITEMS_CNT // self.BUCKET_SLOTS
+        self.SLOT_INDEX_WIDTH = log2ceil(self.BUCKET_SLOTS)
+        # a column of the memory for each slot in bucket
+        self.table = HObjList()
+        self.tableConnector = HObjList()
+        for _ in range(self.BUCKET_SLOTS):
+            t = RamSingleClock()
+            t.PORT_CNT = 1
+            t.ADDR_WIDTH = log2ceil(self.BUCKET_CNT)
+            t.DATA_WIDTH = self.KEY_WIDTH + self.DATA_WIDTH + 1  # +1 for item_vld
+            self.table.append(t)
+
+            tc = RamAsAddrDataRdVld()
+            tc.ADDR_WIDTH = t.ADDR_WIDTH
+            tc.DATA_WIDTH = t.DATA_WIDTH
+            self.tableConnector.append(tc)
+
+    @override
+    def lookupLogic(self, ramR: List[HwIORamRdVldR]):
+        h = self.hash
+        lookup = self.io.lookup
+        res = self.io.lookupRes
+        SLOT_INDEX_WIDTH = self.SLOT_INDEX_WIDTH
+
+        # tmp storage for original key and bucket index for later check
+        origKeyIn = HwIOLookupKey()
+        origKeyIn.KEY_WIDTH = self.KEY_WIDTH
+        origKeyIn.LOOKUP_ID_WIDTH = self.LOOKUP_ID_WIDTH
+        self.origKeyIn = origKeyIn
+
+        origKeyIn.key(lookup.key)
+        if lookup.LOOKUP_ID_WIDTH:
+            origKeyIn.lookupId(lookup.lookupId)
+        origKey = HsBuilder(self, origKeyIn).buff(2).end
+
+        # hash key and address with has in table
+        h.dataIn(lookup.key)
+        inputSlaves = [origKeyIn]
+        outputMasters = [origKey]
+        for r in ramR:
+            # hash can be wider
+            r.addr.data(h.dataOut, fit=True)
+            inputSlaves.append(r.addr)
+            outputMasters.append(r.data)
+
+        if self.LOOKUP_HASH:
+            origBucketIn = HwIODataRdVld()
+            origBucketIn.DATA_WIDTH = self.io.HASH_WIDTH - SLOT_INDEX_WIDTH
+            self.origBucketIn = origBucketIn
+            origBucketOut = HsBuilder(self, origBucketIn).buff(2).end
+
+            origBucketIn.data(h.dataOut, fit=True)
+
+            inputSlaves.append(origBucketIn)
+            outputMasters.append(origBucketOut)
+
+        StreamNode(masters=[lookup],
+                   slaves=inputSlaves).sync()
+
+        # propagate loaded data
+        StreamNode(masters=outputMasters,
+                   slaves=[res]).sync()
+
+        items = [self.parseItem(r.data.data) for r in ramR]
+        found = [item_vld & origKey.key._eq(key) for (key, _, item_vld) in items]
+        empty = [~item_vld for (_, _, item_vld) in items]
+        anyFound = Or(*found)
+        anyEmpty = Or(*empty)
+
+        victimSlot = self._reg("victimSlot", HBits(SLOT_INDEX_WIDTH), def_val=0)
+        If(res.vld & res.rd & ~anyFound & ~anyEmpty,
+           victimSlot(victimSlot + 1)
+        )
+
+        slotIndex = self._sig("slotIndex", HBits(SLOT_INDEX_WIDTH))
+
+        def selectSlot(i: int):
+            key, data, item_vld = items[i]
+            a = [slotIndex(i), res.occupied(item_vld)]
+            if self.LOOKUP_KEY:
+                a.append(res.key(key))
+            if self.DATA_WIDTH:
+                a.append(res.data(data))
+            return a
+
+        # found item, first empty slot, victim slot
+        SwitchLogic(
+            [(f, selectSlot(i)) for i, f in enumerate(found)] +
+            [(e, selectSlot(i)) for i, e in enumerate(empty)] +
+            [(victimSlot._eq(i), selectSlot(i)) for i in range(self.BUCKET_SLOTS - 1)],
+            default=selectSlot(self.BUCKET_SLOTS - 1)
+        )
+        res.found(anyFound)
+
+        if self.LOOKUP_HASH:
+            res.hash(Concat(origBucketOut.data, slotIndex))
+
+        if self.LOOKUP_ID_WIDTH:
+            res.lookupId(origKey.lookupId)
+
+    @override
+    def insertLogic(self, ramW: List[HwIOAddrDataRdVld]):
+        In = self.io.insert
+        SLOT_INDEX_WIDTH = self.SLOT_INDEX_WIDTH
+
+        if self.DATA_WIDTH:
+            rec = Concat(In.key, In.data, In.item_vld)
+        else:
+            rec = Concat(In.key, In.item_vld)
+
+        bucketIndex = In.hash[:SLOT_INDEX_WIDTH]
+        slotIndex = In.hash[SLOT_INDEX_WIDTH:]
+        slotSel = {}
+        for i, w in enumerate(ramW):
+            w.data(rec)
+            w.addr(bucketIndex)
+            slotSel[w] = slotIndex._eq(i)
+
+        StreamNode(masters=[In], slaves=ramW,
+                   extraConds=slotSel,
+                   skipWhen={w: ~sel for w, sel in slotSel.items()}).sync()
+
+    @override
+    def hwImpl(self):
+        for t, tc in zip(self.table, self.tableConnector):
+            t.port[0](tc.ram)
+
+        self.lookupLogic([tc.r for tc in self.tableConnector])
+        self.insertLogic([tc.w for tc in self.tableConnector])
+        propagateClkRstn(self)
+
+
+def _example_HashTableCoreBucketized():
+    return HashTableCoreBucketized(CRC_32)
+
+
+if __name__ == "__main__":
+    from hwt.synth import to_rtl_str
+
+    m = _example_HashTableCoreBucketized()
+    print(to_rtl_str(m))
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from binascii import crc_hqx
+
+from hwt.simulator.simTestCase import SimTestCase
+from hwtLib.logic.crcPoly import CRC_16_CCITT
+from hwtLib.mem.hashTableCoreBucketized import HashTableCoreBucketized
+from hwtSimApi.constants import CLK_PERIOD
+from hwtSimApi.triggers import Timer
+from pyMathBitPrecise.bit_utils import mask
+
+
+class HashTableCoreBucketizedTC(SimTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        dut = cls.dut = HashTableCoreBucketized(CRC_16_CCITT)
+        dut.KEY_WIDTH = 16
+        dut.DATA_WIDTH = 8
+        dut.ITEMS_CNT = 32
+        dut.BUCKET_SLOTS = 4
+
+        dut.LOOKUP_HASH = True
+        dut.LOOKUP_KEY = True
+        cls.compileSim(dut)
+
+    def setUp(self):
+        SimTestCase.setUp(self)
+        # clean up memory
+        m = self.rtl_simulator.model
+        for i in range(self.dut.BUCKET_SLOTS):
+            mem = getattr(m, f"table_{i:d}_inst").io.ram_memory
+            mem.val = mem.def_val = mem._dtype.from_py(0 for _ in range(mem._dtype.size))
+
+    def get_bucket(self, k: int):
+        dut = self.dut
+        return crc_hqx(k.to_bytes(dut.KEY_WIDTH // 8, "little"),
+                       CRC_16_CCITT.INIT) & mask(dut.io.HASH_WIDTH - dut.SLOT_INDEX_WIDTH)
+
+    def get_colliding_keys(self, n: int):
+        """
+        :return: first n keys with same bucket index
+        """
+        keys = []
+        b = None
+        k = 1
+        while len(keys) < n:
+            _b = self.get_bucket(k)
+            if b is None:
+                b = _b
+            if _b == b:
+                keys.append(k)
+            k += 1
+        return b, keys
+
+    def test_lookupInEmpty(self):
+        dut = self.dut
+        keys = [0, 1, 2, 3]
+        dut.io.lookup._ag.data.extend(keys)
+
+        self.runSim(15 * CLK_PERIOD)
+        # first empty slot in bucket
+        self.assertValSequenceEqual(dut.io.lookupRes._ag.data, [
+            (self.get_bucket(k) << dut.SLOT_INDEX_WIDTH, 0, 0, 0, 0)
+            for k in keys
+        ])
+
+    def test_fullBucket(self):
+        dut = self.dut
+        SLOTS = dut.BUCKET_SLOTS
+        b, keys = self.get_colliding_keys(SLOTS + 1)
+
+        for slot_i, k in enumerate(keys[:SLOTS]):
+            dut.io.insert._ag.data.append(((b << dut.SLOT_INDEX_WIDTH) | slot_i, k, k + 1, 1))
+
+        def lookups():
+            yield Timer(10 * CLK_PERIOD)
+            # all items from bucket and the colliding key 2x
+            dut.io.lookup._ag.data.extend(keys + [keys[-1], ])
+
+        self.procs.append(lookups())
+        self.runSim(30 * CLK_PERIOD)
+
+        expected = [
+            ((b << dut.SLOT_INDEX_WIDTH) | slot_i, k, k + 1, 1, 1)
+            for slot_i, k in enumerate(keys[:SLOTS])
+        ]
+        # bucket is full the victim is selected in round-robin manner
+        expected.append(((b << dut.SLOT_INDEX_WIDTH) | 0, keys[0], keys[0] + 1, 0, 1))
+        expected.append(((b << dut.SLOT_INDEX_WIDTH) | 1, keys[1], keys[1] + 1, 0, 1))
+        self.assertValSequenceEqual(dut.io.lookupRes._ag.data, expected)
+
+    def test_firstEmptySlot(self):
+        dut = self.dut
+        b, keys = self.get_colliding_keys(3)
+        # slot 0 left empty, slot 1 occupied
+        dut.io.insert._ag.data.append(((b << dut.SLOT_INDEX_WIDTH) | 1, keys[0], 10, 1))
+
+        def lookups():
+            yield Timer(10 * CLK_PERIOD)
+            dut.io.lookup._ag.data.extend(keys[:2])
+
+        self.procs.append(lookups())
+        self.runSim(25 * CLK_PERIOD)
+        self.assertValSequenceEqual(dut.io.lookupRes._ag.data, [
+            ((b << dut.SLOT_INDEX_WIDTH) | 1, keys[0], 10, 1, 1),
+            ((b << dut.SLOT_INDEX_WIDTH) | 0, 0, 0, 0, 0),
+        ])
+
+
+if __name__ == "__main__":
+    import unittest
+    testLoader = unittest.TestLoader()
+    # suite = unittest.TestSuite([HashTableCoreBucketizedTC("test_fullBucket")])
+    suite = testLoader.loadTestsFromTestCase(HashTableCoreBucketizedTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
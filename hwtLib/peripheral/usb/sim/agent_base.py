@@ -9,7 +9,7 @@ from hwt.hdl.types.bitsConst import HBitsConst
 from hwt.hdl.types.hdlType import HdlType
 from hwt.constants import NOT_SPECIFIED
 from hwtLib.logic.crcPoly import CRC_5_USB, CRC_16_USB
-from hwtLib.logic.crc_test_utils import NaiveCrcAccumulator
+from hwtLib.logic.crc_test_utils import NaiveCrcAccumulator, TableCrcAccumulator
 from hwtLib.peripheral.usb.constants import usb_packet_token_t, USB_PID
 from hwtLib.peripheral.usb.descriptors.bundle import UsbDescriptorBundle
 from hwtLib.types.ctypes import uint8_t
@@ -82,9 +82,8 @@ class UsbPacketData():
         self.data = data
 
     def crc16(self):
-        r = NaiveCrcAccumulator(CRC_16_USB)
-        for d in self.data:
-            r.takeWord(d, 8)
+        r = TableCrcAccumulator(CRC_16_USB)
+        r.takeBytes(bytes(int(d) for d in self.data))
         return r.getFinalValue()
 
     def unpack(self, t: HdlType):
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from hwt.code import Concat, Switch
+from hwt.code import Concat, Switch, SwitchLogic, If
 from hwt.hdl.types.bits import HBits
 from hwt.hwIOs.std import HwIODataRdVld, HwIOVectSignal
 from hwt.hwIOs.utils import addClkRstn, propagateClkRstn
@@ -9,6 +9,7 @@ from hwt.hwModule import HwModule
 from hwt.hwParam import HwParam
 from hwt.math import log2ceil, isPow2
 from hwt.pyUtils.typingFuture import override
+from hwtLib.amba.axi_comp.oooOp.reorder_buffer import ReorderBuffer
 from hwtLib.amba.datapump.intf import HwIOAxiRDatapump
 from hwtLib.handshaked.fifo import HandshakedFifo
 from hwtLib.handshaked.streamNode import StreamNode
@@ -19,6 +20,16 @@ class ArrayItemGetter(HwModule):
     """
     Get specific item from array by index
 
+    :ivar ID: id used for requests on rDatapump
+    :ivar ID_CNT: number of ids used for requests (ID, ID + 1, ... ID + ID_CNT - 1),
+        if > 1 the responses with a different id may arrive out of order, they are reordered
+        by :class:`hwtLib.amba.axi_comp.oooOp.reorder_buffer.ReorderBuffer`
+        (the datapump has to propagate the ids to AXI,
+        e.g. :class:`hwtLib.amba.datapump.r.Axi_rDatapump` with PROPAGATE_ID=True)
+    :ivar MAX_TRANS_OVERLAP: max number of pending requests if ID_CNT > 1
+        (ids are reused, the responses with the same id arrive in order)
+    :note: items are always returned in order of the requests
+
     .. hwt-autodoc::
     """
     @override
@@ -26,6 +37,7 @@ class ArrayItemGetter(HwModule):
         self.ITEMS = HwParam(32)
         self.ITEM_WIDTH = HwParam(32)
         self.ID = HwParam(0)
+        self.ID_CNT = HwParam(1)
         self.ID_WIDTH = HwParam(4)
         self.DATA_WIDTH = HwParam(64)
         self.ADDR_WIDTH = HwParam(32)
@@ -52,6 +64,15 @@ class ArrayItemGetter(HwModule):
             self.rDatapump = HwIOAxiRDatapump()._m()
             self.rDatapump.MAX_BYTES = self.DATA_WIDTH // 8
 
+        if self.ID_CNT > 1:
+            assert isPow2(self.ID_CNT), self.ID_CNT
+            assert self.ID % self.ID_CNT == 0, ("ID has to be aligned to ID_CNT", self.ID, self.ID_CNT)
+            assert self.ID + self.ID_CNT <= 2 ** self.ID_WIDTH, (self.ID, self.ID_CNT, self.ID_WIDTH)
+            rob = self.reorderBuff = ReorderBuffer()
+            # sequence number of the request
+            rob.ID_WIDTH = log2ceil(max(self.ID_CNT, self.MAX_TRANS_OVERLAP))
+            rob.T = HBits(self.DATA_WIDTH)
+
         if self.ITEMS_IN_DATA_WORD > 1:
             assert isPow2(self.ITEMS_IN_DATA_WORD)
             f = self.itemSubIndexFifo = HandshakedFifo(HwIODataRdVld)
@@ -70,19 +91,27 @@ class ArrayItemGetter(HwModule):
             raise NotImplementedError(ITEM_WIDTH)
 
         req = self.rDatapump.req
-        req.id(self.ID)
         req.rem(0)
+        if self.ID_CNT > 1:
+            r, reqEn = self.reorderOutOfOrderResponses(req)
+            reqExtraConds = {req: reqEn}
+        else:
+            req.id(self.ID)
+            r = self.rDatapump.r
+            reqExtraConds = {}
 
         if ITEMS_IN_DATA_WORD == 1:
             addr = Concat(self.index.data, HBits(log2ceil(ITEM_WIDTH // 8)).from_py(0))
             req.addr(self.base + fitTo(addr, req.addr))
-            StreamNode(masters=[self.index], slaves=[req]).sync()
+            StreamNode(masters=[self.index], slaves=[req],
+                       extraConds=reqExtraConds).sync()
 
-            self.item.data(self.rDatapump.r.data)
-            StreamNode(masters=[self.rDatapump.r], slaves=[self.item]).sync()
+            self.item.data(r.data)
+            StreamNode(masters=[r], slaves=[self.item]).sync()
 
         else:
-            r = self.rDatapump.r.data
+            rStream = r
+            r = rStream.data
             f = self.itemSubIndexFifo
             subIndexBits = f.dataIn.data._dtype.bit_length()
             itemAlignBits = log2ceil(ITEM_WIDTH // 8)
@@ -92,15 +121,74 @@ class ArrayItemGetter(HwModule):
             req.addr(self.base + fitTo(addr, req.addr))
             f.dataIn.data(self.index.data[subIndexBits:])
             StreamNode(masters=[self.index],
-                       slaves=[req, f.dataIn]).sync()
+                       slaves=[req, f.dataIn],
+                       extraConds=reqExtraConds).sync()
 
             Switch(f.dataOut.data).add_cases([
                 (i, self.item.data(r[(ITEM_WIDTH * (i + 1)):(ITEM_WIDTH * i)]))
                 for i in range(ITEMS_IN_DATA_WORD)
                 ])
-            StreamNode(masters=[self.rDatapump.r, f.dataOut],
+            StreamNode(masters=[rStream, f.dataOut],
                        slaves=[self.item]).sync()
 
+    def reorderOutOfOrderResponses(self, req):
+        """
+        Assign an id to each request and restore the order of the responses
+
+        The requests are numbered by a sequence number, the lower bits of this number are used as an id.
+        The responses with the same id arrive in order, the number of responses for each id
+        is used to resolve the upper bits of the sequence number of the response.
+
+        :return: tuple (the in order stream of read data words, the enable for the next request)
+        """
+        rob = self.reorderBuff
+        SEQ_W = rob.ID_WIDTH
+        ID_W = log2ceil(self.ID_CNT)
+        r = self.rDatapump.r
+
+        reqSeq = self._reg("reqSeq", HBits(SEQ_W), def_val=0)
+        reqId = reqSeq[ID_W:]
+        if self.ID_WIDTH > ID_W:
+            req.id(Concat(HBits(self.ID_WIDTH - ID_W).from_py(self.ID >> ID_W), reqId))
+        else:
+            req.id(reqId)
+
+        # the reorder buffer has a space only for 2**SEQ_W items
+        pending = self._reg("pending", HBits(SEQ_W + 1), def_val=0)
+        reqAck = req.vld & req.rd
+        respAck = rob.dataOut.vld & rob.dataOut.rd
+        SwitchLogic([
+            (reqAck & ~respAck, pending(pending + 1)),
+            (~reqAck & respAck, pending(pending - 1)),
+        ])
+        If(reqAck,
+           reqSeq(reqSeq + 1)
+        )
+
+        respId = r.id[ID_W:]
+        if SEQ_W > ID_W:
+            # the number of the responses for each id
+            respCntrs = [self._reg(f"respCntr{i:d}", HBits(SEQ_W - ID_W), def_val=0)
+                         for i in range(self.ID_CNT)]
+            respCntr = self._sig("respCntr", HBits(SEQ_W - ID_W))
+            Switch(respId).add_cases(
+                (i, respCntr(c))
+                for i, c in enumerate(respCntrs)
+            )
+            rAck = r.valid & r.ready
+            for i, c in enumerate(respCntrs):
+                If(rAck & respId._eq(i),
+                   c(c + 1)
+                )
+            rob.dataIn.id(Concat(respCntr, respId))
+        else:
+            rob.dataIn.id(respId)
+
+        rob.dataIn.data(r.data)
+        StreamNode(masters=[r], slaves=[rob.dataIn]).sync()
+
+        return rob.dataOut, pending != 2 ** SEQ_W
+
 
 if __name__ == "__main__":
     from hwt.synth import to_rtl_str
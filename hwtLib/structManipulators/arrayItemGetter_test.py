@@ -63,13 +63,14 @@ class ArrayItemGetter2in1WordTC(SimTestCase):
         self.assertEqual(len(dut.rDatapump.req._ag.data), 0)
         self.assertEqual(len(dut.item._ag.data), 0)
 
-    def test_get(self):
+    def test_get(self, batch_requests=False):
         dut = self.dut
         MAGIC = 99
         N = dut.ITEMS
         t = 10 + N
 
-        m = AxiDpSimRam(dut.DATA_WIDTH, dut.clk, rDatapumpHwIO=dut.rDatapump)
+        m = AxiDpSimRam(dut.DATA_WIDTH, dut.clk, rDatapumpHwIO=dut.rDatapump,
+                        batch_requests=batch_requests)
         base = m.calloc(dut.ITEMS,
                         dut.ITEM_WIDTH // 8,
                         initValues=[
@@ -87,9 +88,88 @@ class ArrayItemGetter2in1WordTC(SimTestCase):
                                       for i in range(N)
                                     ])
 
+    def test_get_batch_requests(self):
+        self.test_get(batch_requests=True)
+
+
+class ReorderingAxiDpSimRam(AxiDpSimRam):
+    """
+    :class:`~.AxiDpSimRam` which collects GROUP of read transactions and returns them
+    sorted by id in descending order (the transactions with the same id stay in order)
+
+    :ivar ~.rIds: ids of read transactions in order in which the data was returned
+    """
+    GROUP = 4
+
+    def __init__(self, *args, **kwargs):
+        self._rGroup = []
+        self.rIds = []
+        super(ReorderingAxiDpSimRam, self).__init__(*args, **kwargs)
+
+    def _pushRData(self, read_trans):
+        g = self._rGroup
+        g.append(read_trans)
+        if len(g) == self.GROUP:
+            for t in sorted(g, key=lambda t: -t[0]):
+                self.rIds.append(t[0])
+                super(ReorderingAxiDpSimRam, self)._pushRData(t)
+            g.clear()
+
+
+class ArrayItemGetterOooTC(SimTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        dut = cls.dut = ArrayItemGetter()
+        dut.ID = 4
+        dut.ID_CNT = 4
+        dut.ID_WIDTH = 3
+        dut.ITEMS = 32
+        dut.DATA_WIDTH = 64
+        dut.ITEM_WIDTH = 64
+        cls.compileSim(dut)
+
+    def test_outOfOrderResponses(self):
+        dut = self.dut
+        MAGIC = 99
+        N = 16
+
+        m = ReorderingAxiDpSimRam(dut.DATA_WIDTH, dut.clk, rDatapumpHwIO=dut.rDatapump)
+        base = m.calloc(dut.ITEMS,
+                        dut.ITEM_WIDTH // 8,
+                        initValues=[MAGIC + i for i in range(dut.ITEMS)])
+        dut.base._ag.data.append(base)
+        indexes = [(i * 7) % dut.ITEMS for i in range(N)]
+        dut.index._ag.data.extend(indexes)
+
+        self.runSim((10 + 4 * N) * CLK_PERIOD)
+
+        self.assertValSequenceEqual(dut.item._ag.data, [MAGIC + i for i in indexes])
+        self.assertSequenceEqual(m.rIds, [7, 6, 5, 4] * (N // 4))
+
+    def test_morePendingThanIds(self):
+        # 2 requests for each id has to be pending to complete the group
+        dut = self.dut
+        MAGIC = 99
+        N = 16
+
+        m = ReorderingAxiDpSimRam(dut.DATA_WIDTH, dut.clk, rDatapumpHwIO=dut.rDatapump)
+        m.GROUP = 8
+        base = m.calloc(dut.ITEMS,
+                        dut.ITEM_WIDTH // 8,
+                        initValues=[MAGIC + i for i in range(dut.ITEMS)])
+        dut.base._ag.data.append(base)
+        indexes = [(i * 5) % dut.ITEMS for i in range(N)]
+        dut.index._ag.data.extend(indexes)
+
+        self.runSim((10 + 4 * N) * CLK_PERIOD)
+
+        self.assertValSequenceEqual(dut.item._ag.data, [MAGIC + i for i in indexes])
+        self.assertSequenceEqual(m.rIds, [7, 7, 6, 6, 5, 5, 4, 4] * (N // 8))
+
 
 if __name__ == "__main__":
-    _ALL_TCs = [ArrayItemGetterTC, ArrayItemGetter2in1WordTC]
+    _ALL_TCs = [ArrayItemGetterTC, ArrayItemGetter2in1WordTC, ArrayItemGetterOooTC]
     testLoader = unittest.TestLoader()
     loadedTcs = [testLoader.loadTestsFromTestCase(tc) for tc in _ALL_TCs]
     suite = unittest.TestSuite(loadedTcs)
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -
 
-from hwt.code import If, In, Concat
+from hwt.code import If, In, Concat, SwitchLogic
 from hwt.hdl.types.bits import HBits
 from hwt.hdl.types.bitsCastUtils import fitTo
 from hwt.hwIOs.std import HwIODataRdVld, HwIORegCntrl, HwIOVectSignal
@@ -30,6 +30,12 @@ class CLinkedListReader(HwModule):
     baseAddr is address of actual node
 
     :attention: device reads only chunks of size <= BUFFER_CAPACITY/2,
+    :ivar MAX_OUTSTANDING: max number of read requests which can be pending,
+        if 1 the next request is dispatched after all data of previous request was received.
+        If > 1 (prefetch mode) the requests are dispatched as long as there is a space
+        reserved in the buffer, only the request after the request with next pointer
+        has to wait until the pointer arrives.
+    :note: the rDatapump has to return the data in order of requests
 
     .. hwt-autodoc::
     """
@@ -46,6 +52,7 @@ class CLinkedListReader(HwModule):
         self.ADDR_WIDTH = HwParam(32)
         self.DATA_WIDTH = HwParam(64)
         self.PTR_WIDTH = HwParam(16)
+        self.MAX_OUTSTANDING = HwParam(1)
 
     @override
     def hwDeclr(self):
@@ -92,13 +99,27 @@ class CLinkedListReader(HwModule):
         BUFFER_CAPACITY = self.BUFFER_CAPACITY
         BURST_LEN = BUFFER_CAPACITY // 2
         ID_LAST = self.ID_LAST
+        PREFETCH = self.MAX_OUTSTANDING > 1
         bufferHasSpace = s("bufferHasSpace")
-        bufferHasSpace(f.size < (BURST_LEN + 1))
+        if PREFETCH:
+            # space in buffer for all pending requests is reserved
+            reserved = r("reserved", f.size._dtype, def_val=0)
+            bufferHasSpace((f.size + reserved) < (BURST_LEN + 1))
+        else:
+            bufferHasSpace(f.size < (BURST_LEN + 1))
         # we are counting base next addr as item as well
         inBlock_t = HBits(log2ceil(self.ITEMS_IN_BLOCK + 1))
         ringSpace_t = HBits(self.PTR_WIDTH)
 
-        downloadPending = r("downloadPending", def_val=0)
+        if PREFETCH:
+            outstanding = r("outstanding", HBits(log2ceil(self.MAX_OUTSTANDING + 1)), def_val=0)
+            # the request with next pointer is pending, the address of next request is not known yet
+            nextPtrPending = r("nextPtrPending", def_val=0)
+            canReq = (outstanding != self.MAX_OUTSTANDING) & ~nextPtrPending
+            downloadPending = outstanding != 0
+        else:
+            downloadPending = r("downloadPending", def_val=0)
+            canReq = ~downloadPending
 
         baseIndex = r("baseIndex", HBits(self.ADDR_WIDTH - ALIGN_BITS))
         inBlockRemain = r("inBlockRemain_reg", inBlock_t, def_val=self.ITEMS_IN_BLOCK)
@@ -113,11 +134,17 @@ class CLinkedListReader(HwModule):
         self.wrPtr.din(wrPtr)
         self.rdPtr.din(rdPtr)
 
+        if PREFETCH:
+            # pointer of the items which were already requested
+            reqPtr = r("reqPtr", ringSpace_t, def_val=0)
+        else:
+            reqPtr = rdPtr
+
         # this means items are present in memory
         hasSpace = s("hasSpace")
-        hasSpace(wrPtr != rdPtr)
+        hasSpace(wrPtr != reqPtr)
         doReq = s("doReq")
-        doReq(bufferHasSpace & hasSpace & ~downloadPending & req.rd)
+        doReq(bufferHasSpace & hasSpace & canReq & req.rd)
         req.rem(0)
         self.dataOut(f.dataOut)
 
@@ -127,18 +154,33 @@ class CLinkedListReader(HwModule):
         self.baseAddr.din(baseAddr)
         dataAck = dIn.valid & In(dIn.id, [ID, ID_LAST]) & dBuffIn.rd
 
-        If(self.baseAddr.dout.vld,
-            baseIndex(self.baseAddr.dout.data[:ALIGN_BITS])
-        ).Elif(dataAck & downloadPending,
-            If(dIn.last & dIn.id._eq(ID_LAST),
-               baseIndex(dIn.data[self.ADDR_WIDTH:ALIGN_BITS])
-            ).Else(
-               baseIndex(baseIndex + 1)
+        if PREFETCH:
+            # number of items which will be stored in buffer (next pointer is not an item)
+            reqItems = s("reqItems", ringSpace_t)
+            reqItems(req.id._eq(ID)._ternary(fitTo(req.len, reqItems) + 1,
+                                             fitTo(req.len, reqItems)))
+            # the address is updated when the request is dispatched
+            # or when the next pointer arrives
+            If(self.baseAddr.dout.vld,
+                baseIndex(self.baseAddr.dout.data[:ALIGN_BITS])
+            ).Elif(dataAck & downloadPending & dIn.last & dIn.id._eq(ID_LAST),
+                baseIndex(dIn.data[self.ADDR_WIDTH:ALIGN_BITS])
+            ).Elif(doReq & req.id._eq(ID),
+                baseIndex(baseIndex + fitTo(reqItems, baseIndex))
+            )
+        else:
+            If(self.baseAddr.dout.vld,
+                baseIndex(self.baseAddr.dout.data[:ALIGN_BITS])
+            ).Elif(dataAck & downloadPending,
+                If(dIn.last & dIn.id._eq(ID_LAST),
+                   baseIndex(dIn.data[self.ADDR_WIDTH:ALIGN_BITS])
+                ).Else(
+                   baseIndex(baseIndex + 1)
+                )
             )
-        )
 
         sizeByPtrs = s("sizeByPtrs", ringSpace_t)
-        sizeByPtrs(wrPtr - rdPtr)
+        sizeByPtrs(wrPtr - reqPtr)
 
         inBlockRemain_asPtrSize = fitTo(inBlockRemain, sizeByPtrs)
         constraingSpace = s("constraingSpace", ringSpace_t)
@@ -176,30 +218,57 @@ class CLinkedListReader(HwModule):
         )
 
         # logic of req dispatching
-        If(downloadPending,
-            req.vld(0),
-            If(dataAck & dIn.last,
-                downloadPending(0)
+        if PREFETCH:
+            req.vld(bufferHasSpace & hasSpace & canReq)
+            reqDone = dataAck & downloadPending & dIn.last
+            SwitchLogic([
+                (doReq & ~reqDone, outstanding(outstanding + 1)),
+                (~doReq & reqDone, outstanding(outstanding - 1)),
+            ])
+            If(doReq & req.id._eq(ID_LAST),
+               nextPtrPending(1)
+            ).Elif(reqDone & dIn.id._eq(ID_LAST),
+               nextPtrPending(0)
             )
-        ).Else(
-            req.vld(bufferHasSpace & hasSpace),
-            If(req.rd & bufferHasSpace & hasSpace,
-               downloadPending(1)
+        else:
+            If(downloadPending,
+                req.vld(0),
+                If(dataAck & dIn.last,
+                    downloadPending(0)
+                )
+            ).Else(
+                req.vld(bufferHasSpace & hasSpace),
+                If(req.rd & bufferHasSpace & hasSpace,
+                   downloadPending(1)
+                )
             )
-        )
 
         # into buffer pushing logic
         dBuffIn.data(dIn.data)
 
         isMyData = s("isMyData")
         isMyData(dIn.id._eq(ID) | (~dIn.last & dIn.id._eq(ID_LAST)))
+        itemPush = s("itemPush")
+        itemPush(dIn.valid & downloadPending & dBuffIn.rd & isMyData)
         If(self.rdPtr.dout.vld,
             rdPtr(self.rdPtr.dout.data)
         ).Else(
-            If(dIn.valid & downloadPending & dBuffIn.rd & isMyData,
+            If(itemPush,
                rdPtr(rdPtr + 1)
             )
         )
+        if PREFETCH:
+            If(self.rdPtr.dout.vld,
+                reqPtr(self.rdPtr.dout.data)
+            ).Elif(doReq,
+                reqPtr(reqPtr + reqItems)
+            )
+            _reqItems = fitTo(reqItems, reserved)
+            SwitchLogic([
+                (doReq & ~itemPush, reserved(reserved + _reqItems)),
+                (doReq & itemPush, reserved(reserved + _reqItems - 1)),
+                (itemPush, reserved(reserved - 1)),
+            ])
         # push data into buffer and increment rdPtr
         StreamNode(masters=[dIn],
                    slaves=[dBuffIn],
@@ -12,10 +12,12 @@ from pyMathBitPrecise.bit_utils import mask
 
 
 class CLinkedListReaderTC(SimTestCase):
+    MAX_OUTSTANDING = 1
 
     @classmethod
     def setUpClass(cls):
         dut = cls.dut = CLinkedListReader()
+        dut.MAX_OUTSTANDING = cls.MAX_OUTSTANDING
         cls.ITEMS_IN_BLOCK = 31
         cls.PTR_WIDTH = 8
         cls.BUFFER_CAPACITY = 8
@@ -310,9 +312,39 @@ class CLinkedListReaderTC(SimTestCase):
         return requests, responses
 
 
+class CLinkedListReaderPrefetchTC(CLinkedListReaderTC):
+    MAX_OUTSTANDING = 4
+
+    def test_singleDescrReqMax(self):
+        dut = self.dut
+        t = 20
+        N = self.MAX_LEN + 1
+
+        dut.baseAddr._ag.dout.append(0x1020)
+        dut.wrPtr._ag.dout.append(N * (self.MAX_LEN + 1))
+
+        self.runSim(t * CLK_PERIOD)
+
+        req = dut.rDatapump.req._ag.data
+        self.assertEqual(len(dut.dataOut._ag.data), 0)
+
+        # the next request is dispatched without waiting on data
+        # as long as there is a space in buffer
+        self.assertValSequenceEqual(req,
+                                    [
+                                     (self.ID, 0x1020, self.MAX_LEN, 0),
+                                     (self.ID, 0x1020 + N * self.DATA_WIDTH // 8, self.MAX_LEN, 0),
+                                     ])
+
+
+CLinkedListReaderTCs = [
+    CLinkedListReaderTC,
+    CLinkedListReaderPrefetchTC,
+]
+
 if __name__ == "__main__":
     testLoader = unittest.TestLoader()
     # suite = unittest.TestSuite([CLinkedListReaderTC("test_downloadFullBlockRandomized")])
-    suite = testLoader.loadTestsFromTestCase(CLinkedListReaderTC)
+    suite = unittest.TestSuite(testLoader.loadTestsFromTestCase(tc) for tc in CLinkedListReaderTCs)
     runner = unittest.TextTestRunner(verbosity=3)
     runner.run(suite)
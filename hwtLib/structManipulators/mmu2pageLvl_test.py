@@ -4,18 +4,25 @@
 import unittest
 
 from hwt.constants import WRITE, NOP
+from hwt.math import log2ceil
 from hwt.simulator.simTestCase import SimTestCase
 from hwtLib.amba.datapump.sim_ram import AxiDpSimRam
 from hwtLib.structManipulators.mmu_2pageLvl import MMU_2pageLvl
 from pyMathBitPrecise.bit_utils import mask
 from hwtSimApi.constants import CLK_PERIOD
+from hwtSimApi.triggers import Timer
 
 
 class MMU_2pageLvl_TC(SimTestCase):
+    TLB_ITEMS = 0
+    PAGE_WALK_CNT = 1
 
     @classmethod
     def setUpClass(cls):
         cls.dut = MMU_2pageLvl()
+        cls.dut.TLB_ITEMS = cls.TLB_ITEMS
+        cls.dut.PAGE_WALK_CNT = cls.PAGE_WALK_CNT
+        cls.dut.ID_WIDTH = max(1, log2ceil(cls.PAGE_WALK_CNT))
         cls.compileSim(cls.dut)
 
     def buildVirtAddr(self, lvl1pgtIndx, lvl2pgtIndx, pageOffset):
@@ -103,9 +110,91 @@ class MMU_2pageLvl_TC(SimTestCase):
         self.assertValEqual(dut.segfault._ag.data[-1], 0)
 
 
+class MMU_2pageLvl_tlb_TC(MMU_2pageLvl_TC):
+    TLB_ITEMS = 4
+
+    def _prepare_page(self, lvl1pgtIndx: int, lvl2pgtIndx: int, page: int):
+        """
+        Map a single page of virtual address space
+        """
+        dut = self.dut
+        m = AxiDpSimRam(dut.DATA_WIDTH, dut.clk, rDatapumpHwIO=dut.rDatapump)
+        ADDR_INVALID = mask(dut.ADDR_WIDTH)
+        lvl2pgtData = [page if i == lvl2pgtIndx else ADDR_INVALID
+                       for i in range(dut.LVL2_PAGE_TABLE_ITEMS)]
+        lvl2pgt = m.calloc(dut.LVL2_PAGE_TABLE_ITEMS,
+                           dut.ADDR_WIDTH // 8,
+                           initValues=lvl2pgtData)
+        dut.lvl1Table._ag.requests.append((WRITE, lvl1pgtIndx, lvl2pgt))
+
+    def test_tlb_hit(self):
+        dut = self.dut
+        N = 8
+        PAGE = 3 * dut.PAGE_SIZE
+        self._prepare_page(1, 3, PAGE)
+        virt = dut.virtIn._ag.data
+        # first request results in page walk, rest should hit in TLB
+        virt.extend([NOP, NOP, self.buildVirtAddr(1, 3, 0)])
+        virt.extend([NOP for _ in range(20)])
+        virt.extend(self.buildVirtAddr(1, 3, i) for i in range(1, N))
+
+        self.runSim((N + 50) * CLK_PERIOD)
+
+        self.assertValSequenceEqual(dut.physOut._ag.data, [PAGE + i for i in range(N)])
+        self.assertValEqual(dut.segfault._ag.data[-1], 0)
+        self.assertValEqual(dut.tlbMisses._ag.data[-1], 1)
+        self.assertValEqual(dut.tlbHits._ag.data[-1], N - 1)
+
+    def _test_tlb_invalidate(self, invalidateAll: bool):
+        dut = self.dut
+        PAGE = 3 * dut.PAGE_SIZE
+        self._prepare_page(1, 3, PAGE)
+        va = self.buildVirtAddr(1, 3, 0)
+
+        def invalidate():
+            yield Timer(30 * CLK_PERIOD)
+            if invalidateAll:
+                dut.tlbFlush._ag.data.append(1)
+            else:
+                dut.tlbInvalidate._ag.data.append(va)
+
+        virt = dut.virtIn._ag.data
+        virt.extend([NOP, NOP, va])
+        virt.extend([NOP for _ in range(40)])
+        virt.append(va)
+
+        self.procs.append(invalidate())
+        self.runSim(80 * CLK_PERIOD)
+
+        self.assertValSequenceEqual(dut.physOut._ag.data, [PAGE, PAGE])
+        self.assertValEqual(dut.tlbMisses._ag.data[-1], 2)
+        self.assertValEqual(dut.tlbHits._ag.data[-1], 0)
+
+    def test_tlb_invalidate(self):
+        self._test_tlb_invalidate(False)
+
+    def test_tlb_flush(self):
+        self._test_tlb_invalidate(True)
+
+
+class MMU_2pageLvl_multiWalk_TC(MMU_2pageLvl_TC):
+    PAGE_WALK_CNT = 4
+
+
+class MMU_2pageLvl_tlb_multiWalk_TC(MMU_2pageLvl_tlb_TC):
+    PAGE_WALK_CNT = 4
+
+
+MMU_2pageLvl_TCs = [
+    MMU_2pageLvl_TC,
+    MMU_2pageLvl_tlb_TC,
+    MMU_2pageLvl_multiWalk_TC,
+    MMU_2pageLvl_tlb_multiWalk_TC,
+]
+
 if __name__ == "__main__":
     testLoader = unittest.TestLoader()
     # suite = unittest.TestSuite([MMU_2pageLvl_TC("test_translate10xRandomized")])
-    suite = testLoader.loadTestsFromTestCase(MMU_2pageLvl_TC)
+    suite = unittest.TestSuite(testLoader.loadTestsFromTestCase(tc) for tc in MMU_2pageLvl_TCs)
     runner = unittest.TextTestRunner(verbosity=3)
     runner.run(suite)
@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -
 
-from hwt.code import Concat, If
+from hwt.code import Concat, If, SwitchLogic
+from hwt.code_utils import rename_signal
+from hwt.hdl.types.bits import HBits
+from hwt.hdl.types.defs import BIT
+from hwt.hdl.types.struct import HStruct
 from hwt.hwIOs.std import HwIODataRdVld, HwIOBramPort_noClk, \
-    HwIOSignal
+    HwIOSignal, HwIORdVldSync, HwIOVectSignal
+from hwt.hwIOs.hwIOStruct import HwIOStructRdVld
 from hwt.hwIOs.utils import propagateClkRstn, addClkRstn
 from hwt.hwModule import HwModule
 from hwt.hwParam import HwParam
@@ -13,6 +18,7 @@ from hwtLib.amba.datapump.intf import HwIOAxiRDatapump
 from hwtLib.handshaked.fifo import HandshakedFifo
 from hwtLib.handshaked.ramAsAddrDataRdVld import RamAsAddrDataRdVld
 from hwtLib.handshaked.streamNode import StreamNode
+from hwtLib.mem.cam import CamMultiPort
 from hwtLib.mem.ram import RamSingleClock
 from hwtLib.structManipulators.arrayItemGetter import ArrayItemGetter
 
@@ -35,6 +41,24 @@ class MMU_2pageLvl(HwModule):
     :attention: use value -1 to mark that page is not mapped, it will result
         in segfault signal asserted high when this address is accessed
 
+    :ivar TLB_ITEMS: number of items of fully associative TLB (translation lookaside buffer),
+        0 means that there is no TLB and each request results in a page table walk.
+        The TLB is a :class:`hwtLib.mem.cam.CamMultiPort` keyed by virtual page number,
+        on hit the page walk is skipped, on miss the result of the page walk is stored in the TLB
+        (round-robin replacement, invalid page table items are not stored).
+        Translations are still returned in order.
+    :ivar PAGE_WALK_CNT: if > 1 the leaf page table reads are issued with PAGE_WALK_CNT distinct ids
+        (ID_WIDTH has to be large enough) and they may complete out of order,
+        the order of translations is restored by a reorder buffer in lvl2get
+        (:class:`hwtLib.structManipulators.arrayItemGetter.ArrayItemGetter` ID_CNT),
+        up to MAX_OVERLAP reads may be pending. The datapump connected to rDatapump
+        has to propagate the ids to AXI (:class:`hwtLib.amba.datapump.r.Axi_rDatapump` with PROPAGATE_ID=True),
+        otherwise the reads complete in order.
+    :attention: TLB is not coherent with the page tables, the TLB has to be invalidated
+        by tlbFlush (all items) or tlbInvalidate (items for a virtual address)
+        after the page table was modified. Page walks which are in progress during invalidation
+        do not update the TLB.
+
     .. hwt-autodoc::
     """
     @override
@@ -49,6 +73,8 @@ class MMU_2pageLvl(HwModule):
         self.PAGE_SIZE = HwParam(int(2 ** 12))
 
         self.MAX_OVERLAP = HwParam(16)
+        self.TLB_ITEMS = HwParam(0)
+        self.PAGE_WALK_CNT = HwParam(1)
 
     @override
     def hwDeclr(self):
@@ -59,6 +85,9 @@ class MMU_2pageLvl(HwModule):
         assert self.LVL1_PAGE_TABLE_INDX_WIDTH > 0, self.LVL1_PAGE_TABLE_INDX_WIDTH
         assert self.LVL2_PAGE_TABLE_INDX_WIDTH > 0, self.LVL2_PAGE_TABLE_INDX_WIDTH
         assert self.LVL2_PAGE_TABLE_ITEMS > 1, self.LVL2_PAGE_TABLE_ITEMS
+        assert self.TLB_ITEMS == 0 or self.TLB_ITEMS > 1, self.TLB_ITEMS
+        self.VIRT_PAGE_NUM_WIDTH = self.VIRT_ADDR_WIDTH - self.PAGE_OFFSET_WIDTH
+        self.PHYS_PAGE_NUM_WIDTH = self.ADDR_WIDTH - self.PAGE_OFFSET_WIDTH
 
         # public interfaces
         addClkRstn(self)
@@ -87,6 +116,8 @@ class MMU_2pageLvl(HwModule):
             self.lvl2get = ArrayItemGetter()
         self.lvl2get.ITEM_WIDTH = self.ADDR_WIDTH
         self.lvl2get.ITEMS = self.LVL2_PAGE_TABLE_ITEMS
+        self.lvl2get.ID_CNT = self.PAGE_WALK_CNT
+        self.lvl2get.MAX_TRANS_OVERLAP = self.MAX_OVERLAP
 
         self.lvl2indxFifo = HandshakedFifo(HwIODataRdVld)
         self.lvl2indxFifo.DEPTH = self.MAX_OVERLAP // 2
@@ -96,6 +127,36 @@ class MMU_2pageLvl(HwModule):
         self.pageOffsetFifo.DEPTH = self.MAX_OVERLAP
         self.pageOffsetFifo.DATA_WIDTH = self.PAGE_OFFSET_WIDTH
 
+        if self.TLB_ITEMS:
+            self._declr_tlb()
+
+    def _declr_tlb(self):
+        # invalidate all TLB items
+        self.tlbFlush = HwIORdVldSync()
+        # invalidate TLB items for a virtual address
+        i = self.tlbInvalidate = HwIODataRdVld()
+        i.DATA_WIDTH = self.VIRT_ADDR_WIDTH
+        # free running counters of TLB hits/misses
+        self.tlbHits = HwIOVectSignal(32, signed=False)._m()
+        self.tlbMisses = HwIOVectSignal(32, signed=False)._m()
+
+        # port 0 for translation, port 1 for invalidation
+        c = self.tlbCam = CamMultiPort()
+        c.KEY_WIDTH = self.VIRT_PAGE_NUM_WIDTH
+        c.ITEMS = self.TLB_ITEMS
+        c.USE_VLD_BIT = False
+        c.MATCH_PORT_CNT = 2
+
+        # for each request, if it was hit and physical page number or virtual page number
+        # to update TLB after page walk
+        f = self.tlbResFifo = HandshakedFifo(HwIOStructRdVld)
+        f.DEPTH = self.MAX_OVERLAP
+        f.T = HStruct(
+            (BIT, "hit"),
+            (HBits(self.PHYS_PAGE_NUM_WIDTH), "ppn"),
+            (HBits(self.VIRT_PAGE_NUM_WIDTH), "vpn"),
+        )
+
     def connectLvl1PageTable(self):
         rpgt = self.lvl1Table
         rootW = self.lvl1Converter.w
@@ -110,7 +171,30 @@ class MMU_2pageLvl(HwModule):
         lvl1read = self.lvl1Converter.r
         return lvl1read
 
-    def connectL1Load(self, lvl1readAddr):
+    def tlbLookup(self, tlbVld):
+        """
+        Search the virtual page number of virtIn in TLB
+
+        :return: tuple (hit flag, physical page number if hit)
+        """
+        virtIn = self.virtIn
+        lookup = self.tlbCam.match[0]
+        lookupRes = self.tlbCam.out[0]
+        lookup.data(virtIn.data[:self.PAGE_OFFSET_WIDTH])
+        lookup.vld(virtIn.vld)
+        lookupRes.rd(1)
+
+        match = rename_signal(self, lookupRes.data & tlbVld, "tlbMatch")
+        hit = rename_signal(self, match != 0, "tlbHit")
+        ppn = self._sig("tlbHitPpn", HBits(self.PHYS_PAGE_NUM_WIDTH))
+        # multiple items may match if there were 2 page walks for the same page,
+        # but the items have the same value
+        SwitchLogic([(match[i], ppn(self.tlbPpn[i]))
+                     for i in range(self.TLB_ITEMS)],
+                    default=ppn(None))
+        return hit, ppn
+
+    def connectL1Load(self, lvl1readAddr, tlbHit=None, tlbHitPpn=None):
         virtIn = self.virtIn
         lvl2indx = self.lvl2indxFifo.dataIn
         pageOffset = self.pageOffsetFifo
@@ -120,8 +204,21 @@ class MMU_2pageLvl(HwModule):
         pageOffset.dataIn.data(virtIn.data, fit=True)
         lvl1readAddr.data(virtIn.data[:(self.LVL2_PAGE_TABLE_INDX_WIDTH
                                            + self.PAGE_OFFSET_WIDTH)])
-        StreamNode(masters=[virtIn],
-                   slaves=[lvl2indx, lvl1readAddr, pageOffset.dataIn]).sync()
+        if self.TLB_ITEMS:
+            tlbRes = self.tlbResFifo.dataIn
+            tlbRes.data.hit(tlbHit)
+            tlbRes.data.ppn(tlbHitPpn)
+            tlbRes.data.vpn(virtIn.data[:self.PAGE_OFFSET_WIDTH])
+            # on TLB hit the page walk is not required
+            StreamNode(masters=[virtIn],
+                       slaves=[lvl2indx, lvl1readAddr, pageOffset.dataIn, tlbRes],
+                       skipWhen={
+                           lvl2indx: tlbHit,
+                           lvl1readAddr: tlbHit,
+                       }).sync()
+        else:
+            StreamNode(masters=[virtIn],
+                       slaves=[lvl2indx, lvl1readAddr, pageOffset.dataIn]).sync()
 
     def connectL2Load(self, lvl2base, segfaultFlag):
         lvl2get = self.lvl2get
@@ -141,13 +238,101 @@ class MMU_2pageLvl(HwModule):
         phyAddrBase = self.lvl2get.item
         pageOffset = self.pageOffsetFifo.dataOut
 
-        segfault = segfaultFlag | phyAddrBase.data[0]._eq(FLAG_INVALID)
-        StreamNode(masters=[phyAddrBase, pageOffset],
-                   slaves=[self.physOut],
-                   extraConds={self.physOut:~segfault}).sync()
+        if self.TLB_ITEMS:
+            tlbRes = self.tlbResFifo.dataOut
+            hit = tlbRes.data.hit
+            segfault = segfaultFlag | (~hit & phyAddrBase.data[0]._eq(FLAG_INVALID))
+            StreamNode(masters=[phyAddrBase, pageOffset, tlbRes],
+                       slaves=[self.physOut],
+                       extraConds={self.physOut:~segfault},
+                       skipWhen={phyAddrBase: hit}).sync()
+            ppn = hit._ternary(tlbRes.data.ppn, phyAddrBase.data[:self.PAGE_OFFSET_WIDTH])
+        else:
+            segfault = segfaultFlag | phyAddrBase.data[0]._eq(FLAG_INVALID)
+            StreamNode(masters=[phyAddrBase, pageOffset],
+                       slaves=[self.physOut],
+                       extraConds={self.physOut:~segfault}).sync()
+            ppn = phyAddrBase.data[:self.PAGE_OFFSET_WIDTH]
+
+        self.physOut.data(Concat(ppn, pageOffset.data))
+
+    def tlbUpdate(self, tlbVld, tlbHit):
+        """
+        Store results of page walks to TLB, handle TLB invalidation and hit/miss counters
+        """
+        virtIn = self.virtIn
+        tlbRes = self.tlbResFifo.dataOut
+        phyAddrBase = self.lvl2get.item
+        w = self.tlbCam.write
+
+        invalidate = self.tlbCam.match[1]
+        invalidateRes = self.tlbCam.out[1]
+        invalidate.data(self.tlbInvalidate.data[:self.PAGE_OFFSET_WIDTH])
+        invalidate.vld(self.tlbInvalidate.vld)
+        self.tlbInvalidate.rd(invalidate.rd)
+        invalidateRes.rd(1)
+        self.tlbFlush.rd(1)
+        invalidating = rename_signal(self, self.tlbFlush.vld | invalidateRes.vld, "tlbInvalidating")
+
+        walkStart = rename_signal(self, virtIn.vld & virtIn.rd & ~tlbHit, "tlbWalkStart")
+        walkDone = rename_signal(self, phyAddrBase.vld & phyAddrBase.rd, "tlbWalkDone")
+
+        # number of page walks in progress and number of page walks which were in progress
+        # during last invalidation (and results of them must not be stored in TLB)
+        cnt_t = HBits(log2ceil(self.MAX_OVERLAP + 1))
+        walks = self._reg("tlbWalks", cnt_t, def_val=0)
+        walksNext = self._sig("tlbWalksNext", cnt_t)
+        SwitchLogic([
+            (walkStart & ~walkDone, walksNext(walks + 1)),
+            (~walkStart & walkDone, walksNext(walks - 1)),
+        ], default=walksNext(walks))
+        walks(walksNext)
+
+        walksToDrop = self._reg("tlbWalksToDrop", cnt_t, def_val=0)
+        If(invalidating,
+           walksToDrop(walksNext)
+        ).Elif(walkDone & (walksToDrop != 0),
+           walksToDrop(walksToDrop - 1)
+        )
+
+        victim = self._reg("tlbVictim", w.addr._dtype, def_val=0)
+        fill = rename_signal(self, walkDone & ~phyAddrBase.data[0]._eq(FLAG_INVALID)
+                             & walksToDrop._eq(0) & ~invalidating, "tlbFill")
+        w.addr(victim)
+        w.data(tlbRes.data.vpn)
+        w.vld(fill)
+        If(self.clk._onRisingEdge(),
+           If(fill,
+              self.tlbPpn[victim](phyAddrBase.data[:self.PAGE_OFFSET_WIDTH])
+           )
+        )
+        If(fill,
+           If(victim._eq(self.TLB_ITEMS - 1),
+              victim(0)
+           ).Else(
+              victim(victim + 1)
+           )
+        )
+
+        If(self.tlbFlush.vld,
+           tlbVld(0)
+        ).Elif(invalidateRes.vld,
+           tlbVld(tlbVld & ~invalidateRes.data)
+        ).Elif(fill,
+           tlbVld(tlbVld | Concat(*reversed([victim._eq(i) for i in range(self.TLB_ITEMS)])))
+        )
 
-        self.physOut.data(Concat(phyAddrBase.data[:self.PAGE_OFFSET_WIDTH],
-                                 pageOffset.data))
+        hits = self._reg("tlbHitCntr", self.tlbHits._dtype, def_val=0)
+        misses = self._reg("tlbMissCntr", self.tlbMisses._dtype, def_val=0)
+        If(virtIn.vld & virtIn.rd,
+           If(tlbHit,
+              hits(hits + 1)
+           ).Else(
+              misses(misses + 1)
+           )
+        )
+        self.tlbHits(hits)
+        self.tlbMisses(misses)
 
     def segfaultChecker(self):
         lvl1item = self.lvl1Converter.r.data
@@ -170,9 +355,18 @@ class MMU_2pageLvl(HwModule):
         segfaultFlag = self.segfaultChecker()
 
         lvl1read = self.connectLvl1PageTable()
-        self.connectL1Load(lvl1read.addr)
+        if self.TLB_ITEMS:
+            tlbVld = self._reg("tlbVld", HBits(self.TLB_ITEMS), def_val=0)
+            self.tlbPpn = self._sig("tlbPpn", HBits(self.PHYS_PAGE_NUM_WIDTH)[self.TLB_ITEMS],
+                                    [0 for _ in range(self.TLB_ITEMS)])
+            tlbHit, tlbHitPpn = self.tlbLookup(tlbVld)
+            self.connectL1Load(lvl1read.addr, tlbHit, tlbHitPpn)
+        else:
+            self.connectL1Load(lvl1read.addr)
         self.connectL2Load(lvl1read.data, segfaultFlag)
         self.connectPhyout(segfaultFlag)
+        if self.TLB_ITEMS:
+            self.tlbUpdate(tlbVld, tlbHit)
 
         self.segfault(segfaultFlag)
 
@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import argparse
+from contextlib import nullcontext
+import os
 import sys
 from unittest import TestLoader, TextTestRunner, TestSuite
 
@@ -8,6 +11,8 @@ from hwt.simulator.simTestCase import SimTestCase
 from hwtLib.abstract.busEndpoint_test import BusEndpointTC
 from hwtLib.abstract.frame_utils.alignment_utils_test import FrameAlignmentUtilsTC
 from hwtLib.abstract.frame_utils.join.test import FrameJoinUtilsTC
+from hwtLib.abstract.sim_ram_test import SimRamPagedStorageTC, SimRamTC, \
+    SimRamTimingModelTC
 from hwtLib.abstract.template_configured_test import TemplateConfigured_TC
 from hwtLib.amba.axiLite_comp.buff_test import AxiRegTC
 from hwtLib.amba.axiLite_comp.endpoint_arr_test import AxiLiteEndpointArrTCs
@@ -18,10 +23,14 @@ from hwtLib.amba.axiLite_comp.endpoint_struct_test import \
 from hwtLib.amba.axiLite_comp.endpoint_test import AxiLiteEndpointTCs
 from hwtLib.amba.axiLite_comp.to_axi_test import AxiLite_to_Axi_TC
 from hwtLib.amba.axi_comp.cache.cacheWriteAllocWawOnlyWritePropagating_test import AxiCacheWriteAllocWawOnlyWritePropagatingTCs
+from hwtLib.amba.axi_comp.cache.mshr_test import AxiCacheMshrTC
 from hwtLib.amba.axi_comp.cache.pseudo_lru_test import PseudoLru_TC
+from hwtLib.amba.axi_comp.cache.replacement_policy_test import ReplacementPolicy_TC
+from hwtLib.amba.axi_comp.cache.trace_model_test import AxiCacheTraceModel_TC
 from hwtLib.amba.axi_comp.interconnect.matrixCrossbar_test import \
     AxiInterconnectMatrixCrossbar_TCs
 from hwtLib.amba.axi_comp.interconnect.matrixR_test import AxiInterconnectMatrixR_TCs
+from hwtLib.amba.axi_comp.interconnect.matrixArbitration_test import AxiInterconnectMatrixArbitration_TCs
 from hwtLib.amba.axi_comp.interconnect.matrixW_test import AxiInterconnectMatrixW_TCs
 from hwtLib.amba.axi_comp.lsu.read_aggregator_test import AxiReadAggregator_TCs
 from hwtLib.amba.axi_comp.lsu.store_queue_write_propagating_test import Axi4StoreQueueWritePropagating_TCs
@@ -35,16 +44,21 @@ from hwtLib.amba.axi_comp.stream_to_mem_test import Axi4_streamToMemTC
 from hwtLib.amba.axi_comp.tester_test import AxiTesterTC
 from hwtLib.amba.axi_comp.to_axiLite_test import Axi_to_AxiLite_TC
 from hwtLib.amba.axi_test import AxiTC
+from hwtLib.amba.axi4s_test import Axi4SBytesTC
+from hwtLib.amba.axis_comp.crc_test import Axi4S_crc_TC, Axi4S_crc_comb_TC, Axi4S_crc_multiframe_TC
 from hwtLib.amba.axis_comp.en_test import Axi4S_en_TC
 from hwtLib.amba.axis_comp.fifoDrop_test import Axi4SFifoDropTC
 from hwtLib.amba.axis_comp.fifoMeasuring_test import Axi4S_fifoMeasuringTC
 from hwtLib.amba.axis_comp.frameGen_test import AxisFrameGenTC
 from hwtLib.amba.axis_comp.frame_deparser.test import Axi4S_frameDeparser_TC
+from hwtLib.amba.axis_comp.frame_join.input_reg_test import FrameJoinInputReg_TCs
 from hwtLib.amba.axis_comp.frame_join.test import Axi4S_FrameJoin_TCs
 from hwtLib.amba.axis_comp.frame_parser.footer_split_test import Axi4S_footerSplitTC
+from hwtLib.amba.axis_comp.frame_parser.header_parser_test import Axi4S_frameHeaderParser_TCs
 from hwtLib.amba.axis_comp.frame_parser.test import Axi4S_frameParserTC
 from hwtLib.amba.axis_comp.resizer_test import Axi4S_resizer_TCs
 from hwtLib.amba.axis_comp.storedBurst_test import Axi4SStoredBurstTC
+from hwtLib.amba.axis_comp.sim.pcap_test import Axi4SPcap_TCs
 from hwtLib.amba.axis_comp.strformat_test import Axi4S_strFormat_TC
 from hwtLib.amba.datapump.interconnect.rStrictOrder_test import \
     RStrictOrderInterconnectTC
@@ -159,6 +173,7 @@ from hwtLib.logic.countLeading_test import CountLeadingTC
 from hwtLib.logic.crcComb_test import CrcCombTC
 from hwtLib.logic.crcUtils_test import CrcUtilsTC
 from hwtLib.logic.crc_test import CrcTC
+from hwtLib.logic.crc_test_utils_test import TableCrcAccumulatorTC
 from hwtLib.logic.lfsr import LfsrTC
 from hwtLib.logic.oneHotToBin_test import OneHotToBinTC
 from hwtLib.mem.atomic.flipCntr_test import FlipCntrTC
@@ -167,10 +182,12 @@ from hwtLib.mem.atomic.flipReg_test import FlipRegTC
 from hwtLib.mem.bramEndpoint_test import BramPortEndpointTCs
 from hwtLib.mem.cam_test import CamTC
 from hwtLib.mem.cuckooHashTableWithRam_test import CuckooHashTableWithRamTCs
+from hwtLib.mem.cuckooHashTableStash_test import CuckooHashTableStashWithRamTCs
 from hwtLib.mem.fifoArray_test import FifoArrayTC
 from hwtLib.mem.fifoAsync_test import FifoAsyncTC
 from hwtLib.mem.fifo_test import FifoWriterAgentTC, FifoReaderAgentTC, FifoTC
 from hwtLib.mem.hashTableCoreWithRam_test import HashTableCoreWithRamTC
+from hwtLib.mem.hashTableCoreBucketized_test import HashTableCoreBucketizedTC
 from hwtLib.mem.lutRam_test import LutRamTC
 from hwtLib.mem.ramTransactional_test import RamTransactionalTCs
 from hwtLib.mem.ramXor_test import RamXorSingleClockTC
@@ -196,12 +213,12 @@ from hwtLib.peripheral.usb.usb2.utmi_agent_test import UtmiAgentTCs
 from hwtLib.peripheral.usb.usb2.utmi_to_ulpi_test import Utmi_to_UlpiTC
 from hwtLib.structManipulators.arrayBuff_writer_test import ArrayBuff_writer_TC
 from hwtLib.structManipulators.arrayItemGetter_test import ArrayItemGetterTC, \
-    ArrayItemGetter2in1WordTC
+    ArrayItemGetter2in1WordTC, ArrayItemGetterOooTC
 from hwtLib.structManipulators.cLinkedListReader_test import \
-    CLinkedListReaderTC
+    CLinkedListReaderTCs
 from hwtLib.structManipulators.cLinkedListWriter_test import \
     CLinkedListWriterTC
-from hwtLib.structManipulators.mmu2pageLvl_test import MMU_2pageLvl_TC
+from hwtLib.structManipulators.mmu2pageLvl_test import MMU_2pageLvl_TCs
 from hwtLib.structManipulators.structReader_test import StructReaderTC
 from hwtLib.structManipulators.structWriter_test import StructWriter_TC
 from hwtLib.tests.constraints.xdc_clock_related_test import ConstraintsXdcClockRelatedTC
@@ -209,10 +226,14 @@ from hwtLib.tests.frameTmpl_test import FrameTmplTC
 from hwtLib.tests.hwIORdSync_agent_test import HwIORdSync_agent_TC
 from hwtLib.tests.hwIOStruct_operator_test import HwIOStruct_operatorTC
 from hwtLib.tests.hwIOUnion_test import HwIOUnionTC
+from hwtLib.tests.parallel_runner import run_parallel
+from hwtLib.tests.parallel_runner_test import ParallelRunnerTC
 from hwtLib.tests.pyUtils.arrayQuery_test import ArrayQueryTC
 from hwtLib.tests.pyUtils.fileUtils_test import FileUtilsTC
 from hwtLib.tests.repr_of_hdlObjs_test import ReprOfHdlObjsTC
 from hwtLib.tests.resourceAnalyzer_test import ResourceAnalyzer_TC
+from hwtLib.tests.sim_model_cache import SimModelCache
+from hwtLib.tests.sim_model_cache_test import SimModelCacheTC
 from hwtLib.tests.serialization.hdlRename_test import SerializerHdlRename_TC
 from hwtLib.tests.serialization.ipCorePackager_test import IpCorePackagerTC
 from hwtLib.tests.serialization.modes_test import SerializerModes_TC
@@ -270,6 +291,8 @@ suite = testSuiteFromTCs(
     # basic tests
     FileUtilsTC,
     ArrayQueryTC,
+    ParallelRunnerTC,
+    SimModelCacheTC,
     RtlLvlTC,
     ReprOfHdlObjsTC,
     HdlCommentsTC,
@@ -339,6 +362,11 @@ suite = testSuiteFromTCs(
     FrameJoinUtilsTC,
     HwExceptionCatch_TC,
     PseudoLru_TC,
+    ReplacementPolicy_TC,
+    AxiCacheTraceModel_TC,
+    SimRamPagedStorageTC,
+    SimRamTC,
+    SimRamTimingModelTC,
 
     # tests of simple units
     TimerTC,
@@ -413,6 +441,7 @@ suite = testSuiteFromTCs(
     CrcUtilsTC,
     CrcCombTC,
     CrcTC,
+    TableCrcAccumulatorTC,
     UsbAgentTC,
     *UlpiAgent_TCs,
     *UtmiAgentTCs,
@@ -437,6 +466,7 @@ suite = testSuiteFromTCs(
     # axi tests
     SimpleAxiRegsTC,
     AxiTC,
+    Axi4SBytesTC,
     *AxiLiteEndpointTCs,
     *AxiLiteEndpointArrTCs,
     AxiLiteEndpoint_struct_TC,
@@ -458,6 +488,10 @@ suite = testSuiteFromTCs(
     *Axi_wDatapumpTCs,
     Axi4SlaveTimeoutTC,
     Axi4SStoredBurstTC,
+    *Axi4SPcap_TCs,
+    Axi4S_crc_TC,
+    Axi4S_crc_comb_TC,
+    Axi4S_crc_multiframe_TC,
     Axi4S_en_TC,
     Axi4S_fifoMeasuringTC,
     Axi4SFifoDropTC,
@@ -466,6 +500,8 @@ suite = testSuiteFromTCs(
     Axi4S_localLinkConvTC,
     Axi4S_footerSplitTC,
     Axi4S_frameParserTC,
+    *Axi4S_frameHeaderParser_TCs,
+    *FrameJoinInputReg_TCs,
     *Axi4S_FrameJoin_TCs,
     HandshakedBuilderSimpleTC,
     *EthAddrUpdaterTCs,
@@ -478,21 +514,24 @@ suite = testSuiteFromTCs(
     *AxiInterconnectMatrixAddrCrossbar_TCs,
     *AxiInterconnectMatrixCrossbar_TCs,
     *AxiInterconnectMatrixR_TCs,
+    *AxiInterconnectMatrixArbitration_TCs,
     *AxiInterconnectMatrixW_TCs,
 
     *AxiWriteAggregator_TCs,
     *AxiReadAggregator_TCs,
     *Axi4StoreQueueWritePropagating_TCs,
+    AxiCacheMshrTC,
     *AxiCacheWriteAllocWawOnlyWritePropagatingTCs,
 
     Axi_ag_TC,
     Axi4_streamToMemTC,
     ArrayItemGetterTC,
     ArrayItemGetter2in1WordTC,
+    ArrayItemGetterOooTC,
     ArrayBuff_writer_TC,
-    CLinkedListReaderTC,
+    *CLinkedListReaderTCs,
     CLinkedListWriterTC,
-    MMU_2pageLvl_TC,
+    *MMU_2pageLvl_TCs,
     StructWriter_TC,
     StructReaderTC,
     ReorderBufferTC,
@@ -519,7 +558,9 @@ suite = testSuiteFromTCs(
     HwModuleWrapperTC,
     IpCorePackagerTC,
     HashTableCoreWithRamTC,
+    HashTableCoreBucketizedTC,
     *CuckooHashTableWithRamTCs,
+    *CuckooHashTableStashWithRamTCs,
     Axi4SPingResponderTC,
     DebugBusMonitorExampleAxiTC,
 
@@ -532,23 +573,35 @@ suite = testSuiteFromTCs(
 
 
 def main():
-    # runner = TextTestRunner(verbosity=2, failfast=True)
-    runner = TextTestRunner(verbosity=2)
+    parser = argparse.ArgumentParser(description="Run all tests of hwtLib")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes, 1 for serial run in this process")
+    parser.add_argument("--report", default=None,
+                        help="JSON file where the time of each test should be stored"
+                        " (and used for balancing of the next run)")
+    parser.add_argument("--durations", default=None,
+                        help="JSON report from previous run used for balancing (default --report)")
+    parser.add_argument("--sim-cache", action="store_true",
+                        help="reuse simulation models of DUTs with the same configuration")
+    parser.add_argument("--sim-cache-dir", default=None,
+                        help="directory where simulation models are cached between runs (implies --sim-cache)")
+    args = parser.parse_args()
 
-    try:
-        from concurrencytest import ConcurrentTestSuite, fork_for_tests
-        useParallelTest = True
-    except ImportError:
-        # concurrencytest is not installed, use regular test runner
-        useParallelTest = False
-    # useParallelTest = False
-
-    if useParallelTest:
-        concurrent_suite = ConcurrentTestSuite(suite, fork_for_tests())
-        res = runner.run(concurrent_suite)
+    if args.sim_cache or args.sim_cache_dir is not None:
+        simModelCache = SimModelCache(args.sim_cache_dir).patch()
     else:
-        res = runner.run(suite)
-    if not res.wasSuccessful():
+        simModelCache = nullcontext()
+
+    with simModelCache:
+        if args.jobs > 1 or args.report is not None:
+            ok = run_parallel(suite, jobs=args.jobs, report_file=args.report,
+                              durations_file=args.durations)
+        else:
+            # runner = TextTestRunner(verbosity=2, failfast=True)
+            runner = TextTestRunner(verbosity=2)
+            ok = runner.run(suite).wasSuccessful()
+
+    if not ok:
         sys.exit(1)
 
 
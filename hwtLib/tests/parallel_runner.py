@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Process pool based test runner for :mod:`hwtLib.tests.all` (only stdlib is used)
+
+* The tests are grouped by TestCase class (setUpClass is executed only once per class in a single process).
+* The groups are distributed to worker processes (longest first, to the least loaded worker)
+  using the durations from a previous report (if available).
+* The report is a JSON file with the time spent in the elaboration/compilation of the simulation
+  (:meth:`hwt.simulator.simTestCase.SimTestCase.compileSim`) and the rest of the time of each test.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+import json
+import multiprocessing
+import os
+import sys
+from time import perf_counter
+import traceback
+from typing import Dict, List, Optional, Tuple
+from unittest import TestSuite, TestCase, TestResult
+
+from hwt.simulator.simTestCase import SimTestCase
+
+# flattened tests which are being executed (inherited by forked worker processes)
+_TESTS: List[TestCase] = []
+
+
+def iter_test_cases(suite: TestSuite):
+    for t in suite:
+        if isinstance(t, TestSuite):
+            yield from iter_test_cases(t)
+        else:
+            yield t
+
+
+def get_test_class_id(t: TestCase) -> str:
+    cls = t.__class__
+    return f"{cls.__module__:s}.{cls.__qualname__:s}"
+
+
+def group_by_class(tests: List[TestCase]) -> Dict[str, List[int]]:
+    """
+    :return: dictionary test class id -> indexes of tests in tests list
+    """
+    groups = OrderedDict()
+    for i, t in enumerate(tests):
+        groups.setdefault(get_test_class_id(t), []).append(i)
+    return groups
+
+
+def load_durations(report_file: Optional[str]) -> Dict[str, float]:
+    """
+    Load durations of test classes from the previous report
+
+    :return: dictionary test class id -> time in seconds
+    """
+    if report_file is None or not os.path.isfile(report_file):
+        return {}
+    try:
+        with open(report_file) as f:
+            report = json.load(f)
+    except ValueError:
+        return {}
+
+    return {k: v["total"] for k, v in report.get("classes", {}).items()}
+
+
+def balance_shards(groups: Dict[str, List[int]], durations: Dict[str, float], jobs: int) -> List[List[str]]:
+    """
+    Distribute groups of tests to shards so the expected time of each shard is similar
+    (the longest group first to the shard with the smallest time).
+    The groups without known duration are expected to take the average time of known ones
+    (or 1s per test if there is no known duration).
+
+    :return: list of group ids for each shard
+    """
+    known = [durations[g] for g in groups if g in durations]
+    if known:
+        default_per_test = sum(known) / sum(len(groups[g]) for g in groups if g in durations)
+    else:
+        default_per_test = 1.0
+
+    def expected_time(g):
+        try:
+            return durations[g]
+        except KeyError:
+            return default_per_test * len(groups[g])
+
+    shards = [[] for _ in range(jobs)]
+    shard_times = [0.0 for _ in range(jobs)]
+    # sort is stable, the order of groups with the same time is preserved
+    for g in sorted(groups, key=expected_time, reverse=True):
+        i = min(range(jobs), key=lambda i: shard_times[i])
+        shards[i].append(g)
+        shard_times[i] += expected_time(g)
+
+    return [s for s in shards if s]
+
+
+class _ElaborationTimer():
+    """
+    Measures the time spent in :meth:`SimTestCase.compileSim`
+    """
+
+    def __init__(self):
+        self.time = 0.0
+
+    def take(self) -> float:
+        t = self.time
+        self.time = 0.0
+        return t
+
+    @contextmanager
+    def patch(self):
+        orig = SimTestCase.__dict__["compileSim"]
+        timer = self
+
+        def compileSim(cls, *args, **kwargs):
+            t0 = perf_counter()
+            try:
+                return orig.__func__(cls, *args, **kwargs)
+            finally:
+                timer.time += perf_counter() - t0
+
+        SimTestCase.compileSim = classmethod(compileSim)
+        try:
+            yield self
+        finally:
+            SimTestCase.compileSim = orig
+
+
+class TimingTestResult(TestResult):
+    """
+    TestResult which records time and status of each test
+
+    :ivar ~.records: list of dictionaries for each test and the setUpClass/tearDownClass
+        of each class (test id is "<class id>.<fixture name>" for them)
+    """
+
+    def __init__(self, elaborationTimer: _ElaborationTimer, stream=None, descriptions=None, verbosity=0):
+        super(TimingTestResult, self).__init__(stream, descriptions, verbosity)
+        self.elaborationTimer = elaborationTimer
+        self.records: List[dict] = []
+        self._lastStop = perf_counter()
+        self._lastClass = None
+
+    def _addRecord(self, test_id: str, class_id: str, status: str, total: float, elaboration: float, err=None):
+        self.records.append({
+            "id": test_id,
+            "class": class_id,
+            "status": status,
+            "total": total,
+            "elaboration": elaboration,
+            "simulation": max(0.0, total - elaboration),
+            "error": err,
+        })
+
+    def startTest(self, test: TestCase):
+        now = perf_counter()
+        class_id = get_test_class_id(test)
+        if class_id != self._lastClass:
+            # the time between tests is spent in setUpClass of this class (and tearDownClass of the previous)
+            self._addRecord(f"{class_id:s}.setUpClass", class_id, "ok", now - self._lastStop,
+                            self.elaborationTimer.take())
+            self._lastClass = class_id
+        self._status = "ok"
+        self._err = None
+        self._start = now
+        self.elaborationTimer.take()
+        super(TimingTestResult, self).startTest(test)
+
+    def stopTest(self, test: TestCase):
+        super(TimingTestResult, self).stopTest(test)
+        now = perf_counter()
+        self._addRecord(test.id(), get_test_class_id(test), self._status, now - self._start,
+                        self.elaborationTimer.take(), self._err)
+        self._lastStop = now
+
+    def _setStatus(self, test, status: str, err):
+        self._status = status
+        if err is not None:
+            self._err = self._exc_info_to_string(err, test)
+
+    def addError(self, test, err):
+        super(TimingTestResult, self).addError(test, err)
+        if isinstance(test, TestCase):
+            self._setStatus(test, "error", err)
+        else:
+            # error in the class/module fixture
+            self._addRecord(str(test), self._lastClass, "error", 0.0, 0.0,
+                            self._exc_info_to_string(err, test))
+
+    def addFailure(self, test, err):
+        super(TimingTestResult, self).addFailure(test, err)
+        self._setStatus(test, "fail", err)
+
+    def addSkip(self, test, reason):
+        super(TimingTestResult, self).addSkip(test, reason)
+        self._setStatus(test, "skip", None)
+
+    def addExpectedFailure(self, test, err):
+        super(TimingTestResult, self).addExpectedFailure(test, err)
+        self._setStatus(test, "expected_failure", None)
+
+    def addUnexpectedSuccess(self, test):
+        super(TimingTestResult, self).addUnexpectedSuccess(test)
+        self._setStatus(test, "unexpected_success", None)
+
+    def addSubTest(self, test, subtest, err):
+        super(TimingTestResult, self).addSubTest(test, subtest, err)
+        if err is not None:
+            self._setStatus(test, "fail", err)
+
+
+def _run_shard(test_indexes: List[int]) -> Tuple[List[dict], int]:
+    """
+    Run tests from :data:`_TESTS` (executed in worker process)
+
+    :return: tuple (records, number of executed tests)
+    """
+    timer = _ElaborationTimer()
+    result = TimingTestResult(timer)
+    suite = TestSuite([_TESTS[i] for i in test_indexes])
+    with timer.patch():
+        try:
+            suite.run(result)
+        except Exception:
+            result._addRecord("<runner>", None, "error", 0.0, 0.0, traceback.format_exc())
+    return result.records, result.testsRun
+
+
+def _shard_error_records(test_indexes: List[int], err: str) -> List[dict]:
+    """
+    :return: error records for tests from the shard which was not completed
+        (e.g. the worker process was killed)
+    """
+    return [{
+            "id": _TESTS[i].id(),
+            "class": get_test_class_id(_TESTS[i]),
+            "status": "error",
+            "total": 0.0,
+            "elaboration": 0.0,
+            "simulation": 0.0,
+            "error": err,
+        } for i in test_indexes]
+
+
+def build_report(records: List[dict], wall_time: float, jobs: int) -> dict:
+    classes = OrderedDict()
+    for r in records:
+        cls = r["class"]
+        if cls is None:
+            continue
+        c = classes.get(cls, None)
+        if c is None:
+            c = classes[cls] = {"total": 0.0, "elaboration": 0.0, "simulation": 0.0, "tests": 0}
+        c["total"] += r["total"]
+        c["elaboration"] += r["elaboration"]
+        c["simulation"] += r["simulation"]
+        if not r["id"].endswith(".setUpClass"):
+            c["tests"] += 1
+
+    return {
+        "wall_time": wall_time,
+        "jobs": jobs,
+        "classes": classes,
+        "tests": records,
+    }
+
+
+def run_parallel(suite: TestSuite, jobs: Optional[int]=None,
+                 report_file: Optional[str]=None,
+                 durations_file: Optional[str]=None,
+                 stream=sys.stderr,
+                 slowest_cnt: int=10) -> bool:
+    """
+    Run tests from the suite in a pool of processes
+
+    :param jobs: number of worker processes (default number of CPUs)
+    :param report_file: name of output JSON file with the time of each test (optional)
+    :param durations_file: name of previous report file used for the balancing of shards
+        (default report_file)
+    :param slowest_cnt: number of slowest test classes to print at the end
+    :return: True if all tests passed
+    """
+    global _TESTS
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if durations_file is None:
+        durations_file = report_file
+
+    _TESTS = list(iter_test_cases(suite))
+    groups = group_by_class(_TESTS)
+    shards = balance_shards(groups, load_durations(durations_file), jobs)
+    shards = [[i for g in shard for i in groups[g]] for shard in shards]
+
+    t0 = perf_counter()
+    records = []
+    testsRun = 0
+    if len(shards) > 1 and "fork" in multiprocessing.get_all_start_methods()\
+            and not multiprocessing.current_process().daemon:
+        ctx = multiprocessing.get_context("fork")
+        # if a worker process dies the pool is broken and the unfinished shards are reported as errors
+        with ProcessPoolExecutor(len(shards), mp_context=ctx) as pool:
+            futures = {pool.submit(_run_shard, shard): shard for shard in shards}
+            for f in as_completed(futures):
+                try:
+                    shard_records, shard_testsRun = f.result()
+                except BrokenProcessPool:
+                    shard_records = _shard_error_records(futures[f], traceback.format_exc())
+                    shard_testsRun = 0
+                    stream.write("E" * len(shard_records))
+                else:
+                    stream.write("." * shard_testsRun)
+                records.extend(shard_records)
+                testsRun += shard_testsRun
+                stream.flush()
+    else:
+        # the tests need to be inherited by worker processes,
+        # without fork (or in a worker process) run them in this process
+        for shard in shards:
+            shard_records, shard_testsRun = _run_shard(shard)
+            records.extend(shard_records)
+            testsRun += shard_testsRun
+    wall_time = perf_counter() - t0
+    stream.write("\n")
+
+    report = build_report(records, wall_time, jobs)
+    if report_file is not None:
+        with open(report_file, "w") as f:
+            json.dump(report, f, indent=2)
+
+    failed = [r for r in records if r["status"] in ("error", "fail", "unexpected_success")]
+    for r in failed:
+        stream.write(f"{'=' * 70:s}\n{r['status'].upper():s}: {r['id']:s}\n{'-' * 70:s}\n{r['error']}\n")
+
+    slowest = sorted(report["classes"].items(), key=lambda x: x[1]["total"], reverse=True)[:slowest_cnt]
+    if slowest:
+        stream.write("Slowest test classes (total, elaboration, simulation):\n")
+        for name, c in slowest:
+            stream.write(f"  {c['total']:8.3f}s {c['elaboration']:8.3f}s {c['simulation']:8.3f}s {name:s}\n")
+
+    stream.write(f"Ran {testsRun:d} tests in {wall_time:.3f}s ({jobs:d} jobs)\n")
+    if failed:
+        stream.write(f"FAILED (failures/errors={len(failed):d})\n")
+    else:
+        stream.write("OK\n")
+
+    return not failed
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from io import StringIO
+import json
+import multiprocessing
+import os
+from tempfile import TemporaryDirectory
+import unittest
+
+from hwtLib.tests.parallel_runner import balance_shards, run_parallel
+
+
+class _RunnerExampleTC(unittest.TestCase):
+    # executed only from ParallelRunnerTC
+    __test__ = False
+    setUpClassCnt = 0
+
+    @classmethod
+    def setUpClass(cls):
+        cls.setUpClassCnt += 1
+
+    def test_pass(self):
+        self.assertEqual(self.setUpClassCnt, 1)
+
+    def test_fail(self):
+        self.assertEqual(1, 0)
+
+
+class _RunnerExample2TC(unittest.TestCase):
+    __test__ = False
+
+    def test_pass(self):
+        pass
+
+
+class _RunnerExampleCrashTC(unittest.TestCase):
+    __test__ = False
+
+    def test_crash(self):
+        # simulates a crash of the worker process (e.g. segfault in simulator)
+        os._exit(1)
+
+
+class ParallelRunnerTC(unittest.TestCase):
+
+    def test_balance_shards(self):
+        groups = {"a": [0, 1], "b": [2], "c": [3], "d": [4, 5, 6]}
+        shards = balance_shards(groups, {"a": 10.0, "b": 1.0, "c": 6.0, "d": 4.0}, 2)
+        self.assertEqual(shards, [["a", "b"], ["c", "d"]])
+        # unknown duration is the average per test of known ones (14s / 3 tests)
+        shards = balance_shards(groups, {"a": 10.0, "c": 4.0}, 3)
+        self.assertEqual(shards, [["d"], ["a"], ["b", "c"]])
+        self.assertEqual(balance_shards({"a": [0]}, {}, 4), [["a"]])
+
+    def test_run_and_report(self):
+        loader = unittest.TestLoader()
+        suite = unittest.TestSuite([loader.loadTestsFromTestCase(tc)
+                                    for tc in [_RunnerExampleTC, _RunnerExample2TC]])
+        with TemporaryDirectory() as d:
+            report_file = os.path.join(d, "report.json")
+            out = StringIO()
+            ok = run_parallel(suite, jobs=2, report_file=report_file, stream=out)
+            self.assertFalse(ok)
+            self.assertIn("test_fail", out.getvalue())
+            with open(report_file) as f:
+                report = json.load(f)
+
+        statuses = {r["id"].split(".")[-1] + "_" + r["class"].split(".")[-1]: r["status"]
+                    for r in report["tests"]}
+        self.assertEqual(statuses, {
+            "setUpClass__RunnerExampleTC": "ok",
+            "test_pass__RunnerExampleTC": "ok",
+            "test_fail__RunnerExampleTC": "fail",
+            "setUpClass__RunnerExample2TC": "ok",
+            "test_pass__RunnerExample2TC": "ok",
+        })
+        self.assertEqual(report["classes"][f"{__name__:s}._RunnerExampleTC"]["tests"], 2)
+        for r in report["tests"]:
+            self.assertGreaterEqual(r["total"], r["elaboration"])
+
+    @unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(),
+                         "worker processes are not used without fork")
+    def test_worker_crash(self):
+        loader = unittest.TestLoader()
+        suite = unittest.TestSuite([loader.loadTestsFromTestCase(tc)
+                                    for tc in [_RunnerExampleCrashTC, _RunnerExample2TC]])
+        out = StringIO()
+        ok = run_parallel(suite, jobs=2, stream=out)
+        self.assertFalse(ok)
+        self.assertIn("ERROR: ", out.getvalue())
+        self.assertIn("test_crash", out.getvalue())
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(ParallelRunnerTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Cache of simulation models compiled by :meth:`hwt.simulator.simTestCase.SimTestCase.compileSim`
+
+* In process: the elaborated DUT and the compiled simulator class are reused
+  by all test classes which compile a DUT of the same class with the same configuration.
+* On disk (optional): the simulation model is stored in the directory specific for the configuration
+  and library version and in next runs it is loaded without recompilation.
+
+The key is a hash of the DUT class, the values of public attributes of the DUT (HwParams and other configuration)
+before the elaboration, the simulator class and the version of the libraries.
+If the key can not be resolved deterministically (e.g. some attribute is an object without specific __repr__)
+or the compilation uses a non default options (onAfterToRtl), the cache is not used.
+
+:attention: On in-process cache hit the DUT stored in test class (e.g. ``cls.dut``)
+    is replaced by the cached one, the test has to access the DUT trough the test class
+    after the call of compileSim. The DUTs compiled by :meth:`SimTestCase.compileSimAndStart`
+    are not cached.
+"""
+
+from contextlib import contextmanager
+from hashlib import sha256
+from importlib.metadata import version, PackageNotFoundError
+import inspect
+import os
+from typing import Dict, Optional, Tuple
+
+from hwt.hwModule import HwModule
+from hwt.simulator.simTestCase import SimTestCase
+import hwtLib
+
+
+def _package_version(name: str) -> str:
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+_LIBRARY_FINGERPRINT: Optional[str] = None
+
+
+def library_fingerprint() -> str:
+    """
+    :return: hash of versions of hwt libraries and of the files of hwtLib (path, size, mtime)
+    """
+    global _LIBRARY_FINGERPRINT
+    if _LIBRARY_FINGERPRINT is None:
+        h = sha256()
+        for p in ("hwt", "hwtSimApi", "hwtLib"):
+            h.update(f"{p:s}={_package_version(p):s};".encode())
+        root = os.path.dirname(hwtLib.__file__)
+        for d, dirs, files in os.walk(root):
+            dirs.sort()
+            for f in sorted(files):
+                if f.endswith(".py"):
+                    st = os.stat(os.path.join(d, f))
+                    h.update(f"{os.path.relpath(os.path.join(d, f), root):s}:{st.st_size:d}:{st.st_mtime_ns:d};".encode())
+        _LIBRARY_FINGERPRINT = h.hexdigest()
+
+    return _LIBRARY_FINGERPRINT
+
+
+class SimModelCache():
+    """
+    :see: module docstring
+
+    :ivar ~.cache_dir: directory for on-disk cache (None to use only in-process cache)
+    :ivar ~.hits: number of in-process cache hits
+    :ivar ~.disk_hits: number of compilations where the model was loaded from the disk cache
+    :ivar ~.misses: number of compilations which were not resolved from the cache
+    """
+    MARKER_SUFFIX = ".compiled"
+
+    def __init__(self, cache_dir: Optional[str]=None):
+        self.cache_dir = cache_dir
+        # key -> (dut, rtl_simulator_cls)
+        self._models: Dict[str, Tuple[HwModule, type]] = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        # >0 if inside of SimTestCase.compileSimAndStart which stores the DUT in the test instance
+        self._bypass = 0
+
+    @staticmethod
+    def get_key(tc_cls, dut: HwModule, target_platform) -> Optional[str]:
+        """
+        :return: the key for the cache or None if the configuration can not be represented
+        """
+        items = []
+        for k, v in sorted(vars(dut).items()):
+            if k.startswith("_"):
+                continue
+            r = repr(v)
+            if " at 0x" in r:
+                # object without deterministic representation
+                return None
+            items.append((k, r))
+
+        dut_cls = dut.__class__
+        sim_cls = tc_cls.DEFAULT_SIMULATOR
+        k = (
+            f"{dut_cls.__module__:s}.{dut_cls.__qualname__:s}",
+            items,
+            f"{sim_cls.__module__:s}.{sim_cls.__qualname__:s}",
+            target_platform.__class__.__qualname__,
+            library_fingerprint(),
+        )
+        return sha256(repr(k).encode()).hexdigest()
+
+    def compileSim(self, orig_compileSim, tc_cls, dut, *args, **kwargs):
+        sig = inspect.signature(orig_compileSim)
+        a = sig.bind(tc_cls, dut, *args, **kwargs)
+        a.apply_defaults()
+        a = a.arguments
+        if self._bypass or a.get("onAfterToRtl", None) is not None:
+            self.misses += 1
+            return orig_compileSim(tc_cls, dut, *args, **kwargs)
+
+        key = self.get_key(tc_cls, dut, a.get("target_platform", None))
+        if key is None:
+            self.misses += 1
+            return orig_compileSim(tc_cls, dut, *args, **kwargs)
+
+        cached = self._models.get(key, None)
+        if cached is not None:
+            self.hits += 1
+            c_dut, c_rtl_simulator_cls = cached
+            # the names of the attributes are resolved for this test class
+            # as the DUT may be stored under a different name than in the class which compiled it
+            for n in [n for n, v in vars(tc_cls).items() if v is dut]:
+                setattr(tc_cls, n, c_dut)
+            tc_cls.rtl_simulator_cls = c_rtl_simulator_cls
+            return
+
+        if self.cache_dir is None:
+            self.misses += 1
+            res = orig_compileSim(tc_cls, dut, *args, **kwargs)
+        else:
+            build_dir = os.path.join(self.cache_dir, key[:32])
+            unique_name = a.get("unique_name", None)
+            if unique_name is None:
+                unique_name = tc_cls.get_unique_name(dut)
+            marker = os.path.join(build_dir, unique_name + self.MARKER_SUFFIX)
+            cls_and_dut_arg_names = list(sig.parameters)[:2]
+            kwargs = {k: v for k, v in a.items() if k not in cls_and_dut_arg_names}
+            kwargs["build_dir"] = build_dir
+            kwargs["unique_name"] = unique_name
+            if os.path.exists(marker):
+                self.disk_hits += 1
+                orig_recompile = tc_cls.__dict__.get("RECOMPILE", None)
+                tc_cls.RECOMPILE = False
+                try:
+                    res = orig_compileSim(tc_cls, dut, **kwargs)
+                finally:
+                    if orig_recompile is None:
+                        del tc_cls.RECOMPILE
+                    else:
+                        tc_cls.RECOMPILE = orig_recompile
+            else:
+                self.misses += 1
+                res = orig_compileSim(tc_cls, dut, **kwargs)
+                with open(marker, "w"):
+                    pass
+
+        self._models[key] = (dut, tc_cls.rtl_simulator_cls)
+        return res
+
+    @contextmanager
+    def patch(self):
+        """
+        Use this cache in :meth:`SimTestCase.compileSim` (in this context)
+        """
+        orig = SimTestCase.__dict__["compileSim"]
+        orig_compileSimAndStart = SimTestCase.__dict__["compileSimAndStart"]
+        cache = self
+
+        def compileSim(cls, dut, *args, **kwargs):
+            return cache.compileSim(orig.__func__, cls, dut, *args, **kwargs)
+
+        def compileSimAndStart(tc, *args, **kwargs):
+            # the DUT is a local variable in test, it can not be replaced with a cached one
+            cache._bypass += 1
+            try:
+                return orig_compileSimAndStart(tc, *args, **kwargs)
+            finally:
+                cache._bypass -= 1
+
+        SimTestCase.compileSim = classmethod(compileSim)
+        SimTestCase.compileSimAndStart = compileSimAndStart
+        try:
+            yield self
+        finally:
+            SimTestCase.compileSim = orig
+            SimTestCase.compileSimAndStart = orig_compileSimAndStart
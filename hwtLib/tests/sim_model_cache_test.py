@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+from tempfile import TemporaryDirectory
+import unittest
+
+from hwt.simulator.simTestCase import SimTestCase
+from hwtLib.amba.axis_comp.en import Axi4S_en
+from hwtLib.tests.sim_model_cache import SimModelCache
+
+
+class _SimModelCacheExample0TC(SimTestCase):
+    # used only from SimModelCacheTC
+    __test__ = False
+
+
+class _SimModelCacheExample1TC(SimTestCase):
+    __test__ = False
+
+
+class _SimModelCacheExample2TC(SimTestCase):
+    __test__ = False
+
+
+class SimModelCacheTC(unittest.TestCase):
+
+    def _dut(self, DATA_WIDTH=64):
+        dut = Axi4S_en()
+        dut.DATA_WIDTH = DATA_WIDTH
+        return dut
+
+    def test_key(self):
+        k0 = SimModelCache.get_key(_SimModelCacheExample0TC, self._dut(), None)
+        self.assertEqual(k0, SimModelCache.get_key(_SimModelCacheExample1TC, self._dut(), None))
+        self.assertNotEqual(k0, SimModelCache.get_key(_SimModelCacheExample0TC, self._dut(32), None))
+
+    def test_in_process(self):
+        cache = SimModelCache()
+        orig_compileSim = SimTestCase.__dict__["compileSim"]
+        with cache.patch():
+            dut0 = _SimModelCacheExample0TC.dut = self._dut()
+            _SimModelCacheExample0TC.compileSim(dut0)
+            _SimModelCacheExample1TC.dut = self._dut()
+            _SimModelCacheExample1TC.compileSim(_SimModelCacheExample1TC.dut)
+            self.assertIs(_SimModelCacheExample1TC.dut, dut0)
+            self.assertIs(_SimModelCacheExample1TC.rtl_simulator_cls,
+                          _SimModelCacheExample0TC.rtl_simulator_cls)
+            _SimModelCacheExample1TC.compileSim(self._dut(32))
+            self.assertIsNot(_SimModelCacheExample1TC.dut, dut0)
+
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertIs(SimTestCase.__dict__["compileSim"], orig_compileSim)
+
+    def test_in_process_different_attr_name(self):
+        cache = SimModelCache()
+        with cache.patch():
+            dut0 = _SimModelCacheExample0TC.dut = self._dut()
+            _SimModelCacheExample0TC.compileSim(dut0)
+            _SimModelCacheExample2TC.u = self._dut()
+            _SimModelCacheExample2TC.compileSim(_SimModelCacheExample2TC.u)
+            self.assertIs(_SimModelCacheExample2TC.u, dut0)
+            self.assertNotIn("dut", vars(_SimModelCacheExample2TC))
+
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_on_disk(self):
+        with TemporaryDirectory() as d:
+            cache = SimModelCache(d)
+            with cache.patch():
+                _SimModelCacheExample0TC.compileSim(self._dut())
+            self.assertEqual((cache.disk_hits, cache.misses), (0, 1))
+            self.assertEqual(len(os.listdir(d)), 1)
+
+            # new process
+            cache = SimModelCache(d)
+            with cache.patch():
+                _SimModelCacheExample0TC.compileSim(self._dut())
+            self.assertEqual((cache.disk_hits, cache.misses), (1, 0))
+            self.assertTrue(_SimModelCacheExample0TC.RECOMPILE)
+
+
+if __name__ == "__main__":
+    testLoader = unittest.TestLoader()
+    suite = testLoader.loadTestsFromTestCase(SimModelCacheTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)